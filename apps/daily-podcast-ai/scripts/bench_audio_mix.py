@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+音频装配基准测试（合成的测试音频，无需 TTS）
+
+用 ffmpeg 生成若干个 TTS 长度的语音片段、一段背景音乐和片头片尾，分别用
+pydub 和 ffmpeg 引擎执行 AudioMixer.create_final_podcast，对比耗时与峰值内存。
+每个引擎在独立子进程中运行，峰值内存取 Python 进程与其调用的 ffmpeg 子进程中的最大值
+（fork 出的子进程会继承父进程当时的 RSS，pydub 引擎的子进程峰值因此与 Python 相同）。
+
+用法:
+  python scripts/bench_audio_mix.py
+  python scripts/bench_audio_mix.py --segments 120 --segment-seconds 10
+  python scripts/bench_audio_mix.py --engines ffmpeg --format mp3
+
+注意：pydub 读取 MP3 需要 ffprobe；环境中没有 ffprobe 时自动改用 WAV 片段。
+"""
+
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.ffmpeg_assembler import find_ffmpeg
+
+
+def make_tone(ffmpeg: str, path: Path, seconds: float, freq: int, volume_db: float) -> None:
+    """生成一段带音量起伏的测试音频（单声道）"""
+    subprocess.run(
+        [
+            ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency={freq}:duration={seconds}:sample_rate=44100",
+            "-af", f"volume={volume_db}dB,tremolo=f=3:d=0.6",
+            "-ac", "1", "-b:a", "128k", str(path),
+        ],
+        check=True,
+    )
+
+
+def build_fixtures(ffmpeg: str, workdir: Path, args: argparse.Namespace) -> dict:
+    workdir.mkdir(parents=True, exist_ok=True)
+    ext = args.format
+    jobs = []
+    segments = []
+    for i in range(args.segments):
+        path = workdir / f"line_{i:03d}.{ext}"
+        seconds = args.segment_seconds * (0.6 + 0.8 * ((i * 37) % 11) / 10)
+        jobs.append((path, round(seconds, 2), 200 + (i * 53) % 600, -6 - (i * 7) % 18))
+        segments.append(str(path))
+    bgm = workdir / f"bgm.{ext}"
+    intro = workdir / f"intro.{ext}"
+    outro = workdir / f"outro.{ext}"
+    jobs += [(bgm, 45, 110, -3), (intro, 4, 880, -3), (outro, 5, 660, -3)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda job: make_tone(ffmpeg, *job), jobs))
+
+    return {"segments": segments, "bgm": str(bgm), "intro": str(intro), "outro": str(outro)}
+
+
+def run_child(engine: str, fixtures_path: Path, output: Path) -> None:
+    """子进程：执行一次装配并输出 JSON 结果"""
+    from pydub import AudioSegment as PydubSegment
+    from generators.audio_mixer import AudioMixer
+
+    # pydub 通过 PATH 查找 ffmpeg；这里与装配器使用同一个二进制
+    PydubSegment.converter = find_ffmpeg()
+
+    fixtures = json.loads(fixtures_path.read_text(encoding="utf-8"))
+    config_path = output.with_suffix(".yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"audio": {"engine": engine}}, f)
+
+    mixer = AudioMixer(str(config_path))
+    segments = [SimpleNamespace(filepath=p) for p in fixtures["segments"]]
+
+    start = time.perf_counter()
+    result = mixer.create_final_podcast(
+        segments,
+        str(output),
+        bgm_path=fixtures["bgm"],
+        intro_jingle_path=fixtures["intro"],
+        outro_jingle_path=fixtures["outro"],
+        show_progress=False,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "engine": "ffmpeg" if mixer.assembler else "pydub",
+        "seconds": elapsed,
+        "duration": result.duration_seconds if result else 0,
+        "ok": bool(result and result.has_bgm and result.has_intro_jingle and result.has_outro_jingle),
+        # Linux 上 ru_maxrss 单位为 KB
+        "python_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "size_kb": output.stat().st_size / 1024 if output.exists() else 0,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音频装配基准测试")
+    parser.add_argument("--segments", type=int, default=60, help="语音片段数")
+    parser.add_argument("--segment-seconds", type=float, default=12, help="平均片段时长（秒）")
+    parser.add_argument("--format", choices=["mp3", "wav"], default=None, help="片段格式（默认 mp3，无 ffprobe 时 wav）")
+    parser.add_argument("--engines", default="pydub,ffmpeg", help="对比的引擎，逗号分隔")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--fixtures", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, Path(args.fixtures), Path(args.output))
+        return
+
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        print("❌ 未找到 ffmpeg")
+        sys.exit(1)
+    if args.format is None:
+        args.format = "mp3" if shutil.which("ffprobe") else "wav"
+        if args.format == "wav":
+            print("⚠️ 未找到 ffprobe（pydub 读取 MP3 需要），改用 WAV 片段")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        print(f"🎛️ 生成测试音频: {args.segments} 个片段 × ~{args.segment_seconds}s ({args.format})")
+        fixtures = build_fixtures(ffmpeg, tmp_dir / "fixtures", args)
+        fixtures_path = tmp_dir / "fixtures.json"
+        fixtures_path.write_text(json.dumps(fixtures), encoding="utf-8")
+        print("=" * 60)
+
+        results = []
+        for engine in [e.strip() for e in args.engines.split(",") if e.strip()]:
+            proc = subprocess.run(
+                [
+                    sys.executable, __file__, "--child", engine,
+                    "--fixtures", str(fixtures_path),
+                    "--output", str(tmp_dir / f"podcast-{engine}.mp3"),
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                print(f"❌ {engine} 失败:\n{proc.stderr[-2000:]}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{result['engine']}: {result['seconds']:.2f}s，节目时长 {result['duration'] / 60:.1f} 分钟，"
+                  f"峰值内存 Python {result['python_rss_mb']:.0f}MB / 子进程 {result['child_rss_mb']:.0f}MB，"
+                  f"输出 {result['size_kb'] / 1024:.1f}MB{'' if result['ok'] else '（不完整）'}")
+
+        if results:
+            print("\n📊 结果汇总")
+            base = results[0]
+            for result in results:
+                peak = max(result["python_rss_mb"], result["child_rss_mb"])
+                speedup = base["seconds"] / result["seconds"] if result["seconds"] else 0
+                print(f"  {result['engine']:<7} {result['seconds']:7.2f}s  峰值 {peak:6.0f}MB  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
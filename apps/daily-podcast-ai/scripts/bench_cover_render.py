@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+封面渲染基准测试
+
+在同一进程内连续生成多张封面，统计每张封面的渲染耗时（首张含字体 / logo 加载，
+之后命中缓存）。legacy 为原逐像素 putpixel 渐变实现的 generate_cover，用于对比。
+
+用法:
+  python scripts/bench_cover_render.py
+  python scripts/bench_cover_render.py --runs 5 --skip-legacy
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "scripts"))
+
+import generate_cover
+from generate_movie_cover import generate_movie_cover
+from generate_perfect_days_cover import generate_perfect_days_cover
+from generate_perfect_days_cover_v3 import generate_cover as generate_perfect_days_cover_v3
+
+LOGO_PATH = project_root / generate_cover.DEFAULT_LOGO_PATH
+
+
+def legacy_gradient_background(width: int, height: int, color1: tuple, color2: tuple) -> Image.Image:
+    """原实现：逐像素 putpixel 填充蒙版"""
+    base = Image.new("RGB", (width, height), color1)
+    top = Image.new("RGB", (width, height), color2)
+    mask = Image.new("L", (width, height))
+    for y in range(height):
+        for x in range(width):
+            mask.putpixel((x, y), int(255 * ((x + y) / (width + height))))
+    base.paste(top, mask=mask)
+    return base
+
+
+def measure(label: str, render, runs: int) -> list[float]:
+    timings = []
+    for i in range(runs):
+        start = time.perf_counter()
+        render(i)
+        timings.append(time.perf_counter() - start)
+    warm = timings[1:] or timings
+    print(f"  {label:<22} 首张 {timings[0] * 1000:8.1f}ms   之后平均 {statistics.mean(warm) * 1000:8.1f}ms")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="封面渲染基准测试")
+    parser.add_argument("--runs", type=int, default=3, help="每种封面生成次数")
+    parser.add_argument("--skip-legacy", action="store_true", help="跳过原逐像素实现（很慢）")
+    args = parser.parse_args()
+
+    logo = str(LOGO_PATH) if LOGO_PATH.exists() else None
+    date = datetime(2026, 1, 8)
+
+    # 每张封面都会打印保存信息，这里静默
+    quiet = mock.patch("builtins.print")
+
+    print(f"🎨 封面渲染基准（1400x1400，每种 {args.runs} 张，logo: {'有' if logo else '无'}）")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        results = {}
+
+        def daily(i):
+            with quiet:
+                generate_cover.generate_cover(date, str(out / f"daily-{i}.png"), logo_path=logo,
+                                              category_stats={"ai": 3})
+
+        if not args.skip_legacy:
+            with mock.patch.object(generate_cover, "create_gradient_background", legacy_gradient_background):
+                results["legacy"] = measure("generate_cover (legacy)", daily, max(1, min(args.runs, 2)))
+
+        results["daily"] = measure("generate_cover", daily, args.runs)
+
+        def movie(i):
+            with quiet:
+                generate_movie_cover("完美的日子", str(out / f"movie-{i}.png"), logo_path=logo, date_str="2026-01-08")
+
+        def perfect_days(i):
+            with quiet:
+                generate_perfect_days_cover(str(out / f"perfect-days-{i}.png"), logo_path=logo)
+
+        def perfect_days_v3(i):
+            with quiet:
+                generate_perfect_days_cover_v3(str(out / f"perfect-days-v3-{i}.png"))
+
+        results["movie"] = measure("generate_movie_cover", movie, args.runs)
+        results["perfect_days"] = measure("perfect_days_cover", perfect_days, args.runs)
+        results["perfect_days_v3"] = measure("perfect_days_cover_v3", perfect_days_v3, args.runs)
+
+    if "legacy" in results:
+        legacy = statistics.mean(results["legacy"])
+        daily_time = statistics.mean(results["daily"])
+        print(f"\n📊 generate_cover: {legacy * 1000:.0f}ms → {daily_time * 1000:.0f}ms ({legacy / daily_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+近似重复新闻聚类基准测试
+
+以 cache/ 中的历史新闻为种子，合成指定数量的文章（部分为多源转载的改写版本），
+测量 NewsDeduplicator 的聚类耗时与合并效果。
+
+用法:
+  python scripts/bench_news_dedup.py
+  python scripts/bench_news_dedup.py --articles 5000 --dup-rate 0.4
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from processors.news_dedup import NewsDeduplicator
+
+SOURCES = ["36氪", "虎嗅", "少数派", "澎湃新闻", "IT之家", "TechCrunch", "The Verge"]
+TITLE_PREFIXES = ["", "快讯：", "突发｜", "【独家】", "重磅："]
+TITLE_SUFFIXES = ["", "，官方回应", "（附详情）", " | 最新消息"]
+
+
+def load_seed_news() -> list[dict]:
+    seeds = []
+    for path in sorted((project_root / "cache").glob("*-news.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            seeds.extend(json.load(f))
+    return seeds
+
+
+def rewrite(news: dict, rng: random.Random) -> dict:
+    """模拟转载：换来源、加前后缀、截断/改写摘要"""
+    summary = news.get("summary", "")
+    cut = rng.randint(int(len(summary) * 0.6), len(summary)) if summary else 0
+    return {
+        "title": rng.choice(TITLE_PREFIXES) + news["title"] + rng.choice(TITLE_SUFFIXES),
+        "summary": summary[:cut] + rng.choice(["", "。更多细节请关注后续报道。"]),
+        "link": f"{news.get('link', '')}#{rng.random()}",
+        "source": rng.choice(SOURCES),
+        "category": news.get("category", "科技"),
+        "published": news.get("published"),
+    }
+
+
+def _fragments(seeds: list[dict], key: str) -> list[str]:
+    parts = []
+    for news in seeds:
+        parts.extend(p for p in re.split(r"[，。；！？,.!?：:]", news.get(key, "")) if len(p) >= 4)
+    return parts
+
+
+def _mutate(text: str, vocab: str, rate: float, rng: random.Random) -> str:
+    """随机替换部分字符，使不同事件之间不共享大段原文"""
+    return "".join(rng.choice(vocab) if rng.random() < rate else ch for ch in text)
+
+
+def synthesize(seeds: list[dict], count: int, dup_rate: float, rng: random.Random) -> tuple[list[dict], int]:
+    """
+    生成 count 篇文章，返回 (文章, 独立事件数)
+
+    独立事件由不同种子的片段拼接并随机替换部分字符得到；转载版本由 rewrite() 生成
+    """
+    title_parts = _fragments(seeds, "title")
+    summary_parts = _fragments(seeds, "summary")
+    vocab = "".join(sorted({ch for news in seeds for ch in news.get("summary", "") if "\u4e00" <= ch <= "\u9fff"}))
+    articles, stories = [], 0
+    while len(articles) < count:
+        stories += 1
+        base = dict(rng.choice(seeds))
+        base["title"] = _mutate("，".join(rng.sample(title_parts, 2)), vocab, 0.3, rng)
+        base["summary"] = _mutate("。".join(rng.sample(summary_parts, 4)), vocab, 0.3, rng)
+        base["link"] = f"https://example.com/story/{stories}"
+        articles.append(base)
+        while rng.random() < dup_rate and len(articles) < count:
+            articles.append(rewrite(base, rng))
+    rng.shuffle(articles)
+    return articles, stories
+
+
+def main():
+    parser = argparse.ArgumentParser(description="近似重复新闻聚类基准测试")
+    parser.add_argument("--articles", type=int, default=3000, help="文章数量")
+    parser.add_argument("--dup-rate", type=float, default=0.5, help="每个事件继续产生转载的概率")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快）")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    seeds = load_seed_news()
+    if not seeds:
+        print("❌ cache/ 中没有可用的新闻种子")
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    articles, stories = synthesize(seeds, args.articles, args.dup_rate, rng)
+    dedup = NewsDeduplicator()
+
+    best = float("inf")
+    clusters = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        clusters = dedup.cluster(articles)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"📰 文章 {len(articles)} 篇，独立事件 {stories} 个（种子 {len(seeds)} 篇）")
+    print(f"⏱️ 聚类耗时 {best * 1000:.1f}ms（{best / len(articles) * 1e6:.1f}µs/篇）")
+    print(f"🔗 聚类结果 {len(clusters)} 簇，最大簇 {max(c.size for c in clusters)} 篇")
+
+    # 真实缓存上的效果示例
+    real = NewsDeduplicator().cluster(seeds)
+    merged = [c for c in real if c.size > 1]
+    print(f"\n📂 历史缓存 {len(seeds)} 篇 → {len(real)} 簇，其中 {len(merged)} 簇包含转载/重复")
+    for cluster in merged[:5]:
+        print(f"  [{cluster.size}] {cluster.representative['title'][:40]}  ({', '.join(cluster.sources)})")
+
+
+if __name__ == "__main__":
+    main()
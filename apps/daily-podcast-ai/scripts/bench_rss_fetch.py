@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+RSS 抓取基准测试（本地 fixture feed 服务器，无需外网）
+
+启动若干个本地 HTTP 服务器（每个端口视为一个独立主机），每个服务器提供多个
+RSS feed，支持可配置的响应延迟和 ETag / Last-Modified 条件请求。对比：
+
+  legacy   原串行实现：逐个 requests.get，源之间 sleep(request_interval)
+  cold     并发引擎首次抓取（无条件请求状态）
+  warm     并发引擎再次抓取（feed 未变化，全部命中 304）
+
+用法:
+  python scripts/bench_rss_fetch.py
+  python scripts/bench_rss_fetch.py --sources 24 --hosts 6 --latency 0.3 --interval 1
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import feedparser
+import requests
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from news_sources import RSSFetcher
+
+
+def build_feed(feed_id: int, items: int) -> bytes:
+    """生成一个包含 items 篇文章的 RSS 2.0 feed"""
+    now = datetime.now(timezone.utc)
+    entries = []
+    for i in range(items):
+        published = format_datetime(now - timedelta(minutes=10 * i))
+        entries.append(
+            f"<item><title>AI 新闻 {feed_id}-{i}：大模型产品发布</title>"
+            f"<link>http://example.com/{feed_id}/{i}</link>"
+            f"<description>&lt;p&gt;第 {feed_id} 个源的第 {i} 篇人工智能科技新闻摘要。&lt;/p&gt;</description>"
+            f"<pubDate>{published}</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Fixture {feed_id}</title><link>http://example.com/{feed_id}</link>"
+        f"<description>fixture</description>{''.join(entries)}</channel></rss>"
+    ).encode("utf-8")
+
+
+class FixtureFeedServer:
+    """本地 fixture feed 服务器：/feed/<id>.xml，支持延迟与条件请求"""
+
+    def __init__(self, feeds: dict[int, bytes], latency: float = 0.0):
+        self.feeds = feeds
+        self.latency = latency
+        self.last_modified = format_datetime(datetime.now(timezone.utc), usegmt=True)
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, *args) -> None:
+                return
+
+            def do_GET(self) -> None:
+                time.sleep(server.latency)
+                try:
+                    feed_id = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+                    body = server.feeds[feed_id]
+                except (ValueError, KeyError):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                with server._lock:
+                    server.requests += 1
+                    if self.headers.get("If-None-Match") == etag:
+                        server.not_modified += 1
+                        unchanged = True
+                    else:
+                        unchanged = False
+
+                if unchanged:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", server.last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureFeedServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def write_config(path: Path, sources: list[dict], args: argparse.Namespace, state_file: Path) -> None:
+    config = {
+        "sources": {"rss": sources},
+        "filters": {
+            "include_keywords": ["AI"],
+            "exclude_keywords": [],
+            "max_articles_per_source": 10,
+            "max_total_articles": 1000,
+        },
+        "fetch": {
+            "timeout": 30,
+            "request_interval": args.interval,
+            "per_host_interval": args.interval,
+            "max_workers": args.workers,
+            "max_retries": 1,
+            "conditional_get": True,
+            "state_file": str(state_file),
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+
+
+def legacy_fetch_all(fetcher: RSSFetcher, interval: float) -> int:
+    """原实现：串行下载 + 源间全局 sleep"""
+    sources = fetcher._get_enabled_sources()
+    total = 0
+    for i, source in enumerate(sources):
+        response = requests.get(source["url"], headers={"User-Agent": "bench"}, timeout=30)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        total += len(fetcher._extract_articles(source, feed))
+        if i < len(sources) - 1:
+            time.sleep(interval)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS 抓取基准测试")
+    parser.add_argument("--sources", type=int, default=20, help="feed 数量")
+    parser.add_argument("--hosts", type=int, default=5, help="模拟主机数（每个主机一个端口）")
+    parser.add_argument("--items", type=int, default=30, help="每个 feed 的文章数")
+    parser.add_argument("--latency", type=float, default=0.2, help="服务器响应延迟（秒）")
+    parser.add_argument("--interval", type=float, default=0.5, help="请求间隔 / 同主机间隔（秒）")
+    parser.add_argument("--workers", type=int, default=8, help="并发线程数")
+    parser.add_argument("--skip-legacy", action="store_true", help="跳过串行基线")
+    args = parser.parse_args()
+
+    feeds_per_host: list[dict[int, bytes]] = [{} for _ in range(args.hosts)]
+    for feed_id in range(args.sources):
+        feeds_per_host[feed_id % args.hosts][feed_id] = build_feed(feed_id, args.items)
+
+    servers = [FixtureFeedServer(feeds, args.latency).start() for feeds in feeds_per_host]
+    sources = [
+        {
+            "name": f"fixture-{feed_id}",
+            "url": f"{servers[feed_id % args.hosts].base_url}/feed/{feed_id}.xml",
+            "category": "科技",
+            "enabled": True,
+        }
+        for feed_id in range(args.sources)
+    ]
+
+    print(f"📡 {args.sources} 个 feed / {args.hosts} 个主机，延迟 {args.latency}s，间隔 {args.interval}s，"
+          f"并发 {args.workers}")
+    print("=" * 60)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / "sources.yaml"
+            write_config(config_path, sources, args, Path(tmp) / "feed_state.json")
+
+            timings = {}
+            if not args.skip_legacy:
+                start = time.perf_counter()
+                count = legacy_fetch_all(RSSFetcher(str(config_path)), args.interval)
+                timings["legacy"] = time.perf_counter() - start
+                print(f"legacy: {timings['legacy']:.2f}s，{count} 篇")
+
+            for label in ("cold", "warm"):
+                fetcher = RSSFetcher(str(config_path))
+                start = time.perf_counter()
+                articles = fetcher.fetch_all()
+                timings[label] = time.perf_counter() - start
+                not_modified = sum(1 for s in fetcher.last_stats if s.status == "not_modified")
+                downloaded = sum(s.bytes for s in fetcher.last_stats)
+                print(f"{label}: {timings[label]:.2f}s，{len(articles)} 篇，"
+                      f"304 {not_modified} 个，下载 {downloaded / 1024:.1f}KB")
+                print("=" * 60)
+
+            print("\n📊 结果汇总")
+            for label, seconds in timings.items():
+                speedup = f"（{timings['legacy'] / seconds:.1f}x）" if "legacy" in timings and label != "legacy" else ""
+                print(f"  {label:<7} {seconds:7.2f}s {speedup}")
+            print(f"  服务器请求 {sum(s.requests for s in servers)} 次，"
+                  f"其中 304 {sum(s.not_modified for s in servers)} 次")
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+视频合成基准测试（合成的测试素材，无需图像生成 / TTS）
+
+生成若干张 1920x1080 场景图、对应的测试音频和字幕，分别统计：
+- 字幕帧渲染：原逐字测量换行的串行实现 vs 缓存测量 + 进程池并行
+- 视频合成：moviepy 逐帧合成 vs ffmpeg concat demuxer（恒定帧率 / 每场景一帧），
+  未安装 moviepy 时跳过
+
+用法:
+  python scripts/bench_video_compose.py
+  python scripts/bench_video_compose.py --scenes 40 --scene-seconds 5 --workers 4
+  python scripts/bench_video_compose.py --font /path/to/font.ttc --engines ffmpeg
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw, ImageFont
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.cover_render import vertical_gradient
+from generators.ffmpeg_assembler import find_ffmpeg
+from generators.video_composer import SUBTITLE_FONT_PATHS, VideoComposer
+
+SAMPLE_DIALOGUE = (
+    "今天我们聊聊大模型在端侧设备上的落地，从芯片算力、内存带宽到量化方案，"
+    "每一个环节都会影响最终的用户体验，这也是各家厂商竞争的焦点。"
+)
+
+
+def legacy_render(image_path: str, subtitle: str, output_path: str, subtitle_config: dict) -> str:
+    """原实现：每帧重新加载字体，逐字累加测量换行"""
+    img = Image.open(image_path).convert("RGB")
+    draw = ImageDraw.Draw(img, "RGBA")
+    font_size = subtitle_config.get("font_size", 48)
+    margin = subtitle_config.get("margin", 60)
+
+    font = ImageFont.load_default()
+    for font_path in ([subtitle_config["font_path"]] if subtitle_config.get("font_path") else []) + list(SUBTITLE_FONT_PATHS):
+        if Path(font_path).exists():
+            font = ImageFont.truetype(font_path, font_size)
+            break
+
+    max_width = img.width - 2 * margin
+    lines, current_line = [], ""
+    for char in subtitle:
+        test_line = current_line + char
+        bbox = draw.textbbox((0, 0), test_line, font=font)
+        if bbox[2] - bbox[0] <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = char
+    if current_line:
+        lines.append(current_line)
+
+    line_heights = [draw.textbbox((0, 0), line, font=font)[3] for line in lines]
+    total_height = sum(line_heights) + (len(lines) - 1) * 10
+    y = img.height - total_height - margin
+    draw.rectangle([margin - 20, y - 20, img.width - margin + 20, y + total_height + 20],
+                   fill=tuple(subtitle_config.get("bg_color", [0, 0, 0, 180])))
+    for line in lines:
+        bbox = draw.textbbox((0, 0), line, font=font)
+        draw.text(((img.width - (bbox[2] - bbox[0])) / 2, y), line, font=font,
+                  fill=tuple(subtitle_config.get("font_color", [255, 255, 255])))
+        y += bbox[3] + 10
+    img.save(output_path)
+    return output_path
+
+
+def build_fixtures(ffmpeg: str, workdir: Path, args: argparse.Namespace) -> tuple[list, list]:
+    workdir.mkdir(parents=True, exist_ok=True)
+    frames, segments = [], []
+    for i in range(args.scenes):
+        image_path = workdir / f"scene_{i:03d}.png"
+        top = (40 + i * 7 % 120, 60, 120)
+        vertical_gradient((1920, 1080), top, (20, 20 + i * 11 % 100, 40)).save(image_path)
+
+        audio_path = workdir / f"line_{i:03d}.mp3"
+        subprocess.run(
+            [ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+             "-f", "lavfi", "-i", f"sine=frequency={220 + i * 37 % 500}:duration={args.scene_seconds}",
+             "-ac", "1", "-b:a", "128k", str(audio_path)],
+            check=True,
+        )
+        dialogue = SAMPLE_DIALOGUE[: 30 + i * 13 % len(SAMPLE_DIALOGUE)] * (1 + i % 2)
+        frames.append(SimpleNamespace(image_path=str(image_path), dialogue=dialogue))
+        segments.append(SimpleNamespace(filepath=str(audio_path), duration_seconds=args.scene_seconds))
+    return frames, segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="视频合成基准测试")
+    parser.add_argument("--scenes", type=int, default=24, help="场景数")
+    parser.add_argument("--scene-seconds", type=float, default=4, help="每个场景时长（秒）")
+    parser.add_argument("--workers", type=int, default=None, help="字幕渲染进程数（默认 CPU 核数）")
+    parser.add_argument("--font", default=None, help="字幕字体路径（默认使用系统字体）")
+    parser.add_argument("--engines", default="moviepy,ffmpeg-cfr,ffmpeg",
+                        help="对比的编码引擎，逗号分隔（ffmpeg: 每场景一帧，ffmpeg-cfr: 恒定帧率）")
+    args = parser.parse_args()
+
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        print("❌ 未找到 ffmpeg")
+        sys.exit(1)
+
+    composer = VideoComposer()
+    if args.font:
+        composer.subtitle_config["font_path"] = args.font
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        print(f"🎬 生成测试素材: {args.scenes} 个场景 × {args.scene_seconds}s (1920x1080)")
+        frames, segments = build_fixtures(ffmpeg, tmp_dir / "fixtures", args)
+        print("=" * 60)
+
+        legacy_dir = tmp_dir / "legacy"
+        legacy_dir.mkdir()
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            legacy_render(frame.image_path, frame.dialogue, str(legacy_dir / f"{i}.png"), composer.subtitle_config)
+        legacy_time = time.perf_counter() - start
+        print(f"字幕渲染 (原串行实现): {legacy_time:.2f}s")
+
+        fast_dir = tmp_dir / "fast"
+        fast_dir.mkdir()
+        start = time.perf_counter()
+        composer.render_subtitles(frames, fast_dir, workers=args.workers)
+        fast_time = time.perf_counter() - start
+        print(f"字幕渲染 (缓存 + 进程池): {fast_time:.2f}s")
+
+        results = {}
+        for engine in [e.strip() for e in args.engines.split(",") if e.strip()]:
+            if engine == "moviepy" and importlib.util.find_spec("moviepy") is None:
+                print("moviepy: 未安装，跳过")
+                continue
+            # ffmpeg-cfr: ffmpeg 引擎按 fps 输出恒定帧率
+            composer.video_config["frame_mode"] = "cfr" if engine == "ffmpeg-cfr" else "still"
+            output = tmp_dir / f"video-{engine}.mp4"
+            start = time.perf_counter()
+            meta = composer.compose_video(frames, segments, str(output), show_progress=False,
+                                          engine=engine.split("-")[0])
+            elapsed = time.perf_counter() - start
+            if not meta:
+                print(f"❌ {engine} 失败")
+                continue
+            results[engine] = elapsed
+            print(f"{engine}: {elapsed:.2f}s，视频时长 {meta.duration_seconds:.0f}s，"
+                  f"输出 {output.stat().st_size / 1024 / 1024:.1f}MB")
+
+        print("\n📊 结果汇总")
+        print(f"  字幕渲染 {legacy_time:.2f}s → {fast_time:.2f}s ({legacy_time / fast_time:.1f}x)")
+        base = next(iter(results.values()), None)
+        for engine, elapsed in results.items():
+            print(f"  {engine:<10} {elapsed:7.2f}s  ({base / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@
 """
 
 import argparse
+import os
 import sys
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 
@@ -14,11 +16,13 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
 from dotenv import load_dotenv
-from news_sources.rss_fetcher import Article
 
 # 加载环境变量
 load_dotenv(project_root / ".env")
 
+# 生成流程的阶段（见 generate_podcast）
+PIPELINE_STAGES = ("fetch", "rank", "summarize", "script", "tts", "mix", "cover", "publish")
+
 
 def filter_low_quality_news(articles: list) -> list:
     """
@@ -68,41 +72,37 @@ def filter_low_quality_news(articles: list) -> list:
     return filtered
 
 
-def load_articles_from_cache(date_str: str) -> list:
+def load_articles_from_cache(date_str: str, window_hours: int = None) -> list:
     """
     从缓存加载新闻
 
     Args:
         date_str: 日期字符串 (YYYY-MM-DD)
+        window_hours: 跨天时间窗口（小时）。指定时加载截至该日期（当天则截至现在）
+            前 window_hours 小时内收集的新闻，跨天去重；默认只加载当天收集的新闻
 
     Returns:
         Article 对象列表
     """
-    import json
-
-    cache_path = project_root / "cache" / f"{date_str}-news.json"
-
-    if not cache_path.exists():
-        print(f"  ⚠️ 缓存文件不存在: {cache_path}")
-        return []
-
-    with open(cache_path, "r", encoding="utf-8") as f:
-        news_list = json.load(f)
-
-    # 转换为 Article 对象
-    articles = []
-    for news in news_list:
-        article = Article(
-            title=news["title"],
-            summary=news["summary"],
-            link=news["link"],
-            source=news["source"],
-            category=news["category"],
-            published=datetime.fromisoformat(news["published"]) if news.get("published") else None
-        )
-        articles.append(article)
+    from datetime import timedelta
+    from news_sources import NewsStore
+
+    cache_dir = project_root / "cache"
 
-    print(f"  📂 从缓存加载 {len(articles)} 篇新闻")
+    with NewsStore(cache_dir / "news.db") as store:
+        store.import_json_cache(cache_dir)
+
+        if window_hours:
+            end = min(datetime.now(), datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1))
+            start = end - timedelta(hours=window_hours)
+            articles = store.load_articles(start=start, end=end)
+            print(f"  📂 从缓存加载 {len(articles)} 篇新闻（{start:%m-%d %H:%M} ~ {end:%m-%d %H:%M}）")
+        else:
+            articles = store.load_articles(day=date_str)
+            print(f"  📂 从缓存加载 {len(articles)} 篇新闻")
+
+    if not articles:
+        print(f"  ⚠️ 缓存中没有 {date_str} 的新闻")
     return articles
 
 
@@ -130,6 +130,9 @@ def main():
 
   # 指定输出目录
   python daily_generate.py --output ./my-podcasts
+
+  # 重新运行时复用未变化的阶段，强制重新获取新闻（新闻有变化时下游阶段才会重跑）
+  python daily_generate.py --from-cache --force fetch
         """
     )
 
@@ -224,12 +227,32 @@ def main():
         help="从缓存读取新闻并使用 AI 优选（每小时收集模式）"
     )
 
+    parser.add_argument(
+        "--cache-hours",
+        type=int,
+        default=None,
+        help="配合 --from-cache：读取最近 N 小时收集的新闻（可跨天），默认只读当天"
+    )
+
     parser.add_argument(
         "--classic",
         action="store_true",
         help="使用经典单人播报模式 (禁用 Deep Dive 双人对话)"
     )
 
+    parser.add_argument(
+        "--force",
+        type=str,
+        default=None,
+        help=f"强制重跑的阶段，逗号分隔，all 表示全部；下游阶段只在其产物变化时重跑 (可选: {', '.join(PIPELINE_STAGES)})"
+    )
+
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="生成完成后发布到 RSS.com（需要 RSS_COM_API_KEY / RSS_COM_PODCAST_ID）"
+    )
+
     args = parser.parse_args()
 
     # 解析日期
@@ -244,6 +267,12 @@ def main():
 
     date_str = target_date.strftime("%Y-%m-%d")
 
+    force_stages = [s.strip() for s in (args.force or "").split(",") if s.strip()]
+    unknown = set(force_stages) - set(PIPELINE_STAGES) - {"all"}
+    if unknown:
+        print(f"❌ 未知阶段: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
     # 打印横幅
     print_banner(date_str)
 
@@ -268,7 +297,10 @@ def main():
             verbose=args.verbose,
             dry_run=args.dry_run,
             from_cache=args.from_cache,
-            deep_dive=not args.classic
+            cache_hours=args.cache_hours,
+            deep_dive=not args.classic,
+            force_stages=force_stages,
+            publish=args.publish
         )
 
         if result:
@@ -312,6 +344,9 @@ def print_summary(result: dict):
     if result.get("audio_path"):
         print(f"🎧 音频文件: {result['audio_path']}")
 
+    if result.get("cover_path"):
+        print(f"🎨 封面文件: {result['cover_path']}")
+
     if result.get("duration"):
         minutes = result["duration"] / 60
         print(f"⏱️  时长: {result['duration']:.1f} 秒 ({minutes:.1f} 分钟)")
@@ -322,9 +357,48 @@ def print_summary(result: dict):
     if result.get("categories"):
         print(f"📂 分类: {', '.join(result['categories'])}")
 
+    if result.get("episode_url"):
+        print(f"📡 已发布: {result['episode_url']}")
+
+    if result.get("report_path"):
+        print(f"⏱️  阶段报告: {result['report_path']}")
+
     print()
 
 
+def article_to_dict(article) -> dict:
+    """Article -> 可 JSON 序列化的字典（用于阶段检查点）"""
+    data = asdict(article)
+    if article.published:
+        data["published"] = article.published.isoformat()
+    return data
+
+
+def article_from_dict(data: dict):
+    """从阶段检查点恢复 Article"""
+    from news_sources.rss_fetcher import Article
+
+    data = dict(data)
+    if data.get("published"):
+        data["published"] = datetime.fromisoformat(data["published"])
+    return Article(**data)
+
+
+def script_from_dict(data: dict, deep_dive: bool):
+    """从阶段检查点恢复脚本对象（DialogueScript / PodcastScript）"""
+    if not deep_dive:
+        from processors.script_writer import PodcastScript
+        return PodcastScript(**data)
+
+    try:
+        from processors.claude_dialogue_writer import DialogueLine, DialogueScript
+    except ImportError:
+        from processors.dialogue_writer import DialogueLine, DialogueScript
+    data = dict(data)
+    data["lines"] = [DialogueLine(**line) for line in data["lines"]]
+    return DialogueScript(**data)
+
+
 def generate_podcast(
     target_date: datetime,
     max_articles: int = 10,
@@ -340,11 +414,19 @@ def generate_podcast(
     verbose: bool = False,
     dry_run: bool = False,
     from_cache: bool = False,
-    deep_dive: bool = True
+    cache_hours: int = None,
+    deep_dive: bool = True,
+    force_stages: list = None,
+    publish: bool = False
 ) -> dict:
     """
     生成播客的主流程
 
+    按阶段 DAG 执行：fetch → rank → summarize → script → tts → mix，
+    cover 只依赖 summarize，与 script / tts / mix 并行；publish 依赖 script、mix 和 cover。
+    每个阶段的产物保存在输出目录的 .pipeline/ 下，重新运行时参数与上游产物不变的阶段直接复用，
+    各阶段耗时写入输出目录的 pipeline-report.json。
+
     Args:
         target_date: 目标日期
         max_articles: 最大文章数
@@ -359,16 +441,16 @@ def generate_podcast(
         voice_id: 语音ID
         verbose: 详细输出
         dry_run: 演示模式
+        from_cache: 从缓存读取新闻
+        cache_hours: 缓存读取的时间窗口（小时），None 表示当天
         deep_dive: 是否使用深度对话模式 (Deep Dive)
+        force_stages: 强制重跑的阶段（"all" 表示全部）；下游阶段只在其产物哈希变化时重跑，否则仍复用检查点
+        publish: 生成完成后发布到 RSS.com
 
     Returns:
-        结果字典
+        结果字典（获取新闻到生成脚本之间任一阶段失败时返回 None）
     """
-    from news_sources import RSSFetcher
-    from processors.summarizer import ArticleSummarizer, SimpleSummarizer
-    from processors.script_writer import ScriptWriter
-    from processors.dialogue_writer import DialogueWriter
-    from generators import TTSGenerator, AudioMixer
+    from pipeline import Stage, StageError, StagePipeline, file_fingerprint
     import yaml
 
     date_str = target_date.strftime("%Y-%m-%d")
@@ -405,6 +487,7 @@ def generate_podcast(
         output_path = base_output_path / date_str / "dailyReport"
         
     output_path.mkdir(parents=True, exist_ok=True)
+    audio_dir = output_path / "audio"
 
     result = {
         "date": date_str,
@@ -416,205 +499,237 @@ def generate_podcast(
     }
 
     # ========== 步骤 1: 获取新闻 ==========
-    print("📰 步骤 1/5: 获取新闻")
-    print("-" * 40)
-
-    if from_cache:
-        # 从缓存读取全天收集的新闻
-        articles = load_articles_from_cache(date_str)
-        if not articles:
-            print("⚠️ 缓存为空，回退到实时获取")
-            from_cache = False  # 回退
-
-    if not from_cache:
-        # 实时获取新闻
-        fetcher = RSSFetcher()
-        raw_articles = fetcher.fetch_all()
-
-        if not raw_articles:
-            print("❌ 没有获取到任何文章")
-            return None
+    def fetch_stage(inputs: dict) -> dict:
+        from news_sources import RSSFetcher
+        from processors.news_dedup import NewsDeduplicator
 
-        articles = raw_articles
-
-    print(f"📊 候选新闻: {len(articles)} 篇")
-
-    # 过滤低质量新闻
-    articles = filter_low_quality_news(articles)
-    print(f"📊 过滤后: {len(articles)} 篇")
-
-    # 使用 AI 优选
-    if from_cache and len(articles) > max_articles:
-        print(f"🤖 步骤 1.5: AI 优选新闻 (从 {len(articles)} 篇中选出 {max_articles} 篇)")
+        print("📰 步骤 1/5: 获取新闻")
         print("-" * 40)
-        from processors.news_ranker import NewsRanker
-        ranker = NewsRanker()
-        articles = ranker.rank_articles(articles, max_count=max_articles)
-    else:
-        # 简单截取
-        articles = articles[:max_articles]
 
-    print(f"✅ 最终选定 {len(articles)} 篇文章")
+        articles = []
+        used_cache = from_cache
+        if from_cache:
+            # 从缓存读取全天收集的新闻
+            articles = load_articles_from_cache(date_str, window_hours=cache_hours)
+            if not articles:
+                print("⚠️ 缓存为空，回退到实时获取")
+                used_cache = False  # 回退
+
+        if not used_cache:
+            # 实时获取新闻
+            fetcher = RSSFetcher()
+            articles = fetcher.fetch_all()
+
+            if not articles:
+                print("❌ 没有获取到任何文章")
+                raise StageError("没有获取到任何文章")
+
+        print(f"📊 候选新闻: {len(articles)} 篇")
+
+        # 过滤低质量新闻
+        articles = filter_low_quality_news(articles)
+        print(f"📊 过滤后: {len(articles)} 篇")
+
+        # 合并多家媒体转载的同一事件（保留最佳代表，记录报道热度）
+        clustered = NewsDeduplicator().dedupe(articles)
+        if len(clustered) < len(articles):
+            print(f"  🔗 合并近似重复新闻 {len(articles) - len(clustered)} 篇")
+        articles = clustered
+        print(f"📊 聚类后: {len(articles)} 篇")
+
+        return {"from_cache": used_cache, "articles": [article_to_dict(a) for a in articles]}
+
+    def rank_stage(inputs: dict) -> dict:
+        fetched = inputs["fetch"]
+        articles = [article_from_dict(a) for a in fetched["articles"]]
+
+        # 使用 AI 优选
+        if fetched["from_cache"] and len(articles) > max_articles:
+            print(f"🤖 步骤 1.5: AI 优选新闻 (从 {len(articles)} 篇中选出 {max_articles} 篇)")
+            print("-" * 40)
+            from processors.news_ranker import NewsRanker
+            ranker = NewsRanker()
+            articles = ranker.rank_articles(articles, max_count=max_articles)
+        else:
+            # 简单截取
+            articles = articles[:max_articles]
 
-    if dry_run:
-        for i, article in enumerate(articles, 1):
-            print(f"   {i}. [{article.category}] {article.title[:40]}...")
-        result["article_count"] = len(articles)
-        result["categories"] = list(set(a.category for a in articles))
-        return result
+        print(f"✅ 最终选定 {len(articles)} 篇文章")
+        return {"articles": [article_to_dict(a) for a in articles]}
 
     # ========== 步骤 2: 内容摘要 ==========
-    print("\n📝 步骤 2/5: 内容处理")
-    print("-" * 40)
+    def summarize_stage(inputs: dict) -> dict:
+        from processors.summarizer import ArticleSummarizer, SimpleSummarizer
 
-    if use_ai:
-        try:
-            summarizer = ArticleSummarizer()
-            print("  使用 AI 摘要 (OpenAI GPT-4o-mini)")
-        except ValueError as e:
-            print(f"  ⚠️ {e}")
-            print("  降级使用简单摘要")
+        print("\n📝 步骤 2/5: 内容处理")
+        print("-" * 40)
+
+        if use_ai:
+            try:
+                summarizer = ArticleSummarizer()
+                print("  使用 AI 摘要 (OpenAI GPT-4o-mini)")
+            except ValueError as e:
+                print(f"  ⚠️ {e}")
+                print("  降级使用简单摘要")
+                summarizer = SimpleSummarizer()
+        else:
             summarizer = SimpleSummarizer()
-    else:
-        summarizer = SimpleSummarizer()
-        print("  使用简单摘要")
+            print("  使用简单摘要")
 
-    summarized = summarizer.summarize_batch(articles, show_progress=verbose)
-    print(f"✅ 处理完成 {len(summarized)} 篇文章")
+        articles = [article_from_dict(a) for a in inputs["rank"]["articles"]]
+        summarized = summarizer.summarize_batch(articles, show_progress=verbose)
+        print(f"✅ 处理完成 {len(summarized)} 篇文章")
+        return {"articles": [asdict(a) for a in summarized]}
 
     # ========== 步骤 3: 生成脚本 ==========
-    print(f"\n📜 步骤 3/5: 生成脚本 ({'Deep Dive 对话模式' if deep_dive else '单人播报模式'})")
-    print("-" * 40)
+    def script_stage(inputs: dict) -> dict:
+        from processors.summarizer import SummarizedArticle
 
-    if deep_dive:
-        # 优先使用 Claude 对话生成器
-        try:
-            from processors.claude_dialogue_writer import ClaudeDialogueWriter
-            writer = ClaudeDialogueWriter()
-            print("  🤖 使用 Anthropic Claude 生成高质量对话")
-        except (ImportError, ValueError) as e:
-            print(f"  ⚠️ Claude 不可用 ({e})，回退到 Gemini")
-            writer = DialogueWriter()
-        
-        script = writer.generate_dialogue(summarized, date=target_date)
-        result["article_count"] = len(summarized)
-    else:
-        writer = ScriptWriter()
-        script = writer.generate_script(
-            summarized,
-            date=target_date,
-            group_by_category=group_by_category
-        )
-        result["article_count"] = script.total_articles
-        result["categories"] = script.categories
-
-    # 保存脚本
-    script_path = script.save_to_file(str(output_path))
-    result["script_path"] = script_path
-    
-    print(f"✅ 脚本已保存: {script_path}")
+        print(f"\n📜 步骤 3/5: 生成脚本 ({'Deep Dive 对话模式' if deep_dive else '单人播报模式'})")
+        print("-" * 40)
 
-    if script_only:
-        print("\n⏭️ 跳过音频生成（--script-only 模式）")
-        return result
+        summarized = [SummarizedArticle(**a) for a in inputs["summarize"]["articles"]]
+        if deep_dive:
+            # 优先使用 Claude 对话生成器
+            try:
+                from processors.claude_dialogue_writer import ClaudeDialogueWriter
+                writer = ClaudeDialogueWriter()
+                print("  🤖 使用 Anthropic Claude 生成高质量对话")
+            except (ImportError, ValueError) as e:
+                print(f"  ⚠️ Claude 不可用 ({e})，回退到 Gemini")
+                from processors.dialogue_writer import DialogueWriter
+                writer = DialogueWriter()
+
+            script = writer.generate_dialogue(summarized, date=target_date)
+            article_count, categories = len(summarized), []
+        else:
+            from processors.script_writer import ScriptWriter
+            writer = ScriptWriter()
+            script = writer.generate_script(
+                summarized,
+                date=target_date,
+                group_by_category=group_by_category
+            )
+            article_count, categories = script.total_articles, script.categories
+
+        # 保存脚本
+        script_path = script.save_to_file(str(output_path))
+        print(f"✅ 脚本已保存: {script_path}")
+        return {
+            "script": asdict(script),
+            "script_path": script_path,
+            "article_count": article_count,
+            "categories": categories
+        }
 
     # ========== 步骤 4: 语音合成 ==========
-    print("\n🎙️ 步骤 4/5: 语音合成")
-    print("-" * 40)
+    def tts_stage(inputs: dict) -> dict:
+        from generators import TTSGenerator
 
-    audio_dir = output_path / "audio"
-    audio_segments = []
+        print("\n🎙️ 步骤 4/5: 语音合成")
+        print("-" * 40)
 
-    if skip_tts:
-        print("  ⏭️ 跳过 TTS（--no-tts 模式）")
-        # 尝试查找已存在的音频文件
-        existing_files = list(audio_dir.glob(f"{date_str}_*.mp3"))
-        if existing_files:
-            print(f"  📂 找到 {len(existing_files)} 个已存在的音频文件")
-            # 创建模拟的 AudioSegment 对象
-            from dataclasses import dataclass
+        script = script_from_dict(inputs["script"]["script"], deep_dive)
 
-            @dataclass
-            class MockSegment:
-                filepath: str
+        if skip_tts:
+            print("  ⏭️ 跳过 TTS（--no-tts 模式）")
+            # 使用已存在的音频文件
+            existing_files = sorted(audio_dir.glob(f"{date_str}_*.mp3"))
+            if not existing_files:
+                print("  ⚠️ 没有找到已存在的音频文件，无法继续")
+                raise StageError("没有找到已存在的音频文件")
+            print(f"  📂 找到 {len(existing_files)} 个已存在的音频文件")
+            segments = [
+                {"filepath": str(f), "duration_seconds": 0, "text": "", "segment_index": i}
+                for i, f in enumerate(existing_files)
+            ]
+            return {"segments": segments, "expected": len(segments)}
 
-            audio_segments = [MockSegment(filepath=str(f)) for f in sorted(existing_files)]
-        else:
-            print("  ⚠️ 没有找到已存在的音频文件，无法继续")
-            return result
-    else:
         try:
             tts = TTSGenerator()
-            
-            if deep_dive:
-                # Deep Dive 双人对话模式
-                audio_segments = tts.generate_dialogue_audio(
-                    script,
-                    output_dir=str(audio_dir),
-                    show_progress=True
-                )
-            else:
-                # 单人播报模式
-                if voice_id:
-                    tts.voice_id = voice_id
-
-                if not tts.voice_id:
-                    print("  ❌ 未配置 voice_id，请先运行 setup_voice.py 设置语音")
-                    print("     或使用 --voice-id 参数指定")
-                    return result
-
-                print(f"  🎤 使用语音 ID: {tts.voice_id[:16]}...")
-                audio_segments = tts.generate_podcast_audio(
-                    script,
-                    output_dir=str(audio_dir),
-                    show_progress=True
-                )
-
-            if not audio_segments:
-                print("  ❌ 音频生成失败")
-                return result
-
-            print(f"✅ 生成 {len(audio_segments)} 个音频片段")
-
         except ValueError as e:
             print(f"  ❌ TTS 初始化失败: {e}")
-            return result
+            raise StageError(f"TTS 初始化失败: {e}")
+
+        if deep_dive:
+            # Deep Dive 双人对话模式
+            expected = len(script.lines)
+            audio_segments = tts.generate_dialogue_audio(
+                script,
+                output_dir=str(audio_dir),
+                show_progress=True
+            )
+        else:
+            # 单人播报模式
+            if voice_id:
+                tts.voice_id = voice_id
+
+            if not tts.voice_id:
+                print("  ❌ 未配置 voice_id，请先运行 setup_voice.py 设置语音")
+                print("     或使用 --voice-id 参数指定")
+                raise StageError("未配置 voice_id")
+
+            print(f"  🎤 使用语音 ID: {tts.voice_id[:16]}...")
+            expected = 2 + sum(1 + bool(s.get("transition")) for s in script.segments)
+            audio_segments = tts.generate_podcast_audio(
+                script,
+                output_dir=str(audio_dir),
+                show_progress=True
+            )
+
+        if not audio_segments:
+            print("  ❌ 音频生成失败")
+            raise StageError("音频生成失败")
+
+        print(f"✅ 生成 {len(audio_segments)} 个音频片段")
+        if len(audio_segments) < expected:
+            print(f"  ⚠️ {expected - len(audio_segments)} 个片段合成失败，下次运行时重试")
+        return {"segments": [asdict(s) for s in audio_segments], "expected": expected}
 
     # ========== 步骤 5: 音频后处理 ==========
-    print("\n🎧 步骤 5/5: 音频后处理")
-    print("-" * 40)
+    def mix_stage(inputs: dict) -> dict:
+        from generators import AudioMixer
+        from generators.tts_generator import AudioSegment
 
-    mixer = AudioMixer()
-    
-    # 构造文件名: podcast-{date}-{host_a}-{host_b}.mp3
-    if deep_dive:
-        filename = f"podcast-{date_str}-{host_a_slug}-{host_b_slug}.mp3"
-    else:
-        filename = f"podcast-{date_str}.mp3"
-        
-    final_audio_path = str(output_path / filename)
-
-    final = mixer.create_final_podcast(
-        audio_segments,
-        final_audio_path,
-        bgm_path=bgm_path,
-        intro_jingle_path=intro_jingle_path,
-        outro_jingle_path=outro_jingle_path,
-        show_progress=True
-    )
+        print("\n🎧 步骤 5/5: 音频后处理")
+        print("-" * 40)
+
+        mixer = AudioMixer()
+
+        # 构造文件名: podcast-{date}-{host_a}-{host_b}.mp3
+        if deep_dive:
+            filename = f"podcast-{date_str}-{host_a_slug}-{host_b_slug}.mp3"
+        else:
+            filename = f"podcast-{date_str}.mp3"
+
+        audio_segments = [AudioSegment(**s) for s in inputs["tts"]["segments"]]
+        final = mixer.create_final_podcast(
+            audio_segments,
+            str(output_path / filename),
+            bgm_path=bgm_path,
+            intro_jingle_path=intro_jingle_path,
+            outro_jingle_path=outro_jingle_path,
+            show_progress=True
+        )
+
+        if not final:
+            print("  ❌ 音频后处理失败")
+            raise StageError("音频后处理失败")
 
-    if final:
-        result["audio_path"] = final.filepath
-        result["duration"] = final.duration_seconds
         print(f"✅ 播客音频生成完成: {final.filepath}")
-    else:
-        print("  ❌ 音频后处理失败")
+        return {"audio_path": final.filepath, "duration": final.duration_seconds}
 
     # ========== 步骤 6: 封面生成 ==========
-    print("\n🎨 步骤 6/6: 封面生成")
-    print("-" * 40)
+    podcast_title = "今日科技早报"
+    if deep_dive:
+        podcast_title += " Deep Dive"
+
+    def cover_stage(inputs: dict) -> dict:
+        print("\n🎨 步骤 6/6: 封面生成")
+        print("-" * 40)
+
+        summarized = inputs["summarize"]["articles"]
 
-    try:
         # 统计新闻类别关键词
         category_keywords = {
             "ai": ["AI", "人工智能", "大模型", "GPT", "Claude", "智能体", "Agent"],
@@ -623,14 +738,10 @@ def generate_podcast(
             "green": ["新能源", "电动", "环保", "气候", "碳中和"],
             "chip": ["芯片", "晶圆", "封装"]
         }
-
         category_stats = {}
         for article in summarized:
             # 使用 title 和 summary 进行关键词匹配
-            if isinstance(article, dict):
-                content = article.get("title", "") + article.get("summary", "")
-            else:
-                content = getattr(article, "title", "") + getattr(article, "summary", "")
+            content = article.get("title", "") + article.get("summary", "")
 
             for category, keywords in category_keywords.items():
                 if any(kw in content for kw in keywords):
@@ -641,32 +752,125 @@ def generate_podcast(
         # 使用 PIL 生成封面（更稳定，无需外部 API）
         from generate_cover import generate_cover as pil_generate_cover
 
-        cover_filename = f"cover-{date_str}.png"
-        cover_path = str(output_path / cover_filename)
-
-        podcast_title = "今日科技早报"
-        if deep_dive:
-            podcast_title += " Deep Dive"
-
         generated_cover = pil_generate_cover(
             date=target_date,
-            output_path=cover_path,
+            output_path=str(output_path / f"cover-{date_str}.png"),
             title=podcast_title,
             article_count=len(summarized),
             category_stats=category_stats
         )
-        
-        if generated_cover:
-            print(f"✅ 封面生成完成: {generated_cover}")
-            result["cover_path"] = generated_cover
-        else:
+
+        if not generated_cover:
             print("❌ 封面生成失败")
-            
-    except Exception as e:
-        print(f"❌ 封面生成出错: {e}")
-        if verbose:
-            import traceback
-            traceback.print_exc()
+            raise StageError("封面生成失败")
+
+        print(f"✅ 封面生成完成: {generated_cover}")
+        return {"cover_path": generated_cover}
+
+    # ========== 发布 ==========
+    def publish_stage(inputs: dict) -> dict:
+        from publish_to_rss import RSSComPublisher, generate_episode_description, parse_script_metadata
+
+        print("\n📡 发布到 RSS.com")
+        print("-" * 40)
+
+        api_key = os.getenv("RSS_COM_API_KEY")
+        podcast_id = os.getenv("RSS_COM_PODCAST_ID")
+        if not api_key or not podcast_id:
+            print("  ❌ 未设置 RSS_COM_API_KEY / RSS_COM_PODCAST_ID")
+            raise StageError("未配置 RSS.com 发布凭据")
+
+        script_file = Path(inputs["script"]["script_path"])
+        metadata = parse_script_metadata(script_file)
+        episode = RSSComPublisher(api_key, podcast_id).publish_episode(
+            audio_file=Path(inputs["mix"]["audio_path"]),
+            cover_image=Path(inputs["cover"]["cover_path"]),
+            title=metadata.get("title", f"{podcast_title} - {date_str}"),
+            description=generate_episode_description(script_file, metadata),
+            pub_date=target_date
+        )
+        return {"episode_id": episode.get("id"), "episode_url": episode.get("url")}
+
+    voice_config = file_fingerprint(str(config_path))
+    stages = [
+        Stage("fetch", fetch_stage, label="获取新闻",
+              params={"date": date_str, "from_cache": from_cache, "cache_hours": cache_hours}),
+        Stage("rank", rank_stage, deps=("fetch",), label="优选新闻",
+              params={"max_articles": max_articles}),
+        Stage("summarize", summarize_stage, deps=("rank",), label="内容摘要",
+              # 没有 API Key 时降级为简单摘要，配置 Key 后应重新生成
+              params={"use_ai": use_ai, "ai_available": bool(os.getenv("OPENAI_API_KEY"))}),
+        Stage("script", script_stage, deps=("summarize",), label="生成脚本",
+              params={"deep_dive": deep_dive, "group_by_category": group_by_category,
+                      "claude_available": bool(os.getenv("ANTHROPIC_API_KEY"))},
+              files=lambda a: [a["script_path"]]),
+        Stage("tts", tts_stage, deps=("script",), label="语音合成",
+              params={"voice_id": voice_id, "voice_config": voice_config},
+              files=lambda a: [s["filepath"] for s in a["segments"]],
+              complete=lambda a: len(a["segments"]) >= a["expected"],
+              cacheable=not skip_tts),
+        Stage("mix", mix_stage, deps=("tts",), label="音频后处理",
+              params={
+                  "bgm": file_fingerprint(bgm_path) or bgm_path,
+                  "intro_jingle": file_fingerprint(intro_jingle_path) or intro_jingle_path,
+                  "outro_jingle": file_fingerprint(outro_jingle_path) or outro_jingle_path,
+                  "voice_config": voice_config
+              },
+              files=lambda a: [a["audio_path"]]),
+        Stage("cover", cover_stage, deps=("summarize",), label="封面生成",
+              params={"title": podcast_title},
+              files=lambda a: [a["cover_path"]]),
+    ]
+    if publish:
+        stages.append(Stage("publish", publish_stage, deps=("script", "mix", "cover"), label="发布"))
+
+    if dry_run:
+        targets = ["rank"]
+    elif script_only:
+        targets = ["script"]
+    else:
+        targets = None
+
+    pipeline = StagePipeline(
+        stages,
+        checkpoint_dir=None if dry_run else str(output_path / ".pipeline"),
+        force=[s for s in force_stages or () if s == "all" or s in {stage.name for stage in stages}],
+        verbose=verbose
+    )
+    report = pipeline.run(targets=targets)
+
+    if not dry_run:
+        pipeline.print_report(report)
+        report_path = pipeline.save_report(report, str(output_path / "pipeline-report.json"))
+        result["report_path"] = report_path
+
+    if not all(report.ok(name) for name in report.records if name in ("fetch", "rank", "summarize", "script")):
+        return None
+
+    if dry_run:
+        articles = [article_from_dict(a) for a in report.get("rank")["articles"]]
+        for i, article in enumerate(articles, 1):
+            print(f"   {i}. [{article.category}] {article.title[:40]}...")
+        result["article_count"] = len(articles)
+        result["categories"] = list(set(a.category for a in articles))
+        return result
+
+    script_artifact = report.get("script")
+    result["script_path"] = script_artifact["script_path"]
+    result["article_count"] = script_artifact["article_count"]
+    result["categories"] = script_artifact["categories"]
+
+    if script_only:
+        print("\n⏭️ 跳过音频生成（--script-only 模式）")
+        return result
+
+    if report.ok("mix"):
+        result["audio_path"] = report.get("mix")["audio_path"]
+        result["duration"] = report.get("mix")["duration"]
+    if report.ok("cover"):
+        result["cover_path"] = report.get("cover")["cover_path"]
+    if report.ok("publish"):
+        result["episode_url"] = report.get("publish")["episode_url"]
 
     return result
 
@@ -3,14 +3,28 @@
 播客封面图片生成器
 使用 Pillow 生成简洁专业的播客封面
 支持使用自定义logo替代程序化图标
+渐变、蒙版等像素级运算由 generators.cover_render（NumPy）完成
 """
 
 import argparse
-import math
+import sys
 from datetime import datetime
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.cover_render import (
+    DEFAULT_FONT_PATHS,
+    circular_mask,
+    diagonal_gradient,
+    load_font,
+    load_logo,
+    paste_logo,
+)
 
 
 # 默认logo路径（相对于项目根目录）
@@ -32,23 +46,15 @@ def load_and_resize_logo(logo_path: str, target_size: int = 400) -> Image.Image:
         target_size: 目标尺寸（正方形边长）
 
     Returns:
-        调整大小后的logo图片（RGBA模式）
+        调整大小后的logo图片（RGBA模式，同一进程内按路径和尺寸缓存）
     """
-    logo = Image.open(logo_path)
-    if logo.mode != 'RGBA':
-        logo = logo.convert('RGBA')
-
     # 保持宽高比缩放
-    logo.thumbnail((target_size, target_size), Image.Resampling.LANCZOS)
-    return logo
+    return load_logo(logo_path, (target_size, target_size))
 
 
 def create_circular_mask(size: int) -> Image.Image:
     """创建圆形蒙版"""
-    mask = Image.new('L', (size, size), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse([0, 0, size, size], fill=255)
-    return mask
+    return circular_mask(size)
 
 
 # 定义多套颜色方案
@@ -113,20 +119,8 @@ def detect_theme_from_categories(categories: dict) -> str:
 
 
 def create_gradient_background(width: int, height: int, color1: tuple, color2: tuple) -> Image.Image:
-    """创建渐变背景"""
-    base = Image.new("RGB", (width, height), color1)
-    top = Image.new("RGB", (width, height), color2)
-    mask = Image.new("L", (width, height))
-
-    for y in range(height):
-        # 对角渐变
-        for x in range(width):
-            # 计算渐变值 (0-255)
-            gradient_val = int(255 * ((x + y) / (width + height)))
-            mask.putpixel((x, y), gradient_val)
-
-    base.paste(top, mask=mask)
-    return base
+    """创建渐变背景（对角渐变）"""
+    return diagonal_gradient(width, height, color1, color2)
 
 
 def draw_decorative_elements(draw: ImageDraw.Draw, width: int, height: int):
@@ -198,33 +192,10 @@ def generate_cover(
     # 绘制装饰元素
     draw_decorative_elements(draw, width, height)
 
-    # 尝试加载字体（macOS 系统字体）
-    font_paths = [
-        "/System/Library/Fonts/PingFang.ttc",
-        "/System/Library/Fonts/STHeiti Light.ttc",
-        "/System/Library/Fonts/Hiragino Sans GB.ttc",
-        "/Library/Fonts/Arial Unicode.ttf",
-    ]
-
-    title_font = None
-    date_font = None
-    small_font = None
-
-    for font_path in font_paths:
-        if Path(font_path).exists():
-            try:
-                title_font = ImageFont.truetype(font_path, 120)
-                date_font = ImageFont.truetype(font_path, 72)
-                small_font = ImageFont.truetype(font_path, 48)
-                break
-            except Exception:
-                continue
-
-    # 如果没有找到中文字体，使用默认字体
-    if title_font is None:
-        title_font = ImageFont.load_default()
-        date_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    # 加载字体（macOS 系统字体，没有中文字体时使用默认字体）
+    title_font = load_font(120, DEFAULT_FONT_PATHS)
+    date_font = load_font(72, DEFAULT_FONT_PATHS)
+    small_font = load_font(48, DEFAULT_FONT_PATHS)
 
     # 绘制 Logo 或麦克风图标
     logo_center_x = width // 2
@@ -234,7 +205,6 @@ def generate_cover(
     actual_logo_path = logo_path
     if actual_logo_path is None:
         # 尝试使用默认 logo
-        project_root = Path(__file__).parent.parent
         default_path = project_root / DEFAULT_LOGO_PATH
         if default_path.exists():
             actual_logo_path = str(default_path)
@@ -249,10 +219,7 @@ def generate_cover(
         logo_y = logo_center_y - logo.height // 2
 
         # 将 logo 合成到封面上（保留透明度）
-        if logo.mode == 'RGBA':
-            img.paste(logo, (logo_x, logo_y), logo)
-        else:
-            img.paste(logo, (logo_x, logo_y))
+        paste_logo(img, logo, (logo_x, logo_y))
     else:
         # 回退：绘制麦克风图标
         mic_width = 120
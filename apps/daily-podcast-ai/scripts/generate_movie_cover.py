@@ -7,7 +7,15 @@
 import sys
 from datetime import datetime
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.cover_render import load_font, load_logo, paste_logo, vertical_gradient
+
+FONT_PATHS = ("/System/Library/Fonts/PingFang.ttc",)
 
 
 def generate_movie_cover(
@@ -29,31 +37,18 @@ def generate_movie_cover(
     size = (1400, 1400)
 
     # 创建渐变背景（深色调，符合《完美的日子》的氛围）
-    img = Image.new("RGB", size, color="#1a1a1a")
+    # 添加渐变效果（从深灰到黑，26 到 13）
+    img = vertical_gradient(size, (26, 26, 26), (13, 13, 13))
     draw = ImageDraw.Draw(img)
 
-    # 添加渐变效果（从深灰到黑）
-    for y in range(size[1]):
-        alpha = y / size[1]
-        gray = int(26 * (1 - alpha * 0.5))  # 26 到 13
-        color = (gray, gray, gray)
-        draw.rectangle([(0, y), (size[0], y + 1)], fill=color)
-
     # 添加装饰线条（简约风格）
     draw.rectangle([(50, 50), (1350, 54)], fill="#d4af37")  # 金色线条
     draw.rectangle([(50, 1346), (1350, 1350)], fill="#d4af37")
 
-    # 加载字体
-    try:
-        # 尝试加载系统中文字体
-        title_font = ImageFont.truetype("/System/Library/Fonts/PingFang.ttc", 90)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/PingFang.ttc", 50)
-        info_font = ImageFont.truetype("/System/Library/Fonts/PingFang.ttc", 36)
-    except:
-        # 回退到默认字体
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        info_font = ImageFont.load_default()
+    # 加载字体（系统中文字体，找不到时回退到默认字体）
+    title_font = load_font(90, FONT_PATHS)
+    subtitle_font = load_font(50, FONT_PATHS)
+    info_font = load_font(36, FONT_PATHS)
 
     # 绘制电影标题
     title_text = f"《{movie_title}》"
@@ -98,19 +93,15 @@ def generate_movie_cover(
     # 添加 Logo（如果提供）
     if logo_path and Path(logo_path).exists():
         try:
-            logo = Image.open(logo_path)
             # 调整 logo 大小
             logo_size = (300, 300)
-            logo = logo.resize(logo_size, Image.Resampling.LANCZOS)
+            logo = load_logo(logo_path, logo_size, keep_aspect=False)
 
             # 如果logo有透明通道，保持透明
             logo_x = (size[0] - logo_size[0]) // 2
             logo_y = 750
 
-            if logo.mode == "RGBA":
-                img.paste(logo, (logo_x, logo_y), logo)
-            else:
-                img.paste(logo, (logo_x, logo_y))
+            paste_logo(img, logo, (logo_x, logo_y))
         except Exception as e:
             print(f"⚠️ Logo 加载失败: {e}")
 
@@ -4,25 +4,29 @@
 设计理念：简约、温暖、日系美学
 """
 
+import random
 import sys
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import ImageDraw, ImageFilter
 
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
 
-def create_gradient_background(size, color_top, color_bottom):
-    """创建渐变背景"""
-    img = Image.new("RGB", size, color_top)
-    draw = ImageDraw.Draw(img)
+from generators.cover_render import (
+    add_paper_texture,
+    composite_light_spots,
+    load_font,
+    load_logo,
+    paste_logo,
+    resolve_font_path,
+    vertical_gradient,
+)
 
-    # 从上到下的渐变
-    for y in range(size[1]):
-        ratio = y / size[1]
-        r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-        g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-        b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-        draw.rectangle([(0, y), (size[0], y + 1)], fill=(r, g, b))
 
-    return img
+def create_gradient_background(size, color_top, color_bottom):
+    """创建渐变背景（从上到下）"""
+    return vertical_gradient(size, color_top, color_bottom)
 
 
 def generate_perfect_days_cover(
@@ -49,14 +53,7 @@ def generate_perfect_days_cover(
     draw = ImageDraw.Draw(img)
 
     # 添加纹理效果（模拟纸张质感）
-    import random
-    for _ in range(3000):
-        x = random.randint(0, size[0] - 1)
-        y = random.randint(0, size[1] - 1)
-        brightness = random.randint(-5, 5)
-        pixel = img.getpixel((x, y))
-        new_pixel = tuple(max(0, min(255, p + brightness)) for p in pixel)
-        img.putpixel((x, y), new_pixel)
+    img = add_paper_texture(img, count=3000, amplitude=5)
 
     # 轻微模糊，让纹理更自然
     img = img.filter(ImageFilter.GaussianBlur(radius=0.5))
@@ -76,25 +73,15 @@ def generate_perfect_days_cover(
         "/System/Library/Fonts/Supplemental/Songti.ttc",
     ]
 
-    title_font = None
-    for font_path in font_paths:
-        try:
-            if Path(font_path).exists():
-                title_font = ImageFont.truetype(font_path, 140)
-                subtitle_font = ImageFont.truetype(font_path, 70)
-                info_font = ImageFont.truetype(font_path, 50)
-                small_font = ImageFont.truetype(font_path, 38)
-                print(f"✅ 已加载字体: {font_path}")
-                break
-        except Exception as e:
-            continue
-
-    if not title_font:
+    font_path = resolve_font_path(font_paths)
+    if font_path:
+        print(f"✅ 已加载字体: {font_path}")
+    else:
         print("⚠️ 未找到合适的中文字体，使用默认字体")
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        info_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = load_font(140, font_paths)
+    subtitle_font = load_font(70, font_paths)
+    info_font = load_font(50, font_paths)
+    small_font = load_font(38, font_paths)
 
     text_color = (60, 50, 40)  # 深褐色，易读
 
@@ -156,43 +143,31 @@ def generate_perfect_days_cover(
     center_y = 650
 
     # 绘制几个简单的圆形，模拟光斑
-    light_color = (255, 250, 240, 100)  # 半透明的暖白色
-    overlay = Image.new("RGBA", size, (0, 0, 0, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
-
     # 光斑效果
-    import random
     random.seed(42)  # 固定种子，保证每次生成相同
+    spots = []
     for _ in range(20):
         x = random.randint(300, 1100)
         y = random.randint(550, 850)
         radius = random.randint(40, 120)
         alpha = random.randint(20, 60)
-        overlay_draw.ellipse(
-            [(x - radius, y - radius), (x + radius, y + radius)],
-            fill=(255, 250, 235, alpha)
-        )
+        spots.append((x, y, radius, alpha))
 
     # 应用高斯模糊，让光斑更柔和
-    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=30))
-    img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+    img = composite_light_spots(img, spots, color=(255, 250, 235), blur_radius=30)
     draw = ImageDraw.Draw(img)
 
     # 添加 Logo（如果提供）
     if logo_path and Path(logo_path).exists():
         try:
-            logo = Image.open(logo_path)
             # Logo 放在右下角，作为签名
             logo_size = (180, 180)
-            logo = logo.resize(logo_size, Image.Resampling.LANCZOS)
+            logo = load_logo(logo_path, logo_size, keep_aspect=False)
 
             logo_x = size[0] - logo_size[0] - 80
             logo_y = 1150
 
-            if logo.mode == "RGBA":
-                img.paste(logo, (logo_x, logo_y), logo)
-            else:
-                img.paste(logo, (logo_x, logo_y))
+            paste_logo(img, logo, (logo_x, logo_y))
         except Exception as e:
             print(f"⚠️ Logo 加载失败: {e}")
 
@@ -4,12 +4,28 @@
 更大的字号，更清晰的布局
 """
 
-from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import random
+import sys
+from pathlib import Path
+from PIL import ImageDraw, ImageFilter
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.cover_render import (
+    add_paper_texture,
+    composite_light_spots,
+    load_font,
+    load_logo,
+    paste_logo,
+    vertical_gradient,
+)
 
+FONT_PATHS = ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf",)
 
-def generate_cover():
+
+def generate_cover(output_path: str = "output/2026-01-08/cover-perfect-days-final.png"):
     """生成封面"""
     size = (1400, 1400)
 
@@ -17,26 +33,12 @@ def generate_cover():
     color_top = (245, 240, 230)
     color_bottom = (220, 205, 185)
 
-    img = Image.new("RGB", size, color_top)
-    draw = ImageDraw.Draw(img)
-
     # 渐变
-    for y in range(size[1]):
-        ratio = y / size[1]
-        r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-        g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-        b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-        draw.rectangle([(0, y), (size[0], y + 1)], fill=(r, g, b))
-
-    # 纹理
+    img = vertical_gradient(size, color_top, color_bottom)
+
+    # 纹理（与光斑共用同一随机序列）
     random.seed(42)
-    for _ in range(3000):
-        x = random.randint(0, size[0] - 1)
-        y = random.randint(0, size[1] - 1)
-        brightness = random.randint(-5, 5)
-        pixel = img.getpixel((x, y))
-        new_pixel = tuple(max(0, min(255, p + brightness)) for p in pixel)
-        img.putpixel((x, y), new_pixel)
+    img = add_paper_texture(img, count=3000, amplitude=5)
 
     img = img.filter(ImageFilter.GaussianBlur(radius=0.5))
     draw = ImageDraw.Draw(img)
@@ -47,26 +49,20 @@ def generate_cover():
     draw.rectangle([(100, 1276), (1300, 1280)], fill=line_color)
 
     # 光斑效果
-    overlay = Image.new("RGBA", size, (0, 0, 0, 0))
-    overlay_draw = ImageDraw.Draw(overlay)
+    spots = []
     for _ in range(20):
         x = random.randint(300, 1100)
         y = random.randint(550, 850)
         radius = random.randint(40, 120)
         alpha = random.randint(20, 60)
-        overlay_draw.ellipse(
-            [(x - radius, y - radius), (x + radius, y + radius)],
-            fill=(255, 250, 235, alpha)
-        )
-    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=30))
-    img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+        spots.append((x, y, radius, alpha))
+    img = composite_light_spots(img, spots, color=(255, 250, 235), blur_radius=30)
     draw = ImageDraw.Draw(img)
 
     # 加载字体
-    font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", 1)
-    title_font = font.font_variant(size=140)
-    subtitle_font = font.font_variant(size=70)
-    info_font = font.font_variant(size=52)
+    title_font = load_font(140, FONT_PATHS)
+    subtitle_font = load_font(70, FONT_PATHS)
+    info_font = load_font(52, FONT_PATHS)
 
     text_color = (60, 50, 40)
 
@@ -119,7 +115,7 @@ def generate_cover():
 
     # 背景音乐
     music_credit = "背景音乐作曲: 王植萌"
-    small_font = font.font_variant(size=36)
+    small_font = load_font(36, FONT_PATHS)
     bbox = draw.textbbox((0, 0), music_credit, font=small_font)
     w = bbox[2] - bbox[0]
     x = (size[0] - w) // 2
@@ -129,20 +125,15 @@ def generate_cover():
     logo_path = "logo/王植萌漫画形象.png"
     if Path(logo_path).exists():
         try:
-            logo = Image.open(logo_path)
             logo_size = (180, 180)
-            logo = logo.resize(logo_size, Image.Resampling.LANCZOS)
+            logo = load_logo(logo_path, logo_size, keep_aspect=False)
             logo_x = size[0] - logo_size[0] - 80
             logo_y = 1100
-            if logo.mode == "RGBA":
-                img.paste(logo, (logo_x, logo_y), logo)
-            else:
-                img.paste(logo, (logo_x, logo_y))
+            paste_logo(img, logo, (logo_x, logo_y))
         except:
             pass
 
     # 保存
-    output_path = "output/2026-01-08/cover-perfect-days-final.png"
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     img.save(output_path, quality=95, optimize=True)
 
@@ -29,30 +29,17 @@ def load_articles_from_cache(date_str: str) -> list:
     Returns:
         Article 对象列表
     """
-    import json
-    from news_sources.rss_fetcher import Article
+    from news_sources import NewsStore
 
-    cache_path = project_root / "cache" / f"{date_str}-news.json"
+    cache_dir = project_root / "cache"
 
-    if not cache_path.exists():
-        print(f"  ⚠️ 缓存文件不存在: {cache_path}")
-        return []
+    with NewsStore(cache_dir / "news.db") as store:
+        store.import_json_cache(cache_dir)
+        articles = store.load_articles(day=date_str)
 
-    with open(cache_path, "r", encoding="utf-8") as f:
-        news_list = json.load(f)
-
-    # 转换为 Article 对象
-    articles = []
-    for news in news_list:
-        article = Article(
-            title=news["title"],
-            summary=news["summary"],
-            link=news["link"],
-            source=news["source"],
-            category=news["category"],
-            published=datetime.fromisoformat(news["published"]) if news.get("published") else None
-        )
-        articles.append(article)
+    if not articles:
+        print(f"  ⚠️ 缓存中没有 {date_str} 的新闻")
+        return []
 
     print(f"  📂 从缓存加载 {len(articles)} 篇新闻")
     return articles
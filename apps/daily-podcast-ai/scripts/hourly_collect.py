@@ -2,9 +2,15 @@
 """
 每小时新闻收集脚本
 定时从RSS源获取新闻并存储到缓存，供早上7点优选使用
+
+RSS 源并发抓取，并持久化 ETag / Last-Modified（cache/feed_state.json），
+未更新的 feed 由服务端返回 304，不再每小时重复下载全文。
+
+新闻缓存存储在 cache/news.db（SQLite，按天 + 链接/标题哈希去重，只追加写入），
+旧版 cache/YYYY-MM-DD-news.json 会在首次运行时自动导入。
 """
 
-import json
+import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -14,27 +20,12 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
 from dotenv import load_dotenv
-from news_sources import RSSFetcher
+from news_sources import NewsStore, RSSFetcher
 
 # 加载环境变量
 load_dotenv(project_root / ".env")
 
 
-def load_cache(cache_path: Path) -> list[dict]:
-    """加载缓存的新闻"""
-    if cache_path.exists():
-        with open(cache_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
-
-def save_cache(cache_path: Path, news_list: list[dict]):
-    """保存新闻到缓存"""
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(news_list, f, ensure_ascii=False, indent=2)
-
-
 def article_to_dict(article) -> dict:
     """将 Article 对象转换为字典"""
     return {
@@ -48,30 +39,37 @@ def article_to_dict(article) -> dict:
     }
 
 
-def is_duplicate(article_dict: dict, existing_news: list[dict]) -> bool:
-    """检查是否重复"""
-    # 基于 link 或 title 去重
-    for existing in existing_news:
-        if existing["link"] == article_dict["link"]:
-            return True
-        if existing["title"] == article_dict["title"]:
-            return True
-    return False
-
-
 def main():
     """主入口"""
+    parser = argparse.ArgumentParser(description="每小时新闻收集")
+    parser.add_argument(
+        "--keep-days",
+        type=int,
+        default=30,
+        help="缓存保留天数，每天首次收集时清理更早的数据 (默认: 30)"
+    )
+    args = parser.parse_args()
+
     today = datetime.now().strftime("%Y-%m-%d")
     cache_dir = project_root / "cache"
-    cache_path = cache_dir / f"{today}-news.json"
 
     current_hour = datetime.now().strftime("%H:%M")
 
     print(f"⏰ [{current_hour}] 开始收集新闻...")
 
-    # 加载现有缓存
-    existing_news = load_cache(cache_path)
-    print(f"📂 当前缓存: {len(existing_news)} 篇")
+    store = NewsStore(cache_dir / "news.db")
+    imported = store.import_json_cache(cache_dir)
+    if imported:
+        print(f"📥 已导入旧版 JSON 缓存 {imported} 篇")
+
+    existing_count = store.count(today)
+    print(f"📂 当前缓存: {existing_count} 篇")
+
+    # 每天第一次收集时清理过期数据
+    if existing_count == 0 and args.keep_days > 0:
+        removed = store.compact(args.keep_days)
+        if removed:
+            print(f"🧹 清理 {args.keep_days} 天前的缓存 {removed} 篇")
 
     # 获取新闻
     fetcher = RSSFetcher()
@@ -79,21 +77,20 @@ def main():
 
     if not articles:
         print("❌ 未获取到新闻")
+        store.close()
         sys.exit(1)
 
-    # 去重并追加
-    new_count = 0
-    for article in articles:
-        article_dict = article_to_dict(article)
-        if not is_duplicate(article_dict, existing_news):
-            existing_news.append(article_dict)
-            new_count += 1
+    unchanged = [s.name for s in fetcher.last_stats if s.status == "not_modified"]
+    if unchanged:
+        print(f"♻️ 未更新的源 (304): {', '.join(unchanged)}")
 
-    # 保存缓存
-    save_cache(cache_path, existing_news)
+    # 去重并追加（唯一索引去重，只写入新文章）
+    new_count = store.add((article_to_dict(a) for a in articles), day=today)
+    total = store.count(today)
+    store.close()
 
-    print(f"✅ 新增 {new_count} 篇，总计 {len(existing_news)} 篇")
-    print(f"💾 已保存到: {cache_path}")
+    print(f"✅ 新增 {new_count} 篇，总计 {total} 篇")
+    print(f"💾 已保存到: {store.db_path}")
 
 
 if __name__ == "__main__":
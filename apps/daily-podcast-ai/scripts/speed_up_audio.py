@@ -1,99 +1,236 @@
 #!/usr/bin/env python3
 """
-音频加速工具
-使用 pydub 对已生成的音频进行速度调整，突破 ElevenLabs API 1.2倍速限制
+音频变速工具
+对已生成的音频进行速度调整，突破 ElevenLabs API 1.2倍速限制
+
+- atempo 引擎（默认）：ffmpeg atempo 滤镜链流式变速，音高不变，内存占用与文件长度无关
+- resample 引擎：原 pydub 实现（改采样率后重采样），整段载入内存，音高随速度变化
+- 多个文件在独立进程中并行处理，并报告实时倍率（音频时长 / 处理耗时）
 """
 
 import argparse
+import math
+import os
+import re
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from generators.ffmpeg_assembler import find_ffmpeg
+
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_PROGRESS_TIME = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# 单个 atempo 实例的系数范围（老版本 ffmpeg 只支持 0.5-2.0，超出时串联多个）
+ATEMPO_MIN = 0.5
+ATEMPO_MAX = 2.0
 
-from pydub import AudioSegment
 
+@dataclass
+class StretchResult:
+    """变速结果"""
+    input_path: str
+    output_path: str
+    speed: float
+    engine: str
+    input_seconds: float  # 原始音频时长
+    output_seconds: float  # 变速后音频时长
+    elapsed: float  # 处理耗时
+
+    @property
+    def realtime_factor(self) -> float:
+        """每秒处理的音频秒数"""
+        return self.input_seconds / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def atempo_chain(speed: float) -> str:
+    """
+    生成 atempo 滤镜链
 
-def speed_up_audio(input_path: str, output_path: str, speed: float, verbose: bool = False):
+    超出单个 atempo 范围时拆成 n 个相同系数串联（如 3x -> 1.732 × 1.732），
+    比 2.0 × 1.5 这样的拆法每一级的失真更均匀。
     """
-    加速音频文件
+    if speed <= 0:
+        raise ValueError(f"速度必须大于 0: {speed}")
+    stages = max(1, math.ceil(abs(math.log(speed)) / math.log(ATEMPO_MAX) - 1e-9))
+    factor = speed ** (1 / stages)
+    return ",".join(f"atempo={factor:.6f}" for _ in range(stages))
+
+
+def _parse_seconds(match) -> float:
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _stretch_ffmpeg(ffmpeg: str, input_path: str, output_path: str, speed: float,
+                    bitrate: str) -> tuple[float, float]:
+    """ffmpeg 流式变速，返回 (原始时长, 输出时长)"""
+    output_file = Path(output_path)
+    tmp_file = output_file.with_name(f".{output_file.stem}.partial{output_file.suffix}")
+    command = [
+        ffmpeg, "-hide_banner", "-nostdin", "-y",
+        "-i", str(input_path),
+        "-vn", "-map_metadata", "0",
+        "-filter:a", atempo_chain(speed),
+        "-c:a", "libmp3lame", "-b:a", bitrate,
+        "-f", "mp3", str(tmp_file),
+    ]
+    proc = subprocess.run(command, capture_output=True, text=True, errors="replace")
+    if proc.returncode != 0:
+        tmp_file.unlink(missing_ok=True)
+        raise RuntimeError(proc.stderr.strip()[-2000:] or f"ffmpeg 退出码 {proc.returncode}")
+    os.replace(tmp_file, output_file)
+
+    duration = _DURATION.search(proc.stderr)
+    input_seconds = _parse_seconds(duration) if duration else 0.0
+    # 进度行里最后一个 time= 是输出的时长
+    progress = _PROGRESS_TIME.findall(proc.stderr)
+    output_seconds = (
+        int(progress[-1][0]) * 3600 + int(progress[-1][1]) * 60 + float(progress[-1][2])
+        if progress else input_seconds / speed
+    )
+    return input_seconds, output_seconds
+
+
+def _stretch_resample(input_path: str, output_path: str, speed: float, bitrate: str,
+                      verbose: bool) -> tuple[float, float]:
+    """原 pydub 实现：改采样率再重采样（音高会随速度变化），返回 (原始时长, 输出时长)"""
+    from pydub import AudioSegment
+
+    # 加载音频
+    audio = AudioSegment.from_file(input_path)
+
+    if verbose:
+        original_duration = len(audio) / 1000.0
+        print(f"   原始时长: {original_duration:.1f} 秒 ({original_duration/60:.1f} 分钟)")
+        print(f"   采样率: {audio.frame_rate} Hz")
+        print(f"   声道数: {audio.channels}")
+
+    # 调整速度（改变采样率来加速）
+    new_sample_rate = int(audio.frame_rate * speed)
+
+    audio_fast = audio._spawn(audio.raw_data, overrides={
+        "frame_rate": new_sample_rate
+    })
+
+    # 恢复正常采样率
+    audio_fast = audio_fast.set_frame_rate(audio.frame_rate)
+
+    audio_fast.export(output_path, format="mp3", bitrate=bitrate)
+    return len(audio) / 1000.0, len(audio_fast) / 1000.0
+
+
+def speed_up_audio(
+    input_path: str,
+    output_path: str,
+    speed: float,
+    verbose: bool = False,
+    engine: str = "auto",
+    bitrate: str = "192k"
+) -> Optional[StretchResult]:
+    """
+    调整音频速度
 
     Args:
         input_path: 输入音频文件路径
         output_path: 输出音频文件路径
-        speed: 加速倍数 (1.0-3.0，推荐1.25-2.0)
+        speed: 速度倍数 (0.5-3.0，推荐1.25-2.0)
         verbose: 是否显示详细信息
+        engine: auto / atempo / resample（auto 在找到 ffmpeg 时使用 atempo）
+        bitrate: 输出 MP3 码率
 
     Returns:
-        是否成功
+        StretchResult，失败返回 None
     """
     input_file = Path(input_path)
 
     if not input_file.exists():
         print(f"❌ 输入文件不存在: {input_path}")
-        return False
+        return None
+
+    ffmpeg = find_ffmpeg() if engine in ("auto", "atempo") else None
+    if engine == "atempo" and not ffmpeg:
+        print("❌ 未找到 ffmpeg，无法使用 atempo 引擎")
+        return None
+    engine = "atempo" if ffmpeg else "resample"
 
     if verbose:
         print(f"📂 加载音频: {input_path}")
+        print(f"\n⚡ 变速处理中 ({speed}x, {engine})...")
+        if engine == "atempo":
+            print(f"   滤镜: {atempo_chain(speed)}")
 
     try:
-        # 加载音频
-        audio = AudioSegment.from_file(input_path)
-
-        if verbose:
-            original_duration = len(audio) / 1000.0
-            print(f"   原始时长: {original_duration:.1f} 秒 ({original_duration/60:.1f} 分钟)")
-            print(f"   采样率: {audio.frame_rate} Hz")
-            print(f"   声道数: {audio.channels}")
-
-        # 调整速度（改变采样率来加速）
-        new_sample_rate = int(audio.frame_rate * speed)
-
-        if verbose:
-            print(f"\n⚡ 加速处理中 ({speed}x)...")
-
-        audio_fast = audio._spawn(audio.raw_data, overrides={
-            "frame_rate": new_sample_rate
-        })
-
-        # 恢复正常采样率（保持音高不变）
-        audio_fast = audio_fast.set_frame_rate(audio.frame_rate)
-
-        if verbose:
-            new_duration = len(audio_fast) / 1000.0
-            print(f"   新时长: {new_duration:.1f} 秒 ({new_duration/60:.1f} 分钟)")
-            print(f"   时长缩短: {(1 - new_duration/original_duration)*100:.1f}%")
-
         # 确保输出目录存在
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # 导出
-        if verbose:
-            print(f"\n💾 导出音频: {output_path}")
-
-        audio_fast.export(output_path, format="mp3", bitrate="192k")
+        start = time.perf_counter()
+        if engine == "atempo":
+            original_duration, new_duration = _stretch_ffmpeg(ffmpeg, input_path, output_path, speed, bitrate)
+        else:
+            original_duration, new_duration = _stretch_resample(input_path, output_path, speed, bitrate, verbose)
+        result = StretchResult(
+            input_path=str(input_path),
+            output_path=str(output_path),
+            speed=speed,
+            engine=engine,
+            input_seconds=original_duration,
+            output_seconds=new_duration,
+            elapsed=time.perf_counter() - start
+        )
+
+        if verbose and original_duration:
+            print(f"   原始时长: {original_duration:.1f} 秒 ({original_duration/60:.1f} 分钟)")
+            print(f"   新时长: {new_duration:.1f} 秒 ({new_duration/60:.1f} 分钟)")
+            print(f"   时长变化: {(new_duration/original_duration - 1)*100:+.1f}%")
 
         # 显示文件大小
         file_size = output_file.stat().st_size / (1024 * 1024)  # MB
         print(f"✅ 已生成 {speed}x 速度音频: {output_path}")
-        print(f"   文件大小: {file_size:.1f} MB")
+        print(f"   文件大小: {file_size:.1f} MB，耗时 {result.elapsed:.1f} 秒（{result.realtime_factor:.0f}x 实时）")
 
-        return True
+        return result
 
     except Exception as e:
-        print(f"❌ 加速失败: {e}")
+        print(f"❌ 变速失败: {e}")
         if verbose:
             import traceback
             traceback.print_exc()
-        return False
+        return None
+
+
+def _run_job(job: tuple) -> Optional[StretchResult]:
+    """进程池入口"""
+    input_path, output_path, speed, verbose, engine = job
+    return speed_up_audio(input_path, output_path, speed, verbose=verbose, engine=engine)
+
+
+def default_output_path(input_path: str, speed: float) -> str:
+    """智能生成文件名: podcast-2026-01-14-1.2x.mp3 -> podcast-2026-01-14-1.5x.mp3"""
+    input_file = Path(input_path)
+    base_name = input_file.stem  # podcast-2026-01-14-1.2x
+
+    # 移除旧的速度标识（如果有）
+    if "-" in base_name and "x" in base_name.split("-")[-1]:
+        parts = base_name.split("-")
+        base_name = "-".join(parts[:-1])  # 移除最后的速度部分
+
+    return str(input_file.parent / f"{base_name}-{speed}x.mp3")
 
 
 def main():
     """主入口"""
     parser = argparse.ArgumentParser(
-        description="音频加速工具 - 突破 ElevenLabs 1.2倍速限制",
+        description="音频变速工具 - 突破 ElevenLabs 1.2倍速限制",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 示例用法:
@@ -111,7 +248,11 @@ def main():
       --speed 1.5 \\
       --output my-fast-podcast.mp3
 
+  # 批量处理多期节目（4 个进程并行）
+  python speed_up_audio.py output/*/dailyReport/podcast-*.mp3 --speed 1.5 --workers 4
+
 速度建议:
+  0.75x - 放慢，便于精听
   1.25x - 微快，声音自然
   1.5x  - 明显加快，仍可听清（推荐）
   1.75x - 很快，需要集中注意力
@@ -121,19 +262,34 @@ def main():
 
     parser.add_argument(
         "input",
-        help="输入音频文件路径"
+        nargs="+",
+        help="输入音频文件路径（可多个）"
     )
 
     parser.add_argument(
         "--speed", "-s",
         type=float,
         default=1.5,
-        help="加速倍数 (1.0-3.0，推荐1.25-2.0，默认1.5)"
+        help="速度倍数 (0.5-3.0，推荐1.25-2.0，默认1.5)"
     )
 
     parser.add_argument(
         "--output", "-o",
-        help="输出文件路径 (默认: 在输入文件名后添加速度标识)"
+        help="输出文件路径，仅限单个输入 (默认: 在输入文件名后添加速度标识)"
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "atempo", "resample"],
+        default="auto",
+        help="变速引擎: atempo (ffmpeg 流式，音高不变) / resample (pydub，音高会变) (默认: auto)"
+    )
+
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="并行处理的进程数 (默认: CPU 核数)"
     )
 
     parser.add_argument(
@@ -144,49 +300,69 @@ def main():
 
     args = parser.parse_args()
 
+    if args.speed <= 0:
+        print(f"❌ 速度必须大于 0: {args.speed}")
+        sys.exit(1)
+
     # 验证速度范围
-    if args.speed < 1.0 or args.speed > 3.0:
-        print("⚠️ 警告: 速度建议在 1.0-3.0 之间")
+    if args.speed < 0.5 or args.speed > 3.0:
+        print("⚠️ 警告: 速度建议在 0.5-3.0 之间")
         if args.speed > 3.0:
             print("   速度过快可能严重影响音质和可听性")
-        elif args.speed < 1.0:
-            print("   速度过慢，建议直接使用原始文件或调整 config/voice.yaml")
+        elif args.speed < 0.5:
+            print("   速度过慢，语音会明显失真")
 
-    # 生成输出文件名
-    if args.output:
-        output_path = args.output
-    else:
-        input_file = Path(args.input)
-        # 智能生成文件名: podcast-2026-01-14-1.2x.mp3 -> podcast-2026-01-14-1.5x.mp3
-        base_name = input_file.stem  # podcast-2026-01-14-1.2x
-
-        # 移除旧的速度标识（如果有）
-        if "-" in base_name and "x" in base_name.split("-")[-1]:
-            parts = base_name.split("-")
-            base_name = "-".join(parts[:-1])  # 移除最后的速度部分
+    if args.output and len(args.input) > 1:
+        print("❌ --output 只能用于单个输入文件")
+        sys.exit(1)
 
-        new_name = f"{base_name}-{args.speed}x{input_file.suffix}"
-        output_path = str(input_file.parent / new_name)
+    # 生成输出文件名
+    jobs = [
+        (input_path, args.output or default_output_path(input_path, args.speed),
+         args.speed, args.verbose, args.engine)
+        for input_path in args.input
+    ]
+    workers = max(1, min(args.workers, len(jobs)))
 
     print()
     print("=" * 50)
-    print("⚡ 音频加速工具")
+    print("⚡ 音频变速工具")
     print("=" * 50)
-    print(f"📂 输入: {args.input}")
-    print(f"📁 输出: {output_path}")
+    for input_path, output_path, *_ in jobs:
+        print(f"📂 输入: {input_path}")
+        print(f"📁 输出: {output_path}")
     print(f"⚡ 速度: {args.speed}x")
+    if len(jobs) > 1:
+        print(f"🔀 并行进程: {workers}")
     print()
 
-    # 执行加速
-    success = speed_up_audio(args.input, output_path, args.speed, verbose=args.verbose)
+    # 执行变速
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_job, jobs))
+    elapsed = time.perf_counter() - start
 
-    if success:
+    succeeded = [r for r in results if r]
+    if len(jobs) > 1 and succeeded:
+        audio_seconds = sum(r.input_seconds for r in succeeded)
+        print()
+        print("📊 结果汇总")
+        for r in succeeded:
+            print(f"  {Path(r.output_path).name:<40} {r.input_seconds / 60:6.1f} 分钟  "
+                  f"{r.elapsed:6.1f}s  {r.realtime_factor:6.0f}x 实时")
+        print(f"  合计 {audio_seconds / 60:.1f} 分钟音频，耗时 {elapsed:.1f}s，"
+              f"整体 {audio_seconds / elapsed:.0f}x 实时")
+
+    if len(succeeded) == len(jobs):
         print()
         print("🎉 处理完成!")
         sys.exit(0)
     else:
         print()
-        print("❌ 处理失败")
+        print(f"❌ 处理失败 ({len(jobs) - len(succeeded)}/{len(jobs)})")
         sys.exit(1)
 
 
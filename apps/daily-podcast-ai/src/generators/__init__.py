@@ -1,5 +1,18 @@
 # Audio Generators Module
-from .tts_generator import TTSGenerator
-from .audio_mixer import AudioMixer
+# 导出按需加载：导入 generators.ffmpeg_assembler、generators.cover_render 等纯工具模块时
+# 不会连带加载 elevenlabs / pydub
+import importlib
+
+_EXPORTS = {
+    "TTSGenerator": ".tts_generator",
+    "AudioMixer": ".audio_mixer",
+}
 
 __all__ = ["TTSGenerator", "AudioMixer"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
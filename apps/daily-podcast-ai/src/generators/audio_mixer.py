@@ -1,6 +1,9 @@
 """
 音频混合与后处理模块
 将多个音频片段合并为完整的播客，并添加背景音乐
+
+默认使用 ffmpeg 单次编码装配（见 ffmpeg_assembler.py），找不到 ffmpeg 或执行
+失败时回退到 pydub 实现。可通过 audio.engine 配置为 auto / ffmpeg / pydub。
 """
 
 import os
@@ -11,6 +14,8 @@ from typing import Optional
 import yaml
 from pydub import AudioSegment as PydubSegment
 
+from .ffmpeg_assembler import FFmpegAssembler, FFmpegError
+
 
 @dataclass
 class MixedAudio:
@@ -36,6 +41,16 @@ class AudioMixer:
         self.config = self._load_config(config_path)
         self.audio_config = self.config.get("audio", {})
 
+        # 装配引擎：auto（优先 ffmpeg）/ ffmpeg / pydub
+        self.engine = self.audio_config.get("engine", "auto")
+        self.assembler = None
+        if self.engine != "pydub":
+            assembler = FFmpegAssembler.from_config(self.audio_config)
+            if assembler.available:
+                self.assembler = assembler
+            elif self.engine == "ffmpeg":
+                print("⚠️ 未找到 ffmpeg，回退到 pydub 合成")
+
     def _load_config(self, config_path: str) -> dict:
         """加载配置文件"""
         path = Path(config_path)
@@ -59,7 +74,10 @@ class AudioMixer:
                 "normalize": True,
                 "fade_duration_ms": 500,
                 "segment_gap_ms": 800,
-                "bgm_volume_reduction_db": -20
+                "bgm_volume_reduction_db": -20,
+                "engine": "auto",
+                "target_dbfs": -20.0,
+                "bgm_ducking": True
             }
         }
 
@@ -79,6 +97,15 @@ class AudioMixer:
             print(f"❌ 加载音频失败 ({filepath}): {e}")
             return None
 
+    def _export(self, audio: PydubSegment, output_path: str) -> None:
+        """导出音频（格式取自扩展名，默认 mp3；中间文件用 wav 避免反复有损编码）"""
+        fmt = Path(output_path).suffix.lstrip(".").lower() or "mp3"
+        if fmt == "wav":
+            audio.export(output_path, format="wav")
+        else:
+            bitrate = self.audio_config.get("bitrate", "192k")
+            audio.export(output_path, format=fmt, bitrate=bitrate)
+
     def _apply_fade(
         self,
         audio: PydubSegment,
@@ -115,7 +142,7 @@ class AudioMixer:
         Returns:
             标准化后的音频
         """
-        target_dbfs = -20.0
+        target_dbfs = self.audio_config.get("target_dbfs", -20.0)
         change_in_dbfs = target_dbfs - audio.dBFS
         return audio.apply_gain(change_in_dbfs)
 
@@ -148,6 +175,34 @@ class AudioMixer:
             print(f"\n🎧 开始合并音频，共 {len(segment_files)} 个片段")
             print("-" * 40)
 
+        if self.assembler:
+            try:
+                result = self.assembler.assemble(
+                    segment_files,
+                    output_path,
+                    normalize=normalize,
+                    add_gaps=add_gaps,
+                    show_progress=show_progress
+                )
+                if show_progress:
+                    print("-" * 40)
+                    print(f"✅ 合并完成: {output_path}")
+                    print(f"   时长: {result.duration_seconds:.1f} 秒")
+                return MixedAudio(**vars(result))
+            except FFmpegError as e:
+                print(f"⚠️ ffmpeg 合并失败，回退到 pydub: {e}")
+
+        return self._concatenate_pydub(segment_files, output_path, add_gaps, normalize, show_progress)
+
+    def _concatenate_pydub(
+        self,
+        segment_files: list[str],
+        output_path: str,
+        add_gaps: bool = True,
+        normalize: bool = True,
+        show_progress: bool = True
+    ) -> Optional[MixedAudio]:
+        """pydub 合并实现（整段 PCM 载入内存，作为 ffmpeg 不可用时的回退）"""
         gap_duration = self.audio_config.get("segment_gap_ms", 800)
         gap = PydubSegment.silent(duration=gap_duration)
 
@@ -182,8 +237,7 @@ class AudioMixer:
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
         # 导出
-        bitrate = self.audio_config.get("bitrate", "192k")
-        combined.export(output_path, format="mp3", bitrate=bitrate)
+        self._export(combined, output_path)
 
         duration_seconds = len(combined) / 1000.0
 
@@ -248,8 +302,7 @@ class AudioMixer:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        bitrate = self.audio_config.get("bitrate", "192k")
-        mixed.export(output_path, format="mp3", bitrate=bitrate)
+        self._export(mixed, output_path)
 
         return str(output_file)
 
@@ -303,8 +356,7 @@ class AudioMixer:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        bitrate = self.audio_config.get("bitrate", "192k")
-        result.export(output_path, format="mp3", bitrate=bitrate)
+        self._export(result, output_path)
 
         return str(output_file)
 
@@ -334,6 +386,82 @@ class AudioMixer:
         # 提取文件路径
         segment_files = [seg.filepath for seg in audio_segments]
 
+        if self.assembler:
+            result = self._create_final_podcast_ffmpeg(
+                segment_files,
+                output_path,
+                bgm_path=bgm_path,
+                intro_jingle_path=intro_jingle_path,
+                outro_jingle_path=outro_jingle_path,
+                show_progress=show_progress
+            )
+            if result:
+                return result
+
+        return self._create_final_podcast_pydub(
+            segment_files,
+            output_path,
+            bgm_path=bgm_path,
+            intro_jingle_path=intro_jingle_path,
+            outro_jingle_path=outro_jingle_path,
+            show_progress=show_progress
+        )
+
+    def _print_summary(self, result: MixedAudio) -> None:
+        duration = result.duration_seconds
+        print("\n" + "=" * 40)
+        print(f"🎉 播客生成完成!")
+        print(f"   📁 文件: {result.filepath}")
+        print(f"   ⏱️ 时长: {duration:.1f} 秒 ({duration/60:.1f} 分钟)")
+        print(f"   🎵 背景音乐: {'是' if result.has_bgm else '否'}")
+        print(f"   🎬 片头: {'是' if result.has_intro_jingle else '否'}")
+        print(f"   🏁 片尾: {'是' if result.has_outro_jingle else '否'}")
+
+    def _create_final_podcast_ffmpeg(
+        self,
+        segment_files: list[str],
+        output_path: str,
+        bgm_path: Optional[str] = None,
+        intro_jingle_path: Optional[str] = None,
+        outro_jingle_path: Optional[str] = None,
+        show_progress: bool = True
+    ) -> Optional[MixedAudio]:
+        """ffmpeg 单次编码：合并、标准化、背景音乐、片头片尾一步完成"""
+        def existing(path: Optional[str]) -> Optional[str]:
+            return path if path and Path(path).exists() else None
+
+        if show_progress:
+            print(f"\n📀 ffmpeg 装配音频，共 {len(segment_files)} 个片段")
+
+        try:
+            result = self.assembler.assemble(
+                segment_files,
+                output_path,
+                bgm_path=existing(bgm_path),
+                intro_jingle_path=existing(intro_jingle_path),
+                outro_jingle_path=existing(outro_jingle_path),
+                show_progress=show_progress
+            )
+        except FFmpegError as e:
+            print(f"⚠️ ffmpeg 装配失败，回退到 pydub: {e}")
+            return None
+
+        mixed = MixedAudio(**vars(result))
+        if show_progress:
+            self._print_summary(mixed)
+        return mixed
+
+    def _create_final_podcast_pydub(
+        self,
+        segment_files: list[str],
+        output_path: str,
+        bgm_path: Optional[str] = None,
+        intro_jingle_path: Optional[str] = None,
+        outro_jingle_path: Optional[str] = None,
+        show_progress: bool = True
+    ) -> Optional[MixedAudio]:
+        """pydub 实现：逐步生成临时文件（每一步重新解码 / 编码）"""
+
         # 临时文件路径
         temp_dir = Path(output_path).parent / "temp"
         temp_dir.mkdir(parents=True, exist_ok=True)
@@ -342,8 +470,8 @@ class AudioMixer:
         if show_progress:
             print("\n📀 步骤 1/3: 合并音频片段")
 
-        temp_merged = str(temp_dir / "merged.mp3")
-        merged = self.concatenate_segments(
+        temp_merged = str(temp_dir / "merged.wav")
+        merged = self._concatenate_pydub(
             segment_files,
             temp_merged,
             show_progress=show_progress
@@ -362,7 +490,7 @@ class AudioMixer:
             if show_progress:
                 print("\n🎵 步骤 2/3: 添加背景音乐")
 
-            temp_with_bgm = str(temp_dir / "with_bgm.mp3")
+            temp_with_bgm = str(temp_dir / "with_bgm.wav")
             result = self.add_background_music(
                 current_audio,
                 bgm_path,
@@ -399,9 +527,12 @@ class AudioMixer:
         else:
             if show_progress:
                 print("\n🎶 步骤 3/3: 跳过（无片头片尾）")
-            # 复制最终文件
-            import shutil
-            shutil.copy(current_audio, output_path)
+            # 输出最终文件（中间文件为 wav 时编码为目标格式）
+            if Path(current_audio).suffix == Path(output_path).suffix:
+                import shutil
+                shutil.copy(current_audio, output_path)
+            else:
+                self._export(self._load_audio(current_audio), output_path)
 
         # 清理临时文件
         try:
@@ -417,23 +548,17 @@ class AudioMixer:
         else:
             duration = merged.duration_seconds
 
-        if show_progress:
-            print("\n" + "=" * 40)
-            print(f"🎉 播客生成完成!")
-            print(f"   📁 文件: {output_path}")
-            print(f"   ⏱️ 时长: {duration:.1f} 秒 ({duration/60:.1f} 分钟)")
-            print(f"   🎵 背景音乐: {'是' if has_bgm else '否'}")
-            print(f"   🎬 片头: {'是' if has_intro else '否'}")
-            print(f"   🏁 片尾: {'是' if has_outro else '否'}")
-
-        return MixedAudio(
+        mixed = MixedAudio(
             filepath=output_path,
             duration_seconds=duration,
-            total_segments=len(audio_segments),
+            total_segments=len(segment_files),
             has_bgm=has_bgm,
             has_intro_jingle=has_intro,
             has_outro_jingle=has_outro
         )
+        if show_progress:
+            self._print_summary(mixed)
+        return mixed
 
 
 def main():
@@ -0,0 +1,217 @@
+"""
+封面渲染基础组件（NumPy 向量化）
+供 scripts/generate_cover.py 以及影评封面脚本共用
+
+- 渐变背景：整幅画布一次性计算，替代逐像素 putpixel / 逐行画矩形
+- 圆形蒙版（可选抗锯齿）、纸张纹理、柔光光斑：数组运算或只在局部区域处理
+- 字体与 logo 缩放结果按参数缓存，同一进程内生成多张封面时只加载一次
+"""
+
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# macOS 系统中文字体（按优先级）
+DEFAULT_FONT_PATHS = (
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Light.ttc",
+    "/System/Library/Fonts/Hiragino Sans GB.ttc",
+    "/Library/Fonts/Arial Unicode.ttf",
+)
+
+
+# ========== 渐变 ==========
+
+def diagonal_gradient(width: int, height: int, color1: tuple, color2: tuple) -> Image.Image:
+    """
+    左上到右下的对角渐变
+
+    与原逐像素实现逐点一致：蒙版值 int(255 * (x + y) / (width + height))，
+    再用 Image.paste 按蒙版混合两种颜色。
+    """
+    ys = np.arange(height, dtype=np.int64)[:, None]
+    xs = np.arange(width, dtype=np.int64)[None, :]
+    mask = ((xs + ys) * 255 // (width + height)).astype(np.uint8)
+
+    base = Image.new("RGB", (width, height), color1)
+    base.paste(Image.new("RGB", (width, height), color2), mask=Image.fromarray(mask, "L"))
+    return base
+
+
+def vertical_gradient(size: tuple, color_top: tuple, color_bottom: tuple) -> Image.Image:
+    """
+    从上到下的线性渐变
+
+    每行颜色 int(top * (1 - ratio) + bottom * ratio)，ratio = y / height，与原逐行绘制一致。
+    """
+    width, height = size
+    ratio = (np.arange(height, dtype=np.float64) / height)[:, None]
+    top = np.asarray(color_top[:3], dtype=np.float64)[None, :]
+    bottom = np.asarray(color_bottom[:3], dtype=np.float64)[None, :]
+    column = (top * (1 - ratio) + bottom * ratio).astype(np.uint8)[:, None, :]  # (height, 1, 3)
+    # 1 像素宽的色带横向最近邻拉伸，比在内存中复制整幅数组更快
+    return Image.fromarray(column, "RGB").resize((width, height), Image.Resampling.NEAREST)
+
+
+# ========== 形状 ==========
+
+@lru_cache(maxsize=16)
+def _circular_mask(size: int, supersample: int) -> Image.Image:
+    if supersample <= 1:
+        mask = Image.new("L", (size, size), 0)
+        ImageDraw.Draw(mask).ellipse([0, 0, size, size], fill=255)
+        return mask
+    # 在像素内取 supersample×supersample 个采样点，覆盖率即为抗锯齿后的灰度
+    offsets = (np.arange(supersample) + 0.5) / supersample
+    coords = (np.arange(size)[:, None] + offsets[None, :]).ravel() - size / 2
+    inside = (coords[:, None] ** 2 + coords[None, :] ** 2) <= (size / 2) ** 2
+    coverage = inside.reshape(size, supersample, size, supersample).mean(axis=(1, 3))
+    return Image.fromarray(np.round(coverage * 255).astype(np.uint8), "L")
+
+
+def circular_mask(size: int, supersample: int = 1) -> Image.Image:
+    """
+    创建圆形蒙版（结果按尺寸缓存，返回副本）
+
+    默认与原 draw.ellipse([0, 0, size, size]) 逐点一致；
+    supersample > 1 时按像素内 supersample×supersample 个采样点的覆盖率抗锯齿。
+    """
+    return _circular_mask(size, supersample).copy()
+
+
+def add_paper_texture(
+    img: Image.Image,
+    count: int = 3000,
+    amplitude: int = 5,
+    rng: Optional[random.Random] = None
+) -> Image.Image:
+    """
+    纸张质感：随机选 count 个像素，亮度 ±amplitude
+
+    随机数的取用顺序与原 getpixel / putpixel 循环相同（x, y, brightness），
+    使用同一随机种子时结果不变，后续依赖同一随机序列的元素位置也不变。
+    """
+    rng = rng or random
+    width, height = img.size
+    draws = np.array(
+        [
+            (rng.randint(0, width - 1), rng.randint(0, height - 1), rng.randint(-amplitude, amplitude))
+            for _ in range(count)
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+
+    pixels = np.asarray(img.convert("RGB"), dtype=np.int16).copy()
+    # 同一像素被多次选中时亮度累加，与逐次 putpixel 相同
+    np.add.at(pixels, (draws[:, 1], draws[:, 0]), draws[:, 2:3].astype(np.int16))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), "RGB")
+
+
+def composite_light_spots(
+    img: Image.Image,
+    spots: Sequence[tuple],
+    color: tuple = (255, 250, 235),
+    blur_radius: float = 30
+) -> Image.Image:
+    """
+    叠加模糊的半透明光斑
+
+    只在光斑包围盒（外扩模糊半径的 3 倍）内绘制、模糊和混合，
+    不再对整幅画布做 RGBA 转换与高斯模糊。
+
+    Args:
+        img: RGB 底图
+        spots: [(x, y, radius, alpha), ...]
+        color: 光斑颜色
+        blur_radius: 高斯模糊半径
+
+    Returns:
+        新的 RGB 图片
+    """
+    if not spots:
+        return img.copy()
+
+    margin = int(blur_radius * 3) + 2
+    left = max(0, min(x - r for x, _, r, _ in spots) - margin)
+    top = max(0, min(y - r for _, y, r, _ in spots) - margin)
+    right = min(img.width, max(x + r for x, _, r, _ in spots) + margin + 1)
+    bottom = min(img.height, max(y + r for _, y, r, _ in spots) + margin + 1)
+
+    overlay = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for x, y, radius, alpha in spots:
+        draw.ellipse(
+            [(x - radius - left, y - radius - top), (x + radius - left, y + radius - top)],
+            fill=(*color[:3], alpha)
+        )
+    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+
+    result = img.convert("RGB").copy()
+    region = result.crop((left, top, right, bottom)).convert("RGBA")
+    result.paste(Image.alpha_composite(region, overlay).convert("RGB"), (left, top))
+    return result
+
+
+# ========== 资源缓存 ==========
+
+@lru_cache(maxsize=64)
+def _load_font(font_paths: tuple, size: int):
+    for font_path in font_paths:
+        if Path(font_path).exists():
+            try:
+                return ImageFont.truetype(font_path, size), font_path
+            except Exception:
+                continue
+    return ImageFont.load_default(), None
+
+
+def load_font(size: int, font_paths: Sequence[str] = DEFAULT_FONT_PATHS) -> ImageFont.ImageFont:
+    """按优先级加载第一个可用字体（按路径列表和字号缓存），都不可用时返回默认字体"""
+    return _load_font(tuple(font_paths), size)[0]
+
+
+def resolve_font_path(font_paths: Sequence[str] = DEFAULT_FONT_PATHS) -> Optional[str]:
+    """返回实际使用的字体路径，没有可用字体时返回 None"""
+    return _load_font(tuple(font_paths), 12)[1]
+
+
+@lru_cache(maxsize=32)
+def _load_logo(logo_path: str, mtime: float, size: tuple, keep_aspect: bool) -> Image.Image:
+    logo = Image.open(logo_path)
+    if keep_aspect:
+        if logo.mode != "RGBA":
+            logo = logo.convert("RGBA")
+        logo.thumbnail(size, Image.Resampling.LANCZOS)
+        return logo
+    return logo.resize(size, Image.Resampling.LANCZOS)
+
+
+def load_logo(logo_path: str, size: tuple, keep_aspect: bool = True) -> Image.Image:
+    """
+    加载并缩放 logo（按路径、修改时间和尺寸缓存）
+
+    返回的图片是共享的缓存对象，只用于 paste，不要原地修改。
+
+    Args:
+        logo_path: logo 文件路径
+        size: 目标尺寸 (宽, 高)
+        keep_aspect: True 时保持宽高比缩放到 size 以内并转为 RGBA，
+            False 时直接缩放到 size（保留原始模式）
+
+    Returns:
+        缩放后的 logo
+    """
+    path = Path(logo_path)
+    return _load_logo(str(path.resolve()), path.stat().st_mtime, tuple(size), keep_aspect)
+
+
+def paste_logo(img: Image.Image, logo: Image.Image, position: tuple) -> None:
+    """把 logo 贴到图片上（RGBA logo 保留透明度）"""
+    if logo.mode == "RGBA":
+        img.paste(logo, position, logo)
+    else:
+        img.paste(logo, position)
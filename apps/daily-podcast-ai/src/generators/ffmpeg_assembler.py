@@ -0,0 +1,430 @@
+"""
+ffmpeg 音频装配引擎
+把播客的全部后处理放进一个 ffmpeg filter graph，一次解码、一次编码：
+
+  片段 ─ 增益 ─ 间隔(apad) ─┐
+  片段 ─ 增益 ─ 间隔(apad) ─┼─ concat ─ 淡入淡出 ─┬─ amix ─┐
+  ...                       ┘                    │        ├─ concat ─ MP3
+  背景音乐(循环) ─ 音量 ─ 淡入淡出 ─ sidechaincompress ┘    │
+  片头 / 片尾 ─ 淡入淡出 ─────────────────────────────────┘
+
+逐片段响度标准化分两步（与 pydub 实现的 -20 dBFS 目标一致）：先用一次 ffmpeg 调用
+批量测量所有片段的平均音量和峰值（volumedetect），再在 graph 中对每个片段施加固定
+增益（峰值不超过 -1 dBFS）。直接在 graph 里为每个片段挂 loudnorm 会让每个实例各自
+以 192kHz 缓冲，几十个片段就要占用上 GB 内存。
+
+ffmpeg 以流式方式处理，内存占用与节目时长无关；原 pydub 实现每一步都要把完整
+PCM 载入内存并重新编码一次 MP3。
+"""
+
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_INPUT = re.compile(r"^Input #(\d+),")
+_VOLUME = re.compile(r"\[Parsed_volumedetect_(\d+) @ [^\]]+\] (mean|max)_volume: (-?[\d.]+|-inf) dB")
+
+# 低于该音量视为静音，不做增益
+_SILENCE_DB = -70.0
+# 标准化后允许的最大峰值
+_PEAK_CEILING_DB = -1.0
+
+
+class FFmpegError(RuntimeError):
+    """ffmpeg 执行失败"""
+
+
+def find_ffmpeg() -> Optional[str]:
+    """查找 ffmpeg：FFMPEG_BINARY 环境变量 > PATH > imageio-ffmpeg 自带的二进制"""
+    path = os.environ.get("FFMPEG_BINARY") or shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+@dataclass
+class AudioInfo:
+    """音频探测结果"""
+    duration: float
+    mean_volume: Optional[float] = None  # 平均音量（RMS）dBFS
+    max_volume: Optional[float] = None  # 峰值 dBFS
+
+
+@dataclass
+class AssemblyResult:
+    """装配结果"""
+    filepath: str
+    duration_seconds: float
+    total_segments: int
+    has_bgm: bool
+    has_intro_jingle: bool
+    has_outro_jingle: bool
+
+
+class FFmpegAssembler:
+    """单次编码的 ffmpeg 播客装配器"""
+
+    def __init__(
+        self,
+        ffmpeg: Optional[str] = None,
+        sample_rate: int = 44100,
+        channels: int = 1,
+        bitrate: str = "192k",
+        fade_ms: int = 500,
+        gap_ms: int = 800,
+        jingle_gap_ms: int = 500,
+        target_dbfs: float = -20.0,
+        bgm_volume_db: float = -20.0,
+        bgm_ducking: bool = True,
+        probe_workers: int = 4,
+        probe_batch: int = 64,
+    ):
+        """
+        初始化装配器
+
+        Args:
+            ffmpeg: ffmpeg 路径（默认自动查找）
+            sample_rate: 输出采样率
+            channels: 输出声道数（TTS 片段为单声道）
+            bitrate: MP3 码率
+            fade_ms: 淡入淡出时长
+            gap_ms: 片段间隔
+            jingle_gap_ms: 片头/片尾与正文的间隔
+            target_dbfs: 每个片段标准化后的平均音量（dBFS）
+            bgm_volume_db: 背景音乐基础音量（dB）
+            bgm_ducking: 人声出现时压低背景音乐（sidechain）
+            probe_workers: 并发探测的 ffmpeg 进程数
+            probe_batch: 每个 ffmpeg 进程探测的文件数
+        """
+        self.ffmpeg = ffmpeg or find_ffmpeg()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bitrate = bitrate
+        self.fade = fade_ms / 1000.0
+        self.gap = gap_ms / 1000.0
+        self.jingle_gap = jingle_gap_ms / 1000.0
+        self.target_dbfs = target_dbfs
+        self.bgm_volume_db = bgm_volume_db
+        self.bgm_ducking = bgm_ducking
+        self.probe_workers = max(1, probe_workers)
+        self.probe_batch = max(1, probe_batch)
+
+    @classmethod
+    def from_config(cls, audio_config: dict) -> "FFmpegAssembler":
+        """从 voice.yaml 的 audio 配置创建"""
+        return cls(
+            ffmpeg=audio_config.get("ffmpeg_path"),
+            sample_rate=audio_config.get("sample_rate", 44100),
+            channels=audio_config.get("channels", 1),
+            bitrate=audio_config.get("bitrate", "192k"),
+            fade_ms=audio_config.get("fade_duration_ms", 500),
+            gap_ms=audio_config.get("segment_gap_ms", 800),
+            target_dbfs=audio_config.get("target_dbfs", -20.0),
+            bgm_volume_db=audio_config.get("bgm_volume_reduction_db", -20),
+            bgm_ducking=audio_config.get("bgm_ducking", True),
+        )
+
+    @property
+    def available(self) -> bool:
+        return bool(self.ffmpeg)
+
+    # ========== 探测 ==========
+
+    def _parse_probe(self, stderr: str, count: int, measured: bool) -> list[Optional[AudioInfo]]:
+        """解析 ffmpeg 输出中每个输入的时长，以及 volumedetect 的统计结果"""
+        infos: list[Optional[AudioInfo]] = [None] * count
+        volumes: dict[int, dict[str, float]] = {}
+        current = None
+        for line in stderr.splitlines():
+            match = _INPUT.match(line)
+            if match:
+                current = int(match.group(1))
+                continue
+            match = _DURATION.search(line)
+            if match and current is not None and current < count and infos[current] is None:
+                hours, minutes, seconds = match.groups()
+                infos[current] = AudioInfo(duration=int(hours) * 3600 + int(minutes) * 60 + float(seconds))
+                continue
+            match = _VOLUME.search(line)
+            if match:
+                volumes.setdefault(int(match.group(1)), {})[match.group(2)] = float(match.group(3))
+
+        # volumedetect 实例按 graph 中的顺序编号，与输入顺序一致
+        if measured and len(volumes) == count:
+            for info, key in zip(infos, sorted(volumes)):
+                if info:
+                    info.mean_volume = volumes[key].get("mean")
+                    info.max_volume = volumes[key].get("max")
+        return infos
+
+    def _probe_batch(self, files: list[str], measure: bool) -> list[Optional[AudioInfo]]:
+        """用一个 ffmpeg 进程探测一批文件"""
+        command = [self.ffmpeg, "-hide_banner", "-nostdin"]
+        for filepath in files:
+            command += ["-i", str(filepath)]
+        if measure:
+            command += ["-filter_complex", ";".join(f"[{k}:a]volumedetect[m{k}]" for k in range(len(files)))]
+            for k in range(len(files)):
+                command += ["-map", f"[m{k}]"]
+            command += ["-f", "null", "-"]
+        try:
+            proc = subprocess.run(command, capture_output=True, text=True, errors="replace")
+        except OSError:
+            return [None] * len(files)
+
+        # 不测量时没有输出文件，ffmpeg 必然返回非 0，只要时长都解析到即可
+        if measure and proc.returncode != 0:
+            if len(files) == 1:
+                return self._parse_probe(proc.stderr, 1, measured=False)
+            # 某个文件无法解码：逐个探测，定位坏文件
+            return [info for f in files for info in self._probe_batch([f], measure)]
+        return self._parse_probe(proc.stderr, len(files), measured=measure)
+
+    def probe(self, filepath: str, measure: bool = False) -> Optional[AudioInfo]:
+        """
+        读取音频时长（解析 ffmpeg 的输出，不依赖 ffprobe）
+
+        Args:
+            filepath: 音频路径
+            measure: 同时测量平均音量与峰值（需要完整解码一次）
+
+        Returns:
+            AudioInfo，无法读取返回 None
+        """
+        return self._probe_batch([filepath], measure)[0]
+
+    def probe_all(self, files: list[str], measure: bool = False) -> list[Optional[AudioInfo]]:
+        """分批探测多个文件（每批一个 ffmpeg 进程，多批并发）"""
+        if not files:
+            return []
+        batches = [files[i:i + self.probe_batch] for i in range(0, len(files), self.probe_batch)]
+        with ThreadPoolExecutor(max_workers=min(self.probe_workers, len(batches))) as pool:
+            results = pool.map(lambda batch: self._probe_batch(batch, measure), batches)
+            return [info for batch in results for info in batch]
+
+    def gain_for(self, info: AudioInfo) -> float:
+        """把片段调整到目标平均音量所需的增益（dB），峰值不超过 -1 dBFS"""
+        if info.mean_volume is None or info.mean_volume <= _SILENCE_DB:
+            return 0.0
+        gain = self.target_dbfs - info.mean_volume
+        if info.max_volume is not None and info.max_volume > float("-inf"):
+            gain = min(gain, _PEAK_CEILING_DB - info.max_volume)
+        return gain
+
+    # ========== filter graph ==========
+
+    def _format(self) -> str:
+        layout = "stereo" if self.channels == 2 else "mono"
+        return f"aformat=sample_fmts=fltp:sample_rates={self.sample_rate}:channel_layouts={layout}"
+
+    def _fades(self, duration: float) -> str:
+        fade = min(self.fade, duration / 2)
+        if fade <= 0:
+            return "anull"
+        return (
+            f"afade=t=in:st=0:d={fade:.3f},"
+            f"afade=t=out:st={max(0.0, duration - fade):.3f}:d={fade:.3f}"
+        )
+
+    def build_command(
+        self,
+        segments: list[tuple[str, AudioInfo]],
+        output_path: str,
+        bgm: Optional[str] = None,
+        intro: Optional[tuple[str, float]] = None,
+        outro: Optional[tuple[str, float]] = None,
+        normalize: bool = True,
+        add_gaps: bool = True,
+    ) -> tuple[list[str], float]:
+        """
+        生成 ffmpeg 命令
+
+        Args:
+            segments: [(文件路径, 探测结果)]，至少一个
+            output_path: 输出文件
+            bgm: 背景音乐路径
+            intro: 片头 (路径, 时长)
+            outro: 片尾 (路径, 时长)
+            normalize: 按测得的响度对每个片段施加增益
+            add_gaps: 片段之间插入静音
+
+        Returns:
+            (命令参数列表, 输出总时长秒)
+        """
+        fmt = self._format()
+        inputs: list[str] = []
+        graph: list[str] = []
+
+        def add_input(path: str, loop: bool = False) -> int:
+            if loop:
+                inputs.extend(["-stream_loop", "-1"])
+            inputs.extend(["-i", str(path)])
+            return inputs.count("-i") - 1
+
+        # 人声：逐片段标准化 + 间隔，然后 concat
+        voice_duration = 0.0
+        for k, (path, info) in enumerate(segments):
+            idx = add_input(path)
+            chain = [f"[{idx}:a]{fmt}"]
+            gain = self.gain_for(info) if normalize else 0.0
+            if abs(gain) >= 0.05:
+                chain.append(f"volume={gain:.2f}dB")
+            voice_duration += info.duration
+            if add_gaps and k < len(segments) - 1 and self.gap > 0:
+                chain.append(f"apad=pad_dur={self.gap:.3f}")
+                voice_duration += self.gap
+            graph.append(",".join(chain) + f"[v{k}]")
+
+        labels = "".join(f"[v{k}]" for k in range(len(segments)))
+        graph.append(
+            f"{labels}concat=n={len(segments)}:v=0:a=1,{self._fades(voice_duration)}[voice]"
+        )
+        main = "voice"
+
+        # 背景音乐：循环、截断到人声长度、淡入淡出，人声出现时自动压低
+        if bgm:
+            idx = add_input(bgm, loop=True)
+            graph.append(
+                f"[{idx}:a]atrim=duration={voice_duration:.3f},{fmt},"
+                f"volume={self.bgm_volume_db}dB,{self._fades(voice_duration)}[bgm]"
+            )
+            if self.bgm_ducking:
+                graph.append("[voice]asplit=2[vmain][vkey]")
+                graph.append(
+                    "[bgm][vkey]sidechaincompress=threshold=0.02:ratio=8:attack=20:release=400[ducked]"
+                )
+                graph.append("[vmain][ducked]amix=inputs=2:duration=first:normalize=0[mixed]")
+            else:
+                graph.append("[voice][bgm]amix=inputs=2:duration=first:normalize=0[mixed]")
+            main = "mixed"
+
+        # 片头片尾
+        total_duration = voice_duration
+        parts = []
+        if intro:
+            path, duration = intro
+            idx = add_input(path)
+            graph.append(
+                f"[{idx}:a]{fmt},{self._fades(duration)},apad=pad_dur={self.jingle_gap:.3f}[intro]"
+            )
+            parts.append("[intro]")
+            total_duration += duration + self.jingle_gap
+        parts.append(f"[{main}]")
+        if outro:
+            path, duration = outro
+            idx = add_input(path)
+            delay_ms = int(self.jingle_gap * 1000)
+            graph.append(f"[{idx}:a]{fmt},{self._fades(duration)},adelay={delay_ms}:all=1[outro]")
+            parts.append("[outro]")
+            total_duration += duration + self.jingle_gap
+
+        if len(parts) > 1:
+            graph.append(f"{''.join(parts)}concat=n={len(parts)}:v=0:a=1[out]")
+        else:
+            graph.append(f"[{main}]anull[out]")
+
+        command = [
+            self.ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            *inputs,
+            "-filter_complex", ";".join(graph),
+            "-map", "[out]",
+            "-c:a", "libmp3lame", "-b:a", self.bitrate, "-ar", str(self.sample_rate),
+            "-f", "mp3", str(output_path),
+        ]
+        return command, total_duration
+
+    # ========== 执行 ==========
+
+    def assemble(
+        self,
+        segment_files: list[str],
+        output_path: str,
+        bgm_path: Optional[str] = None,
+        intro_jingle_path: Optional[str] = None,
+        outro_jingle_path: Optional[str] = None,
+        normalize: bool = True,
+        add_gaps: bool = True,
+        show_progress: bool = True,
+    ) -> AssemblyResult:
+        """
+        一次编码生成最终音频
+
+        Args:
+            segment_files: 音频片段路径列表
+            output_path: 输出路径
+            bgm_path: 背景音乐路径（可选）
+            intro_jingle_path: 片头音效路径（可选）
+            outro_jingle_path: 片尾音效路径（可选）
+            normalize: 是否对每个片段做响度标准化
+            add_gaps: 是否在片段之间添加间隔
+            show_progress: 是否显示进度
+
+        Returns:
+            AssemblyResult
+
+        Raises:
+            FFmpegError: ffmpeg 不可用、没有有效片段或编码失败
+        """
+        if not self.available:
+            raise FFmpegError("未找到 ffmpeg")
+
+        extras = [p for p in (bgm_path, intro_jingle_path, outro_jingle_path) if p]
+        extra_durations = {
+            path: info.duration for path, info in zip(extras, self.probe_all(extras)) if info
+        }
+
+        segments = []
+        for filepath, info in zip(segment_files, self.probe_all(segment_files, measure=normalize)):
+            if info and info.duration > 0:
+                segments.append((filepath, info))
+            else:
+                print(f"❌ 加载音频失败 ({filepath}): 无法读取时长")
+        if not segments:
+            raise FFmpegError("没有有效的音频片段")
+
+        def optional(path: Optional[str]) -> Optional[tuple[str, float]]:
+            if path and extra_durations.get(path):
+                return path, extra_durations[path]
+            return None
+
+        intro = optional(intro_jingle_path)
+        outro = optional(outro_jingle_path)
+        bgm = bgm_path if bgm_path and extra_durations.get(bgm_path) else None
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_name(f".{output_file.name}.partial")
+
+        command, duration = self.build_command(
+            segments, str(tmp_file), bgm=bgm, intro=intro, outro=outro,
+            normalize=normalize, add_gaps=add_gaps,
+        )
+
+        if show_progress:
+            print(f"  ⚙️ ffmpeg 单次编码: {len(segments)} 个片段"
+                  f"{' + 背景音乐' if bgm else ''}{' + 片头' if intro else ''}{' + 片尾' if outro else ''}")
+
+        proc = subprocess.run(command, capture_output=True, text=True, errors="replace")
+        if proc.returncode != 0:
+            tmp_file.unlink(missing_ok=True)
+            raise FFmpegError(proc.stderr.strip()[-2000:] or f"ffmpeg 退出码 {proc.returncode}")
+        os.replace(tmp_file, output_file)
+
+        return AssemblyResult(
+            filepath=str(output_file),
+            duration_seconds=duration,
+            total_segments=len(segment_files),
+            has_bgm=bgm is not None,
+            has_intro_jingle=intro is not None,
+            has_outro_jingle=outro is not None,
+        )
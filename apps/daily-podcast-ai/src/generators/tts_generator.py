@@ -1,13 +1,24 @@
 """
 TTS 语音合成模块
 使用 ElevenLabs API 将文本转换为语音
+
+- 多个片段并发合成（max_concurrency），令牌桶限制请求速率以匹配 ElevenLabs 配额
+- 失败时指数退避重试
+- 内容寻址音频缓存：相同 (文本, voice_id, model_id, 语音参数, output_format)
+  直接复用已生成的音频，重复运行和重复的开场/结束语不再消耗字符额度
 """
 
+import hashlib
+import json
 import os
+import random
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import yaml
 from elevenlabs import ElevenLabs, VoiceSettings
@@ -22,6 +33,91 @@ class AudioSegment:
     segment_index: int
 
 
+@dataclass
+class TTSJob:
+    """单个合成任务"""
+    text: str
+    output_path: str
+    voice_id: Optional[str] = None
+    speed: Optional[float] = None
+    speaker: Optional[str] = None
+    max_bytes: int = 5 * 1024 * 1024  # 超过该大小视为异常音频并重试
+
+
+class TokenBucket:
+    """线程安全的令牌桶：平均每秒 rate 个令牌，最多累积 capacity 个"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AudioCache:
+    """内容寻址的音频缓存：cache/tts/<key[:2]>/<key>.<ext>"""
+
+    def __init__(self, cache_dir: Path, extension: str = "mp3"):
+        self.cache_dir = Path(cache_dir)
+        self.extension = extension
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def key(text: str, voice_id: str, model_id: str, voice_settings: dict, output_format: str) -> str:
+        payload = json.dumps(
+            {
+                "text": text,
+                "voice_id": voice_id,
+                "model_id": model_id,
+                "voice_settings": voice_settings,
+                "output_format": output_format,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{self.extension}"
+
+    def lock(self, key: str) -> threading.Lock:
+        """同一内容只允许一个线程合成，其余线程等待后直接命中缓存"""
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def restore(self, key: str, output_path: Path) -> bool:
+        cached = self.path(key)
+        if not cached.exists():
+            return False
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if cached.resolve() != output_path.resolve():
+            shutil.copyfile(cached, output_path)
+        return True
+
+    def store(self, key: str, audio_file: Path) -> None:
+        cached = self.path(key)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f".{threading.get_ident()}.tmp")
+        shutil.copyfile(audio_file, tmp)
+        os.replace(tmp, cached)
+
+
 class TTSGenerator:
     """ElevenLabs TTS 语音生成器"""
 
@@ -47,6 +143,28 @@ class TTSGenerator:
         self.model_id = self.tts_config.get("model", "eleven_v3")
         self.output_format = self.tts_config.get("output_format", "mp3_44100_128")
 
+        # 并发与限速（按 ElevenLabs 套餐的并发数 / 请求速率配置）
+        self.max_concurrency = max(1, int(self.tts_config.get("max_concurrency", 3)))
+        self.max_retries = max(1, int(self.tts_config.get("max_retries", 4)))
+        self.backoff_base = float(self.tts_config.get("backoff_base", 1.0))
+        self.backoff_max = float(self.tts_config.get("backoff_max", 30.0))
+        self.rate_limiter = TokenBucket(
+            rate=float(self.tts_config.get("requests_per_second", 2.0)),
+            capacity=float(self.tts_config.get("burst", self.max_concurrency)),
+        )
+        self._slots = threading.Semaphore(self.max_concurrency)
+
+        # 内容寻址缓存
+        self.cache = None
+        if self.tts_config.get("cache_enabled", True):
+            cache_dir = Path(self.tts_config.get("cache_dir", "cache/tts"))
+            if not cache_dir.is_absolute():
+                cache_dir = Path(__file__).parent.parent.parent / cache_dir
+            self.cache = AudioCache(cache_dir, extension=self.output_format.split("_", 1)[0])
+        self.cache_hits = 0
+        self.characters_billed = 0
+        self._stats_lock = threading.Lock()
+
     def _load_config(self, config_path: str) -> dict:
         """加载配置文件"""
         path = Path(config_path)
@@ -75,8 +193,8 @@ class TTSGenerator:
             }
         }
 
-    def _get_voice_settings(self, speed: Optional[float] = None, speaker: Optional[str] = None) -> VoiceSettings:
-        """获取语音设置"""
+    def _voice_settings_dict(self, speed: Optional[float] = None, speaker: Optional[str] = None) -> dict:
+        """获取语音设置（字典形式，同时用作缓存键的一部分）"""
         settings = self.tts_config.get("voice_settings", {})
 
         # 如果指定了speaker，尝试使用speaker专属配置
@@ -99,13 +217,17 @@ class TTSGenerator:
         speech_speed = speed or settings.get("speed", self.tts_config.get("speed", 1.0))
         speech_speed = max(0.7, min(1.2, speech_speed))  # 限制范围
 
-        return VoiceSettings(
-            stability=settings.get("stability", 0.5),
-            similarity_boost=settings.get("similarity_boost", 0.75),
-            style=settings.get("style", 0.0),
-            use_speaker_boost=settings.get("use_speaker_boost", True),
-            speed=speech_speed
-        )
+        return {
+            "stability": settings.get("stability", 0.5),
+            "similarity_boost": settings.get("similarity_boost", 0.75),
+            "style": settings.get("style", 0.0),
+            "use_speaker_boost": settings.get("use_speaker_boost", True),
+            "speed": speech_speed,
+        }
+
+    def _get_voice_settings(self, speed: Optional[float] = None, speaker: Optional[str] = None) -> VoiceSettings:
+        """获取语音设置"""
+        return VoiceSettings(**self._voice_settings_dict(speed, speaker))
 
     def list_voices(self) -> list[dict]:
         """
@@ -152,16 +274,61 @@ class TTSGenerator:
             print(f"❌ 获取语音信息失败: {e}")
             return None
 
+    def _convert(self, text: str, output_file: Path, voice_id: str, settings: dict, max_bytes: int) -> bool:
+        """
+        调用 ElevenLabs API 合成一次并写入文件
+
+        Returns:
+            True 成功；False 音频异常（已删除文件，可重试）
+        """
+        self.rate_limiter.acquire()
+        with self._slots:
+            audio = self.client.text_to_speech.convert(
+                voice_id=voice_id,
+                text=text,
+                model_id=self.model_id,
+                output_format=self.output_format,
+                voice_settings=VoiceSettings(**settings)
+            )
+
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+
+            # 保存音频（检测异常大小）
+            total_size = 0
+            with open(output_file, "wb") as f:
+                for chunk in audio:
+                    f.write(chunk)
+                    total_size += len(chunk)
+
+                    # 检测异常：单个片段不应超过 max_bytes
+                    if total_size > max_bytes:
+                        print(f"    ⚠️ 检测到异常大小音频 ({total_size/1024/1024:.1f}MB)，停止写入")
+                        break
+
+        with self._stats_lock:
+            self.characters_billed += len(text)
+
+        if output_file.stat().st_size > max_bytes:
+            output_file.unlink()
+            return False
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        """指数退避（带抖动）"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
     def generate_audio(
         self,
         text: str,
         output_path: str,
         voice_id: Optional[str] = None,
         speed: Optional[float] = None,
-        speaker: Optional[str] = None
+        speaker: Optional[str] = None,
+        max_bytes: int = 5 * 1024 * 1024
     ) -> Optional[str]:
         """
-        将文本转换为音频
+        将文本转换为音频（命中缓存时直接复制已有音频，否则限速合成并指数退避重试）
 
         Args:
             text: 要转换的文本
@@ -169,6 +336,7 @@ class TTSGenerator:
             voice_id: 语音 ID（可选，默认使用配置中的）
             speed: 语速（0.7-1.2，默认使用配置中的）
             speaker: 主持人名称（用于获取专属语音配置）
+            max_bytes: 音频大小上限，超过视为异常并重试
 
         Returns:
             生成的音频文件路径，失败返回 None
@@ -178,46 +346,69 @@ class TTSGenerator:
             print("❌ 未指定 voice_id")
             return None
 
-        try:
-            # 调用 ElevenLabs API（语速通过 VoiceSettings 传递）
-            audio = self.client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=text,
-                model_id=self.model_id,
-                output_format=self.output_format,
-                voice_settings=self._get_voice_settings(speed, speaker)
-            )
-
-            # 确保输出目录存在
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-
-            # 保存音频（检测异常大小）
-            chunk_count = 0
-            total_size = 0
-            with open(output_file, "wb") as f:
-                for chunk in audio:
-                    f.write(chunk)
-                    chunk_count += 1
-                    total_size += len(chunk)
-
-                    # 检测异常：单个片段不应超过5MB
-                    if total_size > 5 * 1024 * 1024:
-                        print(f"    ⚠️ 检测到异常大小音频 ({total_size/1024/1024:.1f}MB)，停止写入")
-                        break
+        output_file = Path(output_path)
+        settings = self._voice_settings_dict(speed, speaker)
+
+        key = None
+        lock = threading.Lock()
+        if self.cache:
+            key = AudioCache.key(text, voice_id, self.model_id, settings, self.output_format)
+            lock = self.cache.lock(key)
+
+        with lock:
+            if key and self.cache.restore(key, output_file):
+                with self._stats_lock:
+                    self.cache_hits += 1
+                return str(output_file)
+
+            for attempt in range(self.max_retries):
+                try:
+                    if self._convert(text, output_file, voice_id, settings, max_bytes):
+                        if key:
+                            self.cache.store(key, output_file)
+                        return str(output_file)
+                    print(f"    ⚠️ 第{attempt + 1}次生成音频异常，重试...")
+                except Exception as e:
+                    print(f"❌ 音频生成失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    time.sleep(self._backoff(attempt))
+
+        return None
+
+    def synthesize_many(
+        self,
+        jobs: list[TTSJob],
+        on_done: Optional[Callable[[int, TTSJob, Optional[str]], None]] = None
+    ) -> list[Optional[str]]:
+        """
+        并发合成多个片段
 
-            # 验证文件大小
-            final_size = output_file.stat().st_size
-            if final_size > 5 * 1024 * 1024:
-                print(f"    ⚠️ 音频文件异常 ({final_size/1024/1024:.1f}MB)，删除并重试")
-                output_file.unlink()
-                return None
+        Args:
+            jobs: 合成任务列表
+            on_done: 每个任务完成时的回调 (下标, 任务, 结果路径)
 
-            return str(output_file)
+        Returns:
+            与 jobs 顺序一致的音频路径列表（失败为 None）
+        """
+        def run(index: int) -> Optional[str]:
+            job = jobs[index]
+            result = self.generate_audio(
+                job.text,
+                job.output_path,
+                voice_id=job.voice_id,
+                speed=job.speed,
+                speaker=job.speaker,
+                max_bytes=job.max_bytes
+            )
+            if on_done:
+                on_done(index, job, result)
+            return result
 
-        except Exception as e:
-            print(f"❌ 音频生成失败: {e}")
-            return None
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(jobs))) as pool:
+            return list(pool.map(run, range(len(jobs))))
 
     def generate_podcast_audio(
         self,
@@ -260,39 +451,23 @@ class TTSGenerator:
             print(f"\n🎙️ 开始生成音频，共 {len(texts)} 个片段")
             print("-" * 40)
 
-        rate_limit_delay = self.tts_config.get("rate_limit_delay", 1.0)
+        jobs = [
+            TTSJob(
+                text=text,
+                output_path=str(output_path / f"{script.date}_{name}.mp3"),
+                max_bytes=2 * 1024 * 1024  # 正常片段应该小于2MB（保守估计）
+            )
+            for name, text in texts
+        ]
 
-        for i, (name, text) in enumerate(texts):
+        def on_done(i: int, job: TTSJob, result: Optional[str]) -> None:
             if show_progress:
-                print(f"  [{i + 1}/{len(texts)}] 生成: {name}...")
-
-            filename = f"{script.date}_{name}.mp3"
-            filepath = output_path / filename
+                status = "✅ 完成" if result else f"❌ 失败（已重试{self.max_retries}次）"
+                print(f"  [{i + 1}/{len(texts)}] {texts[i][0]}: {status}")
 
-            # 尝试最多3次（处理API异常）
-            max_retries = 3
-            result = None
-            for attempt in range(max_retries):
-                result = self.generate_audio(text, str(filepath))
-
-                if result:
-                    # 验证生成的文件大小是否合理
-                    file_size = Path(result).stat().st_size
-                    # 正常片段应该小于2MB（保守估计）
-                    if file_size > 2 * 1024 * 1024:
-                        if show_progress:
-                            print(f"    ⚠️ 第{attempt+1}次生成异常 ({file_size/1024/1024:.1f}MB)，重试...")
-                        Path(result).unlink()
-                        result = None
-                        time.sleep(2)  # 等待2秒后重试
-                        continue
-                    break
-                else:
-                    if attempt < max_retries - 1:
-                        if show_progress:
-                            print(f"    ⚠️ 第{attempt+1}次失败，重试...")
-                        time.sleep(2)
+        results = self.synthesize_many(jobs, on_done=on_done)
 
+        for i, ((name, text), result) in enumerate(zip(texts, results)):
             if result:
                 # 获取音频时长（简单估算，实际可用 pydub 计算）
                 # 中文语速约 3-4 字/秒
@@ -305,19 +480,10 @@ class TTSGenerator:
                     segment_index=i
                 ))
 
-                if show_progress:
-                    print(f"    ✅ 完成")
-            else:
-                if show_progress:
-                    print(f"    ❌ 失败（已重试{max_retries}次）")
-
-            # 速率限制
-            if i < len(texts) - 1:
-                time.sleep(rate_limit_delay)
-
         if show_progress:
             print("-" * 40)
             print(f"✅ 音频生成完成，共 {len(segments)} 个片段")
+            self._print_stats()
 
         return segments
 
@@ -360,57 +526,72 @@ class TTSGenerator:
             print(f"⚠️ 未配置 {host_b_name} 声音 ID，尝试使用默认备选 'Adam'...")
             voice_map[host_b_name] = "pNInz6obpgDQGcFmaJgB" # Default Adam
             
-        rate_limit_delay = self.tts_config.get("rate_limit_delay", 0.5)
-        
         if show_progress:
             print(f"\n🎙️ 开始生成双人对话音频，共 {len(dialogue_script.lines)} 句对话")
             print(f"   {host_a_name} Voice: {voice_map[host_a_name]}")
             print(f"   {host_b_name} Voice: {voice_map[host_b_name]}")
             print("-" * 40)
-            
+
+        jobs = []
+        job_lines = []
+        existing = {}
         for i, line in enumerate(dialogue_script.lines):
             speaker = line.speaker
-            text = line.text
-            voice_id = voice_map.get(speaker, voice_map[host_a_name])
-            
-            # 简单的表情处理 (可以通过 stability 调整，暂未深度实现)
-            # emotion = line.emotion 
-            
             filename = f"{dialogue_script.date}_line_{i:03d}_{speaker.replace(' ', '')}.mp3"
             filepath = output_path / filename
-            
-            if show_progress:
-                speaker_icon = "🗣️" if speaker == host_a_name else "🤖"
-                print(f"  [{i+1}/{len(dialogue_script.lines)}] {speaker_icon} {speaker}: {text[:20]}...")
-            
+
             # 检查文件是否已存在 (避免重复生成节省 Credit)
             if filepath.exists():
-                if show_progress:
-                    print("    ⏩ 跳过 (已存在)")
+                existing[i] = str(filepath)
+                continue
+
+            jobs.append(TTSJob(
+                text=line.text,
+                output_path=str(filepath),
+                voice_id=voice_map.get(speaker, voice_map[host_a_name]),
+                speaker=speaker
+            ))
+            job_lines.append(i)
+
+        if show_progress and existing:
+            print(f"  ⏩ 跳过已存在的 {len(existing)} 句")
+
+        def on_done(k: int, job: TTSJob, result: Optional[str]) -> None:
+            i = job_lines[k]
+            if show_progress:
+                speaker_icon = "🗣️" if job.speaker == host_a_name else "🤖"
+                status = "✅" if result else "❌ 生成失败"
+                print(f"  [{i+1}/{len(dialogue_script.lines)}] {speaker_icon} {job.speaker}: {job.text[:20]}... {status}")
+            elif not result:
+                print(f"    ❌ 生成失败: {job.text[:20]}...")
+
+        results = dict(zip(job_lines, self.synthesize_many(jobs, on_done=on_done)))
+
+        for i, line in enumerate(dialogue_script.lines):
+            if i in existing:
                 segments.append(AudioSegment(
-                    filepath=str(filepath),
+                    filepath=existing[i],
                     duration_seconds=0, # 需重新计算，或读取文件元数据
-                    text=text,
+                    text=line.text,
                     segment_index=i
                 ))
-                continue
-
-            result = self.generate_audio(text, str(filepath), voice_id=voice_id, speaker=speaker)
-            
-            if result:
+            elif results.get(i):
                 segments.append(AudioSegment(
-                    filepath=result,
-                    duration_seconds=len(text)/3.5, # 估算
-                    text=text,
+                    filepath=results[i],
+                    duration_seconds=len(line.text)/3.5, # 估算
+                    text=line.text,
                     segment_index=i
                 ))
-            else:
-                print(f"    ❌ 生成失败")
-                
-            time.sleep(rate_limit_delay)
-            
+
+        if show_progress:
+            self._print_stats()
+
         return segments
 
+    def _print_stats(self) -> None:
+        """打印缓存命中与计费字符统计"""
+        print(f"   ♻️ 缓存命中 {self.cache_hits} 个片段，本次计费 {self.characters_billed} 字符")
+
 
 def main():
     """测试入口"""
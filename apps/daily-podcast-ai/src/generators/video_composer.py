@@ -1,16 +1,173 @@
 """
 视频合成模块
 将漫画帧和音频合成为完整视频，并添加字幕
+
+- ffmpeg 引擎（默认）：字幕帧在进程池中并行渲染，每个场景是一张静态图 + 时长，
+  通过 concat demuxer 一次编码，音频拼成一条音轨
+- moviepy 引擎：原实现，逐帧合成（未安装 ffmpeg 时使用）
 """
 
 import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
 import yaml
-from moviepy import ImageClip, AudioFileClip, concatenate_videoclips, CompositeVideoClip
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+from .cover_render import load_font
+from .ffmpeg_assembler import find_ffmpeg
+
+# 字幕字体候选（配置中的 font_path 优先）
+SUBTITLE_FONT_PATHS = (
+    "/System/Library/Fonts/PingFang.ttc",  # macOS
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux
+    "C:\\Windows\\Fonts\\msyh.ttc"  # Windows
+)
+
+# 只用于测量文字尺寸的画布（textbbox 与画布内容无关）
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+
+@lru_cache(maxsize=4096)
+def _text_bbox(font, text: str) -> tuple:
+    """测量文字包围盒（按字体对象和文本缓存，字体由 load_font 缓存，同一进程内对象不变）"""
+    return _MEASURE_DRAW.textbbox((0, 0), text, font=font)
+
+
+def _text_width(font, text: str) -> int:
+    bbox = _text_bbox(font, text)
+    return bbox[2] - bbox[0]
+
+
+def wrap_text(text: str, font, max_width: int) -> List[str]:
+    """
+    文本自动换行
+
+    结果与逐字累加测量的贪心换行一致：每行取不超过 max_width 的最长前缀
+    （单个字符就超宽时独占一行）。前缀宽度随长度单调递增，用二分查找代替逐字测量。
+
+    Args:
+        text: 原始文本
+        font: 字体对象
+        max_width: 最大宽度
+
+    Returns:
+        分行后的文本列表
+    """
+    lines = []
+    start = 0
+    while start < len(text):
+        lo, hi = 1, len(text) - start
+        if _text_width(font, text[start:start + hi]) <= max_width:
+            lo = hi
+        else:
+            # 不变量：长度 lo 可放下（lo=1 时单字强制成行），长度 hi 放不下
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _text_width(font, text[start:start + mid]) <= max_width:
+                    lo = mid
+                else:
+                    hi = mid
+        lines.append(text[start:start + lo])
+        start += lo
+
+    return lines if lines else [text]
+
+
+def render_subtitled_image(
+    image_path: str,
+    subtitle: str,
+    output_path: str,
+    subtitle_config: dict
+) -> str:
+    """
+    在图像上渲染字幕（模块级函数，可在进程池中执行）
+
+    Args:
+        image_path: 原始图像路径
+        subtitle: 字幕文本
+        output_path: 输出路径
+        subtitle_config: video.subtitle 配置
+
+    Returns:
+        带字幕的图像路径
+    """
+    # 如果没有字幕，直接复制原图
+    if not subtitle or subtitle.strip() == "":
+        shutil.copy(image_path, output_path)
+        return output_path
+
+    img = Image.open(image_path)
+
+    # 如果图像有 alpha 通道，转换为 RGB
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        img = background
+
+    draw = ImageDraw.Draw(img, 'RGBA')
+
+    # 获取字幕配置
+    font_size = subtitle_config.get("font_size", 48)
+    font_color = tuple(subtitle_config.get("font_color", [255, 255, 255]))
+    bg_color = tuple(subtitle_config.get("bg_color", [0, 0, 0, 180]))
+    margin = subtitle_config.get("margin", 60)
+
+    # 加载中文字体（按路径和字号缓存）
+    font_path = subtitle_config.get("font_path")
+    font = load_font(font_size, ((font_path,) if font_path else ()) + SUBTITLE_FONT_PATHS)
+
+    # 自动换行处理
+    max_width = img.width - 2 * margin
+    lines = wrap_text(subtitle, font, max_width)
+
+    # 计算字幕总高度
+    line_heights = [_text_bbox(font, line)[3] for line in lines]
+    total_height = sum(line_heights) + (len(lines) - 1) * 10  # 行间距10px
+
+    # 计算位置
+    position_type = subtitle_config.get("position", "bottom")
+    if position_type == "bottom":
+        y_start = img.height - total_height - margin
+    elif position_type == "top":
+        y_start = margin
+    else:  # middle
+        y_start = (img.height - total_height) / 2
+
+    # 绘制半透明背景
+    padding = 20
+    bg_rect = [
+        margin - padding,
+        y_start - padding,
+        img.width - margin + padding,
+        y_start + total_height + padding
+    ]
+    draw.rectangle(bg_rect, fill=bg_color)
+
+    # 绘制每行文字
+    current_y = y_start
+    for line in lines:
+        bbox = _text_bbox(font, line)
+        text_width = bbox[2] - bbox[0]
+        x = (img.width - text_width) / 2  # 居中
+
+        draw.text((x, current_y), line, font=font, fill=font_color)
+        current_y += bbox[3] + 10  # 行间距
+
+    img.save(output_path)
+    return output_path
+
+
+def _render_job(job: tuple) -> str:
+    """进程池入口"""
+    return render_subtitled_image(*job)
 
 
 @dataclass
@@ -59,6 +216,9 @@ class VideoComposer:
                 "codec": "libx264",
                 "bitrate": "5000k",
                 "resolution": "1920x1080",
+                "engine": "auto",
+                "render_workers": 0,
+                "frame_mode": "still",
                 "subtitle": {
                     "font_size": 48,
                     "font_color": [255, 255, 255],
@@ -86,123 +246,52 @@ class VideoComposer:
         Returns:
             带字幕的图像路径
         """
-        # 如果没有字幕，直接复制原图
-        if not subtitle or subtitle.strip() == "":
-            import shutil
-            shutil.copy(image_path, output_path)
-            return output_path
-
-        img = Image.open(image_path)
-
-        # 如果图像有 alpha 通道，转换为 RGB
-        if img.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-
-        draw = ImageDraw.Draw(img, 'RGBA')
-
-        # 获取字幕配置
-        font_size = self.subtitle_config.get("font_size", 48)
-        font_color = tuple(self.subtitle_config.get("font_color", [255, 255, 255]))
-        bg_color = tuple(self.subtitle_config.get("bg_color", [0, 0, 0, 180]))
-        margin = self.subtitle_config.get("margin", 60)
-
-        # 尝试加载中文字体
-        font_path = self.subtitle_config.get("font_path")
-        try:
-            if font_path and Path(font_path).exists():
-                font = ImageFont.truetype(font_path, font_size)
-            else:
-                # 尝试系统字体
-                for fallback_font in [
-                    "/System/Library/Fonts/PingFang.ttc",  # macOS
-                    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # Linux
-                    "C:\\Windows\\Fonts\\msyh.ttc"  # Windows
-                ]:
-                    if Path(fallback_font).exists():
-                        font = ImageFont.truetype(fallback_font, font_size)
-                        break
-                else:
-                    # 使用默认字体
-                    font = ImageFont.load_default()
-        except Exception:
-            font = ImageFont.load_default()
-
-        # 自动换行处理
-        max_width = img.width - 2 * margin
-        lines = self._wrap_text(subtitle, font, max_width, draw)
-
-        # 计算字幕总高度
-        line_heights = [draw.textbbox((0, 0), line, font=font)[3] for line in lines]
-        total_height = sum(line_heights) + (len(lines) - 1) * 10  # 行间距10px
-
-        # 计算位置
-        position_type = self.subtitle_config.get("position", "bottom")
-        if position_type == "bottom":
-            y_start = img.height - total_height - margin
-        elif position_type == "top":
-            y_start = margin
-        else:  # middle
-            y_start = (img.height - total_height) / 2
-
-        # 绘制半透明背景
-        padding = 20
-        bg_rect = [
-            margin - padding,
-            y_start - padding,
-            img.width - margin + padding,
-            y_start + total_height + padding
-        ]
-        draw.rectangle(bg_rect, fill=bg_color)
-
-        # 绘制每行文字
-        current_y = y_start
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = (img.width - text_width) / 2  # 居中
-
-            draw.text((x, current_y), line, font=font, fill=font_color)
-            current_y += bbox[3] + 10  # 行间距
-
-        img.save(output_path)
-        return output_path
+        return render_subtitled_image(image_path, subtitle, output_path, self.subtitle_config)
 
-    def _wrap_text(self, text: str, font, max_width: int, draw) -> List[str]:
+    def _wrap_text(self, text: str, font, max_width: int, draw=None) -> List[str]:
+        """文本自动换行（见 wrap_text）"""
+        return wrap_text(text, font, max_width)
+
+    def render_subtitles(
+        self,
+        frames: List,
+        temp_dir: Path,
+        add_subtitles: bool = True,
+        workers: Optional[int] = None
+    ) -> List[str]:
         """
-        文本自动换行
+        批量渲染字幕帧
+
+        有字幕的帧在进程池中并行渲染，没有字幕的帧直接使用原图。
 
         Args:
-            text: 原始文本
-            font: 字体对象
-            max_width: 最大宽度
-            draw: ImageDraw 对象
+            frames: ComicFrame 列表
+            temp_dir: 字幕帧输出目录
+            add_subtitles: 是否添加字幕
+            workers: 进程数（默认取配置 render_workers，再默认 CPU 核数）
 
         Returns:
-            分行后的文本列表
+            与 frames 顺序一致的图像路径列表
         """
-        lines = []
-        current_line = ""
-
-        for char in text:
-            test_line = current_line + char
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            width = bbox[2] - bbox[0]
-
-            if width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-
-        if current_line:
-            lines.append(current_line)
-
-        return lines if lines else [text]
+        images = [frame.image_path for frame in frames]
+        jobs, indexes = [], []
+        for i, frame in enumerate(frames):
+            if add_subtitles and frame.dialogue:
+                output = str(temp_dir / f"frame_{i:03d}_sub.png")
+                jobs.append((frame.image_path, frame.dialogue, output, self.subtitle_config))
+                indexes.append(i)
+
+        workers = workers or self.video_config.get("render_workers") or os.cpu_count() or 1
+        workers = max(1, min(workers, len(jobs)))
+        if workers == 1:
+            rendered = [_render_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = list(pool.map(_render_job, jobs))
+
+        for i, path in zip(indexes, rendered):
+            images[i] = path
+        return images
 
     def compose_video(
         self,
@@ -210,7 +299,8 @@ class VideoComposer:
         audio_segments: List,  # List[AudioSegment]
         output_path: str,
         add_subtitles: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        engine: Optional[str] = None
     ) -> Optional[VideoMetadata]:
         """
         将图像帧和音频合成为视频
@@ -221,6 +311,7 @@ class VideoComposer:
             output_path: 输出路径
             add_subtitles: 是否添加字幕
             show_progress: 是否显示进度
+            engine: auto / ffmpeg / moviepy（默认取配置 video.engine）
 
         Returns:
             VideoMetadata 对象
@@ -235,14 +326,167 @@ class VideoComposer:
             frames = frames[:min_len]
             audio_segments = audio_segments[:min_len]
 
+        engine = engine or self.video_config.get("engine", "auto")
+        ffmpeg = find_ffmpeg() if engine in ("auto", "ffmpeg") else None
+        if engine == "ffmpeg" and not ffmpeg:
+            print("❌ 未找到 ffmpeg")
+            return None
+
         if show_progress:
-            print(f"\n🎬 开始合成视频，共 {len(frames)} 个片段")
+            print(f"\n🎬 开始合成视频，共 {len(frames)} 个片段（{'ffmpeg' if ffmpeg else 'moviepy'}）")
             print("-" * 40)
 
         # 创建临时目录
         temp_dir = Path(output_path).parent / "temp_subtitled"
         temp_dir.mkdir(parents=True, exist_ok=True)
 
+        try:
+            if ffmpeg:
+                return self._compose_ffmpeg(
+                    ffmpeg, frames, audio_segments, output_path, temp_dir, add_subtitles, show_progress
+                )
+            return self._compose_moviepy(
+                frames, audio_segments, output_path, temp_dir, add_subtitles, show_progress
+            )
+        finally:
+            # 清理临时文件
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _compose_ffmpeg(
+        self,
+        ffmpeg: str,
+        frames: List,
+        audio_segments: List,
+        output_path: str,
+        temp_dir: Path,
+        add_subtitles: bool,
+        show_progress: bool
+    ) -> Optional[VideoMetadata]:
+        """并行渲染字幕帧，concat demuxer（静态图 + 时长）+ 单条音轨一次编码"""
+        if show_progress:
+            print("  🖼️ 渲染字幕帧...")
+        images = self._normalize_images(self.render_subtitles(frames, temp_dir, add_subtitles), temp_dir)
+        durations = [float(audio.duration_seconds) for audio in audio_segments]
+
+        # concat 列表：最后一张图需要重复一次，否则它的 duration 会被忽略
+        concat_file = temp_dir / "scenes.ffconcat"
+        entries = ["ffconcat version 1.0"]
+        for path, duration in zip(images, durations):
+            entries.append(f"file '{self._concat_escape(path)}'")
+            entries.append(f"duration {duration:.3f}")
+        entries.append(f"file '{self._concat_escape(images[-1])}'")
+        concat_file.write_text("\n".join(entries) + "\n", encoding="utf-8")
+
+        fps = self.video_config.get("fps", 24)
+        codec = self.video_config.get("codec", "libx264")
+        bitrate = self.video_config.get("bitrate", "5000k")
+
+        # 音轨：每段补静音再截到场景时长（与 moviepy 中音频随片段截断一致），缺失的音频用静音代替
+        command = [ffmpeg, "-hide_banner", "-nostdin", "-y",
+                   "-f", "concat", "-safe", "0", "-i", str(concat_file)]
+        # still: 每个场景只编码一帧（可变帧率，时长精确），cfr: 按 fps 重复帧（兼容要求恒定帧率的平台）
+        frame_mode = self.video_config.get("frame_mode", "still")
+        video_filter = "[0:v]format=yuv420p"
+        if frame_mode == "cfr":
+            video_filter += f",fps={fps}"
+        filters = [video_filter + "[v]"]
+        audio_labels = []
+        input_index = 1
+        for k, (audio, duration) in enumerate(zip(audio_segments, durations)):
+            if Path(audio.filepath).exists():
+                command += ["-i", str(audio.filepath)]
+                filters.append(
+                    f"[{input_index}:a]aresample=44100,aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                    f"apad,atrim=0:{duration:.3f},asetpts=N/SR/TB[a{k}]"
+                )
+                input_index += 1
+            else:
+                filters.append(f"anullsrc=r=44100:cl=stereo,atrim=0:{duration:.3f},asetpts=N/SR/TB[a{k}]")
+            audio_labels.append(f"[a{k}]")
+        filters.append(f"{''.join(audio_labels)}concat=n={len(audio_labels)}:v=0:a=1[a]")
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_name(f".{output_file.stem}.partial{output_file.suffix}")
+        command += ["-filter_complex", ";".join(filters), "-map", "[v]", "-map", "[a]",
+                    "-c:v", codec, "-b:v", bitrate]
+        if frame_mode != "cfr":
+            command += ["-fps_mode", "vfr"]
+        if codec == "libx264":
+            command += ["-tune", "stillimage"]
+        command += ["-c:a", "aac", "-movflags", "+faststart", "-f", "mp4", str(tmp_file)]
+
+        if show_progress:
+            print(f"  💾 导出视频: {output_path}")
+
+        proc = subprocess.run(command, capture_output=True, text=True, errors="replace")
+        if proc.returncode != 0:
+            tmp_file.unlink(missing_ok=True)
+            print(f"❌ 视频编码失败: {proc.stderr.strip()[-2000:] or f'ffmpeg 退出码 {proc.returncode}'}")
+            return None
+        os.replace(tmp_file, output_file)
+
+        if show_progress:
+            print("-" * 40)
+            print("✅ 视频合成完成!")
+
+        return VideoMetadata(
+            filepath=output_path,
+            duration_seconds=sum(durations),
+            total_frames=len(frames),
+            resolution=self.video_config.get("resolution", "1920x1080"),
+            fps=fps,
+            has_subtitles=add_subtitles
+        )
+
+    @staticmethod
+    def _normalize_images(images: List[str], temp_dir: Path) -> List[str]:
+        """
+        统一场景图的尺寸与像素格式
+
+        concat 输入中途改变分辨率或像素格式时 ffmpeg 会重建滤镜图，音轨可能被截断，
+        因此尺寸或模式不一致的图先在画布上居中贴好。与 moviepy compose 一致：
+        画布取最大宽高（yuv420p 需要偶数尺寸），空白处和透明区域为黑色。
+        """
+        infos = []
+        for path in images:
+            with Image.open(path) as img:
+                infos.append((img.size, img.mode))
+        width = max(size[0] for size, _ in infos)
+        height = max(size[1] for size, _ in infos)
+        width, height = width + width % 2, height + height % 2
+
+        normalized = []
+        for i, (path, (size, mode)) in enumerate(zip(images, infos)):
+            if size == (width, height) and mode == "RGB":
+                normalized.append(path)
+                continue
+            canvas = Image.new("RGB", (width, height), (0, 0, 0))
+            with Image.open(path) as img:
+                img = img.convert("RGBA")
+                canvas.paste(img, ((width - size[0]) // 2, (height - size[1]) // 2), img)
+            output = temp_dir / f"frame_{i:03d}_canvas.png"
+            canvas.save(output)
+            normalized.append(str(output))
+        return normalized
+
+    @staticmethod
+    def _concat_escape(path: str) -> str:
+        """concat 列表中单引号内的路径转义"""
+        return str(Path(path).resolve()).replace("'", "'\\''")
+
+    def _compose_moviepy(
+        self,
+        frames: List,
+        audio_segments: List,
+        output_path: str,
+        temp_dir: Path,
+        add_subtitles: bool,
+        show_progress: bool
+    ) -> Optional[VideoMetadata]:
+        """moviepy 逐帧合成（原实现）"""
+        from moviepy import ImageClip, AudioFileClip, concatenate_videoclips
+
         clips = []
         total_duration = 0
 
@@ -295,13 +539,6 @@ class VideoComposer:
             logger=None if not show_progress else 'bar'
         )
 
-        # 清理临时文件
-        try:
-            import shutil
-            shutil.rmtree(temp_dir)
-        except Exception:
-            pass
-
         # 关闭所有clips释放资源
         for clip in clips:
             clip.close()
@@ -1,4 +1,6 @@
 # News Sources Module
+from .fetch_engine import FeedFetchEngine, FetchStats
+from .news_store import NewsStore
 from .rss_fetcher import RSSFetcher
 
-__all__ = ["RSSFetcher"]
+__all__ = ["RSSFetcher", "FeedFetchEngine", "FetchStats", "NewsStore"]
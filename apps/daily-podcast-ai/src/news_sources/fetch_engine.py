@@ -0,0 +1,275 @@
+"""
+并发 RSS 抓取引擎
+
+- 线程池并发抓取多个源，共享一个 requests.Session（keep-alive 连接复用）
+- 按主机限速（politeness）：同一主机两次请求间隔不少于 per_host_interval 秒，
+  不同主机之间互不等待（替代原来全局 sleep）
+- HTTP 条件请求：持久化每个 URL 的 ETag / Last-Modified，命中 304 时直接复用
+  上次保存的 feed 内容，不再重新下载
+- 每个源的耗时 / 状态 / 字节数统计（FetchStats）
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class FetchStats:
+    """单个源的抓取统计"""
+    url: str
+    name: str = ""
+    status: str = "pending"  # ok / not_modified / error
+    http_status: Optional[int] = None
+    elapsed: float = 0.0  # 总耗时（含限速等待与重试）
+    wait: float = 0.0  # 限速等待时间
+    bytes: int = 0
+    attempts: int = 0
+    articles: int = 0
+    error: str = ""
+
+    def __str__(self) -> str:
+        label = {"ok": "200", "not_modified": "304", "error": "ERR"}.get(self.status, self.status)
+        return (
+            f"{self.name or self.url:<16} {label:>4} {self.elapsed * 1000:7.0f}ms "
+            f"(等待 {self.wait * 1000:.0f}ms) {self.bytes / 1024:7.1f}KB {self.articles:3d} 篇"
+        )
+
+
+@dataclass
+class FetchResult:
+    """抓取结果：content 为 feed 原文（304 时为上次缓存的内容），失败为 None"""
+    url: str
+    content: Optional[bytes]
+    stats: FetchStats = field(default_factory=lambda: FetchStats(url=""))
+
+
+class HostRateLimiter:
+    """按主机限速：同一主机的请求至少间隔 min_interval 秒"""
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def acquire(self, host: str) -> float:
+        """
+        预约该主机的下一个请求时间点并等待到点
+
+        Returns:
+            实际等待的秒数
+        """
+        if self.min_interval <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FeedStateStore:
+    """
+    条件请求状态持久化
+
+    state 文件（JSON）记录每个 URL 的 ETag / Last-Modified，
+    feed 原文保存在同目录 feeds/<sha1(url)>.xml，用于 304 时复用。
+    """
+
+    def __init__(self, state_path: Path):
+        self.state_path = Path(state_path)
+        self.body_dir = self.state_path.parent / "feeds"
+        self._lock = threading.Lock()
+        self._state: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _body_path(self, url: str) -> Path:
+        return self.body_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.xml"
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """返回条件请求头（仅当本地仍有上次的 feed 原文时）"""
+        with self._lock:
+            entry = self._state.get(url) or {}
+        if not entry or not self._body_path(url).exists():
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        try:
+            return self._body_path(url).read_bytes()
+        except OSError:
+            return None
+
+    def update(self, url: str, response: requests.Response) -> None:
+        """保存 200 响应的验证器与原文"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        with self._lock:
+            if not etag and not last_modified:
+                self._state.pop(url, None)
+                return
+            self._state[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": datetime.now().isoformat(),
+            }
+
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        path = self._body_path(url)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(response.content)
+        os.replace(tmp, path)
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            if url in self._state:
+                self._state[url]["checked_at"] = datetime.now().isoformat()
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._state.pop(url, None)
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(self._state, ensure_ascii=False, indent=2)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+
+class FeedFetchEngine:
+    """并发、按主机限速、支持条件请求的 feed 下载器"""
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        user_agent: str = "DailyPodcastAI/1.0",
+        max_retries: int = 3,
+        max_workers: int = 8,
+        per_host_interval: float = 0.0,
+        retry_backoff: float = 2.0,
+        state_path: Optional[Path] = None,
+    ):
+        self.timeout = timeout
+        self.max_retries = max(1, int(max_retries))
+        self.max_workers = max(1, int(max_workers))
+        self.retry_backoff = retry_backoff
+        self.limiter = HostRateLimiter(per_host_interval)
+        self.state = FeedStateStore(state_path) if state_path else None
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent})
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "FeedFetchEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fetch(self, url: str, name: str = "") -> FetchResult:
+        """下载单个 feed（含限速、重试、条件请求）"""
+        stats = FetchStats(url=url, name=name)
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+
+        conditional = self.state.conditional_headers(url) if self.state else {}
+        content: Optional[bytes] = None
+
+        for attempt in range(self.max_retries):
+            stats.attempts = attempt + 1
+            stats.wait += self.limiter.acquire(host)
+            try:
+                response = self.session.get(url, headers=conditional, timeout=self.timeout)
+                stats.http_status = response.status_code
+
+                if response.status_code == 304 and conditional:
+                    content = self.state.load_body(url)
+                    if content is not None:
+                        self.state.touch(url)
+                        stats.status = "not_modified"
+                        break
+                    # 本地原文丢失：放弃条件请求重新下载
+                    self.state.forget(url)
+                    conditional = {}
+                    continue
+
+                response.raise_for_status()
+                content = response.content
+                stats.bytes = len(content)
+                stats.status = "ok"
+                if self.state:
+                    self.state.update(url, response)
+                break
+
+            except requests.RequestException as e:
+                stats.error = str(e)
+                print(f"  ❌ 请求失败 {name or url} (尝试 {attempt + 1}/{self.max_retries}): {e}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_backoff)
+
+        if content is None:
+            stats.status = "error"
+        stats.elapsed = time.perf_counter() - start
+        return FetchResult(url=url, content=content, stats=stats)
+
+    def map(
+        self,
+        jobs: list[tuple[str, str]],
+        handler: Callable[[FetchResult], object],
+    ) -> list[object]:
+        """
+        并发下载 jobs=[(url, name), ...] 并在工作线程中调用 handler 处理结果
+
+        Returns:
+            按 jobs 顺序排列的 handler 返回值
+        """
+        def run(job: tuple[str, str]) -> object:
+            url, name = job
+            return handler(self.fetch(url, name))
+
+        workers = min(self.max_workers, max(1, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-fetch") as pool:
+            results = list(pool.map(run, jobs))
+
+        if self.state:
+            self.state.save()
+        return results
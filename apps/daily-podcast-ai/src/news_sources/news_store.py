@@ -0,0 +1,285 @@
+"""
+新闻缓存存储（SQLite）
+
+替代原来的 cache/YYYY-MM-DD-news.json：
+- 只追加写入，每小时收集只插入新文章，不再整文件重写
+- 按「收集日期 + 规范化链接哈希 / 标题哈希」唯一索引去重，O(1)
+- 支持按收集日期或跨天时间范围查询（跨天结果再按哈希去重）
+- compact() 清理过期天数的数据并回收空间
+- 首次使用时自动导入旧的 JSON 缓存文件（每个文件只导入一次）
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .rss_fetcher import Article
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "cache" / "news.db"
+
+# 规范化链接时丢弃的跟踪参数
+_TRACKING_PARAMS = {"f", "from", "spm", "ref", "source", "share", "share_from"}
+_TITLE_NOISE = re.compile(r"[\s\W_]+", re.UNICODE)
+_LEGACY_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})-news\.json$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    collected_at TEXT NOT NULL,
+    link_hash TEXT,
+    title_hash TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    published TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_news_day_link ON news(day, link_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_news_day_title ON news(day, title_hash);
+CREATE INDEX IF NOT EXISTS ix_news_collected_at ON news(collected_at);
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+def normalize_link(link: str) -> str:
+    """规范化链接：小写协议/主机，去掉跟踪参数、fragment 和末尾斜杠"""
+    link = (link or "").strip()
+    if not link:
+        return ""
+    parts = urlsplit(link)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题：全角转半角、小写、去掉空白和标点"""
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    return _TITLE_NOISE.sub("", text)
+
+
+def _hash(text: str) -> Optional[str]:
+    if not text:
+        return None
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def link_hash(link: str) -> Optional[str]:
+    return _hash(normalize_link(link))
+
+
+def title_hash(title: str) -> str:
+    # 标题规范化后为空（纯标点）时退回原文，避免所有此类标题互相冲突
+    return _hash(normalize_title(title) or (title or "").strip()) or ""
+
+
+class NewsStore:
+    """按天分区、哈希去重的新闻缓存"""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        初始化存储
+
+        Args:
+            db_path: SQLite 文件路径，默认 cache/news.db
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "NewsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ========== 写入 ==========
+
+    def add(self, news_list: Iterable[dict], day: str) -> int:
+        """
+        追加新闻（同一天内按链接或标题去重）
+
+        Args:
+            news_list: 新闻字典列表（title/summary/link/source/category/published/collected_at）
+            day: 收集日期 YYYY-MM-DD
+
+        Returns:
+            实际新增的条数
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                day,
+                news.get("collected_at") or now,
+                link_hash(news.get("link", "")),
+                title_hash(news["title"]),
+                news["title"],
+                news.get("summary") or "",
+                news.get("link") or "",
+                news.get("source") or "",
+                news.get("category") or "",
+                news.get("published"),
+            )
+            for news in news_list
+            if news.get("title")
+        ]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO news "
+                "(day, collected_at, link_hash, title_hash, title, summary, link, source, category, published) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self.conn.total_changes - before
+
+    def contains(self, day: str, link: str = "", title: str = "") -> bool:
+        """检查某天是否已收集过该链接或标题"""
+        row = self.conn.execute(
+            "SELECT 1 FROM news WHERE day = ? AND (link_hash = ? OR title_hash = ?) LIMIT 1",
+            (day, link_hash(link), title_hash(title)),
+        ).fetchone()
+        return row is not None
+
+    # ========== 查询 ==========
+
+    def count(self, day: Optional[str] = None) -> int:
+        if day is None:
+            return self.conn.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM news WHERE day = ?", (day,)).fetchone()[0]
+
+    def days(self) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT day FROM news ORDER BY day")]
+
+    def query(
+        self,
+        day: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[dict]:
+        """
+        查询新闻（按收集时间排序）
+
+        Args:
+            day: 收集日期（与 start/end 二选一）
+            start: 收集时间下限（含）
+            end: 收集时间上限（不含）
+
+        Returns:
+            新闻字典列表；跨天查询时同一新闻只保留最早收集的一条
+        """
+        sql = "SELECT * FROM news"
+        clauses, params = [], []
+        if day is not None:
+            clauses.append("day = ?")
+            params.append(day)
+        if start is not None:
+            clauses.append("collected_at >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("collected_at < ?")
+            params.append(end.isoformat())
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY collected_at, id"
+
+        seen: set[str] = set()
+        results = []
+        for row in self.conn.execute(sql, params):
+            keys = [k for k in (row["link_hash"], row["title_hash"]) if k]
+            if any(k in seen for k in keys):
+                continue
+            seen.update(keys)
+            results.append({
+                "title": row["title"],
+                "summary": row["summary"],
+                "link": row["link"],
+                "source": row["source"],
+                "category": row["category"],
+                "published": row["published"],
+                "collected_at": row["collected_at"],
+            })
+        return results
+
+    def load_articles(
+        self,
+        day: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[Article]:
+        """查询并转换为 Article 对象"""
+        return [
+            Article(
+                title=news["title"],
+                summary=news["summary"],
+                link=news["link"],
+                source=news["source"],
+                category=news["category"],
+                published=datetime.fromisoformat(news["published"]) if news.get("published") else None,
+            )
+            for news in self.query(day=day, start=start, end=end)
+        ]
+
+    # ========== 维护 ==========
+
+    def compact(self, keep_days: int) -> int:
+        """
+        删除 keep_days 天之前收集的新闻并回收空间
+
+        Returns:
+            删除的条数
+        """
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+        with self.conn:
+            deleted = self.conn.execute("DELETE FROM news WHERE day < ?", (cutoff,)).rowcount
+        if deleted:
+            self.conn.execute("VACUUM")
+        return deleted
+
+    def import_json_cache(self, cache_dir: Path) -> int:
+        """
+        导入旧版 cache/YYYY-MM-DD-news.json（每个文件只导入一次）
+
+        Returns:
+            新增的条数
+        """
+        imported = {r[0] for r in self.conn.execute("SELECT name FROM imported_files")}
+        added = 0
+        for path in sorted(Path(cache_dir).glob("*-news.json")):
+            match = _LEGACY_FILE.match(path.name)
+            if not match or path.name in imported:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    news_list = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  ⚠️ 跳过无法读取的缓存文件 {path.name}: {e}")
+                continue
+            added += self.add(news_list, day=match.group(1))
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO imported_files (name, imported_at) VALUES (?, ?)",
+                    (path.name, datetime.now().isoformat()),
+                )
+        return added
@@ -3,16 +3,20 @@ RSS 新闻获取模块
 从配置的 RSS 源获取新闻文章
 """
 
+import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import feedparser
-import requests
 import yaml
 
+from .fetch_engine import FeedFetchEngine, FetchResult, FetchStats
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+
 
 @dataclass
 class Article:
@@ -23,6 +27,8 @@ class Article:
     source: str
     category: str
     published: Optional[datetime] = None
+    coverage: int = 1  # 报道该事件的文章数（近似重复聚类后）
+    coverage_sources: list[str] = field(default_factory=list)
 
     def __str__(self) -> str:
         return f"[{self.source}] {self.title}"
@@ -41,6 +47,8 @@ class RSSFetcher:
         self.config = self._load_config(config_path)
         self.fetch_config = self.config.get("fetch", {})
         self.filters = self.config.get("filters", {})
+        self.last_stats: list[FetchStats] = []
+        self._engine: Optional[FeedFetchEngine] = None
 
     def _load_config(self, config_path: str) -> dict:
         """加载配置文件"""
@@ -61,40 +69,61 @@ class RSSFetcher:
         sources = self.config.get("sources", {}).get("rss", [])
         return [s for s in sources if s.get("enabled", False)]
 
-    def _fetch_feed(self, url: str) -> Optional[feedparser.FeedParserDict]:
+    def _get_engine(self) -> FeedFetchEngine:
+        """创建（或复用）共享 session 的抓取引擎"""
+        if self._engine is None:
+            state_path = None
+            if self.fetch_config.get("conditional_get", True):
+                state_path = Path(self.fetch_config.get("state_file", "cache/feed_state.json"))
+                if not state_path.is_absolute():
+                    state_path = Path(__file__).parent.parent.parent / state_path
+
+            self._engine = FeedFetchEngine(
+                timeout=self.fetch_config.get("timeout", 30),
+                user_agent=self.fetch_config.get("user_agent", "DailyPodcastAI/1.0"),
+                max_retries=self.fetch_config.get("max_retries", 3),
+                max_workers=self.fetch_config.get("max_workers", 8),
+                per_host_interval=self.fetch_config.get(
+                    "per_host_interval", self.fetch_config.get("request_interval", 2)
+                ),
+                state_path=state_path,
+            )
+        return self._engine
+
+    def _parse_feed(self, content: Optional[bytes]) -> Optional[feedparser.FeedParserDict]:
         """
-        获取单个 RSS feed
+        解析 feed 原文
 
         Args:
-            url: RSS feed URL
+            content: feed 原文
 
         Returns:
             解析后的 feed 或 None（失败时）
         """
-        timeout = self.fetch_config.get("timeout", 30)
-        user_agent = self.fetch_config.get("user_agent", "DailyPodcastAI/1.0")
-        max_retries = self.fetch_config.get("max_retries", 3)
+        if content is None:
+            return None
 
-        headers = {"User-Agent": user_agent}
+        feed = feedparser.parse(content)
+        if feed.bozo and not feed.entries:
+            print(f"  ⚠️ RSS 解析警告: {feed.bozo_exception}")
+            return None
+        return feed
 
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=headers, timeout=timeout)
-                response.raise_for_status()
-                feed = feedparser.parse(response.content)
-
-                if feed.bozo and not feed.entries:
-                    print(f"  ⚠️ RSS 解析警告: {feed.bozo_exception}")
-                    continue
-
-                return feed
+    def _fetch_feed(self, url: str) -> Optional[feedparser.FeedParserDict]:
+        """
+        获取单个 RSS feed
 
-            except requests.RequestException as e:
-                print(f"  ❌ 请求失败 (尝试 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
+        Args:
+            url: RSS feed URL
 
-        return None
+        Returns:
+            解析后的 feed 或 None（失败时）
+        """
+        engine = self._get_engine()
+        result = engine.fetch(url)
+        if engine.state:
+            engine.state.save()
+        return self._parse_feed(result.content)
 
     def _parse_published_date(self, entry: dict) -> Optional[datetime]:
         """解析发布时间"""
@@ -149,28 +178,12 @@ class RSSFetcher:
         cutoff = datetime.now() - timedelta(hours=hours)
         return article.published >= cutoff
 
-    def fetch_from_source(self, source: dict) -> list[Article]:
-        """
-        从单个源获取文章
-
-        Args:
-            source: 源配置字典
-
-        Returns:
-            文章列表
-        """
+    def _extract_articles(self, source: dict, feed: feedparser.FeedParserDict) -> list[Article]:
+        """从解析后的 feed 中提取并过滤文章"""
         name = source.get("name", "未知")
-        url = source.get("url", "")
         category = source.get("category", "综合")
         max_articles = self.filters.get("max_articles_per_source", 10)
 
-        print(f"📰 获取 {name} ...")
-
-        feed = self._fetch_feed(url)
-        if not feed:
-            print(f"  ❌ 获取失败")
-            return []
-
         articles = []
         for entry in feed.entries[:max_articles * 2]:  # 获取更多以便过滤
             title = entry.get("title", "").strip()
@@ -181,8 +194,7 @@ class RSSFetcher:
                 continue
 
             # 清理 HTML 标签（简单处理）
-            import re
-            summary = re.sub(r"<[^>]+>", "", summary)
+            summary = _HTML_TAG.sub("", summary)
             summary = summary[:500]  # 限制摘要长度
 
             article = Article(
@@ -201,9 +213,43 @@ class RSSFetcher:
             if len(articles) >= max_articles:
                 break
 
+        return articles
+
+    def fetch_from_source(self, source: dict) -> list[Article]:
+        """
+        从单个源获取文章
+
+        Args:
+            source: 源配置字典
+
+        Returns:
+            文章列表
+        """
+        name = source.get("name", "未知")
+        print(f"📰 获取 {name} ...")
+
+        feed = self._fetch_feed(source.get("url", ""))
+        if not feed:
+            print(f"  ❌ 获取失败")
+            return []
+
+        articles = self._extract_articles(source, feed)
         print(f"  ✅ 获取 {len(articles)} 篇文章")
         return articles
 
+    def _print_stats(self, wall_time: float) -> None:
+        """打印每个源的抓取耗时统计"""
+        for stats in self.last_stats:
+            print(f"  {stats}")
+
+        total = sum(s.elapsed for s in self.last_stats)
+        not_modified = sum(1 for s in self.last_stats if s.status == "not_modified")
+        failed = sum(1 for s in self.last_stats if s.status == "error")
+        print(
+            f"⏱️ 抓取耗时 {wall_time:.2f}s（各源累计 {total:.2f}s），"
+            f"304 未变化 {not_modified} 个，失败 {failed} 个"
+        )
+
     def fetch_all(self) -> list[Article]:
         """
         从所有启用的源获取文章
@@ -219,16 +265,28 @@ class RSSFetcher:
         print(f"🚀 开始获取新闻，共 {len(sources)} 个源")
         print("-" * 40)
 
-        all_articles = []
-        request_interval = self.fetch_config.get("request_interval", 2)
-
-        for i, source in enumerate(sources):
-            articles = self.fetch_from_source(source)
-            all_articles.extend(articles)
+        start = time.perf_counter()
+        by_url = {s.get("url", ""): s for s in sources}
+
+        def handle(result: FetchResult) -> tuple[FetchStats, list[Article]]:
+            # 在抓取线程中直接解析，解析与其他源的网络等待重叠
+            feed = self._parse_feed(result.content)
+            articles = self._extract_articles(by_url[result.url], feed) if feed else []
+            result.stats.articles = len(articles)
+            if feed is None and result.stats.status != "error":
+                result.stats.status = "error"
+                result.stats.error = "解析失败"
+            return result.stats, articles
+
+        results = self._get_engine().map(
+            [(s.get("url", ""), s.get("name", "未知")) for s in sources],
+            handle,
+        )
 
-            # 请求间隔
-            if i < len(sources) - 1:
-                time.sleep(request_interval)
+        # 按配置顺序合并，保证结果稳定
+        all_articles = [article for _, articles in results for article in articles]
+        self.last_stats = [stats for stats, _ in results]
+        self._print_stats(time.perf_counter() - start)
 
         # 去重（基于标题）
         seen_titles = set()
@@ -0,0 +1,4 @@
+# Pipeline Module
+from .stage_pipeline import Stage, StageError, StagePipeline, PipelineReport, file_fingerprint
+
+__all__ = ["Stage", "StageError", "StagePipeline", "PipelineReport", "file_fingerprint"]
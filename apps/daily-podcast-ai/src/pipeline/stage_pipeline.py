@@ -0,0 +1,374 @@
+"""
+可断点续跑的阶段流水线
+把一次生成拆成声明式的阶段 DAG，每个阶段的产物落盘并记录内容哈希
+
+- 阶段键 = 阶段名 + 版本 + 参数 + 上游产物哈希，键不变且输出文件未改动时直接复用产物
+- 没有依赖关系的阶段并行执行（如封面与语音合成）
+- 单个阶段失败只阻断其下游，其余分支照常完成
+- 每次运行写出各阶段的状态与耗时报告
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+MANIFEST_VERSION = 1
+
+
+class StageError(Exception):
+    """阶段执行失败（原因已由阶段自己打印，不需要 traceback）"""
+
+
+@dataclass
+class Stage:
+    """流水线中的一个阶段"""
+    name: str
+    func: Callable[[dict], dict]  # 接收 {上游阶段名: 产物}，返回可 JSON 序列化的产物
+    deps: tuple = ()
+    params: dict = field(default_factory=dict)  # 影响产物的参数，参与阶段键计算
+    files: Optional[Callable[[dict], list]] = None  # 从产物中取出输出文件路径
+    complete: Optional[Callable[[dict], bool]] = None  # 返回 False 时产物照常下传但不写检查点
+    cacheable: bool = True
+    version: int = 1  # 阶段逻辑变化时递增，使旧检查点失效
+    label: str = ""
+
+
+@dataclass
+class StageRecord:
+    """单个阶段的运行记录"""
+    name: str
+    label: str
+    status: str = "pending"  # done / cached / partial / failed / blocked / pending
+    seconds: float = 0.0
+    key: Optional[str] = None
+    hash: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("done", "cached", "partial")
+
+
+@dataclass
+class PipelineReport:
+    """一次运行的结果"""
+    records: dict  # 阶段名 -> StageRecord（按声明顺序）
+    artifacts: dict  # 阶段名 -> 产物
+    seconds: float = 0.0
+
+    def ok(self, name: str) -> bool:
+        record = self.records.get(name)
+        return bool(record and record.ok)
+
+    def get(self, name: str, default=None):
+        return self.artifacts.get(name, default)
+
+    def to_dict(self) -> dict:
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "total_seconds": round(self.seconds, 3),
+            "stages": [
+                {**asdict(record), "seconds": round(record.seconds, 3)}
+                for record in self.records.values()
+            ],
+        }
+
+
+def canonical_hash(data) -> str:
+    """对可 JSON 序列化的数据计算稳定的 sha256"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Optional[str]) -> Optional[dict]:
+    """
+    外部输入文件（配置、背景音乐等）的指纹，用作阶段参数
+
+    只取大小与修改时间，文件不存在时返回 None。
+    """
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class StagePipeline:
+    """
+    阶段 DAG 执行器
+
+    检查点保存在 checkpoint_dir/<阶段名>.json，记录阶段键、产物、产物哈希和输出文件指纹。
+    checkpoint_dir 为 None 时不读写任何文件（演示模式）。
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        checkpoint_dir: Optional[str] = None,
+        max_workers: int = 4,
+        force: Iterable[str] = (),
+        verbose: bool = False
+    ):
+        """
+        Args:
+            stages: 阶段列表（依赖必须在列表中）
+            checkpoint_dir: 检查点目录
+            max_workers: 并行执行的阶段数上限
+            force: 强制重跑的阶段名，"all" 表示全部
+            verbose: 阶段异常时打印 traceback
+        """
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"阶段重复: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"阶段 {stage.name} 的依赖不存在: {missing}")
+        self._order = self._topological_order()
+
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.max_workers = max(1, max_workers)
+        force = set(force)
+        unknown = force - set(self.stages) - {"all"}
+        if unknown:
+            raise ValueError(f"未知阶段: {sorted(unknown)}")
+        self.force = set(self.stages) if "all" in force else force
+        self.verbose = verbose
+        self._lock = threading.Lock()
+
+    def _topological_order(self) -> list:
+        order, state = [], {}
+
+        def visit(name: str, path: tuple) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"阶段存在循环依赖: {' -> '.join(path + (name,))}")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def _required(self, targets: Optional[Iterable[str]]) -> set:
+        if targets is None:
+            return set(self.stages)
+        required, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"未知阶段: {name}")
+            if name not in required:
+                required.add(name)
+                stack.extend(self.stages[name].deps)
+        return required
+
+    # ========== 检查点 ==========
+
+    def _manifest_path(self, name: str) -> Path:
+        return self.checkpoint_dir / f"{name}.json"
+
+    def _stage_key(self, stage: Stage, dep_hashes: dict) -> str:
+        return canonical_hash({
+            "manifest": MANIFEST_VERSION,
+            "stage": stage.name,
+            "version": stage.version,
+            "params": stage.params,
+            "deps": dep_hashes,
+        })
+
+    @staticmethod
+    def _file_entries(paths: list) -> dict:
+        entries = {}
+        for path in paths:
+            stat = os.stat(path)
+            entries[str(path)] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": file_sha256(path),
+            }
+        return entries
+
+    @staticmethod
+    def _files_unchanged(entries: dict) -> bool:
+        for path, entry in entries.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != entry["size"]:
+                return False
+            # 大小和修改时间都没变时不再读文件内容
+            if stat.st_mtime_ns != entry["mtime_ns"] and file_sha256(path) != entry["sha256"]:
+                return False
+        return True
+
+    def _load_checkpoint(self, stage: Stage, key: str) -> Optional[dict]:
+        if not self.checkpoint_dir or not stage.cacheable or stage.name in self.force:
+            return None
+        path = self._manifest_path(stage.name)
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if manifest.get("key") != key or not self._files_unchanged(manifest.get("files", {})):
+            return None
+        return manifest
+
+    def _save_checkpoint(self, stage: Stage, key: str, artifact: dict, files: dict, digest: str,
+                         seconds: float) -> None:
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._manifest_path(stage.name)
+        tmp = path.with_suffix(".json.tmp")
+        manifest = {
+            "stage": stage.name,
+            "key": key,
+            "hash": digest,
+            "seconds": round(seconds, 3),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "files": files,
+            "artifact": artifact,
+        }
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # ========== 执行 ==========
+
+    def _execute(self, stage: Stage, inputs: dict, key: str, record: StageRecord) -> tuple:
+        """
+        在工作线程中执行阶段并写检查点，返回 (状态, 产物)，失败时产物为 None
+
+        record.status 由主线程在取回结果后设置：主线程按状态判断下游是否就绪，
+        状态先于产物和哈希可见时下游会读到不完整的上游结果。
+        """
+        start = time.perf_counter()
+        try:
+            artifact = stage.func(inputs)
+            if artifact is None:
+                artifact = {}
+            paths = [p for p in (stage.files(artifact) if stage.files else []) if p]
+            files = self._file_entries(paths)
+            digest = canonical_hash({"artifact": artifact, "files": {p: e["sha256"] for p, e in files.items()}})
+            complete = stage.complete(artifact) if stage.complete else True
+            seconds = time.perf_counter() - start
+            if self.checkpoint_dir and stage.cacheable and complete:
+                self._save_checkpoint(stage, key, artifact, files, digest, seconds)
+            record.hash = digest
+            return ("done" if complete else "partial"), artifact
+        except StageError as e:
+            record.error = str(e)
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+            with self._lock:
+                print(f"  ❌ 阶段 {stage.label or stage.name} 出错: {record.error}")
+                if self.verbose:
+                    traceback.print_exc()
+        finally:
+            record.seconds = time.perf_counter() - start
+        return "failed", None
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> PipelineReport:
+        """
+        执行流水线
+
+        Args:
+            targets: 只执行这些阶段及其依赖，None 表示全部
+
+        Returns:
+            PipelineReport
+        """
+        required = self._required(targets)
+        records = {
+            name: StageRecord(name=name, label=self.stages[name].label or name)
+            for name in self.stages if name in required
+        }
+        artifacts, hashes = {}, {}
+        pending = [name for name in self._order if name in required]
+        running = {}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                progressed = False
+                for name in list(pending):
+                    stage = self.stages[name]
+                    dep_records = [records[d] for d in stage.deps]
+                    if any(r.status in ("failed", "blocked") for r in dep_records):
+                        records[name].status = "blocked"
+                        pending.remove(name)
+                        progressed = True
+                        continue
+                    if not all(r.ok for r in dep_records):
+                        continue
+
+                    pending.remove(name)
+                    progressed = True
+                    key = self._stage_key(stage, {d: hashes[d] for d in stage.deps})
+                    records[name].key = key
+
+                    manifest = self._load_checkpoint(stage, key)
+                    if manifest is not None:
+                        records[name].status = "cached"
+                        records[name].hash = manifest["hash"]
+                        artifacts[name] = manifest["artifact"]
+                        hashes[name] = manifest["hash"]
+                        print(f"⏩ {records[name].label}: 检查点未变化，跳过")
+                        continue
+
+                    inputs = {d: artifacts[d] for d in stage.deps}
+                    running[pool.submit(self._execute, stage, inputs, key, records[name])] = name
+
+                if progressed:
+                    continue
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    records[name].status, artifact = future.result()
+                    if artifact is not None:
+                        artifacts[name] = artifact
+                        hashes[name] = records[name].hash
+
+        return PipelineReport(records=records, artifacts=artifacts, seconds=time.perf_counter() - start)
+
+    @staticmethod
+    def print_report(report: PipelineReport) -> None:
+        """打印各阶段状态与耗时"""
+        icons = {"done": "✅", "cached": "⏩", "partial": "⚠️", "failed": "❌", "blocked": "⛔", "pending": "…"}
+        print("\n⏱️  阶段耗时")
+        print("-" * 40)
+        for record in report.records.values():
+            suffix = f"  {record.error}" if record.error else ""
+            print(f"  {icons.get(record.status, '?')} {record.label:<10} {record.status:<8} {record.seconds:8.2f}s{suffix}")
+        print(f"  合计 {report.seconds:.2f}s")
+
+    @staticmethod
+    def save_report(report: PipelineReport, path: str) -> str:
+        """把运行报告写成 JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return str(path)
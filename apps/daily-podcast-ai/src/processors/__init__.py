@@ -2,5 +2,6 @@
 from .summarizer import ArticleSummarizer
 from .script_writer import ScriptWriter
 from .news_ranker import NewsRanker
+from .news_dedup import NewsDeduplicator, dedupe_articles
 
-__all__ = ["ArticleSummarizer", "ScriptWriter", "NewsRanker"]
+__all__ = ["ArticleSummarizer", "ScriptWriter", "NewsRanker", "NewsDeduplicator", "dedupe_articles"]
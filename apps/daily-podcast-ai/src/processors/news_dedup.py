@@ -0,0 +1,236 @@
+"""
+近似重复新闻聚类模块
+同一事件被多家媒体转载时合并为一个故事簇，保留最佳代表文章，
+并把簇大小作为「报道热度」（coverage）信号交给 NewsRanker
+
+算法：shingled Jaccard
+- 分词：中文按单字、英文/数字按单词，取相邻 token 的 2-gram 作为 shingle
+- 候选：前缀过滤（prefix filtering）。shingle 按全局文档频率从低到高排序，
+  Jaccard >= t 的两篇文章必然在各自前 |x| - ceil(t·|x|) + 1 个 shingle 中有交集，
+  因此只需为前缀建立倒排索引，常见 shingle 几乎不产生候选
+- 校验：对候选对计算精确 Jaccard（标题 + 摘要，或仅标题）
+- 聚类：相似度超过阈值的文章用并查集合并（可传递），已在同一簇的候选直接跳过
+
+纯 Python 实现，几千篇文章在百毫秒量级完成
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import add
+from typing import Any, Optional
+
+_TOKEN = re.compile(r"[a-z0-9]+|[\u3400-\u9fff\uf900-\ufaff]")
+
+# 参与相似度计算的摘要长度
+SUMMARY_CHARS = 120
+
+
+def _get(article: Any, key: str, default: Any = None) -> Any:
+    if isinstance(article, dict):
+        return article.get(key, default)
+    return getattr(article, key, default)
+
+
+def _set(article: Any, key: str, value: Any) -> None:
+    if isinstance(article, dict):
+        article[key] = value
+    else:
+        setattr(article, key, value)
+
+
+def shingles(text: str) -> set[str]:
+    """
+    生成 shingle 集合（中英文混合）
+
+    Args:
+        text: 原文
+
+    Returns:
+        相邻 token 2-gram（直接拼接）集合；只有一个 token 时返回该 token
+    """
+    tokens = _TOKEN.findall(unicodedata.normalize("NFKC", text or "").lower())
+    if len(tokens) < 2:
+        return set(tokens)
+    return set(map(add, tokens, tokens[1:]))
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+@dataclass
+class StoryCluster:
+    """一个新闻故事簇"""
+    representative: Any
+    members: list = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def sources(self) -> list[str]:
+        seen = []
+        for article in self.members:
+            source = _get(article, "source", "")
+            if source and source not in seen:
+                seen.append(source)
+        return seen
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 保留较小下标作为根，簇顺序与首次出现顺序一致
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def _quality(article: Any, index: int) -> tuple:
+    """代表文章的优先级：摘要更完整 > 有链接 > 发布更早（首发）> 出现更早"""
+    summary = _get(article, "summary", "") or ""
+    published = _get(article, "published")
+    published_key = published.isoformat() if hasattr(published, "isoformat") else (published or "9999")
+    return (-min(len(summary), SUMMARY_CHARS), not _get(article, "link"), published_key, index)
+
+
+def _similar_pairs(sets: list[set[str]], threshold: float):
+    """
+    前缀过滤生成候选对 (i, j)，|sets[j]| <= |sets[i]|
+
+    探测用前缀长度 |x| - ceil(t·|x|) + 1，索引用更短的前缀
+    |x| - ceil(2t/(1+t)·|x|) + 1（PPJoin），两者配合不会漏掉 Jaccard >= t 的文章对
+    """
+    df = Counter(chain.from_iterable(sets))
+    # 全局顺序：文档频率升序；只出现一次的 shingle 排在最前，且不可能与其他文章共享
+    vocab = sorted(df, key=df.__getitem__)
+    rank = dict(zip(vocab, range(len(vocab))))
+    singletons = Counter(df.values())[1]
+
+    index_ratio = 2 * threshold / (1 + threshold)
+    index: dict[int, list[int]] = {}
+    # 按集合大小递增处理，索引中的文章总是不大于当前文章（短索引前缀成立的前提）
+    for i in sorted(range(len(sets)), key=lambda k: len(sets[k])):
+        tokens = sets[i]
+        if not tokens:
+            continue
+        size = len(tokens)
+        ranks = sorted(map(rank.__getitem__, tokens))
+        start = bisect_left(ranks, singletons)
+        probe_len = size - math.ceil(threshold * size) + 1
+        index_len = size - math.ceil(index_ratio * size) + 1
+
+        seen: set[int] = set()
+        for r in ranks[start:probe_len]:
+            posting = index.get(r)
+            if posting is None:
+                continue
+            for j in posting:
+                if j not in seen:
+                    seen.add(j)
+                    # 长度过滤：|y| >= t·|x|
+                    if len(sets[j]) >= threshold * size:
+                        yield i, j
+        for r in ranks[start:index_len]:
+            index.setdefault(r, []).append(i)
+
+
+class NewsDeduplicator:
+    """近似重复新闻聚类器"""
+
+    def __init__(self, threshold: float = 0.5, title_threshold: float = 0.7):
+        """
+        初始化聚类器
+
+        Args:
+            threshold: 标题 + 摘要 shingle 的 Jaccard 阈值
+            title_threshold: 仅标题的 Jaccard 阈值（标题高度相似即视为同一事件）
+        """
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+
+    def cluster(self, articles: list) -> list[StoryCluster]:
+        """
+        聚类文章
+
+        Args:
+            articles: 文章列表（Article 对象或字典）
+
+        Returns:
+            故事簇列表（按簇内首篇文章的原始顺序）
+        """
+        n = len(articles)
+        if n == 0:
+            return []
+
+        titles = [shingles(_get(a, "title", "") or "") for a in articles]
+        docs = [
+            titles[i] | shingles((_get(a, "summary", "") or "")[:SUMMARY_CHARS])
+            for i, a in enumerate(articles)
+        ]
+
+        uf = _UnionFind(n)
+        for sets, threshold in ((docs, self.threshold), (titles, self.title_threshold)):
+            for i, j in _similar_pairs(sets, threshold):
+                if uf.find(i) != uf.find(j) and jaccard(sets[i], sets[j]) >= threshold:
+                    uf.union(i, j)
+
+        groups: dict[int, list[int]] = {}
+        for i in range(n):
+            groups.setdefault(uf.find(i), []).append(i)
+
+        clusters = []
+        for root in sorted(groups):
+            indices = groups[root]
+            best = min(indices, key=lambda i: _quality(articles[i], i))
+            clusters.append(StoryCluster(
+                representative=articles[best],
+                members=[articles[i] for i in indices],
+            ))
+        return clusters
+
+    def dedupe(self, articles: list) -> list:
+        """
+        去除近似重复，返回每个簇的代表文章
+
+        代表文章上会写入 coverage（簇大小）和 coverage_sources（报道来源）
+
+        Args:
+            articles: 文章列表（Article 对象或字典）
+
+        Returns:
+            代表文章列表
+        """
+        results = []
+        for cluster in self.cluster(articles):
+            article = cluster.representative
+            _set(article, "coverage", cluster.size)
+            _set(article, "coverage_sources", cluster.sources)
+            results.append(article)
+        return results
+
+
+def dedupe_articles(articles: list, threshold: Optional[float] = None) -> list:
+    """便捷函数：使用默认参数去除近似重复新闻"""
+    dedup = NewsDeduplicator() if threshold is None else NewsDeduplicator(threshold=threshold)
+    return dedup.dedupe(articles)
@@ -52,6 +52,7 @@ class NewsRanker:
 2. 新颖性：是否有新的进展或突破
 3. 可理解性：是否容易向大众解释
 4. 时效性：是否是最新发生的事件
+5. 报道热度：标注「N 家媒体报道」的事件被多家媒体同时报道，通常更重要
 
 新闻列表：
 {articles_text}
@@ -105,12 +106,16 @@ class NewsRanker:
                 title = article["title"]
                 summary = article["summary"][:150]
                 source = article["source"]
+                outlets = len(article.get("coverage_sources") or [])
             else:
                 title = article.title
                 summary = article.summary[:150]
                 source = article.source
+                outlets = len(getattr(article, "coverage_sources", None) or [])
 
-            lines.append(f"{i}. 【{source}】{title}")
+            # coverage 是簇内文章数，同一媒体可能发了多篇，「家媒体」按不同来源计
+            heat = f"（{outlets} 家媒体报道）" if outlets > 1 else ""
+            lines.append(f"{i}. 【{source}】{title}{heat}")
             lines.append(f"   {summary}...")
             lines.append("")
 
@@ -3,12 +3,32 @@
 使用 AI 对新闻文章进行摘要和改写，使其适合播客播报
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 from openai import OpenAI
 
+# 改写规则（prompt）变更时递增，使旧缓存失效
+PROMPT_VERSION = "v1"
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "summaries"
+
+SYSTEM_PROMPT = "你是专业的科技新闻播报员，擅长将书面新闻改写为口语化的播报文本。"
+
+REWRITE_RULES = """要求：
+1. 语言自然流畅，适合朗读
+2. 保持信息准确，但用口语化表达
+3. 控制在 100-150 字以内
+4. 不要使用"据报道"、"根据消息"等书面语开头
+5. 直接陈述事实，语气专业但亲切"""
+
 
 @dataclass
 class SummarizedArticle:
@@ -20,16 +40,93 @@ class SummarizedArticle:
     category: str
 
 
+class SummaryCache:
+    """
+    播报文本磁盘缓存
+
+    键为 (文章链接哈希, 模型, prompt 版本)，每条缓存一个 JSON 文件，
+    重新生成同一天的节目时只需为新文章调用 API
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    @staticmethod
+    def key(article, model: str) -> str:
+        from news_sources.news_store import link_hash, title_hash
+
+        article_hash = link_hash(article.link) or title_hash(article.title)
+        raw = f"{article_hash}|{model}|{PROMPT_VERSION}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f).get("podcast_text")
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def set(self, key: str, article, model: str, podcast_text: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "title": article.title,
+                "link": article.link,
+                "model": model,
+                "prompt_version": PROMPT_VERSION,
+                "podcast_text": podcast_text,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+class RateLimiter:
+    """线程安全的请求速率限制（每分钟最多 requests_per_minute 次）"""
+
+    def __init__(self, requests_per_minute: float = 0):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class ArticleSummarizer:
     """文章摘要生成器"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o",
+        use_cache: bool = True,
+        cache_dir: Optional[Path] = None,
+        max_workers: int = 4,
+        pack_size: int = 5,
+        requests_per_minute: float = 60,
+    ):
         """
         初始化摘要生成器
 
         Args:
             api_key: OpenAI API 密钥（默认从环境变量读取）
             model: 使用的模型
+            use_cache: 是否使用磁盘缓存（cache/summaries/）
+            cache_dir: 缓存目录
+            max_workers: 批量模式的并发请求数
+            pack_size: 批量模式每个请求打包的文章数（1 表示逐篇请求）
+            requests_per_minute: 每分钟最多请求数（0 表示不限制）
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -37,17 +134,16 @@ class ArticleSummarizer:
 
         self.client = OpenAI(api_key=self.api_key)
         self.model = model
+        self.cache = SummaryCache(cache_dir) if use_cache else None
+        self.max_workers = max(1, max_workers)
+        self.pack_size = max(1, pack_size)
+        self.rate_limiter = RateLimiter(requests_per_minute)
 
     def _create_podcast_prompt(self, title: str, summary: str, source: str) -> str:
         """创建播客文本生成的 prompt"""
         return f"""你是一位专业的科技新闻播报员。请将以下新闻改写为适合播客播报的口语化文本。
 
-要求：
-1. 语言自然流畅，适合朗读
-2. 保持信息准确，但用口语化表达
-3. 控制在 100-150 字以内
-4. 不要使用"据报道"、"根据消息"等书面语开头
-5. 直接陈述事实，语气专业但亲切
+{REWRITE_RULES}
 
 新闻标题：{title}
 来源：{source}
@@ -55,6 +151,73 @@ class ArticleSummarizer:
 
 请直接输出改写后的播报文本，不要添加任何前缀或说明："""
 
+    def _create_packed_prompt(self, articles: list) -> str:
+        """创建多篇文章打包改写的 prompt（JSON 输出）"""
+        blocks = [
+            f"[{i}] 新闻标题：{a.title}\n来源：{a.source}\n原文摘要：{a.summary}"
+            for i, a in enumerate(articles, 1)
+        ]
+        news_text = "\n\n".join(blocks)
+        return f"""你是一位专业的科技新闻播报员。请将以下 {len(articles)} 条新闻分别改写为适合播客播报的口语化文本。
+
+{REWRITE_RULES}
+
+{news_text}
+
+请返回 JSON，每条新闻一项，index 与上面的编号对应：
+{{"items": [{{"index": 1, "podcast_text": "改写后的播报文本"}}]}}
+
+只返回 JSON，不要其他文字。"""
+
+    def _make_result(self, article, podcast_text: str) -> SummarizedArticle:
+        return SummarizedArticle(
+            title=article.title,
+            summary=article.summary,
+            podcast_text=podcast_text,
+            source=article.source,
+            category=article.category
+        )
+
+    def _cached(self, article) -> Optional[str]:
+        if not self.cache:
+            return None
+        return self.cache.get(SummaryCache.key(article, self.model))
+
+    def _store(self, article, podcast_text: str) -> None:
+        if self.cache and podcast_text:
+            self.cache.set(SummaryCache.key(article, self.model), article, self.model, podcast_text)
+
+    def _summarize_packed(self, articles: list) -> dict[int, str]:
+        """
+        一次请求改写多篇文章
+
+        Returns:
+            {文章下标(0-based): 播报文本}，解析失败或缺失的文章不在结果中
+        """
+        self.rate_limiter.acquire()
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": self._create_packed_prompt(articles)}
+            ],
+            temperature=0.7,
+            max_tokens=300 * len(articles),
+            response_format={"type": "json_object"},
+        )
+
+        result = json.loads(response.choices[0].message.content)
+        texts = {}
+        for item in result.get("items", []):
+            try:
+                index = int(item["index"]) - 1
+                text = str(item["podcast_text"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < len(articles) and text:
+                texts[index] = text
+        return texts
+
     def summarize_article(self, article) -> SummarizedArticle:
         """
         对单篇文章进行摘要和改写
@@ -65,6 +228,10 @@ class ArticleSummarizer:
         Returns:
             SummarizedArticle 对象
         """
+        cached = self._cached(article)
+        if cached:
+            return self._make_result(article, cached)
+
         prompt = self._create_podcast_prompt(
             article.title,
             article.summary,
@@ -72,10 +239,11 @@ class ArticleSummarizer:
         )
 
         try:
+            self.rate_limiter.acquire()
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "你是专业的科技新闻播报员，擅长将书面新闻改写为口语化的播报文本。"},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
@@ -83,14 +251,9 @@ class ArticleSummarizer:
             )
 
             podcast_text = response.choices[0].message.content.strip()
+            self._store(article, podcast_text)
 
-            return SummarizedArticle(
-                title=article.title,
-                summary=article.summary,
-                podcast_text=podcast_text,
-                source=article.source,
-                category=article.category
-            )
+            return self._make_result(article, podcast_text)
 
         except Exception as e:
             print(f"  ⚠️ OpenAI 摘要失败: {e}，尝试切换到 Gemini...")
@@ -107,7 +270,7 @@ class ArticleSummarizer:
                 model = genai.GenerativeModel("gemini-1.5-flash")
                 
                 # 添加系统提示词到 prompt 中，因为 Gemini generate_content 主要接受 prompt
-                full_prompt = f"你是专业的科技新闻播报员，擅长将书面新闻改写为口语化的播报文本。\n\n{prompt}"
+                full_prompt = f"{SYSTEM_PROMPT}\n\n{prompt}"
                 
                 response = model.generate_content(full_prompt)
                 podcast_text = response.text.strip()
@@ -138,24 +301,68 @@ class ArticleSummarizer:
         """
         批量处理文章摘要
 
+        已缓存的文章直接复用；其余文章按 pack_size 打包为 JSON 请求，
+        在 max_workers 个线程中并发执行（受 requests_per_minute 限速）。
+        打包请求失败或结果缺失的文章回退到逐篇处理。
+
         Args:
             articles: Article 对象列表
             show_progress: 是否显示进度
 
         Returns:
-            SummarizedArticle 对象列表
+            SummarizedArticle 对象列表（顺序与输入一致）
         """
         if show_progress:
             print(f"\n🤖 开始 AI 内容处理，共 {len(articles)} 篇文章")
             print("-" * 40)
 
-        summarized = []
-        for i, article in enumerate(articles, 1):
-            if show_progress:
-                print(f"  [{i}/{len(articles)}] 处理: {article.title[:30]}...")
-
-            result = self.summarize_article(article)
-            summarized.append(result)
+        texts: dict[int, str] = {}
+        for i, article in enumerate(articles):
+            cached = self._cached(article)
+            if cached:
+                texts[i] = cached
+
+        pending = [i for i in range(len(articles)) if i not in texts]
+        if show_progress and texts:
+            print(f"  ♻️ 命中缓存 {len(texts)} 篇，需处理 {len(pending)} 篇")
+
+        chunks = [pending[k:k + self.pack_size] for k in range(0, len(pending), self.pack_size)]
+        done = 0
+        lock = threading.Lock()
+
+        def run(chunk: list[int]) -> dict[int, SummarizedArticle]:
+            nonlocal done
+            chunk_articles = [articles[i] for i in chunk]
+            packed: dict[int, str] = {}
+            if len(chunk) > 1:
+                try:
+                    packed = self._summarize_packed(chunk_articles)
+                except Exception as e:
+                    print(f"  ⚠️ 批量改写失败: {e}，改为逐篇处理")
+
+            results = {}
+            for k, i in enumerate(chunk):
+                if k in packed:
+                    self._store(articles[i], packed[k])
+                    results[i] = self._make_result(articles[i], packed[k])
+                else:
+                    results[i] = self.summarize_article(articles[i])
+
+            with lock:
+                done += len(chunk)
+                if show_progress:
+                    print(f"  [{done}/{len(pending)}] 完成: {chunk_articles[0].title[:30]}...")
+            return results
+
+        results: dict[int, SummarizedArticle] = {
+            i: self._make_result(articles[i], text) for i, text in texts.items()
+        }
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                for chunk_results in pool.map(run, chunks):
+                    results.update(chunk_results)
+
+        summarized = [results[i] for i in range(len(articles))]
 
         if show_progress:
             print("-" * 40)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+行程 Markdown v2 解析微基准
+
+用仓库测试里的苏州 / 按日期切分样例生成 v2 Markdown，测量共享单遍解析（itinerary_markdown_v2.parse）
+及其消费者（validate / rationalize 解析 / Day 编号 / POI 护栏）的单次耗时：
+- cold：每次迭代清空解析缓存（等价于每个消费者各自重新扫描一次）
+- warm：同一文档在一次请求内被多个消费者复用同一份解析结果
+
+用法（在 python-ai-service 目录下）：
+    python scripts/bench_itinerary_markdown_parser.py --iterations 2000 --scale 10
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services import itinerary_markdown_v2  # noqa: E402
+from src.services.markdown_converter import (  # noqa: E402
+    _extract_day_numbers_from_v2,
+    _fallback_convert_to_itinerary_markdown_v2,
+    _parse_itinerary_markdown_v2,
+    _rationalize_itinerary_markdown_v2,
+)
+from src.services.plan_generation import _extract_pois_by_day_from_markdown  # noqa: E402
+from tests.fakes.itinerary_samples import (  # noqa: E402
+    DATE_SPLIT_FULL_DATES_TEXT,
+    DATE_SPLIT_MONTH_DAY_TEXT,
+    SUZHOU_SAMPLE_TEXT,
+)
+
+
+def _samples(scale: int) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for name, text in [
+        ("suzhou", SUZHOU_SAMPLE_TEXT),
+        ("date_full", DATE_SPLIT_FULL_DATES_TEXT),
+        ("date_month_day", DATE_SPLIT_MONTH_DAY_TEXT),
+    ]:
+        out[name] = _rationalize_itinerary_markdown_v2(_fallback_convert_to_itinerary_markdown_v2(text))
+
+    # Long itinerary: repeat the Suzhou days `scale` times with renumbered headings.
+    body = out["suzhou"].split("\n## ", 1)[1].split("\n> ", 1)[0]
+    days = ["## " + d for d in ("\n## " + body).split("\n## ") if d.strip()]
+    long_days = []
+    for i in range(scale):
+        for j, d in enumerate(days):
+            n = i * len(days) + j + 1
+            long_days.append(d.replace(d.split("（", 1)[0], f"## Day {n}", 1))
+    out[f"suzhou_x{scale}"] = "# 行程安排\n> 版本: v2\n\n" + "\n".join(long_days)
+    return out
+
+
+def _consume(md: str) -> None:
+    itinerary_markdown_v2.validate(md)
+    _parse_itinerary_markdown_v2(md)
+    _extract_day_numbers_from_v2(md)
+    _extract_pois_by_day_from_markdown(md)
+
+
+def _bench(fn, md: str, iterations: int, *, cold: bool) -> float:
+    clear = itinerary_markdown_v2._parse_cached.cache_clear
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            clear()
+        fn(md)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Itinerary markdown v2 parser micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--scale", type=int, default=10, help="repeat factor for the long itinerary sample")
+    args = parser.parse_args()
+
+    print(f"{'sample':<16} {'lines':>6} {'parse(cold)':>12} {'consumers(cold)':>16} {'consumers(warm)':>16}  (µs/op)")
+    for name, md in _samples(args.scale).items():
+        parse_cold = _bench(itinerary_markdown_v2.parse, md, args.iterations, cold=True)
+        all_cold = _bench(_consume, md, args.iterations, cold=True)
+        all_warm = _bench(_consume, md, args.iterations, cold=False)
+        print(f"{name:<16} {md.count(chr(10)):>6} {parse_cold:>12.1f} {all_cold:>16.1f} {all_warm:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+离线压测：python-ai-service 吞吐 / 延迟基准（无需真实 OpenAI / 高德 / RabbitMQ / Java）
+
+所有外部依赖由 tests/fakes 下的本地替身提供：
+- FakeOpenAIServer：chat-completions（可配置延迟，按 prompt 返回合法 JSON，支持 stream）
+- FakeAmapServer：地理编码 / POI 搜索
+- InMemoryBroker：进程内 AMQP（替换 aio_pika.connect_robust）
+- FakeCallbackSink：Java 回调接收端
+
+场景：
+- workflow     run_generation_workflow（V1 结构化输入，3 套方案）
+- workflow_v2  run_generation_workflow（V2 Markdown 输入，1 套方案）
+- stream       stream_generation_workflow（额外报告首个方案耗时）
+- convert      POST /api/v1/markdown/convert（ASGI 进程内调用）
+- optimize     POST /api/v1/markdown/optimize
+- consumer     MQ 消费者：发布 → 生成 → 回调送达（延迟按消息计）
+
+输出 p50/p95/p99 延迟、requests/s、每请求 LLM / 高德调用数。
+
+用法（在 python-ai-service 目录下）：
+    python scripts/bench_load.py --scenario workflow --requests 200 --concurrency 20 --openai-latency 0.5
+    python scripts/bench_load.py --scenario consumer --requests 100 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.models.config import settings  # noqa: E402
+from tests.fakes.amap_server import FakeAmapServer  # noqa: E402
+from tests.fakes.amqp_broker import InMemoryBroker  # noqa: E402
+from tests.fakes.callback_sink import FakeCallbackSink  # noqa: E402
+from tests.fakes.openai_server import FakeOpenAIServer  # noqa: E402
+
+SCENARIOS = ("workflow", "workflow_v2", "stream", "convert", "optimize", "consumer")
+
+_MARKDOWN = (
+    "# 苏州两日团建\n"
+    "Day1: 拙政园-苏州博物馆-平江路\n"
+    "Day2: 寒山寺-金鸡湖\n"
+    "人数：{people}人，预算 2 万\n"
+)
+
+
+def _v1_message(i: int) -> dict[str, Any]:
+    return {
+        "plan_request_id": f"bench_req_{i}",
+        "user_id": "bench_user",
+        "people_count": 10 + i,  # distinct inputs so the AI cache never short-circuits
+        "budget_min": 10000,
+        "budget_max": 20000,
+        "start_date": "2026-05-01",
+        "end_date": "2026-05-02",
+        "departure_city": "上海市",
+        "destination": "苏州",
+        "preferences": {"activity_types": ["team_building"], "accommodation_level": "standard"},
+    }
+
+
+def _v2_message(i: int) -> dict[str, Any]:
+    return {
+        "plan_request_id": f"bench_req_{i}",
+        "user_id": "bench_user",
+        "markdown_content": _MARKDOWN.format(people=10 + i),
+    }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+async def _run_closed_loop(
+    requests: int,
+    concurrency: int,
+    call: Callable[[int], Awaitable[None]],
+) -> tuple[list[float], int, float]:
+    """Run `call(i)` for i in range(requests) with at most `concurrency` in flight."""
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as exc:  # noqa: BLE001 - counted and reported
+                errors += 1
+                logging.getLogger(__name__).debug("request %d failed: %s", i, exc)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def _bench_workflow(args: argparse.Namespace, extra: dict[str, list[float]]) -> tuple[list[float], int, float]:
+    from src.langgraph.workflow import run_generation_workflow
+
+    build = _v2_message if args.scenario == "workflow_v2" else _v1_message
+
+    async def call(i: int) -> None:
+        state = await run_generation_workflow(build(i))
+        if state.get("error"):
+            raise RuntimeError(state["error"])
+
+    return await _run_closed_loop(args.requests, args.concurrency, call)
+
+
+async def _bench_stream(args: argparse.Namespace, extra: dict[str, list[float]]) -> tuple[list[float], int, float]:
+    from src.langgraph.workflow import stream_generation_workflow
+
+    first_plan: list[float] = extra.setdefault("time_to_first_plan", [])
+
+    async def call(i: int) -> None:
+        start = time.perf_counter()
+        seen_first = False
+        async for event in stream_generation_workflow(_v1_message(i)):
+            if event["event"] == "plan" and not seen_first:
+                seen_first = True
+                first_plan.append(time.perf_counter() - start)
+            elif event["event"] == "error":
+                raise RuntimeError(event["data"]["error"])
+
+    return await _run_closed_loop(args.requests, args.concurrency, call)
+
+
+async def _bench_markdown_endpoint(args: argparse.Namespace, extra: dict[str, list[float]]) -> tuple[list[float], int, float]:
+    import httpx
+
+    from src.main import app
+
+    path = "/api/v1/markdown/convert" if args.scenario == "convert" else "/api/v1/markdown/optimize"
+    field = "parsed_content" if args.scenario == "convert" else "markdown_content"
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+
+        async def call(i: int) -> None:
+            resp = await client.post(path, json={field: _MARKDOWN.format(people=10 + i)})
+            resp.raise_for_status()
+
+        return await _run_closed_loop(args.requests, args.concurrency, call)
+
+
+async def _bench_consumer(
+    args: argparse.Namespace,
+    extra: dict[str, list[float]],
+    sink: FakeCallbackSink,
+) -> tuple[list[float], int, float]:
+    from src.services import mq_consumer
+
+    broker = InMemoryBroker()
+    mq_consumer.aio_pika.connect_robust = broker.connect_robust  # type: ignore[assignment]
+    settings.mq_worker_concurrency = args.concurrency
+    settings.mq_prefetch_count = max(args.concurrency * 2, settings.mq_prefetch_count)
+
+    await mq_consumer.start_mq_consumer()
+    published_at: dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        for i in range(args.requests):
+            message = _v1_message(i)
+            published_at[message["plan_request_id"]] = time.perf_counter()
+            await broker.publish(settings.mq_exchange, settings.mq_routing_key, json.dumps(message).encode("utf-8"))
+        await broker.wait_acked(args.requests, timeout=max(60.0, args.requests * 5.0))
+    finally:
+        elapsed = time.perf_counter() - start
+        await mq_consumer.stop_mq_consumer()
+
+    latencies = [
+        sink.delivered_at[req_id] - t0 for req_id, t0 in published_at.items() if req_id in sink.delivered_at
+    ]
+    # Undelivered callbacks (dead-lettered or timed out) count as errors.
+    return latencies, args.requests - len(latencies), elapsed
+
+
+def _report(
+    args: argparse.Namespace,
+    latencies: list[float],
+    errors: int,
+    elapsed: float,
+    *,
+    llm_calls: int,
+    amap_calls: int,
+    extra: dict[str, list[float]],
+) -> None:
+    values = sorted(latencies)
+    n = max(1, args.requests)
+    print(f"scenario={args.scenario} requests={args.requests} concurrency={args.concurrency} "
+          f"openai_latency={args.openai_latency}s amap_latency={args.amap_latency}s cache={'on' if args.cache else 'off'}")
+    print(f"  wall time       : {elapsed:.2f}s")
+    print(f"  throughput      : {args.requests / elapsed if elapsed > 0 else 0.0:.2f} req/s")
+    print(
+        "  latency (ms)    : "
+        f"p50={_percentile(values, 50) * 1000:.0f} p95={_percentile(values, 95) * 1000:.0f} "
+        f"p99={_percentile(values, 99) * 1000:.0f} max={(values[-1] if values else 0.0) * 1000:.0f}"
+    )
+    for name, samples in extra.items():
+        s = sorted(samples)
+        print(f"  {name} (ms): p50={_percentile(s, 50) * 1000:.0f} p95={_percentile(s, 95) * 1000:.0f}")
+    print(f"  LLM calls/req   : {llm_calls / n:.2f}")
+    print(f"  Amap calls/req  : {amap_calls / n:.2f}")
+    print(f"  errors          : {errors}")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    with (
+        FakeOpenAIServer(latency_seconds=args.openai_latency) as openai_server,
+        FakeAmapServer(latency_seconds=args.amap_latency) as amap_server,
+        FakeCallbackSink(latency_seconds=args.callback_latency) as sink,
+    ):
+        settings.openai_api_key = "sk-bench-fake-openai"
+        settings.openai_base_url = openai_server.api_base_url
+        settings.enable_ai_mock = False
+        settings.ai_cache_enabled = args.cache
+        settings.markdown_cache_enabled = args.cache
+        settings.amap_enabled = True
+        settings.amap_api_key = "bench-key"
+        settings.amap_base_url = amap_server.base_url
+        settings.java_callback_url = sink.url
+
+        extra: dict[str, list[float]] = {}
+        if args.scenario in ("workflow", "workflow_v2"):
+            latencies, errors, elapsed = await _bench_workflow(args, extra)
+        elif args.scenario == "stream":
+            latencies, errors, elapsed = await _bench_stream(args, extra)
+        elif args.scenario in ("convert", "optimize"):
+            latencies, errors, elapsed = await _bench_markdown_endpoint(args, extra)
+        else:
+            latencies, errors, elapsed = await _bench_consumer(args, extra, sink)
+
+        _report(
+            args,
+            latencies,
+            errors,
+            elapsed,
+            llm_calls=openai_server.calls,
+            amap_calls=amap_server.count(),
+            extra=extra,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load benchmark for python-ai-service")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="workflow")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--openai-latency", type=float, default=0.5, help="fake OpenAI per-call latency (s)")
+    parser.add_argument("--amap-latency", type=float, default=0.05, help="fake Amap per-call latency (s)")
+    parser.add_argument("--callback-latency", type=float, default=0.01, help="fake Java callback latency (s)")
+    parser.add_argument("--cache", action="store_true", help="keep AI/markdown result caches enabled")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
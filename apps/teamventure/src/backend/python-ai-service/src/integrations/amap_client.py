@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Any
@@ -30,6 +31,52 @@ class AmapGeocode:
     location: str | None
 
 
+# Process-wide caches: AmapClient is instantiated per request, so caches must outlive it.
+# Geocode and POI searches are cached separately so a (city, keywords) search is reused
+# across different activity-type / accommodation combinations.
+_geocode_cache = TTLCache[str, AmapGeocode](
+    ttl_seconds=int(settings.amap_cache_ttl_seconds),
+    max_size=int(settings.amap_cache_max_size),
+)
+_poi_cache = TTLCache[str, list[AmapPoi]](
+    ttl_seconds=int(settings.amap_cache_ttl_seconds),
+    max_size=int(settings.amap_cache_max_size) * 8,
+)
+
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client(base_url: str, timeout: float) -> httpx.AsyncClient:
+    """Long-lived keep-alive client shared by all AmapClient instances on this event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if (
+        _http_client is None
+        or _http_client.is_closed
+        or _http_client_loop is not loop
+        or str(_http_client.base_url).rstrip("/") != base_url
+    ):
+        _http_client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=int(settings.amap_max_connections),
+                max_keepalive_connections=int(settings.amap_max_connections),
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_shared_amap_client() -> None:
+    """Close the shared connection pool (call on application shutdown)."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
 class AmapClient:
     """
     Minimal Amap (高德地图) Web Service client for destination enrichment.
@@ -41,10 +88,7 @@ class AmapClient:
         self._base_url = settings.amap_base_url.rstrip("/")
         self._key = settings.amap_api_key
         self._timeout = float(settings.amap_timeout_seconds)
-        self._cache = TTLCache[str, dict[str, Any]](
-            ttl_seconds=int(settings.amap_cache_ttl_seconds),
-            max_size=int(settings.amap_cache_max_size),
-        )
+        self._max_concurrency = max(1, int(settings.amap_max_concurrency))
 
     def is_enabled(self) -> bool:
         return self._enabled
@@ -62,54 +106,76 @@ class AmapClient:
         if not dest:
             return None
 
-        cache_key = f"amap:dest:{dest}:a={','.join(activity_types)}:h={accommodation_level}"
-        cached = self._cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         try:
-            async with httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout) as client:
-                geocode = await self._geocode(client, address=dest)
-                destination_city = self._normalize_city_name(
-                    (geocode.city or geocode.province or geocode.district) if geocode else None
-                )
-                city_hint = destination_city or (geocode.district or geocode.province or dest) if geocode else dest
-
-                categories: list[tuple[str, str]] = [
-                    ("团建拓展", f"{dest} 团建 拓展 基地"),
-                    ("热门景点", f"{dest} 景点"),
-                ]
-                if "leisure" in activity_types:
-                    categories.append(("休闲度假", f"{dest} 度假 温泉"))
-                if "culture" in activity_types:
-                    categories.append(("文化体验", f"{dest} 博物馆 古镇"))
-                if "sports" in activity_types:
-                    categories.append(("运动挑战", f"{dest} 徒步 漂流 攀岩"))
-
-                categories.append(("餐饮推荐", f"{dest} 特色餐厅"))
-
-                pois_by_category: dict[str, list[dict[str, Any]]] = {}
-                for label, keywords in categories:
-                    pois = await self._place_text(client, keywords=keywords, city=city_hint)
-                    pois_by_category[label] = [self._poi_to_dict(p) for p in pois]
-
-                result: dict[str, Any] = {
-                    "provider": "amap",
-                    "destination": dest,
-                    "destination_city": destination_city,
-                    "geocode": geocode.__dict__ if geocode else None,
-                    "pois": pois_by_category,
-                    "notes": [
-                        "POI 来自高德 WebService 文本搜索，可能存在重名/缺少营业信息；生成时优先引用名称+大致区域。",
-                        "行程安排应尽量围绕同一片区，减少跨城移动。",
-                    ],
-                }
-                self._cache.set(cache_key, result)
-                return result
+            client = _get_http_client(self._base_url, self._timeout)
+            geocode = await self._geocode_cached(client, address=dest)
+            destination_city = self._normalize_city_name(
+                (geocode.city or geocode.province or geocode.district) if geocode else None
+            )
+            city_hint = destination_city or (geocode.district or geocode.province or dest) if geocode else dest
+
+            categories: list[tuple[str, str]] = [
+                ("团建拓展", f"{dest} 团建 拓展 基地"),
+                ("热门景点", f"{dest} 景点"),
+            ]
+            if "leisure" in activity_types:
+                categories.append(("休闲度假", f"{dest} 度假 温泉"))
+            if "culture" in activity_types:
+                categories.append(("文化体验", f"{dest} 博物馆 古镇"))
+            if "sports" in activity_types:
+                categories.append(("运动挑战", f"{dest} 徒步 漂流 攀岩"))
+
+            categories.append(("餐饮推荐", f"{dest} 特色餐厅"))
+
+            # Category searches are independent: fan out with a bounded concurrency limit.
+            semaphore = asyncio.Semaphore(self._max_concurrency)
+
+            async def search(keywords: str) -> list[AmapPoi]:
+                async with semaphore:
+                    return await self._place_text_cached(client, keywords=keywords, city=city_hint)
+
+            results = await asyncio.gather(*(search(keywords) for _, keywords in categories))
+            pois_by_category: dict[str, list[dict[str, Any]]] = {
+                label: [self._poi_to_dict(p) for p in pois]
+                for (label, _), pois in zip(categories, results)
+            }
+
+            return {
+                "provider": "amap",
+                "destination": dest,
+                "destination_city": destination_city,
+                "geocode": geocode.__dict__ if geocode else None,
+                "pois": pois_by_category,
+                "notes": [
+                    "POI 来自高德 WebService 文本搜索，可能存在重名/缺少营业信息；生成时优先引用名称+大致区域。",
+                    "行程安排应尽量围绕同一片区，减少跨城移动。",
+                ],
+            }
         except Exception as e:
             logger.warning("amap enrichment failed: dest=%s err=%s", dest, e)
             return None
 
+    async def _geocode_cached(self, client: httpx.AsyncClient, *, address: str) -> AmapGeocode | None:
+        return await _geocode_cache.get_or_load(
+            f"amap:geo:{address}",
+            lambda: self._geocode(client, address=address),
+        )
+
+    async def _place_text_cached(
+        self, client: httpx.AsyncClient, *, keywords: str, city: str
+    ) -> list[AmapPoi]:
+        pois = await _poi_cache.get_or_load(
+            f"amap:poi:{city}:{keywords}:n={int(settings.amap_max_pois_per_category)}",
+            lambda: self._place_text_or_none(client, keywords=keywords, city=city),
+        )
+        return pois or []
+
+    async def _place_text_or_none(
+        self, client: httpx.AsyncClient, *, keywords: str, city: str
+    ) -> list[AmapPoi] | None:
+        # Empty results are not cached (may be a transient quota/status error).
+        return await self._place_text(client, keywords=keywords, city=city) or None
+
     async def _geocode(self, client: httpx.AsyncClient, *, address: str) -> AmapGeocode | None:
         r = await client.get(
             "/v3/geocode/geo",
@@ -1,29 +1,192 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
 from src.models.config import settings
+from src.utils.mq_metrics import (
+    CALLBACK_ATTEMPTS_TOTAL,
+    CALLBACK_DEAD_LETTERS_TOTAL,
+    CALLBACK_QUEUE_DEPTH,
+)
+from src.utils.workflow_metrics import time_stage
 
 logger = logging.getLogger(__name__)
 
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Keep-alive client shared by all callbacks on this event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=float(settings.java_callback_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=int(settings.java_callback_workers) * 2,
+                max_keepalive_connections=int(settings.java_callback_workers),
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_shared_java_client() -> None:
+    """Close the shared connection pool (call on application shutdown)."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 class JavaCallbackClient:
-    def __init__(self) -> None:
+    def __init__(self, http_client: httpx.AsyncClient | None = None) -> None:
         self._url = settings.java_callback_url
         self._secret = settings.java_internal_secret
+        self._http_client = http_client
 
     async def post_generated_plans(self, payload: dict[str, Any]) -> None:
         headers = {"X-Internal-Secret": self._secret}
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(self._url, json=payload, headers=headers)
-            if resp.status_code >= 400:
-                logger.error(
-                    "Java callback failed: status=%s body=%s",
-                    resp.status_code,
-                    resp.text,
-                )
-                resp.raise_for_status()
+        client = self._http_client or _get_http_client()
+        resp = await client.post(self._url, json=payload, headers=headers)
+        if resp.status_code >= 400:
+            logger.error(
+                "Java callback failed: status=%s body=%s",
+                resp.status_code,
+                resp.text,
+            )
+            resp.raise_for_status()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+@dataclass
+class CallbackJob:
+    payload: dict[str, Any]
+    mode: str = "v1"
+    # Called once the callback is delivered (e.g. ack the source MQ message).
+    on_delivered: Callable[[], Awaitable[None]] | None = None
+    # Called with a reason when the callback is given up on; must persist the payload.
+    on_dead_letter: Callable[[str], Awaitable[None]] | None = None
+
+
+class CallbackDispatcher:
+    """
+    Outbound callback queue: a bounded asyncio.Queue drained by a few workers that post
+    to the Java service with exponential-backoff retries (transport errors, 429, 5xx).
+
+    `submit` blocks when the queue is full, which backs pressure up into the MQ workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: JavaCallbackClient | None = None,
+        workers: int | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+        retry_max_seconds: float | None = None,
+        max_queue_size: int | None = None,
+    ) -> None:
+        self._client = client or JavaCallbackClient()
+        self._workers_count = max(1, int(workers or settings.java_callback_workers))
+        self._max_attempts = max(1, int(max_attempts or settings.java_callback_max_attempts))
+        self._retry_base = float(
+            settings.java_callback_retry_base_seconds if retry_base_seconds is None else retry_base_seconds
+        )
+        self._retry_max = float(
+            settings.java_callback_retry_max_seconds if retry_max_seconds is None else retry_max_seconds
+        )
+        self._queue: asyncio.Queue[CallbackJob] = asyncio.Queue(
+            maxsize=int(max_queue_size or settings.java_callback_queue_max_size)
+        )
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"java-callback-{i}") for i in range(self._workers_count)
+        ]
+
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def join(self) -> None:
+        """Wait until every submitted job has been delivered or dead-lettered."""
+        await self._queue.join()
+
+    async def submit(self, job: CallbackJob) -> None:
+        await self._queue.put(job)
+        CALLBACK_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            CALLBACK_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                await self._deliver(job)
+            except Exception:
+                logger.exception("Callback worker error plan_request_id=%s", job.payload.get("plan_request_id"))
+            finally:
+                self._queue.task_done()
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        delay = min(self._retry_max, self._retry_base * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+    async def _deliver(self, job: CallbackJob) -> None:
+        plan_request_id = job.payload.get("plan_request_id")
+        with time_stage("callback", mode=job.mode):
+            for attempt in range(1, self._max_attempts + 1):
+                try:
+                    await self._client.post_generated_plans(job.payload)
+                except Exception as exc:
+                    retryable = _is_retryable(exc)
+                    if not retryable or attempt == self._max_attempts:
+                        CALLBACK_ATTEMPTS_TOTAL.labels(status="failed").inc()
+                        reason = "retries_exhausted" if retryable else "non_retryable"
+                        logger.error(
+                            "Java callback gave up plan_request_id=%s attempts=%d reason=%s err=%s",
+                            plan_request_id,
+                            attempt,
+                            reason,
+                            exc,
+                        )
+                        CALLBACK_DEAD_LETTERS_TOTAL.labels(reason=reason).inc()
+                        if job.on_dead_letter is not None:
+                            await job.on_dead_letter(reason)
+                        return
+
+                    CALLBACK_ATTEMPTS_TOTAL.labels(status="retry").inc()
+                    delay = self._backoff_seconds(attempt)
+                    logger.warning(
+                        "Java callback failed, retrying plan_request_id=%s attempt=%d in %.1fs err=%s",
+                        plan_request_id,
+                        attempt,
+                        delay,
+                        exc,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
 
+                CALLBACK_ATTEMPTS_TOTAL.labels(status="success").inc()
+                if job.on_delivered is not None:
+                    await job.on_delivered()
+                return
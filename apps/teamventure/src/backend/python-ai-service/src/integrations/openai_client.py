@@ -1,22 +1,173 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
+import httpx
 from openai import AsyncOpenAI
 
 from src.models.config import settings
-from src.utils.llm_metrics import record_llm_call
+from src.utils.json_stream import JsonArrayItemStream
+from src.utils.llm_metrics import LLM_INFLIGHT_REQUESTS, LLM_QUEUED_REQUESTS, record_llm_call
 
 logger = logging.getLogger(__name__)
 
 
+class _TokenBucket:
+    """Async token bucket refilled at `requests_per_minute`; burst is capped by `capacity`."""
+
+    def __init__(self, *, requests_per_minute: int, capacity: int) -> None:
+        self._rate = requests_per_minute / 60.0
+        self._capacity = float(max(1, capacity))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+
+
+class _ModelLimiter:
+    """Per-model concurrency cap (semaphore) plus optional requests-per-minute token bucket."""
+
+    def __init__(self, *, model: str, max_concurrency: int, requests_per_minute: int) -> None:
+        self._model = model
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._bucket = (
+            _TokenBucket(requests_per_minute=requests_per_minute, capacity=max_concurrency)
+            if requests_per_minute > 0
+            else None
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        queued = LLM_QUEUED_REQUESTS.labels(model=self._model)
+        inflight = LLM_INFLIGHT_REQUESTS.labels(model=self._model)
+
+        queued.inc()
+        try:
+            await self._semaphore.acquire()
+            try:
+                if self._bucket is not None:
+                    await self._bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            queued.dec()
+
+        inflight.inc()
+        try:
+            yield
+        finally:
+            inflight.dec()
+            self._semaphore.release()
+
+
+class _OpenAIPool:
+    """
+    Process-wide AsyncOpenAI client backed by one keep-alive httpx pool.
+
+    Bound to the event loop it was created on (httpx pools and asyncio primitives
+    cannot be shared across loops).
+    """
+
+    def __init__(self, *, api_key: str, base_url: str) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.api_key = api_key
+        self.base_url = base_url
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(settings.openai_max_connections),
+                max_keepalive_connections=int(settings.openai_max_keepalive_connections),
+                keepalive_expiry=float(settings.openai_keepalive_expiry_seconds),
+            ),
+            timeout=httpx.Timeout(float(settings.openai_timeout_seconds), connect=10.0),
+        )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url or None, http_client=self._http_client)
+        self._limiters: dict[str, _ModelLimiter] = {}
+
+    def limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            overrides = settings.openai_model_concurrency or {}
+            limiter = _ModelLimiter(
+                model=model,
+                max_concurrency=int(overrides.get(model, settings.openai_max_concurrency)),
+                requests_per_minute=int(settings.openai_requests_per_minute),
+            )
+            self._limiters[model] = limiter
+        return limiter
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+
+_pool: _OpenAIPool | None = None
+# Close tasks of replaced pools (kept referenced so they are not garbage-collected mid-close).
+_closing: set[asyncio.Future[None]] = set()
+
+
+def _get_pool(api_key: str) -> _OpenAIPool:
+    global _pool
+    loop = asyncio.get_running_loop()
+    base_url = settings.openai_base_url
+    if _pool is None or _pool.loop is not loop or _pool.api_key != api_key or _pool.base_url != base_url:
+        if _pool is not None:
+            _schedule_close(_pool)
+        _pool = _OpenAIPool(api_key=api_key, base_url=base_url)
+    return _pool
+
+
+def _schedule_close(pool: _OpenAIPool) -> None:
+    """Close a replaced pool's httpx connections on the loop that owns them."""
+    if pool.loop.is_closed():
+        # Its transports went away with the loop; nothing left to release.
+        return
+    if pool.loop is asyncio.get_running_loop():
+        future: asyncio.Future[None] = pool.loop.create_task(pool.aclose())
+    elif pool.loop.is_running():
+        future = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(pool.aclose(), pool.loop))
+    else:
+        return
+    _closing.add(future)
+    future.add_done_callback(_on_pool_closed)
+
+
+def _on_pool_closed(future: asyncio.Future[None]) -> None:
+    _closing.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Closing replaced OpenAI client failed: %s", future.exception())
+
+
+async def close_shared_openai_client() -> None:
+    """Close the shared connection pool (call on application shutdown)."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None and pool.loop is asyncio.get_running_loop():
+        await pool.aclose()
+
+
 class OpenAIClient:
     """
     Minimal OpenAI client wrapper.
 
+    Instances are cheap: all of them share one pooled AsyncOpenAI client and a
+    per-model concurrency limiter (see `_get_pool`).
+
     Note: This repo may run without valid OPENAI_API_KEY in local dev; callers should
     gracefully fall back to deterministic stub generation when keys are missing.
     """
@@ -30,6 +181,41 @@ class OpenAIClient:
     def is_configured(self) -> bool:
         return bool(self._api_key and not self._api_key.startswith("sk-xxxx"))
 
+    def _chat_kwargs(
+        self,
+        prompt: str,
+        *,
+        model: str,
+        temperature: float | None,
+        max_tokens: int | None,
+    ) -> dict[str, Any]:
+        temperature_to_use = self._temperature if temperature is None else temperature
+        max_tokens_to_use = self._max_tokens if max_tokens is None else max_tokens
+
+        kwargs: dict[str, Any] = {
+            "model": model,
+            "temperature": temperature_to_use,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a careful assistant. "
+                        "Return ONLY valid JSON that matches the user's requested shape. "
+                        "Do not wrap in markdown."
+                    ),
+                },
+                {"role": "user", "content": prompt},
+            ],
+        }
+
+        # Some newer models (e.g. gpt-5.*) reject `max_tokens` and require `max_completion_tokens`.
+        if isinstance(model, str) and model.startswith(("gpt-5", "o")):
+            kwargs["max_completion_tokens"] = max_tokens_to_use
+        else:
+            kwargs["max_tokens"] = max_tokens_to_use
+        return kwargs
+
     async def generate_json(
         self,
         prompt: str,
@@ -41,72 +227,48 @@ class OpenAIClient:
         if not self.is_configured():
             raise RuntimeError("OPENAI_API_KEY is not configured")
 
-        client = AsyncOpenAI(api_key=self._api_key)
-        start_time = time.perf_counter()
-
+        pool = _get_pool(self._api_key)
         model_to_use = model or self._model
-        temperature_to_use = self._temperature if temperature is None else temperature
-        max_tokens_to_use = self._max_tokens if max_tokens is None else max_tokens
+        kwargs = self._chat_kwargs(prompt, model=model_to_use, temperature=temperature, max_tokens=max_tokens)
 
-        try:
-            kwargs: dict[str, Any] = {
-                "model": model_to_use,
-                "temperature": temperature_to_use,
-                "response_format": {"type": "json_object"},
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a careful assistant. "
-                            "Return ONLY valid JSON that matches the user's requested shape. "
-                            "Do not wrap in markdown."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            }
-
-            # Some newer models (e.g. gpt-5.*) reject `max_tokens` and require `max_completion_tokens`.
-            if isinstance(model_to_use, str) and model_to_use.startswith(("gpt-5", "o")):
-                kwargs["max_completion_tokens"] = max_tokens_to_use
-            else:
-                kwargs["max_tokens"] = max_tokens_to_use
-
-            response = await client.chat.completions.create(**kwargs)
-            duration = time.perf_counter() - start_time
-
-            # Record metrics
-            usage = response.usage
-            input_tokens = usage.prompt_tokens if usage else 0
-            output_tokens = usage.completion_tokens if usage else 0
-
-            record_llm_call(
-                model=model_to_use,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                duration_seconds=duration,
-                status="success",
-            )
+        async with pool.limiter(model_to_use).slot():
+            start_time = time.perf_counter()
+            try:
+                response = await pool.client.chat.completions.create(**kwargs)
+                duration = time.perf_counter() - start_time
 
-            logger.info(
-                "OpenAI call completed: model=%s, input_tokens=%d, output_tokens=%d, duration=%.2fs",
-                model_to_use,
-                input_tokens,
-                output_tokens,
-                duration,
-            )
+                # Record metrics
+                usage = response.usage
+                input_tokens = usage.prompt_tokens if usage else 0
+                output_tokens = usage.completion_tokens if usage else 0
 
-        except Exception:
-            duration = time.perf_counter() - start_time
-            record_llm_call(
-                model=model_to_use,
-                input_tokens=0,
-                output_tokens=0,
-                duration_seconds=duration,
-                status="error",
-            )
-            logger.exception("OpenAI call failed after %.2fs", duration)
-            raise
+                record_llm_call(
+                    model=model_to_use,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    duration_seconds=duration,
+                    status="success",
+                )
+
+                logger.info(
+                    "OpenAI call completed: model=%s, input_tokens=%d, output_tokens=%d, duration=%.2fs",
+                    model_to_use,
+                    input_tokens,
+                    output_tokens,
+                    duration,
+                )
+
+            except Exception:
+                duration = time.perf_counter() - start_time
+                record_llm_call(
+                    model=model_to_use,
+                    input_tokens=0,
+                    output_tokens=0,
+                    duration_seconds=duration,
+                    status="error",
+                )
+                logger.exception("OpenAI call failed after %.2fs", duration)
+                raise
 
         content = (response.choices[0].message.content or "").strip()
         if not content:
@@ -121,3 +283,78 @@ class OpenAIClient:
         if not isinstance(parsed, dict):
             raise RuntimeError("OpenAI JSON root must be an object")
         return parsed
+
+    async def stream_json_array(
+        self,
+        prompt: str,
+        *,
+        array_key: str,
+        model: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Streaming variant of `generate_json` for prompts whose JSON root holds an array of objects.
+
+        Yields each object of `root[array_key]` as soon as the model has emitted it completely.
+        The model slot is held until the stream ends (or the caller stops iterating).
+        """
+        if not self.is_configured():
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+
+        pool = _get_pool(self._api_key)
+        model_to_use = model or self._model
+        kwargs = self._chat_kwargs(prompt, model=model_to_use, temperature=temperature, max_tokens=max_tokens)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        scanner = JsonArrayItemStream(array_key)
+        yielded = 0
+        async with pool.limiter(model_to_use).slot():
+            start_time = time.perf_counter()
+            input_tokens = output_tokens = 0
+            status = "error"
+            try:
+                stream = await pool.client.chat.completions.create(**kwargs)
+                async for chunk in stream:
+                    if chunk.usage:
+                        input_tokens = chunk.usage.prompt_tokens or 0
+                        output_tokens = chunk.usage.completion_tokens or 0
+                    if not chunk.choices:
+                        continue
+                    for item in scanner.feed(chunk.choices[0].delta.content or ""):
+                        yielded += 1
+                        yield item
+                status = "success"
+            except Exception:
+                logger.exception("OpenAI streaming call failed after %.2fs", time.perf_counter() - start_time)
+                raise
+            finally:
+                duration = time.perf_counter() - start_time
+                record_llm_call(
+                    model=model_to_use,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    duration_seconds=duration,
+                    status=status,
+                )
+
+        logger.info(
+            "OpenAI streaming call completed: model=%s, input_tokens=%d, output_tokens=%d, items=%d, duration=%.2fs",
+            model_to_use,
+            input_tokens,
+            output_tokens,
+            yielded,
+            duration,
+        )
+
+        content = scanner.text.strip()
+        if not content:
+            raise RuntimeError("OpenAI returned empty content")
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError as exc:
+            logger.error("OpenAI returned non-JSON content: %r", content[:500])
+            raise RuntimeError("OpenAI returned invalid JSON") from exc
+        if not isinstance(parsed, dict):
+            raise RuntimeError("OpenAI JSON root must be an object")
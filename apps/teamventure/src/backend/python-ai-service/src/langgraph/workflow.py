@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 
 from src.langgraph.state import GenerationState
-from src.services.plan_generation import generate_three_plans, generate_plan_from_markdown
+from src.models.config import settings
+from src.services.plan_generation import generate_plan_from_markdown, generate_three_plans, stream_three_plans
 from src.services.requirement_parser import parse_requirements
-from src.services.itinerary_markdown_enforcer import ensure_valid_itinerary_markdown
+from src.services.itinerary_markdown_enforcer import (
+    ensure_valid_itinerary_markdown,
+    to_valid_itinerary_template,
+)
 from src.services.itinerary_markdown_v2 import itinerary_to_markdown_v2
+from src.utils.workflow_metrics import record_time_to_first_plan, time_stage
 
 logger = logging.getLogger(__name__)
 
@@ -25,28 +33,34 @@ async def run_generation_workflow(message: dict[str, Any]) -> GenerationState:
         "user_inputs": message,
     }
 
+    started = time.perf_counter()
     try:
         logger.info("workflow start plan_request_id=%s", state["plan_request_id"])
 
         # V2: 如果包含markdown_content，使用新的生成逻辑
         if "markdown_content" in message and message["markdown_content"]:
+            mode = "v2"
             logger.info("V2模式：使用Markdown输入生成1套方案")
-            state["generated_plans"] = await generate_plan_from_markdown(
-                plan_request_id=state["plan_request_id"],
-                user_id=state["user_id"],
-                markdown_content=message["markdown_content"],
-                plan_name=message.get("plan_name"),
-            )
+            with time_stage("generate", mode=mode):
+                state["generated_plans"] = await generate_plan_from_markdown(
+                    plan_request_id=state["plan_request_id"],
+                    user_id=state["user_id"],
+                    markdown_content=message["markdown_content"],
+                    plan_name=message.get("plan_name"),
+                )
         else:
             # V1: 旧版结构化输入，生成3套方案（向后兼容）
+            mode = "v1"
             logger.info("V1模式：使用结构化输入生成3套方案")
-            state["parsed_requirements"] = parse_requirements(message)
+            with time_stage("parse", mode=mode):
+                state["parsed_requirements"] = parse_requirements(message)
             logger.info("requirements parsed plan_request_id=%s", state["plan_request_id"])
-            state["generated_plans"] = await generate_three_plans(
-                plan_request_id=state["plan_request_id"],
-                user_id=state["user_id"],
-                inputs=state["parsed_requirements"],
-            )
+            with time_stage("generate", mode=mode):
+                state["generated_plans"] = await generate_three_plans(
+                    plan_request_id=state["plan_request_id"],
+                    user_id=state["user_id"],
+                    inputs=state["parsed_requirements"],
+                )
 
         logger.info(
             "plans generated plan_request_id=%s count=%s",
@@ -59,19 +73,163 @@ async def run_generation_workflow(message: dict[str, Any]) -> GenerationState:
         plans = state.get("generated_plans") or []
         if isinstance(plans, list) and plans:
             fallback_markdown = str(message.get("markdown_content") or "").strip()
-            for plan in plans:
-                if not isinstance(plan, dict):
-                    continue
-                md0 = itinerary_to_markdown_v2(plan.get("itinerary"))
-                enforced = await ensure_valid_itinerary_markdown(
-                    initial_markdown=md0,
-                    fallback_markdown=fallback_markdown or md0,
-                    max_attempts=5,
+            with time_stage("enforce", mode=mode):
+                await enforce_plans_itinerary_markdown(
+                    [p for p in plans if isinstance(p, dict)],
+                    fallback_markdown=fallback_markdown,
+                    plan_request_id=state["plan_request_id"],
                 )
-                plan["itinerary_markdown"] = enforced["markdown"]
+            record_time_to_first_plan(time.perf_counter() - started, mode=mode, delivery="batch")
 
         return state
     except Exception as exc:
         logger.exception("Generation workflow failed")
         state["error"] = str(exc)
         return state
+
+
+async def stream_generation_workflow(message: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+    """
+    流式方案生成工作流：每套方案生成并完成行程 Markdown 校验后立即产出
+
+    产出事件（按就绪顺序，`index` 为方案在生成结果中的序号）：
+    - {"event": "plan", "data": {"index": i, "plan": {...}}}
+    - {"event": "done", "data": {"plan_request_id", "user_id", "count"}}
+    - {"event": "error", "data": {"plan_request_id", "error"}}（已产出的方案仍然有效）
+
+    V1 使用 LLM streaming，一个方案的 JSON 完整即开始其 enforce，与后续方案的生成重叠；
+    每个方案的 enforce 各自受 ITINERARY_ENFORCE_DEADLINE_SECONDS 约束。
+    """
+    plan_request_id = message["plan_request_id"]
+    user_id = message["user_id"]
+    markdown_content = str(message.get("markdown_content") or "")
+    mode = "v2" if markdown_content else "v1"
+    fallback_markdown = markdown_content.strip()
+
+    started = time.perf_counter()
+    ready: asyncio.Queue[tuple[int, dict[str, Any]] | None] = asyncio.Queue()
+    enforce_tasks: list[asyncio.Task[None]] = []
+
+    async def enforce(index: int, plan: dict[str, Any]) -> None:
+        await enforce_plans_itinerary_markdown(
+            [plan],
+            fallback_markdown=fallback_markdown,
+            plan_request_id=plan_request_id,
+        )
+        ready.put_nowait((index, plan))
+
+    def spawn_enforce(plan: Any) -> None:
+        if isinstance(plan, dict):
+            enforce_tasks.append(asyncio.create_task(enforce(len(enforce_tasks), plan)))
+
+    async def produce() -> None:
+        try:
+            try:
+                with time_stage("generate", mode=mode):
+                    if mode == "v2":
+                        for plan in await generate_plan_from_markdown(
+                            plan_request_id=plan_request_id,
+                            user_id=user_id,
+                            markdown_content=markdown_content,
+                            plan_name=message.get("plan_name"),
+                        ):
+                            spawn_enforce(plan)
+                    else:
+                        with time_stage("parse", mode=mode):
+                            inputs = parse_requirements(message)
+                        async for plan in stream_three_plans(
+                            plan_request_id=plan_request_id,
+                            user_id=user_id,
+                            inputs=inputs,
+                        ):
+                            spawn_enforce(plan)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Plans generated before the failure are still enforced and emitted.
+                await asyncio.gather(*enforce_tasks, return_exceptions=True)
+                raise
+            with time_stage("enforce", mode=mode):
+                await asyncio.gather(*enforce_tasks)
+        finally:
+            for task in enforce_tasks:
+                task.cancel()
+            ready.put_nowait(None)
+
+    logger.info("stream workflow start plan_request_id=%s mode=%s", plan_request_id, mode)
+    producer = asyncio.create_task(produce())
+    count = 0
+    try:
+        while (ready_item := await ready.get()) is not None:
+            index, plan = ready_item
+            if count == 0:
+                record_time_to_first_plan(time.perf_counter() - started, mode=mode, delivery="stream")
+            count += 1
+            yield {"event": "plan", "data": {"index": index, "plan": plan}}
+
+        await asyncio.gather(producer, return_exceptions=True)
+        exc = producer.exception()
+        if exc is not None:
+            logger.error("Stream generation workflow failed plan_request_id=%s err=%s", plan_request_id, exc)
+            yield {"event": "error", "data": {"plan_request_id": plan_request_id, "error": str(exc)}}
+            return
+
+        logger.info("stream workflow done plan_request_id=%s count=%d", plan_request_id, count)
+        yield {"event": "done", "data": {"plan_request_id": plan_request_id, "user_id": user_id, "count": count}}
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+async def enforce_plans_itinerary_markdown(
+    plans: list[dict[str, Any]],
+    *,
+    fallback_markdown: str,
+    plan_request_id: str = "",
+    deadline_seconds: float | None = None,
+) -> None:
+    """
+    Enforce itinerary markdown for all plans concurrently (bounded), under one per-request deadline.
+
+    Plans whose validate->fix loop does not finish before the deadline (or fails) get the
+    deterministic template built from the fallback source, which always passes validation.
+    """
+    if not plans:
+        return
+
+    deadline = settings.itinerary_enforce_deadline_seconds if deadline_seconds is None else deadline_seconds
+    semaphore = asyncio.Semaphore(max(1, int(settings.itinerary_enforce_max_concurrency)))
+    initial = [itinerary_to_markdown_v2(plan.get("itinerary")) for plan in plans]
+
+    async def enforce(md0: str) -> str:
+        async with semaphore:
+            enforced = await ensure_valid_itinerary_markdown(
+                initial_markdown=md0,
+                fallback_markdown=fallback_markdown or md0,
+                max_attempts=5,
+            )
+        return enforced["markdown"]
+
+    tasks = [asyncio.create_task(enforce(md0)) for md0 in initial]
+    _, pending = await asyncio.wait(tasks, timeout=max(0.0, float(deadline)))
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(
+            "itinerary enforcement exceeded deadline=%.1fs plan_request_id=%s timed_out=%d",
+            deadline,
+            plan_request_id,
+            len(pending),
+        )
+
+    for plan, md0, task in zip(plans, initial, tasks):
+        if task.cancelled() or task.exception() is not None:
+            if not task.cancelled():
+                logger.warning(
+                    "itinerary enforcement failed plan_request_id=%s err=%s", plan_request_id, task.exception()
+                )
+            plan["itinerary_markdown"] = to_valid_itinerary_template(fallback_markdown or md0)
+        else:
+            plan["itinerary_markdown"] = task.result()
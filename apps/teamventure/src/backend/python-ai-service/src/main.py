@@ -18,18 +18,22 @@ TeamVenture AI Service - 主应用入口
 @since 2025-12-30
 """
 
+import json
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from src.models.config import settings
-from src.langgraph.workflow import run_generation_workflow
+from src.integrations.amap_client import close_shared_amap_client
+from src.integrations.java_client import close_shared_java_client
+from src.integrations.openai_client import close_shared_openai_client
+from src.langgraph.workflow import run_generation_workflow, stream_generation_workflow
 from src.scheduler.scheduler import start_scheduler, stop_scheduler
 from src.services.mq_consumer import start_mq_consumer, stop_mq_consumer
 from src.services.markdown_converter import MarkdownConverter
@@ -38,6 +42,9 @@ from src.services.xhs_normalizer import XhsNormalizer
 
 # Import and initialize LLM metrics with Prometheus REGISTRY
 from src.utils.llm_metrics import init_metrics as init_llm_metrics
+from src.utils.cache_metrics import init_metrics as init_cache_metrics
+from src.utils.workflow_metrics import init_metrics as init_workflow_metrics
+from src.utils.mq_metrics import init_metrics as init_mq_metrics
 
 # 配置日志
 logging.basicConfig(
@@ -62,6 +69,9 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize LLM metrics (so they appear in /metrics even before first call)
         init_llm_metrics(default_model=settings.openai_model)
+        init_cache_metrics(["plan", "markdown_plan", "markdown"])
+        init_workflow_metrics()
+        init_mq_metrics()
         logger.info("✅ LLM metrics initialized")
 
         # 启动MQ消费者
@@ -90,6 +100,11 @@ async def lifespan(app: FastAPI):
 
         await stop_scheduler()
         logger.info("✅ Scheduler stopped")
+
+        await close_shared_openai_client()
+        await close_shared_amap_client()
+        await close_shared_java_client()
+        logger.info("✅ OpenAI/Amap/Java callback connection pools closed")
     except Exception as e:
         logger.error(f"⚠️ Shutdown warning: {e}")
 
@@ -175,6 +190,33 @@ async def generate_plan_http(request: dict):
     )
 
 
+@app.post("/api/v1/plans/generate/stream", tags=["Plans"])
+async def generate_plan_stream(request: dict):
+    """
+    流式生成方案（Server-Sent Events）
+
+    说明：
+    - 每套方案生成并完成行程 Markdown 校验后立即推送 `event: plan`（data 含 index 与 plan），
+      调用方可先渲染首个方案；全部完成后推送 `event: done`，失败时推送 `event: error`。
+    - 请求体与 /api/v1/plans/generate 相同。
+    """
+    payload = request or {}
+    trace_id = payload.get("trace_id")
+
+    async def events():
+        async for event in stream_generation_workflow(payload):
+            data = event["data"]
+            if event["event"] == "done":
+                data = {**data, "trace_id": trace_id}
+            yield f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class XhsNormalizeRequest(BaseModel):
     url: str = Field(default="", description="XHS share URL")
     title: str = Field(default="", description="Extracted title")
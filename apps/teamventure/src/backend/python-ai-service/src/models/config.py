@@ -31,6 +31,16 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4-0125-preview"
     openai_temperature: float = 0.7
     openai_max_tokens: int = 4000
+    openai_base_url: str = ""  # 为空使用官方地址；可指向兼容网关或本地压测替身（如 http://127.0.0.1:9000/v1）
+
+    # OpenAI连接池/并发控制（进程内共享一个 AsyncOpenAI 客户端）
+    openai_timeout_seconds: float = 120.0
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry_seconds: float = 30.0
+    openai_max_concurrency: int = 8  # 每个模型同时在途请求上限
+    openai_model_concurrency: dict[str, int] = {}  # 按模型覆盖，如 {"gpt-4o-mini": 16}
+    openai_requests_per_minute: int = 0  # 每个模型的令牌桶速率，0=不限速
 
     # AI Mock模式（开发测试时减少token消耗）
     enable_ai_mock: bool = False  # True=强制使用mock数据，False=优先真实AI
@@ -44,6 +54,18 @@ class Settings(BaseSettings):
     # AI缓存配置
     ai_cache_enabled: bool = True  # 启用AI响应缓存
     ai_cache_ttl_seconds: int = 86400  # 缓存24小时
+    ai_cache_l1_max_size: int = 512  # 进程内L1缓存条目上限
+    ai_cache_l1_ttl_seconds: int = 600  # L1缓存有效期（不超过 ai_cache_ttl_seconds）
+
+    # Markdown 转换/优化/小红书规范化结果缓存（按输入内容+模型+prompt版本寻址）
+    markdown_cache_enabled: bool = True
+    markdown_cache_ttl_seconds: int = 604800  # 7天
+    markdown_cache_max_size: int = 1024  # 进程内条目上限（超出按最早过期淘汰）
+    markdown_cache_redis_enabled: bool = False  # 是否同时写入Redis（多实例共享）
+
+    # 行程Markdown校验/修复（多方案并发执行，整体截止时间后回退到确定性模板）
+    itinerary_enforce_max_concurrency: int = 3
+    itinerary_enforce_deadline_seconds: float = 60.0
 
     # RabbitMQ配置
     rabbitmq_host: str = "localhost"
@@ -57,9 +79,24 @@ class Settings(BaseSettings):
     mq_queue: str = "ai.gen.req.queue"
     mq_routing_key: str = "plan.request.#"
 
+    # MQ消费并发（prefetch 决定 broker 最多推送多少条未确认消息，worker 数决定同时生成多少个方案）
+    mq_prefetch_count: int = 10
+    mq_worker_concurrency: int = 4
+    mq_queue_depth_sample_seconds: float = 15.0
+
+    # 死信（生成失败/回调最终失败的消息，便于排查与重放）
+    mq_dead_letter_exchange: str = "plan.generation.dlx"
+    mq_dead_letter_queue: str = "ai.gen.dead.queue"
+
     # Java服务回调配置
     java_callback_url: str = "http://localhost:8080/internal/plans/batch"
     java_internal_secret: str = "change-this-in-production"
+    java_callback_timeout_seconds: float = 10.0
+    java_callback_workers: int = 2
+    java_callback_queue_max_size: int = 100
+    java_callback_max_attempts: int = 5
+    java_callback_retry_base_seconds: float = 1.0
+    java_callback_retry_max_seconds: float = 30.0
 
     # Amap (高德地图) WebService enrichment
     amap_enabled: bool = False
@@ -69,6 +106,8 @@ class Settings(BaseSettings):
     amap_cache_ttl_seconds: int = 3600
     amap_cache_max_size: int = 256
     amap_max_pois_per_category: int = 6
+    amap_max_concurrency: int = 4  # 单次目的地补全时并发的分类搜索数
+    amap_max_connections: int = 10  # 共享连接池上限
 
     # 日志配置
     log_level: str = "INFO"
@@ -0,0 +1,204 @@
+"""
+AI 响应缓存（异步、非阻塞）
+
+两级缓存：
+- L1: 进程内 TTLCache（命中时不访问网络）
+- L2: redis.asyncio（跨实例共享；不可用时自动降级为仅 L1）
+
+并提供 single-flight 合并：同一 cache key 的并发请求只触发一次 loader（LLM 调用），
+其余请求等待同一结果。值统一以 JSON 文本存储，每次读取都会反序列化出独立副本，
+调用方可以放心修改返回值。
+
+`markdown_result_cache` 是 Markdown 转换/优化/小红书规范化共享的内容寻址缓存：
+key 由 (操作, prompt 版本, 模型, 输入文本) 的 hash 组成，修改 prompt 时提升对应
+模块的版本常量即可让旧条目失效。只缓存 LLM 成功的结果，降级结果通过 UncachedResult 返回。
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.models.config import settings
+from src.utils.cache_metrics import record_cache_result
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# ============ Redis异步客户端（懒加载，绑定事件循环）============
+_redis_client: Any = None
+_redis_loop: asyncio.AbstractEventLoop | None = None
+_redis_unavailable = False
+
+
+async def _get_redis_client() -> Any:
+    """获取 redis.asyncio 客户端（懒加载）；连接失败后标记为不可用，仅使用 L1。"""
+    global _redis_client, _redis_loop, _redis_unavailable
+    if _redis_unavailable or not settings.ai_cache_enabled:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _redis_client is not None and _redis_loop is loop:
+        return _redis_client
+
+    try:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            db=settings.redis_db,
+            decode_responses=True,
+            socket_connect_timeout=1.0,
+            socket_timeout=2.0,
+        )
+        await client.ping()
+        logger.info("Redis AI cache connected successfully")
+    except Exception as exc:
+        logger.warning(f"Failed to connect to Redis for AI cache: {exc}")
+        _redis_unavailable = True
+        return None
+
+    _redis_client = client
+    _redis_loop = loop
+    return _redis_client
+
+
+class UncachedResult(Exception):
+    """
+    loader 用它返回降级结果（兜底转换、原文回退等）：
+    结果照常交给调用方和合并等待的请求，但不写入缓存，下次请求会重新调用 LLM。
+    """
+
+    def __init__(self, value: Any) -> None:
+        super().__init__("uncached result")
+        self.value = value
+
+
+class AICache:
+    """L1 内存 + L2 Redis 的 JSON 缓存，带 single-flight 请求合并。"""
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        ttl_seconds: int | None = None,
+        max_size: int | None = None,
+        use_redis: bool = True,
+    ) -> None:
+        self._name = name
+        self._ttl_seconds = int(ttl_seconds or settings.ai_cache_ttl_seconds)
+        self._use_redis = use_redis
+        # With Redis as the source of truth keep L1 short-lived; without it L1 is the only level.
+        l1_ttl = min(self._ttl_seconds, int(settings.ai_cache_l1_ttl_seconds)) if use_redis else self._ttl_seconds
+        self._l1 = TTLCache[str, str](
+            ttl_seconds=l1_ttl,
+            max_size=int(max_size or settings.ai_cache_l1_max_size),
+        )
+        self._inflight: dict[str, asyncio.Future[str]] = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def get(self, key: str) -> Any | None:
+        raw = self._l1.get(key)
+        if raw is not None:
+            record_cache_result(cache=self._name, result="hit_l1")
+            return json.loads(raw)
+
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(key)
+            except Exception as exc:
+                logger.warning(f"读取AI缓存失败: {exc}")
+                raw = None
+            if raw:
+                self._l1.set(key, raw)
+                record_cache_result(cache=self._name, result="hit_l2")
+                return json.loads(raw)
+
+        # Misses are recorded by load_once (leader = miss, follower = coalesced).
+        return None
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, or run `loader` once (single-flight) and cache its result."""
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        return await self.load_once(key, loader)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._store(key, json.dumps(value, ensure_ascii=False))
+
+    async def load_once(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Single-flight：若同 key 已有请求在执行则等待其结果，否则执行 loader 并写入缓存。
+
+        loader 抛出的异常会传递给所有等待者（不写缓存）；
+        loader 抛出 UncachedResult 时返回其中的值，同样不写缓存。
+        """
+        pending = self._inflight.get(key)
+        if pending is not None:
+            record_cache_result(cache=self._name, result="coalesced")
+            return json.loads(await asyncio.shield(pending))
+
+        record_cache_result(cache=self._name, result="miss")
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        cacheable = True
+        try:
+            try:
+                value = await loader()
+            except UncachedResult as uncached:
+                value, cacheable = uncached.value, False
+            raw = json.dumps(value, ensure_ascii=False)
+            future.set_result(raw)
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError(f"in-flight request cancelled: {key}"))
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Avoid "exception was never retrieved" when nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if cacheable:
+            await self._store(key, raw)
+        return json.loads(raw)
+
+    async def _redis(self) -> Any:
+        return await _get_redis_client() if self._use_redis else None
+
+    async def _store(self, key: str, raw: str) -> None:
+        self._l1.set(key, raw)
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.setex(key, self._ttl_seconds, raw)
+            logger.info(f"AI响应已缓存 cache_key={key}, ttl={self._ttl_seconds}s")
+        except Exception as exc:
+            logger.warning(f"写入AI缓存失败: {exc}")
+
+
+def content_cache_key(operation: str, *, version: str, model: str, content: str) -> str:
+    """Content-addressed key: identical input text + model + prompt version share one entry."""
+    digest = hashlib.sha256(f"{model}\x00{content}".encode("utf-8")).hexdigest()[:32]
+    return f"ai:md:{operation}:{version}:{digest}"
+
+
+markdown_result_cache = AICache(
+    name="markdown",
+    ttl_seconds=int(settings.markdown_cache_ttl_seconds),
+    max_size=int(settings.markdown_cache_max_size),
+    use_redis=bool(settings.markdown_cache_redis_enabled),
+)
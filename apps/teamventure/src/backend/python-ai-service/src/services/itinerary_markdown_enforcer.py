@@ -4,7 +4,9 @@ import re
 from typing import Any
 
 from src.integrations.openai_client import OpenAIClient
+from src.services.itinerary_markdown_repair import repair_itinerary_markdown
 from src.services.itinerary_markdown_v2 import validate
+from src.utils.workflow_metrics import record_repair_outcome
 
 
 async def ensure_valid_itinerary_markdown(
@@ -15,22 +17,35 @@ async def ensure_valid_itinerary_markdown(
     model: str | None = None,
 ) -> dict[str, Any]:
     """
-    Closed-loop: validate -> (LLM fix) -> validate, up to max_attempts.
+    Closed-loop: validate -> (local rule repair) -> (LLM fix) -> validate, up to max_attempts.
 
-    If still invalid after retries (or LLM not configured), fall back to fallback_markdown.
+    Mechanical problems are fixed locally first; only what the rule engine cannot resolve
+    is escalated to the LLM. If still invalid after retries (or LLM not configured),
+    fall back to fallback_markdown.
     """
     candidate = (initial_markdown or "").strip()
     fallback_source = (fallback_markdown or "").strip()
-    fallback = _to_valid_itinerary_template(fallback_source or candidate)
+    fallback = to_valid_itinerary_template(fallback_source or candidate)
 
-    client = OpenAIClient()
+    def _fallback(attempts: int) -> dict[str, Any]:
+        record_repair_outcome("fallback")
+        return {"markdown": fallback, "check": validate(fallback), "attempts": attempts, "fallback_used": True}
 
     last_check = validate(candidate)
     if last_check["valid"]:
+        record_repair_outcome("valid")
         return {"markdown": candidate, "check": last_check, "attempts": 0, "fallback_used": False}
 
+    repaired = repair_itinerary_markdown(candidate)
+    if repaired["check"]["valid"]:
+        record_repair_outcome("local")
+        return {"markdown": repaired["markdown"], "check": repaired["check"], "attempts": 0, "fallback_used": False}
+    candidate = repaired["markdown"].strip()
+    last_check = repaired["check"]
+
+    client = OpenAIClient()
     if not client.is_configured():
-        return {"markdown": fallback, "check": validate(fallback), "attempts": 0, "fallback_used": True}
+        return _fallback(0)
 
     for attempt in range(1, max_attempts + 1):
         errors = last_check.get("errors") or []
@@ -58,24 +73,27 @@ async def ensure_valid_itinerary_markdown(
         try:
             res = await client.generate_json(prompt, model=model, temperature=0.0, max_tokens=2000)
         except Exception:
-            return {"markdown": fallback, "check": validate(fallback), "attempts": attempt, "fallback_used": True}
+            return _fallback(attempt)
 
         fixed = (res.get("markdown_content") or "").strip()
         if not fixed:
-            return {"markdown": fallback, "check": validate(fallback), "attempts": attempt, "fallback_used": True}
+            return _fallback(attempt)
 
-        candidate = fixed
-        last_check = validate(candidate)
+        # LLM output often still has mechanical slips; clean them up locally before retrying.
+        repaired = repair_itinerary_markdown(fixed)
+        candidate = repaired["markdown"].strip()
+        last_check = repaired["check"]
         if last_check["valid"]:
+            record_repair_outcome("llm")
             return {"markdown": candidate, "check": last_check, "attempts": attempt, "fallback_used": False}
 
-    return {"markdown": fallback, "check": validate(fallback), "attempts": max_attempts, "fallback_used": True}
+    return _fallback(max_attempts)
 
 
 _DAY_MARKER = re.compile(r"(?i)(?:^|\s)(?:D\s*\d+|day\s*\d+|第\s*\d+\s*天)(?:\b|\s|:|：)")
 
 
-def _to_valid_itinerary_template(source_text: str) -> str:
+def to_valid_itinerary_template(source_text: str) -> str:
     """
     Deterministic fallback that ALWAYS produces validator-passing v2 markdown,
     while preserving the original input as blockquote reference.
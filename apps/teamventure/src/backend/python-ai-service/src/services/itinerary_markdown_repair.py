@@ -0,0 +1,219 @@
+"""
+行程 Markdown v2 的确定性修复（规则引擎）
+
+消费 `itinerary_markdown_v2.validate` 返回的结构化 issues，在本地修复机械性问题：
+- 不可见字符 / 全角竖线（normalize_markdown）
+- 时间格式：9:00-10:00、9点~10点半、0900-1000、缺少连字符的单个开始时间
+- 行项目缺少「|」分隔：- 09:00-10:00 参观西湖 → - 09:00 - 10:00 | 参观西湖
+- 活动为空但有地点列：用地点作为活动
+- 非标准的 Day 标题（# Day 2 杭州、### 第2天 苏州）：改写为「## Day N（说明）」
+- Day 内的非行项目文本：* / • / 1. 列表转为行项目，其余转为引用（> ...）保留原文；
+  含 Day 编号但无法改写的行保持原样，留给 LLM（避免后续行项目并入前一天）
+- 第一个 Day 之前的行项目：移动到第一个 Day 下方；没有任何 Day 标题时补「## Day 1」
+
+无法在不编造事实的前提下修复的问题（如缺少时间的活动、空 Day）留给 LLM 处理。
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from src.services.itinerary_markdown_v2 import (
+    ISSUE_EMPTY_ACTIVITY,
+    ISSUE_ITEM_FORMAT,
+    ISSUE_ITEM_OUTSIDE_DAY,
+    ISSUE_NO_DAY_HEADING,
+    ISSUE_TIME_FORMAT,
+    ISSUE_UNRECOGNIZED,
+    _DAY_MARKER,
+    _parse_day_heading,
+    normalize_markdown,
+    validate,
+)
+
+# 9:00 / 09：30 / 9.30 / 9点 / 9点半 / 9点15分 / 0930
+_TIME_TOKEN = (
+    r"(?<!\d)(?:"
+    r"([01]?\d|2[0-3])\s*[:：.]\s*([0-5]\d)"
+    r"|([01]?\d|2[0-3])\s*[点时]\s*(半|[0-5]?\d)?\s*分?"
+    r"|([01]\d|2[0-3])([0-5]\d)"
+    r")(?!\d)"
+)
+_TIME_TOKEN_RE = re.compile(_TIME_TOKEN)
+_LEADING_TIME_RANGE_RE = re.compile(
+    r"^\s*(" + _TIME_TOKEN + r"(?:\s*(?:-|~|～|—|–|至|到)\s*(?:" + _TIME_TOKEN + r")?)?)\s*[:：,，、]?\s*"
+)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·+]|\d{1,2}[.、)）])\s*")
+# 行内任意位置的 Day 编号（第2天 / Day 2 / D2）
+_DAY_NUMBER_RE = re.compile(r"第\s*[^\s天]{1,3}\s*天|\bday\s*\d|\bd\d{1,3}\b", re.IGNORECASE)
+_CN_DIGITS = {"一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+
+
+def repair_itinerary_markdown(markdown: str | None) -> dict[str, Any]:
+    """
+    Apply rule-based fixes for the issues reported by `validate`.
+
+    Returns {"markdown": str, "check": validate(markdown), "fixed": int}; `check` tells the
+    caller whether the result is already valid or which issues still need the LLM.
+    """
+    text = normalize_markdown(markdown).strip()
+    check = validate(text)
+    if check["valid"]:
+        return {"markdown": text, "check": check, "fixed": 0}
+
+    lines = text.split("\n")
+    fixed = 0
+
+    for issue in check["issues"]:
+        idx = issue["line"] - 1 if issue["line"] else None
+        if idx is None or not 0 <= idx < len(lines):
+            continue
+        code = issue["code"]
+        if code in (ISSUE_ITEM_FORMAT, ISSUE_EMPTY_ACTIVITY, ISSUE_TIME_FORMAT, ISSUE_ITEM_OUTSIDE_DAY):
+            repaired = _repair_item_line(lines[idx])
+        elif code == ISSUE_UNRECOGNIZED:
+            repaired = _repair_unrecognized_line(lines[idx])
+        else:
+            repaired = None
+        if repaired is not None and repaired != lines[idx]:
+            lines[idx] = repaired
+            fixed += 1
+
+    structural = validate("\n".join(lines))
+    codes = {issue["code"] for issue in structural["issues"]}
+    if ISSUE_NO_DAY_HEADING in codes and _has_item_line(lines):
+        lines = _insert_first_day_heading(lines)
+        fixed += 1
+    elif ISSUE_ITEM_OUTSIDE_DAY in codes:
+        stray = [i["line"] - 1 for i in structural["issues"] if i["code"] == ISSUE_ITEM_OUTSIDE_DAY]
+        lines = _move_items_under_first_day(lines, stray)
+        fixed += len(stray)
+
+    repaired_md = "\n".join(lines).rstrip() + "\n"
+    return {"markdown": repaired_md, "check": validate(repaired_md), "fixed": fixed}
+
+
+def _pad_time(hour: str, minute: str) -> str:
+    return f"{int(hour):02d}:{int(minute):02d}"
+
+
+def _extract_times(text: str) -> list[str]:
+    out: list[str] = []
+    for m in _TIME_TOKEN_RE.finditer(text):
+        if m.group(1) is not None:
+            out.append(_pad_time(m.group(1), m.group(2)))
+        elif m.group(3) is not None:
+            minute_token = m.group(4) or "0"
+            minute = "30" if minute_token == "半" else minute_token
+            out.append(_pad_time(m.group(3), minute))
+        else:
+            out.append(_pad_time(m.group(5), m.group(6)))
+    return out
+
+
+def _format_item(start: str, end: str, activity: str, extra: list[str]) -> str:
+    line = f"- {start} - {end} | {activity}"
+    for cell in extra:
+        line += f" | {cell}"
+    return line
+
+
+def _repair_item_line(line: str) -> str | None:
+    body = _BULLET_RE.sub("", line, count=1).strip()
+    if not body:
+        return None
+
+    parts = [p.strip() for p in body.split("|")]
+    if len(parts) >= 2:
+        time_part, activity, extra = parts[0], parts[1], parts[2:]
+        if not activity:
+            # 活动为空：用第一个非空的地点/备注列顶上（不编造内容）
+            filled = next((c for c in extra if c), "")
+            if not filled:
+                return None
+            activity = filled
+            extra = [c for c in extra if c is not filled]
+    else:
+        m = _LEADING_TIME_RANGE_RE.match(body)
+        if not m:
+            return None
+        time_part, activity, extra = m.group(1), body[m.end():].strip(), []
+        if not activity:
+            return None
+
+    times = _extract_times(time_part)
+    if not times:
+        return None
+    start = times[0]
+    end = times[1] if len(times) > 1 else ""
+    return _format_item(start, end, activity, extra)
+
+
+def _day_number(token: str) -> int | None:
+    if token.isdigit():
+        return int(token) or None
+    if "十" not in token:
+        return _CN_DIGITS.get(token)
+    tens, ones = token.split("十", 1)
+    t = _CN_DIGITS.get(tens) if tens else 1
+    o = _CN_DIGITS.get(ones) if ones else 0
+    return t * 10 + o if t is not None and o is not None else None
+
+
+def _repair_day_marker(line: str) -> str | None:
+    m = _DAY_MARKER.match(line)
+    if not m:
+        return None
+    number = _day_number(next(g for g in m.groups()[:3] if g is not None).strip())
+    if number is None:
+        return None
+    rest = m.group(4).replace("**", "").strip().lstrip(":：-—|").strip()
+    bracketed = re.fullmatch(r"[（(](.*)[)）]", rest)
+    if bracketed:
+        rest = bracketed.group(1).strip()
+    return f"## Day {number}（{rest}）" if rest else f"## Day {number}"
+
+
+def _repair_unrecognized_line(line: str) -> str:
+    stripped = line.strip()
+    heading = _repair_day_marker(stripped)
+    if heading is not None:
+        return heading
+    if _DAY_NUMBER_RE.search(stripped):
+        # 含 Day 编号却无法改写：转成引用会让后面的行项目并入前一天，保持原样交给 LLM
+        return line
+    if _BULLET_RE.match(stripped):
+        repaired = _repair_item_line(stripped)
+        if repaired is not None:
+            return repaired
+    if _LEADING_TIME_RANGE_RE.match(stripped):
+        repaired = _repair_item_line(stripped)
+        if repaired is not None:
+            return repaired
+    # 保留原文但不参与校验（子标题、说明文字等）
+    return "> " + stripped.lstrip("#").strip()
+
+
+def _has_item_line(lines: list[str]) -> bool:
+    return any(line.strip().startswith("- ") for line in lines)
+
+
+def _is_day_heading(line: str) -> bool:
+    return _parse_day_heading(line.strip()) is not None
+
+
+def _insert_first_day_heading(lines: list[str]) -> list[str]:
+    for i, line in enumerate(lines):
+        if line.strip().startswith("- "):
+            return lines[:i] + ["## Day 1"] + lines[i:]
+    return lines
+
+
+def _move_items_under_first_day(lines: list[str], stray: list[int]) -> list[str]:
+    stray_set = set(stray)
+    moved = [lines[i] for i in stray]
+    kept = [line for i, line in enumerate(lines) if i not in stray_set]
+    for i, line in enumerate(kept):
+        if _is_day_heading(line):
+            return kept[: i + 1] + moved + kept[i + 1 :]
+    return lines
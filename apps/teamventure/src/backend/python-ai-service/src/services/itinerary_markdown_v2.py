@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 
@@ -9,11 +11,23 @@ _DAY_HEADING_LOOSE = re.compile(
     r"^(?:#{1,6}\s*)?(?:\*\*)?\s*(?:day|d)\s*(\d+)\s*(?:\*\*)?\s*(?:（(.*)）|\((.*)\))?\s*(?:[:：]\s*(.*))?$",
     re.IGNORECASE,
 )
+# "## Day 2 苏州古城": any other "## Day N" line is still a day; the trailing text is its title.
+_DAY_HEADING_TITLED = re.compile(r"^##\s*Day\s*(\d+)(.*)$", re.IGNORECASE)
 _DAY_HEADING_CN = re.compile(
     r"^(?:#{1,6}\s*)?(?:\*\*)?\s*第\s*(\d+)\s*天\s*(?:\*\*)?\s*(?:[:：]\s*(.*))?$",
     re.IGNORECASE,
 )
+# A Day marker under heading markup ("# Day 2 杭州", "### 第2天 苏州", "**D3 返程**"). Lines like this
+# that are not one of the accepted heading forms are reported instead of being read as a title / text.
+_DAY_MARKER = re.compile(
+    r"^(?:#{1,6}|\*\*)\s*(?:\*\*)?\s*(?:第\s*([一二两三四五六七八九十\d]{1,3})\s*天|day\s*(\d{1,3})|d(\d{1,3}))(?!\d)(.*)$",
+    re.IGNORECASE,
+)
 _TIME_RANGE = re.compile(r"^(\d{1,2}:\d{2})\s*-\s*(\d{0,2}:?\d{0,2})\s*$")
+_ITEM_PREFIX = re.compile(r"^\-\s*")
+_INVISIBLE = re.compile(r"[\u200B-\u200F\u202A-\u202E\u2060\uFEFF]")
+_DASHES = re.compile(r"[—–－‐‑‒―−~〜～﹣]")
+_WHITESPACE = re.compile(r"\s+")
 
 
 def normalize_markdown(markdown: str | None) -> str:
@@ -25,69 +39,192 @@ def normalize_markdown(markdown: str | None) -> str:
     return s
 
 
-def validate(markdown: str | None) -> dict[str, Any]:
-    normalized = normalize_markdown(markdown)
-    raw_lines = normalized.split("\n")
+# Structured issue codes reported by `validate` (see `issues` in its result).
+ISSUE_NO_DAY_HEADING = "no_day_heading"
+ISSUE_DAY_WITHOUT_ITEMS = "day_without_items"
+ISSUE_ITEM_OUTSIDE_DAY = "item_outside_day"
+ISSUE_ITEM_FORMAT = "item_format"
+ISSUE_EMPTY_ACTIVITY = "empty_activity"
+ISSUE_TIME_FORMAT = "time_format"
+ISSUE_UNRECOGNIZED = "unrecognized"
+
+
+@dataclass(frozen=True, slots=True)
+class ItineraryIssue:
+    code: str
+    line: int | None
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class ItineraryItem:
+    """A "- 时间 | 活动 | 地点 | 备注" line; `issue` is set when the line is malformed."""
+
+    line: int
+    time_start: str
+    time_end: str
+    activity: str
+    location: str
+    note: str
+    issue: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ItineraryDay:
+    """
+    A Day heading and the items under it.
+
+    `strict` marks the canonical "## Day N（日期）" form; looser headings (DAY1：A→B, 第1天：...)
+    carry their inline route in `inline_item`, and "## Day N 标题" keeps its free text in `title`.
+    """
+
+    number: int
+    line: int
+    strict: bool
+    date: str
+    inline_item: str
+    items: tuple[ItineraryItem, ...]
+    title: str = ""
+
+    @property
+    def heading_suffix(self) -> str:
+        return f"（{self.date}）" if self.date else ""
+
+    @property
+    def valid_items(self) -> tuple[ItineraryItem, ...]:
+        return tuple(it for it in self.items if it.issue is None)
 
-    errors: list[str] = []
-    days = 0
-    total_items = 0
 
-    in_day = False
-    current_day_has_item = False
-    current_day_number: int | None = None
+@dataclass(frozen=True, slots=True)
+class ItineraryDocument:
+    """Result of a single `parse` pass, shared by validation, rationalization and POI guardrails."""
 
-    for i, raw in enumerate(raw_lines):
-        line = _normalize_line(raw)
+    title: str
+    days: tuple[ItineraryDay, ...]
+    appendix: tuple[str, ...]
+    issues: tuple[ItineraryIssue, ...]
+    # 1-based lines skipped without an issue: free text before the first Day, repeated "# " titles.
+    skipped_lines: tuple[int, ...]
+
+    @property
+    def item_count(self) -> int:
+        return sum(len(d.valid_items) + (1 if d.inline_item else 0) for d in self.days)
+
+    @property
+    def is_canonical(self) -> bool:
+        """Valid, only "## Day N" headings and nothing outside the schema."""
+        return not self.issues and not self.skipped_lines and all(d.strict for d in self.days)
+
+
+def parse(markdown: str | None) -> ItineraryDocument:
+    """
+    Parse itinerary markdown v2 in one pass over its lines.
+
+    The result is immutable and memoized by content, so the enforcer, the converter's
+    rationalizer and the POI extractor reuse one parse of the same document.
+    """
+    return _parse_cached(normalize_markdown(markdown))
+
+
+@lru_cache(maxsize=256)
+def _parse_cached(normalized: str) -> ItineraryDocument:
+    title = ""
+    days: list[ItineraryDay] = []
+    appendix: list[str] = []
+    issues: list[ItineraryIssue] = []
+    skipped: list[int] = []
+
+    # Current day being built (finalized into an ItineraryDay on the next heading / EOF).
+    day_head: tuple[int, int, bool, str, str, str] | None = None
+    day_items: list[ItineraryItem] = []
+
+    def close_day() -> None:
+        if day_head is None:
+            return
+        number, line_no, strict, date, inline_item, day_title = day_head
+        if not inline_item and not any(it.issue is None for it in day_items):
+            issues.append(
+                ItineraryIssue(
+                    ISSUE_DAY_WITHOUT_ITEMS,
+                    line_no,
+                    f"Day {number} 下未找到任何行项目（以 \"-\" 开头）",
+                )
+            )
+        days.append(ItineraryDay(number, line_no, strict, date, inline_item, tuple(day_items), day_title))
+
+    for i, raw in enumerate(normalized.split("\n"), start=1):
+        line = raw.strip()
         if not line:
             continue
 
-        if line.startswith("# "):
+        first = line[0]
+        if first == "#" and line.startswith("# ") and not _DAY_MARKER.match(line):
+            if title:
+                skipped.append(i)
+            else:
+                title = line[2:].strip()
             continue
-        if line.startswith(">"):
+        if first == ">":
+            text = line[1:].strip()
+            if text and not text.startswith("版本"):
+                appendix.append(text)
             continue
 
-        parsed = _parse_day_heading(line)
-        if parsed is not None:
-            day_number, inline_item = parsed
-            if in_day and not current_day_has_item and current_day_number is not None:
-                errors.append(f"Day {current_day_number} 下未找到任何行项目（以 \"-\" 开头）")
-            in_day = True
-            current_day_has_item = False
-            current_day_number = day_number
-            days += 1
-            if inline_item:
-                current_day_has_item = True
-                total_items += 1
+        heading = _match_day_heading(line)
+        if heading is not None:
+            close_day()
+            day_head = (heading[0], i, heading[1], heading[2], heading[3], heading[4])
+            day_items = []
+            continue
+        if first in "#*" and _DAY_MARKER.match(line):
+            issues.append(ItineraryIssue(ISSUE_UNRECOGNIZED, i, f"第 {i} 行：无法识别的 Day 标题（请使用「## Day N（日期）」）"))
             continue
 
-        if line.startswith("- "):
-            if not in_day or current_day_number is None:
-                errors.append(f"第 {i + 1} 行：行项目必须放在某个 Day 标题下方")
+        if first == "-" and line.startswith("- "):
+            if day_head is None:
+                issues.append(ItineraryIssue(ISSUE_ITEM_OUTSIDE_DAY, i, f"第 {i} 行：行项目必须放在某个 Day 标题下方"))
                 continue
-            err = _validate_item_line(line)
-            if err:
-                errors.append(f"第 {i + 1} 行：{err}")
-                continue
-            current_day_has_item = True
-            total_items += 1
+            item = _parse_item_line(line, i)
+            if item.issue is not None:
+                issues.append(ItineraryIssue(item.issue, i, f"第 {i} 行：{_ISSUE_MESSAGES[item.issue]}"))
+            day_items.append(item)
             continue
 
-        if not in_day:
+        if day_head is None:
+            skipped.append(i)
             continue
 
-        errors.append(f"第 {i + 1} 行：无法识别的内容（请使用 Day 标题或 \"-\" 行项目）")
+        issues.append(ItineraryIssue(ISSUE_UNRECOGNIZED, i, f"第 {i} 行：无法识别的内容（请使用 Day 标题或 \"-\" 行项目）"))
+
+    close_day()
+    if not days:
+        issues.append(ItineraryIssue(ISSUE_NO_DAY_HEADING, None, "未找到任何 Day 标题（例如：## Day 1（日期））"))
 
-    if days == 0:
-        errors.append("未找到任何 Day 标题（例如：## Day 1（日期））")
-    elif in_day and not current_day_has_item and current_day_number is not None:
-        errors.append(f"Day {current_day_number} 下未找到任何行项目（以 \"-\" 开头）")
+    return ItineraryDocument(
+        title=title,
+        days=tuple(days),
+        appendix=tuple(appendix),
+        issues=tuple(issues),
+        skipped_lines=tuple(skipped),
+    )
 
+
+def validate(markdown: str | None) -> dict[str, Any]:
+    """
+    Validate itinerary markdown v2.
+
+    Returns `errors` (human-readable strings, also sent to the LLM fixer) and `issues`
+    (the same problems as dicts with `code`, `line` (1-based, None for document-level)
+    and `message`), which the deterministic repair pass consumes.
+    """
+    doc = parse(markdown)
+    issues = [{"code": it.code, "line": it.line, "message": it.message} for it in doc.issues]
     return {
-        "valid": len(errors) == 0,
-        "errors": errors,
-        "days": days,
-        "items": total_items,
+        "valid": len(issues) == 0,
+        "errors": [issue["message"] for issue in issues],
+        "issues": issues,
+        "days": len(doc.days),
+        "items": doc.item_count,
     }
 
 
@@ -121,77 +258,103 @@ def itinerary_to_markdown_v2(itinerary: dict[str, Any] | None) -> str:
     return "\n".join(out).rstrip() + "\n"
 
 
-def _validate_item_line(line: str) -> str | None:
-    trimmed = normalize_markdown(line).lstrip()
-    trimmed = re.sub(r"^\-\s*", "", trimmed, count=1)
-    parts = trimmed.split("|")
-    if len(parts) < 2:
-        return "行项目格式错误：需要至少包含「时间 | 活动」"
+_ISSUE_MESSAGES = {
+    ISSUE_ITEM_FORMAT: "行项目格式错误：需要至少包含「时间 | 活动」",
+    ISSUE_EMPTY_ACTIVITY: "活动不能为空",
+    ISSUE_TIME_FORMAT: "时间格式错误：应为「HH:MM - HH:MM」（结束时间可留空）",
+}
 
-    time_range = _normalize_time_range(parts[0].strip())
-    activity = _strip_invisible(parts[1]).strip()
-    if not activity:
-        return "活动不能为空"
 
-    if not _TIME_RANGE.match(time_range):
-        return "时间格式错误：应为「HH:MM - HH:MM」（结束时间可留空）"
+def _parse_item_line(line: str, line_no: int) -> ItineraryItem:
+    """Split an already-normalized "- ..." line into columns (extra columns beyond 4 are ignored)."""
+    parts = _ITEM_PREFIX.sub("", line, count=1).split("|")
+    if len(parts) < 2:
+        return ItineraryItem(line_no, "", "", "", "", "", ISSUE_ITEM_FORMAT)
 
-    return None
+    activity = parts[1].strip()
+    location = parts[2].strip() if len(parts) > 2 else ""
+    note = parts[3].strip() if len(parts) > 3 else ""
+    if not activity:
+        return ItineraryItem(line_no, "", "", activity, location, note, ISSUE_EMPTY_ACTIVITY)
 
+    m = _TIME_RANGE.match(_normalize_time_range(parts[0].strip()))
+    if not m:
+        return ItineraryItem(line_no, "", "", activity, location, note, ISSUE_TIME_FORMAT)
+    return ItineraryItem(line_no, m.group(1), m.group(2), activity, location, note)
 
-def _normalize_line(line: str | None) -> str:
-    return _strip_invisible("" if line is None else str(line)).strip()
 
+def _match_day_heading(line: str) -> tuple[int, bool, str, str, str] | None:
+    """Return (day number, strict, date, inline item, title) for a Day heading line."""
+    first = line[0]
+    # Cheap first-character gate: every heading form starts with '#', '*', 'D/d' or '第'.
+    if first not in "#*Dd第":
+        return None
 
-def _parse_day_heading(line: str) -> tuple[int, str] | None:
-    """
-    Accepts strict v2 headings:
-      - ## Day 1（可选日期）
-    And also looser, user-authored headings:
-      - DAY1：A→B→C
-      - Day 2: ...
-      - 第1天：...
-    """
     m_strict = _DAY_HEADING_STRICT.match(line)
     if m_strict:
         day_number = _safe_int(m_strict.group(1))
         if day_number is None:
             return None
-        return (day_number, "")
+        return (day_number, True, (m_strict.group(2) or "").strip(), "", "")
 
     m_loose = _DAY_HEADING_LOOSE.match(line)
     if m_loose:
         day_number = _safe_int(m_loose.group(1))
         if day_number is None:
             return None
-        inline_item = (m_loose.group(4) or "").strip()
-        return (day_number, inline_item)
+        date = (m_loose.group(2) or m_loose.group(3) or "").strip()
+        return (day_number, False, date, (m_loose.group(4) or "").strip(), "")
 
     m_cn = _DAY_HEADING_CN.match(line)
     if m_cn:
         day_number = _safe_int(m_cn.group(1))
         if day_number is None:
             return None
-        inline_item = (m_cn.group(2) or "").strip()
-        return (day_number, inline_item)
+        return (day_number, False, "", (m_cn.group(2) or "").strip(), "")
+
+    m_titled = _DAY_HEADING_TITLED.match(line)
+    if m_titled:
+        day_number = _safe_int(m_titled.group(1))
+        if day_number is None:
+            return None
+        return (day_number, False, "", "", m_titled.group(2).strip())
 
     return None
 
 
+def _parse_day_heading(line: str) -> tuple[int, str] | None:
+    """
+    Accepts strict v2 headings:
+      - ## Day 1（可选日期）
+    And also looser, user-authored headings:
+      - DAY1：A→B→C
+      - Day 2: ...
+      - 第1天：...
+      - ## Day 2 苏州古城
+    """
+    line = (line or "").strip()
+    if not line:
+        return None
+    matched = _match_day_heading(line)
+    if matched is None:
+        return None
+    return (matched[0], matched[3])
+
+
 def _normalize_time_range(time_range: str | None) -> str:
     if time_range is None:
         return ""
     s = _strip_invisible(str(time_range))
     s = s.replace("：", ":")
-    s = re.sub(r"[—–－‐‑‒―−~〜～﹣]", "-", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _DASHES.sub("-", s)
+    s = _WHITESPACE.sub(" ", s).strip()
     return s
 
 
 def _strip_invisible(s: str | None) -> str:
     if s is None:
         return ""
-    return re.sub(r"[\u200B-\u200F\u202A-\u202E\u2060\uFEFF]", "", str(s))
+    return _INVISIBLE.sub("", str(s))
 
 
 def _safe_int(s: str | None) -> int | None:
@@ -3,7 +3,14 @@ from __future__ import annotations
 import re
 
 from src.integrations.openai_client import OpenAIClient
+from src.models.config import settings
+from src.services.ai_cache import UncachedResult, content_cache_key, markdown_result_cache
 from src.services.itinerary_markdown_enforcer import ensure_valid_itinerary_markdown
+from src.services.itinerary_markdown_v2 import normalize_markdown
+from src.services.itinerary_markdown_v2 import parse as parse_itinerary_markdown
+
+# Bump when the convert prompt, schema rendering or rationalizer changes so cached results are invalidated.
+_CONVERT_CACHE_VERSION = "v2"
 
 
 def _looks_like_standard_itinerary_markdown(md: str) -> bool:
@@ -60,6 +67,7 @@ def _looks_like_low_quality_itinerary_markdown(md: str) -> bool:
     return False
 
 
+_MD_DAY_HEADING_RE = re.compile(r"^##\s*Day\s*\d+(.*)$", re.IGNORECASE)
 _DAY_HEADER_RE = re.compile(r"(?im)^\s*(第\s*[一二三四五六七八九十\d]+\s*天|d\s*\d+|day\s*\d+)\s*[:：]?\s*(.*)$")
 _TIME_RANGE_RE = re.compile(r"[（(]\s*(\d{1,2})\s*[:：]\s*(\d{2})\s*[-~–—]\s*(\d{1,2})\s*[:：]\s*(\d{2})\s*[)）]")
 _TIME_HINT_RE = re.compile(r"(早上|上午|中午|下午|傍晚|晚上|夜间)")
@@ -500,7 +508,7 @@ class MarkdownConverter:
             f"{text}\n"
         )
 
-        try:
+        async def _convert() -> str:
             result = await self._client.generate_json(
                 prompt,
                 model=model,
@@ -523,25 +531,30 @@ class MarkdownConverter:
                     max_attempts=3,
                     model=model,
                 )
-                return _rationalize_itinerary_markdown_v2(enforced["markdown"])
+                converted = _rationalize_itinerary_markdown_v2(enforced["markdown"])
+                if enforced["fallback_used"]:
+                    raise UncachedResult(converted)
+                return converted
 
             # Fall back to deterministic conversion for better UX.
-            return _rationalize_itinerary_markdown_v2(_fallback_convert_to_itinerary_markdown_v2(text))
-        except Exception:
-            raise
-
-
-_V2_DAY_HEADING_RE = re.compile(r"(?im)^\s*##\s*Day\s*(\d+)\b")
+            raise UncachedResult(_rationalize_itinerary_markdown_v2(_fallback_convert_to_itinerary_markdown_v2(text)))
+
+        if not settings.markdown_cache_enabled:
+            try:
+                return await _convert()
+            except UncachedResult as uncached:
+                return uncached.value
+        cache_key = content_cache_key(
+            "convert",
+            version=_CONVERT_CACHE_VERSION,
+            model=model or settings.openai_model,
+            content=text,
+        )
+        return await markdown_result_cache.get_or_load(cache_key, _convert)
 
 
 def _extract_day_numbers_from_v2(md: str) -> set[int]:
-    out: set[int] = set()
-    for m in _V2_DAY_HEADING_RE.finditer(md or ""):
-        try:
-            out.add(int(m.group(1)))
-        except Exception:
-            continue
-    return out
+    return {day.number for day in parse_itinerary_markdown(md).days}
 
 
 def _extract_explicit_day_markers(text: str) -> set[int]:
@@ -646,56 +659,38 @@ def _rationalize_itinerary_markdown_v2(md: str) -> str:
 
 
 def _parse_itinerary_markdown_v2(md: str) -> list[dict[str, object]]:
-    text = (md or "").replace("\r", "").strip()
-    if not text:
-        return []
-
-    days: list[dict[str, object]] = []
-    current: dict[str, object] | None = None
-
-    for raw in text.split("\n"):
-        line = raw.strip()
-        if not line:
-            continue
-        if line.startswith("# "):
-            continue
-        if line.startswith(">"):
-            continue
-
-        m_day = re.match(r"^##\s*Day\s*(\d+)(.*)$", line, flags=re.IGNORECASE)
-        if m_day:
-            day_no = int(m_day.group(1))
-            suffix = (m_day.group(2) or "").rstrip()
-            current = {"day": day_no, "heading_suffix": suffix, "items": []}
-            days.append(current)
+    """
+    "## Day N..." days of the shared v2 parse. Non-canonical "## Day" headings
+    (## Day 1：抵达苏州, ## Day 2(2026-01-20), ## Day 3 苏州古城) keep their original suffix; headings without
+    "##" (DAY1：A→B) carry their route inline rather than as items and are left out.
+    """
+    doc = parse_itinerary_markdown(md)
+    lines = normalize_markdown(md).split("\n")
+    days = []
+    for day in doc.days:
+        if day.strict:
+            days.append((day, day.heading_suffix))
             continue
-
-        if line.startswith("- ") and current is not None:
-            body = line[2:].strip()
-            cols = [c.strip() for c in body.split("|")]
-            while len(cols) < 4:
-                cols.append("")
-            time_range = cols[0]
-            activity = cols[1]
-            location = cols[2]
-            note = cols[3]
-
-            m_tr = re.match(r"^\s*(\d{1,2}:\d{2})\s*-\s*(\d{0,2}:?\d{0,2})\s*$", time_range)
-            if not m_tr:
-                continue
-            start = _pad_hhmm(m_tr.group(1))
-            end = _pad_hhmm(m_tr.group(2))
-            current["items"].append(
+        m = _MD_DAY_HEADING_RE.match(lines[day.line - 1].strip())
+        if m:
+            days.append((day, m.group(1).rstrip()))
+    return [
+        {
+            "day": day.number,
+            "heading_suffix": heading_suffix,
+            "items": [
                 {
-                    "time_start": start,
-                    "time_end": end,
-                    "activity": activity,
-                    "location": location,
-                    "note": note,
+                    "time_start": _pad_hhmm(it.time_start),
+                    "time_end": _pad_hhmm(it.time_end),
+                    "activity": it.activity,
+                    "location": it.location,
+                    "note": it.note,
                 }
-            )
-
-    return days
+                for it in day.valid_items
+            ],
+        }
+        for day, heading_suffix in days
+    ]
 
 
 def _pad_hhmm(v: str) -> str:
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from src.integrations.openai_client import OpenAIClient
+from src.models.config import settings
+from src.services.ai_cache import UncachedResult, content_cache_key, markdown_result_cache
 from src.services.plan_generation import _extract_pois_by_day_from_markdown
 
+# Bump when the optimize prompt or guardrail changes so cached results are invalidated.
+_OPTIMIZE_CACHE_VERSION = "v1"
+
 
 class MarkdownOptimizer:
     def __init__(self) -> None:
@@ -62,7 +67,7 @@ class MarkdownOptimizer:
             f"{text}\n"
         )
 
-        try:
+        async def _optimize() -> str:
             result = await self._client.generate_json(
                 prompt,
                 model=model,
@@ -71,9 +76,23 @@ class MarkdownOptimizer:
             )
             content = (result.get("markdown_content") or "").strip()
             if not content:
-                return text
+                raise UncachedResult(text)
             if self._drops_user_pois(text, content):
-                return text
+                raise UncachedResult(text)
             return content
+
+        try:
+            if not settings.markdown_cache_enabled:
+                try:
+                    return await _optimize()
+                except UncachedResult as uncached:
+                    return uncached.value
+            cache_key = content_cache_key(
+                "optimize",
+                version=_OPTIMIZE_CACHE_VERSION,
+                model=model or settings.openai_model,
+                content=text,
+            )
+            return await markdown_result_cache.get_or_load(cache_key, _optimize)
         except Exception:
             return text
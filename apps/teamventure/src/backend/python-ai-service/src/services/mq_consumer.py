@@ -3,26 +3,51 @@ RabbitMQ 消费者模块
 
 负责：
 1. 监听 Java 服务发送的方案生成请求
-2. 触发 LangGraph 工作流
-3. 回调 Java 服务写入生成结果
+2. 由固定数量的 worker 并发执行 LangGraph 工作流（并发度与 prefetch 分开配置）
+3. 通过回调队列（连接池 + 指数退避重试）回调 Java 服务写入生成结果
+4. 生成失败 / 回调最终失败的消息写入死信队列
+
+消息确认时机：回调成功或写入死信队列之后才 ack；进程中途退出时未 ack 的消息会被
+broker 重新投递（重复生成可命中 AI 缓存）。
 """
 
+import asyncio
 import json
 import logging
+import time
 from typing import Any
 
 import aio_pika
-from aio_pika.abc import AbstractIncomingMessage, AbstractRobustChannel, AbstractRobustConnection
+from aio_pika.abc import (
+    AbstractExchange,
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustChannel,
+    AbstractRobustConnection,
+)
 
-from src.integrations.java_client import JavaCallbackClient
+from src.integrations.java_client import CallbackDispatcher, CallbackJob
 from src.langgraph.workflow import run_generation_workflow
 from src.models.config import settings
+from src.utils.mq_metrics import (
+    MQ_BROKER_QUEUE_DEPTH,
+    MQ_DEAD_LETTERS_TOTAL,
+    MQ_INFLIGHT_MESSAGES,
+    MQ_MESSAGE_PROCESSING_SECONDS,
+    MQ_PENDING_MESSAGES,
+)
 
 logger = logging.getLogger(__name__)
 
 _connection: AbstractRobustConnection | None = None
 _channel: AbstractRobustChannel | None = None
 _consumer_tag: str | None = None
+_request_queue: AbstractQueue | None = None
+_dead_letter_exchange: AbstractExchange | None = None
+_work_queue: "asyncio.Queue[AbstractIncomingMessage] | None" = None
+_workers: list[asyncio.Task] = []
+_sampler: asyncio.Task | None = None
+_dispatcher: CallbackDispatcher | None = None
 
 
 def _amqp_url() -> str:
@@ -35,7 +60,8 @@ def _amqp_url() -> str:
 async def start_mq_consumer():
     """启动MQ消费者"""
     logger.info("Starting MQ consumer...")
-    global _connection, _channel, _consumer_tag
+    global _connection, _channel, _consumer_tag, _request_queue, _dead_letter_exchange
+    global _work_queue, _workers, _sampler, _dispatcher
 
     if _connection is not None:
         logger.info("MQ consumer already started")
@@ -43,44 +69,167 @@ async def start_mq_consumer():
 
     _connection = await aio_pika.connect_robust(_amqp_url())
     _channel = await _connection.channel()
-    await _channel.set_qos(prefetch_count=5)
+    await _channel.set_qos(prefetch_count=int(settings.mq_prefetch_count))
 
     exchange = await _channel.declare_exchange(
         settings.mq_exchange,
         aio_pika.ExchangeType.TOPIC,
         durable=True,
     )
-    queue = await _channel.declare_queue(settings.mq_queue, durable=True)
-    await queue.bind(exchange, routing_key=settings.mq_routing_key)
+    _request_queue = await _channel.declare_queue(settings.mq_queue, durable=True)
+    await _request_queue.bind(exchange, routing_key=settings.mq_routing_key)
+
+    _dead_letter_exchange = await _channel.declare_exchange(
+        settings.mq_dead_letter_exchange,
+        aio_pika.ExchangeType.FANOUT,
+        durable=True,
+    )
+    dead_letter_queue = await _channel.declare_queue(settings.mq_dead_letter_queue, durable=True)
+    await dead_letter_queue.bind(_dead_letter_exchange)
+
+    _dispatcher = CallbackDispatcher()
+    _dispatcher.start()
+
+    _work_queue = asyncio.Queue()
+    _workers = [
+        asyncio.create_task(_worker_loop(_work_queue), name=f"mq-worker-{i}")
+        for i in range(max(1, int(settings.mq_worker_concurrency)))
+    ]
+    _sampler = asyncio.create_task(_sample_queue_depth(), name="mq-queue-depth")
 
     async def on_message(message: AbstractIncomingMessage) -> None:
-        async with message.process(ignore_processed=True, requeue=False):
-            body = message.body.decode("utf-8")
-            payload: dict[str, Any] = json.loads(body)
-            logger.info("Received plan generation message: %s", payload.get("plan_request_id"))
-
-            state = await run_generation_workflow(payload)
-            if state.get("error"):
-                logger.error("Plan generation failed: %s", state["error"])
-                return
-
-            callback_payload = {
-                "plan_request_id": state["plan_request_id"],
-                "user_id": state["user_id"],
-                "plans": state.get("generated_plans", []),
-                "trace_id": payload.get("trace_id"),
-            }
-            client = JavaCallbackClient()
-            await client.post_generated_plans(callback_payload)
+        # Hand off to the worker pool; prefetch bounds how many can pile up here.
+        assert _work_queue is not None
+        await _work_queue.put(message)
+        MQ_PENDING_MESSAGES.set(_work_queue.qsize())
+
+    _consumer_tag = await _request_queue.consume(on_message)
+    logger.info(
+        "MQ consumer ready: exchange=%s queue=%s prefetch=%s workers=%s",
+        settings.mq_exchange,
+        settings.mq_queue,
+        settings.mq_prefetch_count,
+        len(_workers),
+    )
+
 
-    _consumer_tag = await queue.consume(on_message)
-    logger.info("MQ consumer ready: exchange=%s queue=%s", settings.mq_exchange, settings.mq_queue)
+async def _worker_loop(work_queue: "asyncio.Queue[AbstractIncomingMessage]") -> None:
+    while True:
+        message = await work_queue.get()
+        MQ_PENDING_MESSAGES.set(work_queue.qsize())
+        MQ_INFLIGHT_MESSAGES.inc()
+        try:
+            await _process_message(message)
+        except Exception:
+            logger.exception("MQ worker error")
+        finally:
+            MQ_INFLIGHT_MESSAGES.dec()
+            work_queue.task_done()
+
+
+async def _process_message(message: AbstractIncomingMessage) -> None:
+    start = time.perf_counter()
+    try:
+        payload: dict[str, Any] = json.loads(message.body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        logger.error("Invalid plan generation message: %s", exc)
+        await _dead_letter_and_settle(message, message.body, reason="invalid_message", stage="request")
+        return
+
+    plan_request_id = payload.get("plan_request_id")
+    logger.info("Received plan generation message: %s", plan_request_id)
+
+    try:
+        state = await run_generation_workflow(payload)
+    except Exception as exc:
+        state = {"error": str(exc) or exc.__class__.__name__}
+
+    if state.get("error"):
+        MQ_MESSAGE_PROCESSING_SECONDS.labels(outcome="failed").observe(time.perf_counter() - start)
+        logger.error("Plan generation failed: %s", state["error"])
+        await _dead_letter_and_settle(
+            message, message.body, reason="generation_failed", stage="request", error=state["error"]
+        )
+        return
+
+    MQ_MESSAGE_PROCESSING_SECONDS.labels(outcome="success").observe(time.perf_counter() - start)
+
+    callback_payload = {
+        "plan_request_id": state["plan_request_id"],
+        "user_id": state["user_id"],
+        "plans": state.get("generated_plans", []),
+        "trace_id": payload.get("trace_id"),
+    }
+
+    async def on_dead_letter(reason: str) -> None:
+        body = json.dumps(callback_payload, ensure_ascii=False).encode("utf-8")
+        await _dead_letter_and_settle(message, body, reason=reason, stage="callback")
+
+    assert _dispatcher is not None
+    await _dispatcher.submit(
+        CallbackJob(
+            payload=callback_payload,
+            mode="v2" if payload.get("markdown_content") else "v1",
+            on_delivered=message.ack,
+            on_dead_letter=on_dead_letter,
+        )
+    )
+
+
+async def _dead_letter_and_settle(
+    message: AbstractIncomingMessage,
+    body: bytes,
+    *,
+    reason: str,
+    stage: str,
+    error: str | None = None,
+) -> None:
+    """Dead-letter then ack; if the DLQ publish fails, requeue the original so its prefetch slot is released."""
+    try:
+        await _dead_letter(body, reason=reason, stage=stage, error=error)
+    except Exception:
+        logger.exception("Dead-letter publish failed; requeueing stage=%s reason=%s", stage, reason)
+        await message.nack(requeue=True)
+        return
+    await message.ack()
+
+
+async def _dead_letter(body: bytes, *, reason: str, stage: str, error: str | None = None) -> None:
+    """Publish a failed request (stage=request) or undeliverable callback (stage=callback) to the DLQ."""
+    MQ_DEAD_LETTERS_TOTAL.labels(reason=reason).inc()
+    if _dead_letter_exchange is None:
+        logger.error("Dead-letter exchange unavailable; dropping stage=%s reason=%s body=%r", stage, reason, body[:2000])
+        return
+    headers: dict[str, Any] = {"x-failure-stage": stage, "x-failure-reason": reason}
+    if error:
+        headers["x-failure-error"] = error[:500]
+    await _dead_letter_exchange.publish(
+        aio_pika.Message(
+            body=body,
+            headers=headers,
+            content_type="application/json",
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        ),
+        routing_key=settings.mq_dead_letter_queue,
+    )
+
+
+async def _sample_queue_depth() -> None:
+    while True:
+        try:
+            if _request_queue is not None:
+                declared = await _request_queue.declare()
+                MQ_BROKER_QUEUE_DEPTH.set(declared.message_count or 0)
+        except Exception as exc:
+            logger.debug("Failed to sample MQ queue depth: %s", exc)
+        await asyncio.sleep(float(settings.mq_queue_depth_sample_seconds))
 
 
 async def stop_mq_consumer():
     """停止MQ消费者"""
     logger.info("Stopping MQ consumer...")
-    global _connection, _channel, _consumer_tag
+    global _connection, _channel, _consumer_tag, _request_queue, _dead_letter_exchange
+    global _work_queue, _workers, _sampler, _dispatcher
 
     try:
         if _channel is not None and _consumer_tag is not None:
@@ -88,11 +237,26 @@ async def stop_mq_consumer():
     finally:
         _consumer_tag = None
 
+    # Unacked messages (in workers or the callback queue) are redelivered by the broker.
+    tasks = list(_workers) + ([_sampler] if _sampler is not None else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers, _sampler, _work_queue = [], None, None
+
+    try:
+        if _dispatcher is not None:
+            await _dispatcher.stop()
+    finally:
+        _dispatcher = None
+
     try:
         if _channel is not None:
             await _channel.close()
     finally:
         _channel = None
+        _request_queue = None
+        _dead_letter_exchange = None
 
     try:
         if _connection is not None:
@@ -11,45 +11,39 @@
 """
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import logging
 import re
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
 from src.integrations.openai_client import OpenAIClient
 from src.integrations.amap_client import AmapClient
+from src.services.ai_cache import AICache
 from src.services.id_generator import new_prefixed_id
+from src.services.itinerary_markdown_v2 import parse as parse_itinerary_markdown
 from src.models.config import settings
 
 logger = logging.getLogger(__name__)
 
-# ============ Redis缓存客户端（懒加载）============
-_redis_client = None
+# ============ AI缓存（L1内存 + L2 redis.asyncio，带 single-flight 合并）============
 _MARKDOWN_PLAN_CACHE_VERSION = "v3_poi_guardrail_20260119_bold_day"
+_plan_cache = AICache(name="plan")
+_markdown_plan_cache = AICache(name="markdown_plan")
 
+# 缓存中不保存的请求级字段（每次返回时重新生成/填充）
+_PLAN_IDENTITY_FIELDS = ("plan_id", "plan_request_id", "user_id")
 
-def _get_redis_client():
-    """获取Redis客户端（懒加载）"""
-    global _redis_client
-    if _redis_client is None and settings.ai_cache_enabled:
-        try:
-            import redis
-            _redis_client = redis.Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                password=settings.redis_password,
-                db=settings.redis_db,
-                decode_responses=True,
-            )
-            # 测试连接
-            _redis_client.ping()
-            logger.info("Redis AI cache connected successfully")
-        except Exception as exc:
-            logger.warning(f"Failed to connect to Redis for AI cache: {exc}")
-            _redis_client = False  # 标记为不可用
-    return _redis_client if _redis_client is not False else None
+
+def _stamp_plan_identity(plan: dict[str, Any], *, plan_request_id: str, user_id: str) -> dict[str, Any]:
+    """为缓存/合并得到的方案填充本次请求的ID（避免ID重复）"""
+    plan["plan_id"] = new_prefixed_id("plan")
+    plan["plan_request_id"] = plan_request_id
+    plan["user_id"] = user_id
+    return plan
 
 
 def _generate_cache_key(inputs: dict[str, Any]) -> str:
@@ -181,33 +175,53 @@ def _normalize_generated_plans(
     if not isinstance(plans, list) or len(plans) != 3:
         raise ValueError("LLM response must include plans: [..3 items..]")
 
-    normalized: list[dict[str, Any]] = []
-    for plan in plans:
-        if not isinstance(plan, dict):
-            raise ValueError("Each plan must be an object")
-        normalized.append(
-            {
-                "plan_id": new_prefixed_id("plan"),
-                "plan_request_id": plan_request_id,
-                "user_id": user_id,
-                "plan_type": str(plan.get("plan_type", "")),
-                "plan_name": str(plan.get("plan_name", "")),
-                "summary": str(plan.get("summary", "")),
-                "highlights": plan.get("highlights", []),
-                "itinerary": plan.get("itinerary", {}),
-                "budget_breakdown": plan.get("budget_breakdown", {}),
-                # MVP 不输出供应商信息，但数据库字段仍为 NOT NULL，统一写空数组
-                "supplier_snapshots": [],
-                "budget_total": float(plan.get("budget_total", 0.0) or 0.0),
-                "budget_per_person": float(plan.get("budget_per_person", 0.0) or 0.0),
-                "duration_days": duration_days,
-                "departure_city": departure_city,  # 出发城市（从输入获取，非LLM生成）
-                "destination": destination,        # 目的地（从输入获取，非LLM生成）
-                "destination_city": destination_city,  # 目的地城市（可由上游/高德补全）
-                "status": "draft",
-            }
+    return [
+        _normalize_generated_plan(
+            plan,
+            plan_request_id=plan_request_id,
+            user_id=user_id,
+            duration_days=duration_days,
+            departure_city=departure_city,
+            destination=destination,
+            destination_city=destination_city,
         )
-    return normalized
+        for plan in plans
+    ]
+
+
+def _normalize_generated_plan(
+    plan: Any,
+    *,
+    plan_request_id: str,
+    user_id: str,
+    duration_days: int,
+    departure_city: str,
+    destination: str,
+    destination_city: str,
+) -> dict[str, Any]:
+    """规范化单个 LLM 方案（流式生成时每收到一个方案即调用）"""
+    if not isinstance(plan, dict):
+        raise ValueError("Each plan must be an object")
+    return {
+        "plan_id": new_prefixed_id("plan"),
+        "plan_request_id": plan_request_id,
+        "user_id": user_id,
+        "plan_type": str(plan.get("plan_type", "")),
+        "plan_name": str(plan.get("plan_name", "")),
+        "summary": str(plan.get("summary", "")),
+        "highlights": plan.get("highlights", []),
+        "itinerary": plan.get("itinerary", {}),
+        "budget_breakdown": plan.get("budget_breakdown", {}),
+        # MVP 不输出供应商信息，但数据库字段仍为 NOT NULL，统一写空数组
+        "supplier_snapshots": [],
+        "budget_total": float(plan.get("budget_total", 0.0) or 0.0),
+        "budget_per_person": float(plan.get("budget_per_person", 0.0) or 0.0),
+        "duration_days": duration_days,
+        "departure_city": departure_city,  # 出发城市（从输入获取，非LLM生成）
+        "destination": destination,        # 目的地（从输入获取，非LLM生成）
+        "destination_city": destination_city,  # 目的地城市（可由上游/高德补全）
+        "status": "draft",
+    }
 
 
 # ============ 预算合理性校验 ============
@@ -445,19 +459,15 @@ async def generate_plan_from_markdown(
     # === 2. 缓存检查 ===
     markdown_hash = hashlib.sha256((markdown_content or "").encode("utf-8")).hexdigest()[:16]
     cache_key = f"markdown_plan:{_MARKDOWN_PLAN_CACHE_VERSION}:{markdown_hash}"
-    redis = _get_redis_client()
-    if redis and settings.ai_cache_enabled:
-        try:
-            cached = redis.get(cache_key)
-            if cached:
-                logger.info(f"AI缓存命中 cache_key={cache_key}")
-                cached_plan = json.loads(cached)
-                cached_plan["plan_id"] = new_prefixed_id("plan")
-                cached_plan["plan_request_id"] = plan_request_id
-                cached_plan["user_id"] = user_id
-                return [cached_plan]
-        except Exception as exc:
-            logger.warning(f"读取AI缓存失败: {exc}")
+    use_cache = settings.ai_cache_enabled
+    if use_cache:
+        cached_plan = await _markdown_plan_cache.get(cache_key)
+        if cached_plan:
+            logger.info(f"AI缓存命中 cache_key={cache_key}")
+            cached_plan = _stamp_plan_identity(cached_plan, plan_request_id=plan_request_id, user_id=user_id)
+            if desired_plan_name:
+                cached_plan["plan_name"] = desired_plan_name
+            return [cached_plan]
 
     # === 3. API Key检查 ===
     client = OpenAIClient()
@@ -537,7 +547,7 @@ async def generate_plan_from_markdown(
         '- 确保JSON格式完全正确，所有字段都必须存在\n'
     )
 
-    try:
+    async def _generate() -> dict[str, Any]:
         raw = await client.generate_json(prompt)
         plan = _normalize_single_plan(raw, plan_request_id, user_id, markdown_content)
         if desired_plan_name:
@@ -546,15 +556,17 @@ async def generate_plan_from_markdown(
         plan = _remove_empty_placeholder_items(plan)
         plan = _ensure_itinerary_contains_all_pois(plan, extracted_pois_by_day)
         plan = _sanitize_itinerary_times(plan)
+        return plan
 
-        # 写入缓存
-        if redis and settings.ai_cache_enabled:
-            try:
-                redis.setex(cache_key, settings.ai_cache_ttl_seconds, json.dumps(plan))
-                logger.info(f"AI结果已缓存 cache_key={cache_key}")
-            except Exception as exc:
-                logger.warning(f"写入AI缓存失败: {exc}")
+    try:
+        if not use_cache:
+            return [await _generate()]
 
+        # 相同 Markdown 的并发请求只触发一次 LLM 调用，结果写入缓存
+        plan = await _markdown_plan_cache.load_once(cache_key, _generate)
+        plan = _stamp_plan_identity(plan, plan_request_id=plan_request_id, user_id=user_id)
+        if desired_plan_name:
+            plan["plan_name"] = desired_plan_name
         return [plan]
     except Exception as exc:
         logger.exception("LLM生成失败，降级到mock方案")
@@ -652,8 +664,27 @@ def _extract_pois_by_day_from_markdown(markdown: str) -> dict[int, list[str]]:
 
     current_day: int | None = None
     pois: dict[int, list[str]] = {}
+    lines = text.split("\n")
+
+    # Fast path: canonical v2 markdown (e.g. the optimizer's input/output) reuses the shared
+    # single-pass parse instead of rescanning every line with the loose patterns below.
+    doc = parse_itinerary_markdown(markdown)
+    if (
+        doc.is_canonical
+        and not day_header.match(f"# {doc.title}")
+        and not any(sep.search(d.date) for d in doc.days)
+    ):
+        for d in doc.days:
+            day_pois = pois.setdefault(d.number, [])
+            for it in d.valid_items:
+                candidate = it.location or it.activity
+                for p in [x.strip() for x in re.split(r"[、,，]\s*", candidate) if x.strip()]:
+                    normalized_name = normalize_poi_name(p)
+                    if normalized_name:
+                        day_pois.append(normalized_name)
+        lines = []
 
-    for line in text.split("\n"):
+    for line in lines:
         s = line.strip()
         if not s:
             continue
@@ -1169,14 +1200,6 @@ async def generate_three_plans(
     2. 缓存机制：相同输入24小时内直接返回缓存结果
     3. Fallback：API key未配置时自动降级到stub
     """
-    people = int(inputs["people_count"])
-    duration_days = int(inputs["duration_days"])
-    # 正确区分出发城市和目的地
-    departure_city = inputs.get("departure_city") or "出发地"  # 出发城市
-    destination = inputs.get("destination") or "目的地"        # 团建活动举办地点
-    destination_city = inputs.get("destination_city") or ""   # 目的地所属城市（用于季节/价格配置）
-    targets = _budget_targets(inputs)
-
     # === 1. Mock模式检查 ===
     if settings.enable_ai_mock:
         logger.info("AI Mock模式已启用，使用确定性stub生成（节省token）")
@@ -1188,21 +1211,16 @@ async def generate_three_plans(
 
     # === 2. 缓存检查 ===
     cache_key = _generate_cache_key(inputs)
-    redis = _get_redis_client()
-    if redis and settings.ai_cache_enabled:
-        try:
-            cached = redis.get(cache_key)
-            if cached:
-                logger.info(f"AI缓存命中 cache_key={cache_key}，跳过LLM调用")
-                cached_plans = json.loads(cached)
-                # 更新 plan_id 和 plan_request_id（避免ID重复）
-                for plan in cached_plans:
-                    plan["plan_id"] = new_prefixed_id("plan")
-                    plan["plan_request_id"] = plan_request_id
-                    plan["user_id"] = user_id
-                return cached_plans
-        except Exception as exc:
-            logger.warning(f"读取AI缓存失败: {exc}")
+    use_cache = settings.ai_cache_enabled
+    if use_cache:
+        cached_plans = await _plan_cache.get(cache_key)
+        if cached_plans:
+            logger.info(f"AI缓存命中 cache_key={cache_key}，跳过LLM调用")
+            # 更新 plan_id 和 plan_request_id（避免ID重复）
+            return [
+                _stamp_plan_identity(plan, plan_request_id=plan_request_id, user_id=user_id)
+                for plan in cached_plans
+            ]
 
     # === 3. API Key检查 ===
     client = OpenAIClient()
@@ -1214,6 +1232,101 @@ async def generate_three_plans(
             inputs=inputs,
         )
 
+    # === 4. LLM生成（相同输入的并发请求只触发一次LLM调用，结果写入缓存）===
+    if not use_cache:
+        return await _generate_three_plans_llm(
+            client=client,
+            plan_request_id=plan_request_id,
+            user_id=user_id,
+            inputs=inputs,
+        )
+
+    async def _generate() -> list[dict[str, Any]]:
+        plans = await _generate_three_plans_llm(
+            client=client,
+            plan_request_id=plan_request_id,
+            user_id=user_id,
+            inputs=inputs,
+        )
+        # 缓存清理ID后的plans（避免ID污染）
+        return [_cacheable_plan(plan) for plan in plans]
+
+    plans = await _plan_cache.load_once(cache_key, _generate)
+    return [_stamp_plan_identity(plan, plan_request_id=plan_request_id, user_id=user_id) for plan in plans]
+
+
+def _cacheable_plan(plan: dict[str, Any]) -> dict[str, Any]:
+    """写入缓存的方案：去掉ID字段的深拷贝，与调用方手里的方案不共享嵌套对象"""
+    return copy.deepcopy({k: v for k, v in plan.items() if k not in _PLAN_IDENTITY_FIELDS})
+
+
+async def stream_three_plans(
+    *,
+    plan_request_id: str,
+    user_id: str,
+    inputs: dict[str, Any],
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    流式版 generate_three_plans：每套方案一生成就产出（Mock/缓存/stub 行为与非流式一致）
+
+    LLM 以 streaming 方式返回 JSON，解析到一个完整方案即规范化并产出；
+    三套方案全部收齐后写入缓存。流式请求不参与 single-flight 合并（需要尽早拿到首个方案）。
+    """
+    if settings.enable_ai_mock:
+        logger.info("AI Mock模式已启用，使用确定性stub生成（节省token）")
+        for plan in await _generate_three_plans_stub(plan_request_id=plan_request_id, user_id=user_id, inputs=inputs):
+            yield plan
+        return
+
+    cache_key = _generate_cache_key(inputs)
+    use_cache = settings.ai_cache_enabled
+    if use_cache:
+        cached_plans = await _plan_cache.get(cache_key)
+        if cached_plans:
+            logger.info(f"AI缓存命中 cache_key={cache_key}，跳过LLM调用")
+            for plan in cached_plans:
+                yield _stamp_plan_identity(plan, plan_request_id=plan_request_id, user_id=user_id)
+            return
+
+    client = OpenAIClient()
+    if not client.is_configured():
+        logger.warning("OPENAI_API_KEY not configured; using stub plan generation")
+        for plan in await _generate_three_plans_stub(plan_request_id=plan_request_id, user_id=user_id, inputs=inputs):
+            yield plan
+        return
+
+    # 产出的方案会被下游（markdown 规范化等）并发修改，缓存用产出时的深拷贝
+    plans: list[dict[str, Any]] = []
+    async for plan in _stream_three_plans_llm(
+        client=client,
+        plan_request_id=plan_request_id,
+        user_id=user_id,
+        inputs=inputs,
+    ):
+        plans.append(_cacheable_plan(plan))
+        yield plan
+
+    if len(plans) != 3:
+        raise ValueError("LLM response must include plans: [..3 items..]")
+    if use_cache:
+        await _plan_cache.set(cache_key, plans)
+
+
+async def _prepare_three_plans_llm(
+    *,
+    plan_request_id: str,
+    user_id: str,
+    inputs: dict[str, Any],
+) -> dict[str, Any]:
+    """构建3套方案的 LLM prompt（含高德目的地补全），返回 prompt 及规范化/预算校验所需的上下文"""
+    people = int(inputs["people_count"])
+    duration_days = int(inputs["duration_days"])
+    # 正确区分出发城市和目的地
+    departure_city = inputs.get("departure_city") or "出发地"  # 出发城市
+    destination = inputs.get("destination") or "目的地"        # 团建活动举办地点
+    destination_city = inputs.get("destination_city") or ""   # 目的地所属城市（用于季节/价格配置）
+    targets = _budget_targets(inputs)
+
     # 提取用户偏好
     preferences = inputs.get("preferences", {}) or {}
     activity_types = preferences.get("activity_types", [])
@@ -1305,41 +1418,73 @@ async def generate_three_plans(
         "- 每天至少3个时间段，包含具体活动名称\n"
     )
 
-    raw = await client.generate_json(prompt)
+    return {
+        "prompt": prompt,
+        "people_count": people,
+        "duration_days": duration_days,
+        "departure_city": departure_city,  # 出发城市
+        "destination": destination,        # 目的地
+        "destination_city": destination_city,
+        "city_for_context": city_for_context,
+        "accommodation_level": accommodation_level,
+    }
+
+
+async def _generate_three_plans_llm(
+    *,
+    client: OpenAIClient,
+    plan_request_id: str,
+    user_id: str,
+    inputs: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """调用 LLM 生成3套方案（含高德目的地补全与预算校验）"""
+    ctx = await _prepare_three_plans_llm(plan_request_id=plan_request_id, user_id=user_id, inputs=inputs)
+    raw = await client.generate_json(ctx["prompt"])
     normalized_plans = _normalize_generated_plans(
         raw=raw,
         plan_request_id=plan_request_id,
         user_id=user_id,
-        duration_days=duration_days,
-        departure_city=departure_city,  # 出发城市
-        destination=destination,        # 目的地
-        destination_city=destination_city,
+        duration_days=ctx["duration_days"],
+        departure_city=ctx["departure_city"],
+        destination=ctx["destination"],
+        destination_city=ctx["destination_city"],
     )
 
     # 预算合理性校验（基于目的地，因为住宿/活动在目的地）
     validated_plans = _validate_and_fix_budget(
         plans=normalized_plans,
-        people_count=people,
-        duration_days=duration_days,
-        city=city_for_context,  # 优先使用目的地城市（行政区）进行预算校验
-        accommodation_level=accommodation_level,
+        people_count=ctx["people_count"],
+        duration_days=ctx["duration_days"],
+        city=ctx["city_for_context"],  # 优先使用目的地城市（行政区）进行预算校验
+        accommodation_level=ctx["accommodation_level"],
     )
 
-    # === 4. 写入缓存 ===
-    if redis and settings.ai_cache_enabled:
-        try:
-            # 缓存清理ID后的plans（避免ID污染）
-            cache_data = [
-                {k: v for k, v in plan.items() if k not in ["plan_id", "plan_request_id", "user_id"]}
-                for plan in validated_plans
-            ]
-            redis.setex(
-                cache_key,
-                settings.ai_cache_ttl_seconds,
-                json.dumps(cache_data, ensure_ascii=False),
-            )
-            logger.info(f"AI响应已缓存 cache_key={cache_key}, ttl={settings.ai_cache_ttl_seconds}s")
-        except Exception as exc:
-            logger.warning(f"写入AI缓存失败: {exc}")
-
     return validated_plans
+
+
+async def _stream_three_plans_llm(
+    *,
+    client: OpenAIClient,
+    plan_request_id: str,
+    user_id: str,
+    inputs: dict[str, Any],
+) -> AsyncIterator[dict[str, Any]]:
+    """流式调用 LLM：每生成完一个方案就规范化、校验预算并立即产出"""
+    ctx = await _prepare_three_plans_llm(plan_request_id=plan_request_id, user_id=user_id, inputs=inputs)
+    async for raw_plan in client.stream_json_array(ctx["prompt"], array_key="plans"):
+        plan = _normalize_generated_plan(
+            raw_plan,
+            plan_request_id=plan_request_id,
+            user_id=user_id,
+            duration_days=ctx["duration_days"],
+            departure_city=ctx["departure_city"],
+            destination=ctx["destination"],
+            destination_city=ctx["destination_city"],
+        )
+        yield _validate_and_fix_budget(
+            plans=[plan],
+            people_count=ctx["people_count"],
+            duration_days=ctx["duration_days"],
+            city=ctx["city_for_context"],
+            accommodation_level=ctx["accommodation_level"],
+        )[0]
@@ -3,6 +3,11 @@ from __future__ import annotations
 import re
 
 from src.integrations.openai_client import OpenAIClient
+from src.models.config import settings
+from src.services.ai_cache import UncachedResult, content_cache_key, markdown_result_cache
+
+# Bump when the normalize prompt changes so cached results are invalidated.
+_XHS_NORMALIZE_CACHE_VERSION = "v1"
 
 
 def _is_mostly_hashtags(text: str) -> bool:
@@ -50,7 +55,7 @@ class XhsNormalizer:
             'Return JSON: {"content": "..."}'
         )
 
-        try:
+        async def _normalize() -> str:
             result = await self._client.generate_json(
                 prompt,
                 model=model,
@@ -59,11 +64,26 @@ class XhsNormalizer:
             )
             content = (result.get("content") or "").strip()
             if not content:
-                return text
+                raise UncachedResult(text)
 
             # If model output regressed to hashtag-only while input was richer, keep input.
             if _is_mostly_hashtags(content) and not _is_mostly_hashtags(text):
-                return text
+                raise UncachedResult(text)
             return content
+
+        try:
+            if not settings.markdown_cache_enabled:
+                try:
+                    return await _normalize()
+                except UncachedResult as uncached:
+                    return uncached.value
+            # Keyed by note content (not URL): share links for the same note carry per-user tokens.
+            cache_key = content_cache_key(
+                "xhs_normalize",
+                version=_XHS_NORMALIZE_CACHE_VERSION,
+                model=model or settings.openai_model,
+                content=f"{title}\x00{text}",
+            )
+            return await markdown_result_cache.get_or_load(cache_key, _normalize)
         except Exception:
             return text
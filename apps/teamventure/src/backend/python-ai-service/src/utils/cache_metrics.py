@@ -0,0 +1,50 @@
+"""
+AI cache Prometheus Metrics
+
+Exposes:
+- ai_cache_requests_total: Counter of cache lookups (labels: cache, result)
+    result = hit_l1 | hit_l2 | miss | coalesced
+- ai_cache_hit_ratio: Gauge of lifetime hit ratio per cache (coalesced counts as a hit)
+
+`miss` counts lookups that had to run the loader (a new LLM call); `coalesced` counts
+callers that found an identical request already in flight and waited for its result
+instead of issuing their own LLM call.
+"""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Gauge
+
+AI_CACHE_REQUESTS_TOTAL = Counter(
+    "ai_cache_requests_total",
+    "Total number of AI cache lookups",
+    labelnames=["cache", "result"],
+)
+
+AI_CACHE_HIT_RATIO = Gauge(
+    "ai_cache_hit_ratio",
+    "Fraction of AI cache lookups served without a new LLM call",
+    labelnames=["cache"],
+)
+
+CACHE_RESULTS = ("hit_l1", "hit_l2", "miss", "coalesced")
+
+# cache -> [hits, total]
+_totals: dict[str, list[int]] = {}
+
+
+def record_cache_result(*, cache: str, result: str) -> None:
+    AI_CACHE_REQUESTS_TOTAL.labels(cache=cache, result=result).inc()
+    totals = _totals.setdefault(cache, [0, 0])
+    if result != "miss":
+        totals[0] += 1
+    totals[1] += 1
+    AI_CACHE_HIT_RATIO.labels(cache=cache).set(totals[0] / totals[1])
+
+
+def init_metrics(caches: list[str]) -> None:
+    """Initialize counters with zero values so they appear in /metrics output."""
+    for cache in caches:
+        AI_CACHE_HIT_RATIO.labels(cache=cache)
+        for result in CACHE_RESULTS:
+            AI_CACHE_REQUESTS_TOTAL.labels(cache=cache, result=result)
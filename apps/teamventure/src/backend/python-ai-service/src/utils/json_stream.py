@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class JsonArrayItemStream:
+    """
+    Incrementally extract the objects of one top-level array from a streamed JSON document.
+
+    Feed text chunks as they arrive (e.g. OpenAI streaming deltas); `feed` returns every
+    `{...}` element of `root[key]` whose closing brace has been seen, so callers can act on
+    the first element while the rest of the document is still being generated.
+
+        stream = JsonArrayItemStream("plans")
+        for chunk in chunks:
+            for plan in stream.feed(chunk):
+                ...
+
+    Only object elements are reported; the complete text is kept in `text` so callers can
+    still parse the whole document at the end.
+    """
+
+    def __init__(self, key: str) -> None:
+        self._key = key
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = ""
+        self._awaiting_array = False  # saw `"key":` at depth 1
+        self._array_depth = -1  # depth inside the target array, -1 when not in it
+        self._item_start = -1
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        if not chunk:
+            return []
+        self._text += chunk
+        items: list[dict[str, Any]] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._array_depth < 0:
+                        self._last_string = text[self._string_start + 1 : i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":":
+                self._awaiting_array = self._depth == 1 and self._last_string == self._key
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._awaiting_array and self._depth == 2:
+                    self._array_depth = self._depth
+                elif ch == "{" and self._array_depth > 0 and self._depth == self._array_depth + 1:
+                    self._item_start = i
+                self._awaiting_array = False
+            elif ch in "}]":
+                if ch == "}" and self._item_start >= 0 and self._depth == self._array_depth + 1:
+                    item = self._decode(text[self._item_start : i + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._item_start = -1
+                elif ch == "]" and self._depth == self._array_depth:
+                    self._array_depth = -1
+                self._depth -= 1
+            elif not ch.isspace():
+                self._awaiting_array = False
+
+        self._pos = len(text)
+        return items
+
+    @staticmethod
+    def _decode(raw: str) -> dict[str, Any] | None:
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
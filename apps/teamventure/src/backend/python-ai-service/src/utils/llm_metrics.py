@@ -6,6 +6,8 @@ Exposes:
 - llm_tokens_total: Counter of tokens used (labels: model, type=input|output)
 - llm_request_duration_seconds: Histogram of request latency
 - llm_estimated_cost_usd: Counter of estimated cost in USD
+- llm_inflight_requests: Gauge of LLM calls currently holding a concurrency slot
+- llm_queued_requests: Gauge of LLM calls waiting for a concurrency slot / rate token
 
 Usage:
     from src.utils.llm_metrics import record_llm_call
@@ -21,7 +23,7 @@ Usage:
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # ==================== Metrics Definition ====================
 
@@ -50,6 +52,18 @@ LLM_ESTIMATED_COST_USD = Counter(
     labelnames=["model"],
 )
 
+LLM_INFLIGHT_REQUESTS = Gauge(
+    "llm_inflight_requests",
+    "Number of LLM requests currently in flight",
+    labelnames=["model"],
+)
+
+LLM_QUEUED_REQUESTS = Gauge(
+    "llm_queued_requests",
+    "Number of LLM requests waiting for the concurrency limiter",
+    labelnames=["model"],
+)
+
 
 # ==================== Pricing (as of 2024-12, update as needed) ====================
 # https://openai.com/pricing
@@ -117,3 +131,5 @@ def init_metrics(default_model: str = "gpt-4") -> None:
     LLM_TOKENS_TOTAL.labels(model=default_model, type="output")
     LLM_REQUEST_DURATION_SECONDS.labels(model=default_model)
     LLM_ESTIMATED_COST_USD.labels(model=default_model)
+    LLM_INFLIGHT_REQUESTS.labels(model=default_model)
+    LLM_QUEUED_REQUESTS.labels(model=default_model)
@@ -0,0 +1,70 @@
+"""
+MQ consumer / Java callback Prometheus Metrics
+
+Exposes:
+- mq_broker_queue_depth: Gauge of ready messages in the request queue (sampled from the broker)
+- mq_pending_messages: Gauge of delivered messages waiting for a free worker
+- mq_inflight_messages: Gauge of messages currently being processed by workers
+- mq_message_processing_seconds: Histogram of request processing latency (labels: outcome)
+- callback_queue_depth: Gauge of callbacks waiting to be sent to the Java service
+- callback_attempts_total: Counter of callback HTTP attempts (labels: status=success|retry|failed)
+- callback_dead_letters_total: Counter of callbacks given up on and dead-lettered (labels: reason)
+- mq_dead_letters_total: Counter of request messages dead-lettered (labels: reason)
+"""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Gauge, Histogram
+
+MQ_BROKER_QUEUE_DEPTH = Gauge(
+    "mq_broker_queue_depth",
+    "Ready messages in the plan request queue (sampled from RabbitMQ)",
+)
+
+MQ_PENDING_MESSAGES = Gauge(
+    "mq_pending_messages",
+    "Delivered plan requests waiting for a free worker",
+)
+
+MQ_INFLIGHT_MESSAGES = Gauge(
+    "mq_inflight_messages",
+    "Plan requests currently being processed",
+)
+
+MQ_MESSAGE_PROCESSING_SECONDS = Histogram(
+    "mq_message_processing_seconds",
+    "Plan request processing latency in seconds (generation, excluding callback delivery)",
+    labelnames=["outcome"],  # success | failed
+    buckets=(1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+MQ_DEAD_LETTERS_TOTAL = Counter(
+    "mq_dead_letters_total",
+    "Plan request messages published to the dead-letter queue",
+    labelnames=["reason"],
+)
+
+CALLBACK_QUEUE_DEPTH = Gauge(
+    "callback_queue_depth",
+    "Generated plan callbacks waiting to be sent to the Java service",
+)
+
+CALLBACK_ATTEMPTS_TOTAL = Counter(
+    "callback_attempts_total",
+    "Java callback HTTP attempts",
+    labelnames=["status"],  # success | retry | failed
+)
+
+CALLBACK_DEAD_LETTERS_TOTAL = Counter(
+    "callback_dead_letters_total",
+    "Java callbacks given up on after retries and dead-lettered",
+    labelnames=["reason"],
+)
+
+
+def init_metrics() -> None:
+    """Initialize labelled metrics with zero values so they appear in /metrics output."""
+    for outcome in ("success", "failed"):
+        MQ_MESSAGE_PROCESSING_SECONDS.labels(outcome=outcome)
+    for status in ("success", "retry", "failed"):
+        CALLBACK_ATTEMPTS_TOTAL.labels(status=status)
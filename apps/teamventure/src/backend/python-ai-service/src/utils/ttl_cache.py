@@ -1,48 +1,123 @@
 from __future__ import annotations
 
+import asyncio
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Generic, TypeVar
 
 K = TypeVar("K")
 V = TypeVar("V")
 
 
-@dataclass
 class _Entry(Generic[V]):
-    value: V
-    expires_at: float
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: V, expires_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
 
 
 class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache with per-entry TTL.
+
+    - get/set are O(1): entries live in an OrderedDict kept in recency order; when full,
+      the least recently used entry is evicted (expired entries are dropped lazily on access).
+    - Expiry uses the monotonic clock, so wall-clock adjustments never resurrect/expire entries.
+    - `get_or_load` coalesces concurrent misses for the same key into one loader call.
+    - hits / misses / evictions / expirations are counted for observability (`stats()`).
+
+    `None` is not a cacheable value (it means "missing").
+    """
+
     def __init__(self, *, ttl_seconds: int, max_size: int = 256) -> None:
         self._ttl_seconds = max(1, int(ttl_seconds))
         self._max_size = max(1, int(max_size))
-        self._data: dict[K, _Entry[V]] = {}
+        self._data: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._loading: dict[K, asyncio.Future[V | None]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
 
     def get(self, key: K) -> V | None:
         entry = self._data.get(key)
         if entry is None:
+            self.misses += 1
             return None
-        if entry.expires_at <= time.time():
-            self._data.pop(key, None)
+        if entry.expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
             return None
+        self._data.move_to_end(key)
+        self.hits += 1
         return entry.value
 
     def set(self, key: K, value: V) -> None:
-        if len(self._data) >= self._max_size:
-            self._prune()
-        self._data[key] = _Entry(value=value, expires_at=time.time() + self._ttl_seconds)
-
-    def _prune(self) -> None:
-        now = time.time()
-        expired = [k for k, v in self._data.items() if v.expires_at <= now]
-        for k in expired:
-            self._data.pop(k, None)
-        if len(self._data) < self._max_size:
+        expires_at = time.monotonic() + self._ttl_seconds
+        entry = self._data.get(key)
+        if entry is not None:
+            entry.value = value
+            entry.expires_at = expires_at
+            self._data.move_to_end(key)
             return
-        # still too large: drop oldest
-        items = sorted(self._data.items(), key=lambda kv: kv[1].expires_at)
-        for k, _ in items[: max(1, len(items) - self._max_size + 1)]:
-            self._data.pop(k, None)
+        if len(self._data) >= self._max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        self._data[key] = _Entry(value, expires_at)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._data.pop(key, None)
+        return entry.value if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        """
+        Return the cached value or await `loader()` and cache its (non-None) result.
+
+        Concurrent callers missing on the same key share one in-flight loader call;
+        a loader exception is propagated to all of them and nothing is cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[V | None] = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                exc = RuntimeError(f"cache loader cancelled for key {key!r}")
+            future.set_exception(exc)
+            # Mark retrieved so an unawaited future doesn't log "exception was never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+        if value is not None:
+            self.set(key, value)
+        future.set_result(value)
+        return value
 
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,80 @@
+"""
+Plan generation workflow Prometheus Metrics
+
+Exposes:
+- workflow_stage_duration_seconds: Histogram of per-stage latency
+    (labels: stage=parse|generate|enforce|callback, mode=v1|v2)
+- itinerary_repair_total: Counter of itinerary markdown enforcement outcomes
+    (labels: outcome=valid|local|llm|fallback)
+- workflow_time_to_first_plan_seconds: Histogram of request start -> first enforced plan ready
+    (labels: mode=v1|v2, delivery=stream|batch; batch == whole workflow)
+
+Usage:
+    from src.utils.workflow_metrics import time_stage
+
+    with time_stage("generate", mode="v1"):
+        plans = await generate_three_plans(...)
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram
+
+WORKFLOW_STAGE_DURATION_SECONDS = Histogram(
+    "workflow_stage_duration_seconds",
+    "Plan generation workflow stage latency in seconds",
+    labelnames=["stage", "mode"],
+    buckets=(0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+ITINERARY_REPAIR_TOTAL = Counter(
+    "itinerary_repair_total",
+    "Itinerary markdown enforcement outcomes",
+    labelnames=["outcome"],  # valid | local | llm | fallback
+)
+
+WORKFLOW_TIME_TO_FIRST_PLAN_SECONDS = Histogram(
+    "workflow_time_to_first_plan_seconds",
+    "Time from request start until the first generated and enforced plan is available",
+    labelnames=["mode", "delivery"],
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 20.0, 30.0, 60.0, 120.0),
+)
+
+WORKFLOW_STAGES = ("parse", "generate", "enforce", "callback")
+REPAIR_OUTCOMES = ("valid", "local", "llm", "fallback")
+
+
+def record_repair_outcome(outcome: str) -> None:
+    ITINERARY_REPAIR_TOTAL.labels(outcome=outcome).inc()
+
+
+def record_time_to_first_plan(seconds: float, *, mode: str, delivery: str) -> None:
+    WORKFLOW_TIME_TO_FIRST_PLAN_SECONDS.labels(mode=mode, delivery=delivery).observe(seconds)
+
+
+@contextmanager
+def time_stage(stage: str, *, mode: str = "v1") -> Iterator[None]:
+    """Observe the wall time of the wrapped block (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        WORKFLOW_STAGE_DURATION_SECONDS.labels(stage=stage, mode=mode).observe(
+            time.perf_counter() - start
+        )
+
+
+def init_metrics() -> None:
+    """Initialize histograms so they appear in /metrics output."""
+    for stage in WORKFLOW_STAGES:
+        for mode in ("v1", "v2"):
+            WORKFLOW_STAGE_DURATION_SECONDS.labels(stage=stage, mode=mode)
+    for outcome in REPAIR_OUTCOMES:
+        ITINERARY_REPAIR_TOTAL.labels(outcome=outcome)
+    for mode in ("v1", "v2"):
+        for delivery in ("stream", "batch"):
+            WORKFLOW_TIME_TO_FIRST_PLAN_SECONDS.labels(mode=mode, delivery=delivery)
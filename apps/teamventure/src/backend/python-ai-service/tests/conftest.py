@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from tests.fakes.amap_server import FakeAmapServer
+from tests.fakes.amqp_broker import InMemoryBroker
+from tests.fakes.callback_sink import FakeCallbackSink
+from tests.fakes.openai_server import FakeOpenAIServer
+
+
+@pytest.fixture
+def fake_amap(monkeypatch) -> Iterator[FakeAmapServer]:
+    """Run a local fake Amap server and point settings at it."""
+    from src.integrations import amap_client
+    from src.models.config import settings
+
+    with FakeAmapServer(latency_seconds=0.05) as server:
+        monkeypatch.setattr(settings, "amap_enabled", True)
+        monkeypatch.setattr(settings, "amap_api_key", "test-key")
+        monkeypatch.setattr(settings, "amap_base_url", server.base_url)
+        monkeypatch.setattr(amap_client, "_geocode_cache", amap_client.TTLCache(ttl_seconds=60))
+        monkeypatch.setattr(amap_client, "_poi_cache", amap_client.TTLCache(ttl_seconds=60))
+        yield server
+
+
+@pytest.fixture
+def fake_openai(monkeypatch) -> Iterator[FakeOpenAIServer]:
+    """Run a local fake OpenAI chat-completions server and point settings at it (AI caches off)."""
+    from src.models.config import settings
+
+    with FakeOpenAIServer() as server:
+        monkeypatch.setattr(settings, "openai_api_key", "sk-test-fake-openai")
+        monkeypatch.setattr(settings, "openai_base_url", server.api_base_url)
+        monkeypatch.setattr(settings, "enable_ai_mock", False)
+        monkeypatch.setattr(settings, "ai_cache_enabled", False)
+        monkeypatch.setattr(settings, "markdown_cache_enabled", False)
+        yield server
+
+
+@pytest.fixture
+def callback_sink(monkeypatch) -> Iterator[FakeCallbackSink]:
+    """Run a local fake Java callback endpoint and point settings at it."""
+    from src.models.config import settings
+
+    with FakeCallbackSink() as sink:
+        monkeypatch.setattr(settings, "java_callback_url", sink.url)
+        monkeypatch.setattr(settings, "java_callback_retry_base_seconds", 0.01)
+        yield sink
+
+
+@pytest.fixture
+def in_memory_broker(monkeypatch) -> InMemoryBroker:
+    """Route `mq_consumer`'s aio-pika connection to an in-process broker."""
+    from src.services import mq_consumer
+
+    broker = InMemoryBroker()
+    monkeypatch.setattr(mq_consumer.aio_pika, "connect_robust", broker.connect_robust)
+    return broker
@@ -0,0 +1,57 @@
+"""
+Fake Amap (高德地图) WebService for offline tests and latency benchmarks.
+
+Serves `/v3/geocode/geo` and `/v3/place/text` on 127.0.0.1 with a configurable
+per-request latency, and records request counts and peak concurrency so callers
+can assert on fan-out / caching behavior.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from tests.fakes.http_server import FakeHTTPServer, FakeResponse
+
+
+class FakeAmapServer(FakeHTTPServer):
+    def __init__(self, *, latency_seconds: float = 0.0, pois_per_search: int = 6) -> None:
+        super().__init__(latency_seconds=latency_seconds)
+        self.pois_per_search = pois_per_search
+
+    def handle(self, method: str, path: str, params: dict[str, str], body: Any) -> FakeResponse:
+        if path == "/v3/geocode/geo":
+            return FakeResponse(payload=self._geocode(params))
+        if path == "/v3/place/text":
+            return FakeResponse(payload=self._place_text(params))
+        return FakeResponse(payload={"status": "0", "info": "NOT_FOUND"})
+
+    def _geocode(self, params: dict[str, str]) -> dict:
+        address = params.get("address", "")
+        return {
+            "status": "1",
+            "geocodes": [
+                {
+                    "formatted_address": address,
+                    "province": "浙江省",
+                    "city": "杭州市",
+                    "district": "淳安县",
+                    "adcode": "330127",
+                    "location": "119.04,29.61",
+                }
+            ],
+        }
+
+    def _place_text(self, params: dict[str, str]) -> dict:
+        keywords = params.get("keywords", "")
+        limit = min(int(params.get("offset") or self.pois_per_search), self.pois_per_search)
+        return {
+            "status": "1",
+            "pois": [
+                {
+                    "name": f"{keywords.split()[-1]}{i + 1}",
+                    "type": "风景名胜",
+                    "address": f"{params.get('city', '')}某路{i + 1}号",
+                    "location": f"119.0{i},29.6{i}",
+                }
+                for i in range(limit)
+            ],
+        }
@@ -0,0 +1,205 @@
+"""
+In-process stand-in for RabbitMQ, covering the aio-pika surface used by `mq_consumer`.
+
+    broker = InMemoryBroker()
+    monkeypatch.setattr(mq_consumer.aio_pika, "connect_robust", broker.connect_robust)
+    await mq_consumer.start_mq_consumer()
+    await broker.publish(settings.mq_exchange, settings.mq_routing_key, body)
+    await broker.wait_acked(1)
+
+Topic / fanout / direct exchanges route into asyncio queues; consumers receive messages
+under the channel's prefetch limit and unacked messages count against it, like a broker.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import aio_pika
+
+
+@dataclass
+class _DeclareResult:
+    message_count: int
+
+
+class FakeIncomingMessage:
+    def __init__(
+        self,
+        body: bytes,
+        *,
+        headers: dict[str, Any] | None,
+        queue: FakeQueue,
+        on_settled: Callable[[], None] | None = None,
+    ) -> None:
+        self.body = body
+        self.headers = headers or {}
+        self._queue = queue
+        self._on_settled = on_settled
+        self.acked = False
+
+    async def ack(self, multiple: bool = False) -> None:
+        if self.acked:
+            return
+        self.acked = True
+        if self._on_settled is not None:
+            self._on_settled()
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        await self.reject(requeue=requeue)
+
+    async def reject(self, requeue: bool = False) -> None:
+        if self.acked:
+            return
+        self.acked = True
+        if self._on_settled is not None:
+            self._on_settled()
+        if requeue:
+            self._queue._messages.put_nowait((self.body, self.headers))
+
+
+class FakeQueue:
+    def __init__(self, broker: InMemoryBroker, name: str) -> None:
+        self.name = name
+        self._broker = broker
+        self._messages: asyncio.Queue[tuple[bytes, dict[str, Any]]] = asyncio.Queue()
+        self._consumers: dict[str, asyncio.Task[None]] = {}
+        self._channel: FakeChannel | None = None  # channel that declared the queue (prefetch)
+        self._permits: asyncio.Semaphore | None = None
+        self.unacked = 0
+
+    async def bind(self, exchange: FakeExchange, routing_key: str = "#") -> None:
+        exchange._bindings.append((self, routing_key))
+
+    async def declare(self) -> _DeclareResult:
+        return _DeclareResult(message_count=self._messages.qsize())
+
+    async def consume(self, callback: Any, **_: Any) -> str:
+        tag = f"ctag-{self.name}-{len(self._consumers) + 1}"
+        prefetch = self._channel.prefetch_count if self._channel is not None else 0
+        self._consumers[tag] = asyncio.create_task(self._deliver(callback, prefetch))
+        return tag
+
+    def cancel(self, tag: str) -> None:
+        task = self._consumers.pop(tag, None)
+        if task is not None:
+            task.cancel()
+
+    def get_nowait(self) -> FakeIncomingMessage | None:
+        """Pull one message without a consumer (e.g. to inspect a dead-letter queue)."""
+        try:
+            body, headers = self._messages.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        return FakeIncomingMessage(body, headers=headers, queue=self)
+
+    def qsize(self) -> int:
+        return self._messages.qsize()
+
+    async def _deliver(self, callback: Any, prefetch: int) -> None:
+        self._permits = asyncio.Semaphore(prefetch if prefetch > 0 else 1 << 30)
+        while True:
+            await self._permits.acquire()
+            body, headers = await self._messages.get()
+            self.unacked += 1
+            await callback(FakeIncomingMessage(body, headers=headers, queue=self, on_settled=self._settled))
+
+    def _settled(self) -> None:
+        self.unacked -= 1
+        self._broker.acked += 1
+        if self._permits is not None:
+            self._permits.release()
+        self._broker._notify()
+
+
+class FakeExchange:
+    def __init__(self, broker: InMemoryBroker, name: str, type_: Any) -> None:
+        self.name = name
+        self._broker = broker
+        self._type = aio_pika.ExchangeType(type_)
+        self._bindings: list[tuple[FakeQueue, str]] = []
+
+    async def publish(self, message: aio_pika.Message, routing_key: str = "") -> None:
+        for queue, binding_key in self._bindings:
+            if self._routes(binding_key, routing_key):
+                queue._messages.put_nowait((message.body, dict(message.headers or {})))
+        self._broker.published += 1
+
+    def _routes(self, binding_key: str, routing_key: str) -> bool:
+        if self._type == aio_pika.ExchangeType.FANOUT:
+            return True
+        if self._type == aio_pika.ExchangeType.TOPIC:
+            pattern = re.escape(binding_key).replace(r"\#", ".*").replace(r"\*", r"[^.]+")
+            return re.fullmatch(pattern, routing_key) is not None
+        return binding_key == routing_key
+
+
+class FakeChannel:
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+        self.prefetch_count = 0
+
+    async def set_qos(self, prefetch_count: int = 0, **_: Any) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def declare_exchange(self, name: str, type_: Any = aio_pika.ExchangeType.DIRECT, **_: Any) -> FakeExchange:
+        exchange = self._broker.exchanges.get(name)
+        if exchange is None:
+            exchange = self._broker.exchanges[name] = FakeExchange(self._broker, name, type_)
+        return exchange
+
+    async def declare_queue(self, name: str, **_: Any) -> FakeQueue:
+        queue = self._broker.queues.get(name)
+        if queue is None:
+            queue = self._broker.queues[name] = FakeQueue(self._broker, name)
+        queue._channel = self
+        return queue
+
+    async def basic_cancel(self, consumer_tag: str) -> None:
+        for queue in self._broker.queues.values():
+            queue.cancel(consumer_tag)
+
+    async def close(self) -> None:
+        for queue in self._broker.queues.values():
+            for tag in list(queue._consumers):
+                queue.cancel(tag)
+
+
+class FakeConnection:
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+
+    async def channel(self) -> FakeChannel:
+        return FakeChannel(self._broker)
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryBroker:
+    def __init__(self) -> None:
+        self.exchanges: dict[str, FakeExchange] = {}
+        self.queues: dict[str, FakeQueue] = {}
+        self.published = 0
+        self.acked = 0
+        self._changed = asyncio.Event()
+
+    async def connect_robust(self, url: str = "", **_: Any) -> FakeConnection:
+        return FakeConnection(self)
+
+    async def publish(self, exchange: str, routing_key: str, body: bytes) -> None:
+        await self.exchanges[exchange].publish(aio_pika.Message(body=body), routing_key=routing_key)
+
+    async def wait_acked(self, count: int, timeout: float = 10.0) -> None:
+        async def _wait() -> None:
+            while self.acked < count:
+                self._changed.clear()
+                await self._changed.wait()
+
+        await asyncio.wait_for(_wait(), timeout=timeout)
+
+    def _notify(self) -> None:
+        self._changed.set()
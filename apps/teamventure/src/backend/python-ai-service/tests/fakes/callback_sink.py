@@ -0,0 +1,49 @@
+"""
+Fake Java callback endpoint (`POST /internal/plans/batch`) for offline tests and benchmarks.
+
+Records every delivered payload; `fail_first` makes the first N requests return
+`fail_status` so retry / dead-letter paths can be exercised.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from tests.fakes.http_server import FakeHTTPServer, FakeResponse
+
+CALLBACK_PATH = "/internal/plans/batch"
+
+
+class FakeCallbackSink(FakeHTTPServer):
+    def __init__(self, *, latency_seconds: float = 0.0, fail_first: int = 0, fail_status: int = 503) -> None:
+        super().__init__(latency_seconds=latency_seconds)
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.delivered: list[dict[str, Any]] = []
+        # plan_request_id -> time.perf_counter() at delivery (same clock as the test process)
+        self.delivered_at: dict[str, float] = {}
+        self._attempts = 0
+        self._delivered_cond = threading.Condition()
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}{CALLBACK_PATH}"
+
+    def handle(self, method: str, path: str, params: dict[str, str], body: Any) -> FakeResponse:
+        if method != "POST" or path != CALLBACK_PATH:
+            return FakeResponse(status=404, payload={"success": False})
+        with self._delivered_cond:
+            self._attempts += 1
+            if self._attempts <= self.fail_first:
+                return FakeResponse(status=self.fail_status, payload={"success": False})
+            payload = body if isinstance(body, dict) else {}
+            self.delivered.append(payload)
+            self.delivered_at[str(payload.get("plan_request_id"))] = time.perf_counter()
+            self._delivered_cond.notify_all()
+        return FakeResponse(payload={"success": True})
+
+    def wait_for(self, count: int, timeout: float = 10.0) -> bool:
+        """Block (in a worker thread) until `count` callbacks have been delivered."""
+        with self._delivered_cond:
+            return self._delivered_cond.wait_for(lambda: len(self.delivered) >= count, timeout=timeout)
@@ -0,0 +1,128 @@
+"""
+Threaded local HTTP server base for the fakes in this package.
+
+Subclasses implement `handle(method, path, params, body)` and return a `FakeResponse`.
+The base records every request, applies the configured per-request latency and tracks
+peak concurrency, so tests/benchmarks can assert on fan-out, caching and call counts.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class FakeResponse:
+    status: int = 200
+    payload: Any = None
+    # When set, sent as a close-delimited stream (e.g. SSE) with `chunk_delay_seconds` between chunks.
+    chunks: list[bytes] = field(default_factory=list)
+    chunk_delay_seconds: float = 0.0
+    content_type: str = "application/json; charset=utf-8"
+
+
+class FakeHTTPServer:
+    def __init__(self, *, latency_seconds: float = 0.0) -> None:
+        self.latency_seconds = latency_seconds
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self.peak_inflight = 0
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, path: str | None = None) -> int:
+        with self._lock:
+            return sum(1 for p, _ in self.requests if path is None or p == path)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.peak_inflight = 0
+
+    def start(self) -> FakeHTTPServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, params: dict[str, str], body: Any) -> FakeResponse:
+        raise NotImplementedError
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._serve("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._serve("POST")
+
+            def _serve(self, method: str) -> None:
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                body: Any = None
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    raw = self.rfile.read(length)
+                    try:
+                        body = json.loads(raw)
+                    except ValueError:
+                        body = raw
+                with server._lock:
+                    server.requests.append((url.path, body if isinstance(body, dict) else params))
+                    server._inflight += 1
+                    server.peak_inflight = max(server.peak_inflight, server._inflight)
+                try:
+                    if server.latency_seconds > 0:
+                        time.sleep(server.latency_seconds)
+                    resp = server.handle(method, url.path, params, body)
+                finally:
+                    with server._lock:
+                        server._inflight -= 1
+
+                self.send_response(resp.status)
+                self.send_header("Content-Type", resp.content_type)
+                if resp.chunks:
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    for chunk in resp.chunks:
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                        if resp.chunk_delay_seconds > 0:
+                            time.sleep(resp.chunk_delay_seconds)
+                    self.close_connection = True
+                    return
+
+                data = json.dumps(resp.payload, ensure_ascii=False).encode("utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        return Handler
@@ -0,0 +1,53 @@
+"""
+Itinerary text samples for the markdown parser benchmark (scripts/bench_itinerary_markdown_parser.py),
+copied from the converter tests (test_markdown_converter_suzhou_sample / _date_split).
+"""
+from __future__ import annotations
+
+# 小红书笔记解析原文：苏州两天一晚（无 Day 标题，靠「第一天/第二天」与时间段切分）
+SUZHOU_SAMPLE_TEXT = """苏州带娃老人两天一晚旅游攻略
+行程安排
+第一天：古典园林与文化体验
+上午：拙政园（7:30-10:30）
+中国四大名园之一，全园山水萦绕，庭院错落有致。建议选择最早入园时段，避开人流高峰。园内亭台楼阁、假山流水构成精美画卷，适合老人和孩子慢慢欣赏。
+中午：观前街午餐（11:00-12:30）
+从拙政园步行约10分钟可达观前街，这里是苏州美食聚集地。推荐品尝松鼠桂鱼、清炒虾仁等苏帮菜，老人和孩子都能接受。
+下午：苏州博物馆（13:00-15:00）
+由建筑大师贝聿铭设计，免费参观但需提前1-7天在\"苏州博物馆\"官网或微信公众号预约。周一闭馆，请避开此日。
+傍晚：平江路历史街区（15:30-17:30）
+\"一条平江路，半部姑苏史\"，这里是保存最完好的古街之一。可以租一套汉服拍照，或乘坐手摇船（约20分钟）感受水乡风情。（图7赵元章烧肉很好吃）阿婆绿豆水一言难尽😂
+晚上：金鸡湖夜景（18:30-20:00）
+从平江路打车前往金鸡湖，约15分钟车程。傍晚时分湖面倒映夕阳，东方之门灯光璀璨，可以沿湖散步或乘坐游船。周五周六晚19:30/20:30有音乐喷泉表演。
+第二天：上午：寒山寺（9:00-11:00）
+\"姑苏城外寒山寺，夜半钟声到客船\"，这座千年古寺文化底蕴深厚。门票20元，寺院内香火鼎盛，地面平整，适合老人游览。
+中午：寒山寺附近用餐（11:30-12:30）
+推荐品尝素斋面或地道苏式面点1人均50-80元。
+下午：购物（戚薇旗袍工厂店(和基广场店)
+和基广场4楼，服装经济实惠，这次淘到了两件旗袍和一件国风外套，超级喜欢！
+住宿推荐
+首选区域：观前街/平江路附近
+这里是古城中心，地铁1号线和4号线交汇，前往各大园林、博物馆、老街都非常方便，餐饮选择极多。推荐酒店：苏州中心大酒店（368元起）、苏州文旅姑苏小院·万年桥酒店（256元起）。
+美食推荐
+苏帮菜老字号：
+• 松鹤楼（观前店）：松鼠桂鱼、清炒虾仁
+• 得月楼：响油鳝糊、蟹粉豆腐
+• 吴门人家：地道家常苏帮菜，价格实惠
+特色小吃：
+• 苏式汤面：同得兴、裕兴记的枫镇大肉面
+• 糕点：黄天源糕团、采芝斋
+• 糖粥：潘玉麟糖粥铺
+实用贴士
+1.交通方式：苏州地铁便利，建议打车
+2.儿童照顾：苏州博物馆提供儿童推车（免费），准备一些小零食安抚孩子情绪。#上有天堂下有苏杭[话题]# #苏州七里山塘街[话题]# #苏州旅游攻略[话题]#"""
+
+# 以完整日期作为每天开头
+DATE_SPLIT_FULL_DATES_TEXT = """
+2026-01-19：上午：南京路步行街（9:00-10:30）
+2026-01-20：中午：外滩午餐（11:00-12:00）
+"""
+
+# 以「月日」作为每天开头（不猜测年份）
+DATE_SPLIT_MONTH_DAY_TEXT = """
+6月1日：上午：拙政园（7:30-10:30）
+6月2日：上午：寒山寺（9:00-11:00）
+"""
@@ -0,0 +1,171 @@
+"""
+Fake OpenAI chat-completions API for offline tests and load benchmarks.
+
+Serves `POST /v1/chat/completions` (set `settings.openai_base_url` to `base_url + "/v1"`).
+The JSON returned to each prompt is produced by `responder(prompt)`; the default
+responder recognises the prompts this service sends (3 plans, 1 plan from markdown,
+markdown convert / optimize / fix, XHS normalize) and returns a well-formed payload.
+`stream=True` requests are answered as SSE chunks of `stream_chunk_chars` characters.
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+from tests.fakes.http_server import FakeHTTPServer, FakeResponse
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+
+
+def _itinerary(days: int) -> dict[str, Any]:
+    return {
+        "days": [
+            {
+                "day": d,
+                "items": [
+                    {"time_start": "09:00", "time_end": "11:00", "activity": f"景点游览{d}-1", "location": f"景点{d}-1"},
+                    {"time_start": "12:00", "time_end": "13:00", "activity": "午餐", "location": ""},
+                    {"time_start": "14:00", "time_end": "17:00", "activity": f"团队拓展{d}", "location": f"基地{d}"},
+                ],
+            }
+            for d in range(1, days + 1)
+        ]
+    }
+
+
+def _plan(plan_type: str, budget_total: float, days: int) -> dict[str, Any]:
+    return {
+        "plan_type": plan_type,
+        "plan_name": f"{plan_type} 方案",
+        "summary": "离线基准测试生成的方案",
+        "highlights": ["亮点A", "亮点B"],
+        "itinerary": _itinerary(days),
+        "budget_breakdown": {
+            "total": budget_total,
+            "per_person": round(budget_total / 10, 2),
+            "categories": [
+                {"category": "住宿", "subtotal": round(budget_total * 0.3, 2)},
+                {"category": "活动", "subtotal": round(budget_total * 0.35, 2)},
+                {"category": "餐饮", "subtotal": round(budget_total * 0.25, 2)},
+                {"category": "交通", "subtotal": round(budget_total * 0.1, 2)},
+            ],
+        },
+        "budget_total": budget_total,
+        "budget_per_person": round(budget_total / 10, 2),
+    }
+
+
+def _section_after(prompt: str, marker: str) -> str:
+    idx = prompt.find(marker)
+    return prompt[idx + len(marker) :].strip() if idx >= 0 else ""
+
+
+def default_responder(prompt: str) -> dict[str, Any]:
+    m_days = re.search(r"(\d+)人,\s*(\d+)天", prompt)
+    days = int(m_days.group(2)) if m_days else 2
+    if "生成3套团建方案" in prompt:
+        return {
+            "plans": [
+                _plan("budget", 12000.0, days),
+                _plan("standard", 16000.0, days),
+                _plan("premium", 22000.0, days),
+            ]
+        }
+    if "生成1套完整的团建方案" in prompt:
+        return _plan("standard", 16000.0, days)
+    if "小红书笔记解析原文" in prompt:
+        return {
+            "days": [
+                {
+                    "date": "今天",
+                    "items": [
+                        {"time_start": "09:00", "time_end": "11:00", "activity": "游览", "location": "拙政园", "note": ""},
+                        {"time_start": "13:00", "time_end": "15:00", "activity": "游览", "location": "苏州博物馆", "note": ""},
+                    ],
+                    "appendix": [],
+                }
+            ],
+            "appendix": [],
+        }
+    if "未通过格式校验" in prompt:
+        return {"markdown_content": "## Day 1\n- 09:00 - 10:00 | 自由活动 |  | \n"}
+    if "markdown_content:\n" in prompt:
+        return {"markdown_content": _section_after(prompt, "markdown_content:\n")}
+    if "extracted_text:\n" in prompt:
+        return {"content": _section_after(prompt, "extracted_text:\n").rsplit("Return JSON", 1)[0].strip()}
+    return {}
+
+
+class FakeOpenAIServer(FakeHTTPServer):
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        responder: Callable[[str], dict[str, Any]] | None = None,
+        stream_chunk_chars: int = 64,
+        stream_chunk_delay_seconds: float = 0.0,
+    ) -> None:
+        super().__init__(latency_seconds=latency_seconds)
+        self.responder = responder or default_responder
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.stream_chunk_delay_seconds = stream_chunk_delay_seconds
+
+    @property
+    def api_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    @property
+    def calls(self) -> int:
+        return self.count(CHAT_COMPLETIONS_PATH)
+
+    def handle(self, method: str, path: str, params: dict[str, str], body: Any) -> FakeResponse:
+        if method != "POST" or path != CHAT_COMPLETIONS_PATH or not isinstance(body, dict):
+            return FakeResponse(status=404, payload={"error": {"message": "not found"}})
+
+        messages = body.get("messages") or []
+        prompt = str(messages[-1].get("content") or "") if messages else ""
+        content = json.dumps(self.responder(prompt), ensure_ascii=False)
+        model = str(body.get("model") or "fake-model")
+        usage = {
+            "prompt_tokens": len(prompt) // 2,
+            "completion_tokens": len(content) // 2,
+            "total_tokens": (len(prompt) + len(content)) // 2,
+        }
+
+        if body.get("stream"):
+            return FakeResponse(
+                chunks=self._sse_chunks(model, content, usage),
+                chunk_delay_seconds=self.stream_chunk_delay_seconds,
+                content_type="text/event-stream",
+            )
+        return FakeResponse(
+            payload={
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ],
+                "usage": usage,
+            }
+        )
+
+    def _sse_chunks(self, model: str, content: str, usage: dict[str, int]) -> list[bytes]:
+        def event(choices: list[dict[str, Any]], extra: dict[str, Any] | None = None) -> bytes:
+            data = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": model}
+            data["choices"] = choices
+            data.update(extra or {})
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        step = self.stream_chunk_chars
+        chunks = [
+            event([{"index": 0, "delta": {"content": content[i : i + step]}, "finish_reason": None}])
+            for i in range(0, len(content), step)
+        ]
+        chunks.append(event([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        chunks.append(event([], {"usage": usage}))
+        chunks.append(b"data: [DONE]\n\n")
+        return chunks
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from src.integrations.amap_client import AmapClient, close_shared_amap_client
+
+
+@pytest.mark.asyncio
+async def test_enrich_destination_fans_out_category_searches(fake_amap):
+    client = AmapClient()
+    result = await client.enrich_destination(
+        destination="千岛湖",
+        activity_types=["leisure", "culture", "sports"],
+        accommodation_level="standard",
+    )
+    await close_shared_amap_client()
+
+    assert result is not None
+    assert result["destination_city"] == "杭州"
+    assert len(result["pois"]) == 6
+    assert fake_amap.count("/v3/place/text") == 6
+    # Searches overlap at the fake server (serially the peak would stay at 1).
+    assert fake_amap.peak_inflight > 1
+
+
+@pytest.mark.asyncio
+async def test_poi_searches_are_cached_per_keyword_across_activity_combos(fake_amap):
+    client = AmapClient()
+    await client.enrich_destination(
+        destination="千岛湖", activity_types=["leisure"], accommodation_level="standard"
+    )
+    fake_amap.reset_stats()
+
+    result = await client.enrich_destination(
+        destination="千岛湖", activity_types=["culture"], accommodation_level="premium"
+    )
+    await close_shared_amap_client()
+
+    assert result is not None
+    assert "文化体验" in result["pois"]
+    assert fake_amap.count("/v3/geocode/geo") == 0
+    # Only the culture search is new; 团建/景点/餐饮 come from the per-keyword cache.
+    assert fake_amap.count("/v3/place/text") == 1
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from src.integrations.java_client import CallbackDispatcher, CallbackJob, JavaCallbackClient
+
+
+def _client(statuses: list[int], seen: list[dict]) -> JavaCallbackClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append({"path": request.url.path})
+        return httpx.Response(statuses[min(len(seen), len(statuses)) - 1])
+
+    return JavaCallbackClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+async def _run_job(dispatcher: CallbackDispatcher) -> list[str]:
+    events: list[str] = []
+
+    async def delivered() -> None:
+        events.append("delivered")
+
+    async def dead_letter(reason: str) -> None:
+        events.append(f"dead_letter:{reason}")
+
+    dispatcher.start()
+    await dispatcher.submit(
+        CallbackJob(payload={"plan_request_id": "pr_1"}, on_delivered=delivered, on_dead_letter=dead_letter)
+    )
+    await dispatcher.join()
+    await dispatcher.stop()
+    return events
+
+
+@pytest.mark.asyncio
+async def test_callback_retries_transient_errors_then_delivers():
+    seen: list[dict] = []
+    dispatcher = CallbackDispatcher(
+        client=_client([503, 502, 200], seen), max_attempts=5, retry_base_seconds=0.001
+    )
+    assert await _run_job(dispatcher) == ["delivered"]
+    assert len(seen) == 3
+
+
+@pytest.mark.asyncio
+async def test_callback_dead_letters_after_retries_exhausted():
+    seen: list[dict] = []
+    dispatcher = CallbackDispatcher(client=_client([503], seen), max_attempts=3, retry_base_seconds=0.001)
+    assert await _run_job(dispatcher) == ["dead_letter:retries_exhausted"]
+    assert len(seen) == 3
+
+
+@pytest.mark.asyncio
+async def test_callback_does_not_retry_client_errors():
+    seen: list[dict] = []
+    dispatcher = CallbackDispatcher(client=_client([400], seen), max_attempts=5, retry_base_seconds=0.001)
+    assert await _run_job(dispatcher) == ["dead_letter:non_retryable"]
+    assert len(seen) == 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.integrations.openai_client import _ModelLimiter, _get_pool
+from src.utils.llm_metrics import LLM_INFLIGHT_REQUESTS, LLM_QUEUED_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_model_limiter_caps_inflight_and_tracks_queue():
+    limiter = _ModelLimiter(model="test-limiter", max_concurrency=2, requests_per_minute=0)
+    inflight = LLM_INFLIGHT_REQUESTS.labels(model="test-limiter")
+    queued = LLM_QUEUED_REQUESTS.labels(model="test-limiter")
+
+    peak = 0
+    release = asyncio.Event()
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, int(inflight._value.get()))
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    assert inflight._value.get() == 2
+    assert queued._value.get() == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 2
+    assert inflight._value.get() == 0
+    assert queued._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_is_reused_within_event_loop():
+    a = _get_pool("sk-test-pool")
+    b = _get_pool("sk-test-pool")
+    assert a is b
+    assert a.limiter("gpt-4o-mini") is b.limiter("gpt-4o-mini")
+    await a.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replaced_pool_is_closed():
+    old = _get_pool("sk-test-old")
+    new = _get_pool("sk-test-new")
+    assert new is not old
+    await asyncio.sleep(0)
+    assert old.client.is_closed()
+    assert not new.client.is_closed()
+    await new.aclose()
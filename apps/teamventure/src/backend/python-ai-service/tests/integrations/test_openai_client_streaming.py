@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.integrations.openai_client import OpenAIClient
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_yields_items_before_the_response_ends(fake_openai):
+    fake_openai.stream_chunk_chars = 64
+    fake_openai.stream_chunk_delay_seconds = 0.01
+    client = OpenAIClient()
+
+    start = time.perf_counter()
+    arrivals = []
+    async for plan in client.stream_json_array("生成3套团建方案 10人, 2天", array_key="plans"):
+        arrivals.append((plan["plan_type"], time.perf_counter() - start))
+    total = time.perf_counter() - start
+
+    assert [t for t, _ in arrivals] == ["budget", "standard", "premium"]
+    # Streamed: the last plan needs the remaining ~2/3 of the chunks after the first one arrives
+    # (buffered, all three would arrive together at the end).
+    assert arrivals[-1][1] - arrivals[0][1] > total * 0.25
+    assert fake_openai.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_json_uses_configured_base_url(fake_openai):
+    result = await OpenAIClient().generate_json("生成1套完整的团建方案 10人, 3天")
+
+    assert result["plan_type"] == "standard"
+    assert len(result["itinerary"]["days"]) == 3
+    assert fake_openai.calls == 1
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.langgraph import workflow
+from src.services.itinerary_markdown_v2 import validate
+
+
+def _plan(activity: str) -> dict:
+    return {
+        "itinerary": {
+            "days": [{"day": 1, "items": [{"time_start": "09:00", "time_end": "10:00", "activity": activity}]}]
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_plans_are_enforced_concurrently(monkeypatch):
+    async def slow_enforce(*, initial_markdown, fallback_markdown, max_attempts):
+        await asyncio.sleep(0.1)
+        return {"markdown": initial_markdown}
+
+    monkeypatch.setattr(workflow, "ensure_valid_itinerary_markdown", slow_enforce)
+    plans = [_plan("A"), _plan("B"), _plan("C")]
+
+    start = time.perf_counter()
+    await workflow.enforce_plans_itinerary_markdown(plans, fallback_markdown="", deadline_seconds=5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.25
+    for plan, activity in zip(plans, "ABC"):
+        assert f"| {activity} |" in plan["itinerary_markdown"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back_to_valid_template(monkeypatch):
+    async def enforce(*, initial_markdown, fallback_markdown, max_attempts):
+        if "| slow |" in initial_markdown:
+            await asyncio.sleep(5)
+        return {"markdown": initial_markdown}
+
+    monkeypatch.setattr(workflow, "ensure_valid_itinerary_markdown", enforce)
+    plans = [_plan("fast"), _plan("slow")]
+
+    await workflow.enforce_plans_itinerary_markdown(plans, fallback_markdown="", deadline_seconds=0.1)
+
+    assert "| fast |" in plans[0]["itinerary_markdown"]
+    assert "slow" in plans[1]["itinerary_markdown"]
+    assert validate(plans[1]["itinerary_markdown"])["valid"] is True
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.langgraph import workflow
+
+_MESSAGE = {
+    "plan_request_id": "plan_req_stream",
+    "user_id": "user_stream",
+    "people_count": 10,
+    "budget_min": 10000,
+    "budget_max": 20000,
+    "start_date": "2026-05-01",
+    "end_date": "2026-05-02",
+}
+
+
+def _plan(activity: str) -> dict:
+    return {
+        "plan_type": activity,
+        "itinerary": {
+            "days": [{"day": 1, "items": [{"time_start": "09:00", "time_end": "10:00", "activity": activity}]}]
+        },
+    }
+
+
+async def _passthrough_enforce(*, initial_markdown, fallback_markdown, max_attempts):
+    return {"markdown": initial_markdown}
+
+
+@pytest.mark.asyncio
+async def test_first_plan_is_emitted_before_the_rest_are_generated(monkeypatch):
+    async def slow_stream(*, plan_request_id, user_id, inputs):
+        for activity in ("budget", "standard", "premium"):
+            await asyncio.sleep(0.2)
+            yield _plan(activity)
+
+    monkeypatch.setattr(workflow, "stream_three_plans", slow_stream)
+    monkeypatch.setattr(workflow, "ensure_valid_itinerary_markdown", _passthrough_enforce)
+
+    start = time.perf_counter()
+    events = []
+    first_plan_at = None
+    async for event in workflow.stream_generation_workflow(_MESSAGE):
+        if event["event"] == "plan" and first_plan_at is None:
+            first_plan_at = time.perf_counter() - start
+        events.append(event)
+
+    assert first_plan_at is not None and first_plan_at < 0.4
+    plans = [e["data"] for e in events if e["event"] == "plan"]
+    assert [p["index"] for p in plans] == [0, 1, 2]
+    assert all("| " + p["plan"]["plan_type"] + " |" in p["plan"]["itinerary_markdown"] for p in plans)
+    assert events[-1] == {
+        "event": "done",
+        "data": {"plan_request_id": "plan_req_stream", "user_id": "user_stream", "count": 3},
+    }
+
+
+@pytest.mark.asyncio
+async def test_generation_failure_keeps_already_generated_plans(monkeypatch):
+    async def failing_stream(*, plan_request_id, user_id, inputs):
+        yield _plan("budget")
+        raise ValueError("LLM response must include plans: [..3 items..]")
+
+    monkeypatch.setattr(workflow, "stream_three_plans", failing_stream)
+    monkeypatch.setattr(workflow, "ensure_valid_itinerary_markdown", _passthrough_enforce)
+
+    events = [event async for event in workflow.stream_generation_workflow(_MESSAGE)]
+
+    assert [e["event"] for e in events] == ["plan", "error"]
+    assert "3 items" in events[-1]["data"]["error"]
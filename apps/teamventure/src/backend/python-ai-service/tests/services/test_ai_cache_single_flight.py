@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services import ai_cache
+from src.services.ai_cache import AICache
+
+
+@pytest.fixture(autouse=True)
+def _no_redis(monkeypatch):
+    monkeypatch.setattr(ai_cache, "_redis_unavailable", True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_trigger_single_load():
+    cache = AICache(name="test_single_flight")
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return [{"plan_type": "budget"}]
+
+    results = await asyncio.gather(*(cache.load_once("k", loader) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == [{"plan_type": "budget"}] for r in results)
+    # Each caller receives an independent copy.
+    results[0][0]["plan_type"] = "mutated"
+    assert results[1][0]["plan_type"] == "budget"
+    assert await cache.get("k") == [{"plan_type": "budget"}]
+
+
+@pytest.mark.asyncio
+async def test_loader_error_is_shared_and_not_cached():
+    cache = AICache(name="test_single_flight_error")
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(cache.load_once("k", loader) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await cache.get("k") is None
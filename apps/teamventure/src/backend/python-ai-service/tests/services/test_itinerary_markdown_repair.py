@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from src.services.itinerary_markdown_enforcer import ensure_valid_itinerary_markdown
+from src.services.itinerary_markdown_repair import repair_itinerary_markdown
+from src.services.itinerary_markdown_v2 import validate
+
+
+def test_repair_fixes_time_padding_and_missing_separator():
+    md = "# 行程安排\n## Day 1\n- 9点-10点半 参观西湖\n- 14:00 | 灵隐寺\n- 0930~1100｜茶园\n"
+    out = repair_itinerary_markdown(md)
+    assert out["check"]["valid"] is True
+    lines = out["markdown"].splitlines()
+    assert "- 09:00 - 10:30 | 参观西湖" in lines
+    assert "- 14:00 -  | 灵隐寺" in lines
+    assert "- 09:30 - 11:00 | 茶园" in lines
+
+
+def test_repair_moves_items_before_first_day_and_quotes_free_text():
+    md = "# 行程安排\n- 08:00 - 09:00 | 早餐\n## Day 1\n### 上午\n- 10:00 - 11:00 | 西湖​\n"
+    out = repair_itinerary_markdown(md)
+    assert out["check"]["valid"] is True
+    assert out["markdown"].splitlines()[1:4] == ["## Day 1", "- 08:00 - 09:00 | 早餐", "> 上午"]
+
+
+def test_repair_rewrites_cn_day_marker_under_subheading():
+    md = "# 行程安排\n## Day 1\n- 09:00 - 10:00 | 集合\n### 第2天 苏州\n- 09:00 - 10:00 | 虎丘\n"
+    out = repair_itinerary_markdown(md)
+    assert out["check"]["valid"] is True
+    assert out["check"]["days"] == 2
+    assert out["markdown"].splitlines()[3] == "## Day 2（苏州）"
+
+
+def test_repair_rewrites_top_level_day_heading_instead_of_treating_it_as_title():
+    md = "# 行程安排\n## Day 1\n- 09:00 - 10:00 | 集合\n# Day 2 杭州\n- 09:00 - 10:00 | 西湖\n"
+    assert validate(md)["valid"] is False
+    out = repair_itinerary_markdown(md)
+    assert out["check"]["valid"] is True
+    assert out["check"]["days"] == 2
+    assert out["markdown"].splitlines()[3] == "## Day 2（杭州）"
+
+
+def test_repair_never_quotes_unparseable_day_marker():
+    md = "# 行程安排\n## Day 1\n- 09:00 - 10:00 | 集合\n第2天 苏州\n- 09:00 - 10:00 | 虎丘\n"
+    out = repair_itinerary_markdown(md)
+    assert out["check"]["valid"] is False
+    assert "第2天 苏州" in out["markdown"].splitlines()
+    assert "> 第2天 苏州" not in out["markdown"]
+
+
+def test_repair_adds_day_heading_when_missing():
+    out = repair_itinerary_markdown("# 行程安排\n- 09:00 - 10:00 | 集合\n")
+    assert out["check"]["valid"] is True
+    assert "## Day 1" in out["markdown"]
+
+
+def test_repair_leaves_items_without_time_for_llm():
+    out = repair_itinerary_markdown("## Day 1\n- 参观西湖\n")
+    assert out["check"]["valid"] is False
+    assert {i["code"] for i in validate(out["markdown"])["issues"]} >= {"item_format"}
+
+
+@pytest.mark.asyncio
+async def test_enforcer_repairs_locally_without_llm():
+    res = await ensure_valid_itinerary_markdown(
+        initial_markdown="# 行程安排\n## Day 1\n- 9点-10点 | 集合出发\n",
+        fallback_markdown="",
+    )
+    assert res["fallback_used"] is False
+    assert res["attempts"] == 0
+    assert "- 09:00 - 10:00 | 集合出发" in res["markdown"]
@@ -28,3 +28,11 @@ def test_validate_accepts_d1_d2_d3_headings():
     assert out["valid"] is True
     assert out["days"] == 3
     assert out["items"] == 3
+
+
+def test_validate_accepts_day_heading_with_space_separated_title():
+    md = "## Day 1 抵达苏州\n- 09:00 - 10:00 | 抵达 | 苏州站 |  |\n## Day 2 苏州古城\n- 09:00 - 11:00 | 游览 | 虎丘 |  |\n"
+    out = validate(md)
+    assert out["valid"] is True
+    assert out["days"] == 2
+    assert out["items"] == 2
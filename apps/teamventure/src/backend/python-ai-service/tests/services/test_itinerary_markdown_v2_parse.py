@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from src.services.itinerary_markdown_v2 import ISSUE_TIME_FORMAT, parse, validate
+from src.services.markdown_converter import _extract_day_numbers_from_v2, _parse_itinerary_markdown_v2
+from src.services.plan_generation import _extract_pois_by_day_from_markdown
+
+
+_MD = """# 行程安排
+> 版本: v2
+
+## Day 1（2026-01-19）
+- 9:00 - 10:30 | 参观南京路步行街 | 南京路步行街 | 
+- 11:00 - 12:00 | 游览 | 外白渡桥、乍浦路桥 | 拍照
+## Day 2
+- 09:00 - | 自由活动 |  | 
+
+> 住宿：外滩附近
+"""
+
+
+def test_parse_builds_days_items_and_appendix_in_one_pass():
+    doc = parse(_MD)
+
+    assert doc.title == "行程安排"
+    assert doc.is_canonical
+    assert [d.number for d in doc.days] == [1, 2]
+    assert doc.days[0].heading_suffix == "（2026-01-19）"
+    first = doc.days[0].items[0]
+    assert (first.time_start, first.time_end, first.activity, first.location) == ("9:00", "10:30", "参观南京路步行街", "南京路步行街")
+    assert doc.days[1].items[0].time_end == ""
+    assert doc.appendix == ("住宿：外滩附近",)
+
+
+def test_parse_is_memoized_and_shared_by_consumers():
+    assert parse(_MD) is parse(_MD.replace("｜", "|"))
+
+    out = validate(_MD)
+    assert out["valid"] is True and out["days"] == 2 and out["items"] == 3
+    assert _extract_day_numbers_from_v2(_MD) == {1, 2}
+    assert _parse_itinerary_markdown_v2(_MD)[0]["items"][0]["time_start"] == "09:00"
+    assert _extract_pois_by_day_from_markdown(_MD) == {1: ["南京路步行街", "外白渡桥", "乍浦路桥"], 2: ["自由活动"]}
+
+
+def test_parse_keeps_malformed_items_with_issue_code():
+    doc = parse("## Day 1\n- 上午 | 拙政园\n")
+
+    assert doc.days[0].items[0].issue == ISSUE_TIME_FORMAT
+    assert doc.days[0].valid_items == ()
+    assert not doc.is_canonical
+    assert [i.code for i in doc.issues] == [ISSUE_TIME_FORMAT, "day_without_items"]
@@ -126,6 +126,55 @@ def test_rationalizer_inserts_transfer_and_meal_without_new_pois():
     assert "黑龙江省博物馆" in fixed
 
 
+def test_rationalizer_keeps_non_canonical_day_headings():
+    md = """
+# 行程安排
+> 版本: v2
+
+## Day 1：抵达苏州
+- 09:00 - 10:00 | 抵达 | 苏州站 |  |
+## Day 2(2026-01-20)
+- 09:00 - 11:00 | 游览 | 虎丘 |  |
+## Day 3（2026-01-21）
+- 09:00 - 11:00 | 漫步 | 平江路 |  |
+""".strip()
+    from src.services.markdown_converter import _rationalize_itinerary_markdown_v2
+
+    fixed = _rationalize_itinerary_markdown_v2(md)
+    assert "## Day 1：抵达苏州" in fixed
+    assert "## Day 2(2026-01-20)" in fixed
+    assert "## Day 3（2026-01-21）" in fixed
+    assert "苏州站" in fixed
+    assert "虎丘" in fixed
+    assert "平江路" in fixed
+
+
+def test_rationalizer_keeps_day_headings_with_space_separated_title():
+    md = """
+# 行程安排
+> 版本: v2
+
+## Day 1 抵达苏州
+- 09:00 - 10:00 | 抵达 | 苏州站 |  |
+## Day 2 苏州古城
+- 09:00 - 11:00 | 游览 | 虎丘 |  |
+""".strip()
+    from src.services.markdown_converter import _rationalize_itinerary_markdown_v2
+
+    fixed = _rationalize_itinerary_markdown_v2(md)
+    assert "## Day 1 抵达苏州" in fixed
+    assert "## Day 2 苏州古城" in fixed
+    # Day 2's items stay under Day 2 instead of folding into Day 1.
+    assert fixed.index("虎丘") > fixed.index("## Day 2 苏州古城")
+
+
+def test_extract_day_numbers_accepts_space_separated_title():
+    from src.services.markdown_converter import _extract_day_numbers_from_v2
+
+    md = "## Day 1 抵达苏州\n- 09:00 - 10:00 | 抵达 | 苏州站 |  |\n## Day 2 苏州古城\n- 09:00 - 11:00 | 游览 | 虎丘 |  |\n"
+    assert _extract_day_numbers_from_v2(md) == {1, 2}
+
+
 def test_fallback_converter_diverts_sectionish_blocks_to_appendix_blockquote():
     text = """
 苏州两天行程
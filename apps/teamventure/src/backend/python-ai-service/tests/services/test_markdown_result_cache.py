@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from src.services import ai_cache
+from src.services.ai_cache import AICache, content_cache_key
+from src.services.markdown_optimizer import MarkdownOptimizer
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def is_configured(self) -> bool:
+        return True
+
+    async def generate_json(self, prompt, **kwargs):
+        self.calls += 1
+        return {"markdown_content": "# 优化后\n- A\n"}
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(ai_cache, "_redis_unavailable", True)
+    cache = AICache(name="markdown_test", ttl_seconds=60, max_size=8, use_redis=False)
+    monkeypatch.setattr("src.services.markdown_optimizer.markdown_result_cache", cache)
+    return cache
+
+
+def test_content_cache_key_depends_on_version_model_and_content():
+    base = content_cache_key("optimize", version="v1", model="gpt-4o", content="abc")
+    assert base == content_cache_key("optimize", version="v1", model="gpt-4o", content="abc")
+    assert base != content_cache_key("optimize", version="v2", model="gpt-4o", content="abc")
+    assert base != content_cache_key("optimize", version="v1", model="gpt-4o-mini", content="abc")
+    assert base != content_cache_key("optimize", version="v1", model="gpt-4o", content="abd")
+    assert base != content_cache_key("convert", version="v1", model="gpt-4o", content="abc")
+
+
+@pytest.mark.asyncio
+async def test_optimizer_reuses_cached_result_for_same_input(fresh_cache):
+    optimizer = MarkdownOptimizer()
+    fake = _FakeClient()
+    optimizer._client = fake
+
+    first = await optimizer.optimize_markdown(markdown_content="# 草稿\n- A\n")
+    second = await optimizer.optimize_markdown(markdown_content="# 草稿\n- A\n")
+    third = await optimizer.optimize_markdown(markdown_content="# 另一份草稿\n- A\n")
+
+    assert first == second == third == "# 优化后\n- A"
+    assert fake.calls == 2
+
+
+class _DroppingClient(_FakeClient):
+    async def generate_json(self, prompt, **kwargs):
+        self.calls += 1
+        return {"markdown_content": "# 优化后\n"}
+
+
+@pytest.mark.asyncio
+async def test_optimizer_does_not_cache_guardrail_fallback(fresh_cache, monkeypatch):
+    optimizer = MarkdownOptimizer()
+    fake = _DroppingClient()
+    optimizer._client = fake
+    monkeypatch.setattr(optimizer, "_drops_user_pois", lambda original, optimized: True)
+
+    first = await optimizer.optimize_markdown(markdown_content="# 草稿\n- 拙政园\n")
+    second = await optimizer.optimize_markdown(markdown_content="# 草稿\n- 拙政园\n")
+
+    assert first == second == "# 草稿\n- 拙政园"
+    assert fake.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_converter_does_not_cache_deterministic_fallback(monkeypatch):
+    from src.services.markdown_converter import MarkdownConverter
+
+    monkeypatch.setattr(ai_cache, "_redis_unavailable", True)
+    cache = AICache(name="markdown_test", ttl_seconds=60, max_size=8, use_redis=False)
+    monkeypatch.setattr("src.services.markdown_converter.markdown_result_cache", cache)
+
+    class _NoItineraryClient(_FakeClient):
+        async def generate_json(self, prompt, **kwargs):
+            self.calls += 1
+            return {"markdown_content": ""}
+
+    converter = MarkdownConverter()
+    fake = _NoItineraryClient()
+    converter._client = fake
+
+    text = "D1 拙政园 平江路\nD2 虎丘"
+    first = await converter.convert_parsed_text_to_markdown(parsed_content=text)
+    second = await converter.convert_parsed_text_to_markdown(parsed_content=text)
+
+    assert first == second
+    assert "## Day 1" in first
+    assert fake.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_uncached_result_is_returned_but_not_stored():
+    cache = AICache(name="markdown_test", ttl_seconds=60, max_size=8, use_redis=False)
+
+    async def loader():
+        raise ai_cache.UncachedResult("fallback")
+
+    assert await cache.get_or_load("k", loader) == "fallback"
+    assert await cache.get("k") is None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from src.models.config import settings
+from src.services import mq_consumer
+
+
+def _request(i: int) -> bytes:
+    return json.dumps(
+        {
+            "plan_request_id": f"plan_req_{i}",
+            "user_id": "user_mq",
+            "people_count": 10,
+            "budget_min": 10000,
+            "budget_max": 20000,
+            "start_date": "2026-05-01",
+            "end_date": "2026-05-02",
+            "destination": f"目的地{i}",
+        }
+    ).encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_consumer_generates_and_calls_back_for_each_message(fake_openai, callback_sink, in_memory_broker):
+    await mq_consumer.start_mq_consumer()
+    try:
+        for i in range(3):
+            await in_memory_broker.publish(settings.mq_exchange, settings.mq_routing_key, _request(i))
+        await in_memory_broker.publish(settings.mq_exchange, settings.mq_routing_key, b"not json")
+
+        await in_memory_broker.wait_acked(4)
+        await asyncio.to_thread(callback_sink.wait_for, 3, 1.0)
+    finally:
+        await mq_consumer.stop_mq_consumer()
+
+    delivered = sorted(p["plan_request_id"] for p in callback_sink.delivered)
+    assert delivered == ["plan_req_0", "plan_req_1", "plan_req_2"]
+    assert all(len(p["plans"]) == 3 for p in callback_sink.delivered)
+    assert fake_openai.calls == 3
+
+    dead = in_memory_broker.queues[settings.mq_dead_letter_queue].get_nowait()
+    assert dead is not None and dead.body == b"not json"
+    assert dead.headers["x-failure-reason"] == "invalid_message"
+
+
+@pytest.mark.asyncio
+async def test_failed_dead_letter_publish_requeues_message(fake_openai, callback_sink, in_memory_broker):
+    await mq_consumer.start_mq_consumer()
+    exchange = mq_consumer._dead_letter_exchange
+    publish = exchange.publish
+    attempts = 0
+
+    async def flaky_publish(*args, **kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("dlq unavailable")
+        await publish(*args, **kwargs)
+
+    exchange.publish = flaky_publish
+    try:
+        await in_memory_broker.publish(settings.mq_exchange, settings.mq_routing_key, b"not json")
+        # First delivery is nacked back onto the queue, the redelivery is dead-lettered and acked.
+        await in_memory_broker.wait_acked(2)
+    finally:
+        await mq_consumer.stop_mq_consumer()
+
+    assert attempts == 2
+    dead = in_memory_broker.queues[settings.mq_dead_letter_queue].get_nowait()
+    assert dead is not None and dead.body == b"not json"
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from src.services import ai_cache, plan_generation
+from src.services.ai_cache import AICache
+
+_INPUTS = {"people_count": 10, "duration_days": 2, "budget_min": 10000, "budget_max": 20000}
+
+
+class _ConfiguredClient:
+    def is_configured(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_stream_caches_plans_as_yielded_not_as_mutated_downstream(monkeypatch):
+    monkeypatch.setattr(ai_cache, "_redis_unavailable", True)
+    cache = AICache(name="plan_test", ttl_seconds=60, max_size=8, use_redis=False)
+    monkeypatch.setattr(plan_generation, "_plan_cache", cache)
+    monkeypatch.setattr(plan_generation.settings, "enable_ai_mock", False)
+    monkeypatch.setattr(plan_generation.settings, "ai_cache_enabled", True)
+    monkeypatch.setattr(plan_generation, "OpenAIClient", _ConfiguredClient)
+
+    async def fake_stream(*, client, plan_request_id, user_id, inputs):
+        for plan_type in ("budget", "standard", "premium"):
+            yield {"plan_id": plan_type, "plan_type": plan_type, "itinerary": {"markdown": plan_type}}
+
+    monkeypatch.setattr(plan_generation, "_stream_three_plans_llm", fake_stream)
+
+    async for plan in plan_generation.stream_three_plans(plan_request_id="req", user_id="u", inputs=_INPUTS):
+        # Downstream enforcement rewrites nested fields in place.
+        plan["itinerary"]["markdown"] = "enforced"
+
+    cached = await cache.get(plan_generation._generate_cache_key(_INPUTS))
+    assert [p["itinerary"]["markdown"] for p in cached] == ["budget", "standard", "premium"]
+    assert all("plan_id" not in p for p in cached)
+
+    # Cache hits hand out independent copies.
+    first = await cache.get(plan_generation._generate_cache_key(_INPUTS))
+    first[0]["itinerary"]["markdown"] = "changed"
+    second = await cache.get(plan_generation._generate_cache_key(_INPUTS))
+    assert second[0]["itinerary"]["markdown"] == "budget"
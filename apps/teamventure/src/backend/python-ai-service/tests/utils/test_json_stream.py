@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.json_stream import JsonArrayItemStream
+
+
+def test_items_are_reported_as_soon_as_they_close():
+    doc = json.dumps(
+        {
+            "note": 'decoy "plans": [{"x": 1}]',
+            "meta": {"plans": [{"nested": True}]},
+            "plans": [{"plan_type": "budget", "s": "}{]["}, 3, {"plan_type": "standard"}],
+        },
+        ensure_ascii=False,
+    )
+    stream = JsonArrayItemStream("plans")
+
+    seen: list[list[str]] = []
+    for i in range(0, len(doc), 5):
+        seen.append([item["plan_type"] for item in stream.feed(doc[i : i + 5])])
+
+    flat = [t for chunk in seen for t in chunk]
+    assert flat == ["budget", "standard"]
+    # "budget" is reported before the document is complete.
+    first_chunk = next(i for i, chunk in enumerate(seen) if chunk)
+    assert first_chunk < len(seen) - 1
+    assert json.loads(stream.text)["plans"][2] == {"plan_type": "standard"}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.utils import ttl_cache
+from src.utils.ttl_cache import TTLCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache[str, int](ttl_seconds=60, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expires_entries_on_monotonic_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache[str, int](ttl_seconds=10, max_size=4)
+    cache.set("a", 1)
+
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses():
+    cache = TTLCache[str, str](ttl_seconds=60)
+    calls = 0
+
+    async def loader() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert await cache.get_or_load("k", loader) == "value"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_none():
+    cache = TTLCache[str, str](ttl_seconds=60)
+
+    async def loader() -> None:
+        return None
+
+    assert await cache.get_or_load("k", loader) is None
+    assert len(cache) == 0
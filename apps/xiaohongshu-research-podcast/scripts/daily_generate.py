@@ -6,12 +6,12 @@
 import argparse
 import json
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
-# 添加项目根目录到路径
+# 添加项目根目录到路径（src 下的模块使用相对导入，需要经 src 包导入）
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root))
 
 from dotenv import load_dotenv
 
@@ -19,17 +19,17 @@ from dotenv import load_dotenv
 load_dotenv(project_root / ".env")
 
 # 导入模块
-from scrapers.newrank_scraper import NewrankScraper
-from analyzers.topic_analyzer import TopicAnalyzer
-from analyzers.trend_analyzer import TrendAnalyzer
-from analyzers.insight_generator import InsightGenerator
-from processors.dialogue_writer import DialogueWriter, PodcastScript
-from generators.tts_generator import TTSGenerator
-from generators.audio_mixer import AudioMixer
-from generators.cover_generator import CoverGenerator
-from generators.report_generator import ReportGenerator
-from utils.logger import get_logger
-from utils.cache import CacheManager
+from src.scrapers.newrank_scraper import NewRankScraper
+from src.analyzers.topic_analyzer import TopicAnalyzer
+from src.analyzers.trend_analyzer import TrendAnalyzer
+from src.analyzers.insight_generator import InsightGenerator
+from src.processors.dialogue_writer import DialogueWriter, PodcastScript
+from src.generators.tts_generator import TTSGenerator
+from src.generators.audio_mixer import AudioMixer
+from src.generators.cover_generator import CoverGenerator
+from src.generators.report_generator import ReportGenerator
+from src.utils.logger import get_logger
+from src.utils.cache_manager import CacheManager
 
 logger = get_logger()
 
@@ -214,7 +214,7 @@ def generate_podcast(
             print("  🔍 演示模式：跳过实际抓取")
             topics = []
         else:
-            scraper = NewrankScraper()
+            scraper = NewRankScraper()
             topics = scraper.fetch_hot_topics(max_count=50)
 
             if not topics:
@@ -230,7 +230,7 @@ def generate_podcast(
     print("\n[步骤 2/7] 话题分析")
     print("-" * 50)
 
-    analyzer = TopicAnalyzer()
+    analyzer = TopicAnalyzer(cache_dir=project_root / "cache")
     analysis_result = analyzer.analyze(topics, date_str)
 
     print(f"  ✓ 总热度: {analysis_result.total_heat / 10000:.1f}万")
@@ -241,15 +241,22 @@ def generate_podcast(
     print("\n[步骤 3/7] 趋势分析")
     print("-" * 50)
 
-    trend_analyzer = TrendAnalyzer(cache_dir=project_root / "cache")
-    trend_result = trend_analyzer.analyze_trends(topics, date_str)
+    trend_analyzer = TrendAnalyzer()
+    history_start = (target_date - timedelta(days=trend_analyzer.lookback_days)).strftime("%Y-%m-%d")
+    history = cache_manager.history.query_range(history_start, date_str)
+    if date_str in cache_manager.history.available_dates():
+        trend_result = trend_analyzer.analyze_history(history, date_str)
+    else:
+        # 演示模式等未入库的情况：没有历史可对比
+        trend_result = trend_analyzer.analyze_trends(topics, [])
 
     # 合并趋势数据到分析结果
-    analysis_result.rising_topics = trend_result.get("rising", [])
-    analysis_result.new_topics = trend_result.get("new", [])
+    analysis_result.rising_topics = trend_result.get("rising_topics", [])
+    analysis_result.new_topics = trend_result.get("new_topics", [])
 
     print(f"  ✓ 热度上升: {len(analysis_result.rising_topics)}个")
     print(f"  ✓ 新话题: {len(analysis_result.new_topics)}个")
+    print(f"  ✓ 异动突破: {len(trend_result.get('breakout_topics', []))}个")
 
     # 步骤4: AI洞察生成
     print("\n[步骤 4/7] AI洞察生成")
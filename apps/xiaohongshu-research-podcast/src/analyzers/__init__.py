@@ -1,6 +1,7 @@
 """数据分析模块"""
 from .topic_analyzer import TopicAnalyzer
+from .keyword_index import KeywordIndex
 from .trend_analyzer import TrendAnalyzer
 from .insight_generator import InsightGenerator
 
-__all__ = ["TopicAnalyzer", "TrendAnalyzer", "InsightGenerator"]
+__all__ = ["TopicAnalyzer", "KeywordIndex", "TrendAnalyzer", "InsightGenerator"]
@@ -0,0 +1,256 @@
+"""热词提取：分词缓存与跨天文档频率索引"""
+import hashlib
+import math
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import jieba
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    title_hash TEXT PRIMARY KEY,
+    tokens     TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    docs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS day_terms (
+    date TEXT NOT NULL,
+    term TEXT NOT NULL,
+    df   INTEGER NOT NULL,
+    PRIMARY KEY (date, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS doc_freq (
+    term TEXT PRIMARY KEY,
+    df   INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# SQLite 单条语句的参数个数上限（旧版本为 999）
+_BATCH = 900
+
+# 分词规则（词典、过滤、大小写处理等）变化时递增，参与分词缓存的键，旧版本的缓存不再命中
+TOKENIZER_VERSION = 2
+
+
+def configure_jieba(cache_dir: Optional[str] = None):
+    """
+    配置 jieba
+
+    jieba 首次使用时把词典构建成前缀词典并序列化到 jieba.cache，之后启动只需反序列化。
+    默认写在系统临时目录（可能被定期清理），指定 cache_dir 后保存在项目缓存目录。
+    """
+    jieba.setLogLevel(20)  # 降低日志级别
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        jieba.dt.tmp_dir = str(cache_dir)
+
+
+def cut_title(title: str) -> list[str]:
+    """标题分词，过滤单字和空白，英文统一小写（"AI" 与 "ai" 为同一个词）"""
+    return [w.lower() for w in jieba.cut(title) if len(w) > 1 and w.strip()]
+
+
+def _init_worker(cache_dir: Optional[str]):
+    configure_jieba(cache_dir)
+    jieba.initialize()
+
+
+def _cut_batch(titles: list[str]) -> list[list[str]]:
+    return [cut_title(title) for title in titles]
+
+
+def title_hash(title: str) -> str:
+    """分词缓存的键（含分词规则版本）"""
+    return hashlib.sha1(f"{TOKENIZER_VERSION}:{title}".encode("utf-8")).hexdigest()
+
+
+class KeywordIndex:
+    """
+    热词索引
+
+    - 分词缓存：按标题哈希保存分词结果，每天重复上榜的标题不再调用 jieba；
+      全部命中缓存时不会加载 jieba 词典
+    - 大批量未缓存标题用进程池并行分词
+    - 文档频率索引：每个标题为一篇文档，按天增量累加词的文档频率，
+      热词按 TF-IDF（当天词频 × 相对全部历史的 IDF）排序
+
+    指定 cache_dir 时保存到 {cache_dir}/keyword-index.db，否则只在内存中。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        parallel_threshold: int = 2000,
+    ):
+        """
+        初始化
+
+        Args:
+            cache_dir: 缓存目录
+            workers: 分词进程数（默认 CPU 核数，1 表示不使用进程池）
+            parallel_threshold: 未缓存标题达到该数量时才使用进程池
+        """
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+
+        if self.cache_dir:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(Path(self.cache_dir) / "keyword-index.db")
+        else:
+            self._conn = sqlite3.connect(":memory:")
+        self._conn.executescript(_SCHEMA)
+        self._tokens: dict[str, list[str]] = {}
+
+    def close(self):
+        """关闭数据库连接"""
+        self._conn.close()
+
+    # ========== 分词 ==========
+
+    def tokenize(self, titles: Sequence[str]) -> list[list[str]]:
+        """
+        批量分词（带缓存）
+
+        Args:
+            titles: 标题列表
+
+        Returns:
+            与 titles 对应的分词结果
+        """
+        hashes = {title: title_hash(title) for title in titles}
+        missing = {h for h in hashes.values() if h not in self._tokens}
+
+        # 内存中没有的先查持久化缓存
+        pending = list(missing)
+        for i in range(0, len(pending), _BATCH):
+            batch = pending[i: i + _BATCH]
+            for h, tokens in self._conn.execute(
+                f"SELECT title_hash, tokens FROM tokens WHERE title_hash IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                self._tokens[h] = tokens.split()
+
+        uncached = [title for title, h in hashes.items() if h not in self._tokens]
+        if uncached:
+            for title, tokens in zip(uncached, self._cut(uncached)):
+                self._tokens[hashes[title]] = tokens
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tokens (title_hash, tokens) VALUES (?, ?)",
+                    [(hashes[title], " ".join(self._tokens[hashes[title]])) for title in uncached],
+                )
+
+        return [list(self._tokens[hashes[title]]) for title in titles]
+
+    def _cut(self, titles: list[str]) -> list[list[str]]:
+        # 先在主进程加载词典：fork 出的子进程直接继承，spawn 时子进程从已生成的缓存文件加载
+        jieba.initialize()
+        if self.workers <= 1 or len(titles) < self.parallel_threshold:
+            return _cut_batch(titles)
+
+        chunk = math.ceil(len(titles) / (self.workers * 4))
+        batches = [titles[i: i + chunk] for i in range(0, len(titles), chunk)]
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.cache_dir,)
+        ) as pool:
+            return [tokens for batch in pool.map(_cut_batch, batches) for tokens in batch]
+
+    # ========== 文档频率 ==========
+
+    def add_documents(self, date: str, documents: Sequence[Sequence[str]]):
+        """
+        把一天的文档计入文档频率索引（同一天重复调用时替换当天的数据）
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD）
+            documents: 分词后的文档列表
+        """
+        day_df = Counter(term for doc in documents for term in set(doc))
+
+        with self._conn:
+            # 先撤销当天旧数据的贡献
+            self._conn.execute(
+                """
+                UPDATE doc_freq SET df = df - (
+                    SELECT d.df FROM day_terms d WHERE d.date = ? AND d.term = doc_freq.term
+                )
+                WHERE term IN (SELECT term FROM day_terms WHERE date = ?)
+                """,
+                (date, date),
+            )
+            self._conn.execute("DELETE FROM day_terms WHERE date = ?", (date,))
+
+            self._conn.executemany(
+                "INSERT INTO day_terms (date, term, df) VALUES (?, ?, ?)",
+                [(date, term, df) for term, df in day_df.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO doc_freq (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                day_df.items(),
+            )
+            self._conn.execute("DELETE FROM doc_freq WHERE df <= 0")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO days (date, docs) VALUES (?, ?)", (date, len(documents))
+            )
+
+    def document_frequency(self, terms: Sequence[str]) -> tuple[int, dict[str, int]]:
+        """
+        查询文档总数和词的文档频率
+
+        Args:
+            terms: 词列表
+
+        Returns:
+            (文档总数, {词: 文档频率})
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(docs), 0) FROM days").fetchone()[0]
+        terms = list(terms)
+        df = {}
+        for i in range(0, len(terms), _BATCH):
+            batch = terms[i: i + _BATCH]
+            df.update(self._conn.execute(
+                f"SELECT term, df FROM doc_freq WHERE term IN ({','.join('?' * len(batch))})", batch
+            ))
+        return total, df
+
+    def top_keywords(
+        self, documents: Sequence[Sequence[str]], top_n: int = 20, date: Optional[str] = None
+    ) -> list[str]:
+        """
+        按 TF-IDF 提取热词
+
+        Args:
+            documents: 当天分词后的文档列表
+            top_n: 返回前N个热词
+            date: 指定时先把当天文档计入索引；不指定时只临时加上当天文档计算 IDF
+
+        Returns:
+            热词列表（按分数降序）
+        """
+        tf = Counter(term for doc in documents for term in doc)
+        if not tf:
+            return []
+
+        if date:
+            self.add_documents(date, documents)
+            total, df = self.document_frequency(tf)
+        else:
+            total, df = self.document_frequency(tf)
+            total += len(documents)
+            for term, count in Counter(term for doc in documents for term in set(doc)).items():
+                df[term] = df.get(term, 0) + count
+
+        # 与 sklearn TfidfVectorizer(smooth_idf=True) 相同的 IDF
+        scores = {
+            term: count * (math.log((1 + total) / (1 + df.get(term, 0))) + 1)
+            for term, count in tf.items()
+        }
+        return sorted(scores, key=lambda term: (-scores[term], term))[:top_n]
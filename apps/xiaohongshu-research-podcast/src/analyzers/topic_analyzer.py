@@ -1,11 +1,11 @@
 """话题分析器"""
+import sqlite3
 from collections import Counter
 from typing import Optional
-import jieba
-from sklearn.feature_extraction.text import TfidfVectorizer
 
 from ..models.topic import XHSTopic, TopicAnalysisResult
 from ..utils.logger import get_logger
+from .keyword_index import KeywordIndex, configure_jieba
 
 logger = get_logger()
 
@@ -13,10 +13,17 @@ logger = get_logger()
 class TopicAnalyzer:
     """话题数据分析器"""
 
-    def __init__(self):
-        """初始化"""
-        # 加载jieba词典（可选：添加自定义词典）
-        jieba.setLogLevel(20)  # 降低日志级别
+    def __init__(self, cache_dir: Optional[str] = None, workers: Optional[int] = None):
+        """
+        初始化
+
+        Args:
+            cache_dir: 缓存目录（分词缓存、文档频率索引和 jieba 词典缓存），为空时只缓存在内存中
+            workers: 大批量标题分词的进程数（默认 CPU 核数）
+        """
+        # jieba 词典延迟到首次分词时加载（可选：添加自定义词典）
+        configure_jieba(cache_dir)
+        self.keyword_index = KeywordIndex(cache_dir, workers=workers)
 
     def analyze(self, topics: list[XHSTopic], date: str) -> TopicAnalysisResult:
         """
@@ -38,7 +45,7 @@ class TopicAnalyzer:
             )
 
         # 1. 热词提取
-        top_keywords = self._extract_keywords(topics, top_n=20)
+        top_keywords = self._extract_keywords(topics, top_n=20, date=date)
         logger.info(f"  提取热词: {len(top_keywords)}个")
 
         # 2. 分类统计
@@ -62,14 +69,15 @@ class TopicAnalyzer:
         return result
 
     def _extract_keywords(
-        self, topics: list[XHSTopic], top_n: int = 20
+        self, topics: list[XHSTopic], top_n: int = 20, date: Optional[str] = None
     ) -> list[str]:
         """
-        提取热词（基于TF-IDF）
+        提取热词（基于TF-IDF，IDF 相对历史各天的标题计算）
 
         Args:
             topics: 话题列表
             top_n: 返回前N个热词
+            date: 分析日期，指定时当天标题计入文档频率索引
 
         Returns:
             热词列表
@@ -83,28 +91,16 @@ class TopicAnalyzer:
         if not texts:
             return []
 
-        # 中文分词
-        tokenized_texts = []
-        for text in texts:
-            # 分词
-            words = jieba.cut(text)
-            # 过滤停用词和单字
-            filtered_words = [w for w in words if len(w) > 1 and w.strip()]
-            tokenized_texts.append(" ".join(filtered_words))
-
-        if not tokenized_texts:
-            return []
+        # 中文分词（过滤单字，命中缓存的标题不重复分词）
+        tokenized = self.keyword_index.tokenize(texts)
 
         # TF-IDF提取
         try:
-            vectorizer = TfidfVectorizer(max_features=top_n)
-            vectorizer.fit(tokenized_texts)
-            keywords = vectorizer.get_feature_names_out().tolist()
-            return keywords
-        except Exception as e:
+            return self.keyword_index.top_keywords(tokenized, top_n=top_n, date=date)
+        except sqlite3.Error as e:
             logger.warning(f"TF-IDF提取失败: {e}")
             # 回退到简单词频统计
-            return self._fallback_keyword_extraction(tokenized_texts, top_n)
+            return self._fallback_keyword_extraction([" ".join(words) for words in tokenized], top_n)
 
     def _fallback_keyword_extraction(
         self, tokenized_texts: list[str], top_n: int
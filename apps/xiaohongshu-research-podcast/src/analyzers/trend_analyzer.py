@@ -1,17 +1,155 @@
 """趋势分析器"""
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Optional
+
+import numpy as np
+
 from ..models.topic import XHSTopic
 from ..utils.logger import get_logger
+from ..utils.topic_history import TopicHistory
+from ..utils.topic_resolver import TopicResolver
 
 logger = get_logger()
 
 
+@dataclass
+class TrendMetrics:
+    """
+    目标日期的多窗口趋势指标（每个数组长度均为话题数）
+
+    - deltas[w] / delta_percents[w]: 相对 w 天前的热度变化量 / 百分比
+    - momentum: 每日对数热度变化的 EWMA（%/天），正数表示持续升温
+    - zscore: 当日热度变化相对该话题自身历史波动的 z 分数
+    - rank_velocity: 近期排名的线性回归斜率（名次/天，正数表示排名上升）
+    """
+
+    date: str
+    titles: list[str]
+    categories: list[str]
+    present: np.ndarray  # 当日在榜
+    present_prev: np.ndarray  # 上一次抓取时在榜
+    heat: np.ndarray
+    prev_heat: np.ndarray
+    rank: np.ndarray
+    prev_rank: np.ndarray
+    deltas: dict[int, np.ndarray]
+    delta_percents: dict[int, np.ndarray]
+    momentum: np.ndarray
+    zscore: np.ndarray
+    rank_velocity: np.ndarray
+    breakout: np.ndarray
+
+
+def _carry_forward_missing_days(matrix: np.ndarray) -> np.ndarray:
+    """没有抓取的日期沿用上一次抓取的整列数据（榜单缺失的话题仍为 NaN）"""
+    crawled = ~np.isnan(matrix).all(axis=0)
+    source = np.maximum.accumulate(np.where(crawled, np.arange(matrix.shape[1]), 0))
+    return matrix[:, source]
+
+
+def _column(matrix: np.ndarray, index: int) -> np.ndarray:
+    if index < 0:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix[:, index]
+
+
+def _masked_sums(values: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """按行计算 Σ w·x 与 Σ w（跳过 NaN）"""
+    valid = ~np.isnan(values)
+    return np.where(valid, values, 0.0) @ weights, valid @ weights
+
+
+def _ewma_last(values: np.ndarray, span: int) -> np.ndarray:
+    """每行最后一个时刻的 EWMA（权重 (1-α)^k，跳过 NaN 并按有效权重归一化）"""
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], np.nan)
+    alpha = 2 / (span + 1)
+    weights = (1 - alpha) ** np.arange(values.shape[1])[::-1]
+    total, weight = _masked_sums(values, weights)
+    return np.divide(total, weight, out=np.full_like(total, np.nan), where=weight > 0)
+
+
+def _zscore(current: np.ndarray, baseline: np.ndarray, min_history: int, min_std: float) -> np.ndarray:
+    """current 相对 baseline 每行（跳过 NaN）的 z 分数，有效样本不足时为 NaN"""
+    ones = np.ones(baseline.shape[1])
+    total, count = _masked_sums(baseline, ones)
+    mean = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+    squares, _ = _masked_sums((baseline - mean[:, None]) ** 2, ones)
+    std = np.sqrt(np.divide(squares, count - 1, out=np.zeros_like(squares), where=count > 1))
+    z = (current - mean) / np.maximum(std, min_std)
+    return np.where(count >= min_history, z, np.nan)
+
+
+def _slope(values: np.ndarray) -> np.ndarray:
+    """每行对列序号做最小二乘的斜率（跳过 NaN，有效点少于 2 个时为 NaN）"""
+    x = np.arange(values.shape[1], dtype=np.float64)
+    valid = ~np.isnan(values)
+    y = np.where(valid, values, 0.0)
+    n = valid.sum(axis=1)
+    sx = valid @ x
+    sy = y.sum(axis=1)
+    sxx = valid @ (x * x)
+    sxy = y @ x
+    denom = n * sxx - sx * sx
+    return np.divide(n * sxy - sx * sy, denom, out=np.full(len(n), np.nan), where=(n >= 2) & (denom > 0))
+
+
+def _number(value) -> Optional[float]:
+    """NumPy 标量转为可 JSON 序列化的数值，NaN 转为 None"""
+    if value is None or np.isnan(value):
+        return None
+    return int(value) if float(value).is_integer() else float(value)
+
+
 class TrendAnalyzer:
-    """趋势分析器 - 对比历史数据分析趋势"""
+    """
+    趋势分析器 - 基于多日历史数据分析趋势
+
+    在 话题 × 日期 的热度 / 排名矩阵上一次性计算所有话题的指标：
+    1/3/7/30 天热度变化、EWMA 动量、z 分数异动检测和排名速度，
+    再按上一次抓取对比划分上升 / 下降 / 新出现 / 消失话题。
+    """
+
+    def __init__(
+        self,
+        windows: tuple[int, ...] = (1, 3, 7, 30),
+        ewma_span: int = 7,
+        zscore_window: int = 30,
+        zscore_threshold: float = 3.0,
+        min_history: int = 5,
+        rank_velocity_window: int = 7,
+        min_heat_change: int = 10000,
+        top_n: int = 10,
+    ):
+        """
+        初始化
+
+        Args:
+            windows: 热度变化的对比窗口（天），须包含 1
+            ewma_span: 动量 EWMA 的跨度（天）
+            zscore_window: z 分数的历史基线长度（天）
+            zscore_threshold: 判定为异动突破的 z 分数阈值
+            min_history: 计算 z 分数所需的最少历史天数
+            rank_velocity_window: 排名速度的回归窗口（天）
+            min_heat_change: 判定上升 / 下降的单日热度变化阈值
+            top_n: 各类话题最多返回的数量
+        """
+        if 1 not in windows:
+            raise ValueError("windows 必须包含 1（单日对比）")
+        self.windows = tuple(sorted(windows))
+        self.ewma_span = ewma_span
+        self.zscore_window = zscore_window
+        self.zscore_threshold = zscore_threshold
+        self.min_history = min_history
+        self.rank_velocity_window = rank_velocity_window
+        self.min_heat_change = min_heat_change
+        self.top_n = top_n
 
-    def __init__(self):
-        """初始化"""
-        pass
+    @property
+    def lookback_days(self) -> int:
+        """计算全部指标需要的历史天数（不含当天）"""
+        return max(max(self.windows), self.zscore_window + 1, self.rank_velocity_window, self.ewma_span)
 
     def analyze_trends(
         self, today_topics: list[XHSTopic], yesterday_topics: list[XHSTopic]
@@ -19,6 +157,9 @@ class TrendAnalyzer:
         """
         分析趋势（对比昨日数据）
 
+        标题经 TopicResolver 识别，略有改动的同一话题按一个话题对比。
+        只有两天数据，多日窗口和异动检测的指标为空。有历史存储时使用 analyze_history。
+
         Args:
             today_topics: 今日话题列表
             yesterday_topics: 昨日话题列表
@@ -30,89 +171,196 @@ class TrendAnalyzer:
             logger.warning("今日话题列表为空")
             return self._empty_trend_result()
 
-        if not yesterday_topics:
-            logger.info("无昨日数据，所有话题标记为新话题")
-            return {
-                "rising_topics": [],
-                "falling_topics": [],
-                "new_topics": [t.title for t in today_topics[:10]],
-                "disappeared_topics": [],
-                "stable_topics": [],
-            }
-
-        logger.info("开始趋势分析...")
-
-        # 构建昨日数据字典（标题 -> 话题）
-        yesterday_map = {t.title: t for t in yesterday_topics}
-        today_set = {t.title for t in today_topics}
-        yesterday_set = {t.title for t in yesterday_topics}
-
-        rising_topics = []
-        falling_topics = []
-        stable_topics = []
-        new_topics = []
-
-        # 分析今日话题
-        for topic in today_topics:
-            if topic.title in yesterday_map:
-                yesterday_topic = yesterday_map[topic.title]
-
-                # 计算热度变化
-                heat_change = topic.heat_score - yesterday_topic.heat_score
-                heat_change_percent = (
-                    (heat_change / yesterday_topic.heat_score) * 100
-                    if yesterday_topic.heat_score > 0
-                    else 0
-                )
+        # 每个话题一行：先放昨日话题，再把今日话题对应到昨日的行或追加新行
+        def unique_by_title(topics: list[XHSTopic]) -> list[XHSTopic]:
+            first: dict[str, XHSTopic] = {}
+            for topic in topics:
+                first.setdefault(topic.title, topic)
+            return list(first.values())
 
-                # 计算排名变化（排名下降=数值上升=变好）
-                rank_change = yesterday_topic.rank - topic.rank
-
-                topic_info = {
-                    "title": topic.title,
-                    "today_rank": topic.rank,
-                    "yesterday_rank": yesterday_topic.rank,
-                    "rank_change": rank_change,
-                    "today_heat": topic.heat_score,
-                    "yesterday_heat": yesterday_topic.heat_score,
-                    "heat_change": heat_change,
-                    "heat_change_percent": round(heat_change_percent, 1),
-                    "category": topic.category,
-                }
-
-                # 分类
-                if heat_change > 10000:  # 热度增长1万+
-                    rising_topics.append(topic_info)
-                elif heat_change < -10000:  # 热度下降1万+
-                    falling_topics.append(topic_info)
-                else:
-                    stable_topics.append(topic_info)
+        yesterday = unique_by_title(yesterday_topics)
+        today = unique_by_title(today_topics)
+        resolver = TopicResolver()
+        for key, topic in enumerate(yesterday):
+            resolver.register(key, topic.title)
+        rows: list[list] = [[topic, None] for topic in yesterday]
+        for topic, key in zip(today, resolver.resolve([t.title for t in today])):
+            if key is None:
+                rows.append([None, topic])
             else:
-                # 新出现的话题
-                new_topics.append(topic.title)
+                rows[key][1] = topic
 
-        # 找出消失的话题
-        disappeared_topics = list(yesterday_set - today_set)
+        def matrix(field: str) -> np.ndarray:
+            return np.array(
+                [[getattr(t, field) if t is not None else np.nan for t in row] for row in rows],
+                dtype=np.float64,
+            )
 
-        # 排序
-        rising_topics = sorted(
-            rising_topics, key=lambda x: x["heat_change"], reverse=True
-        )[:10]
-        falling_topics = sorted(falling_topics, key=lambda x: x["heat_change"])[:10]
+        date = today_topics[0].crawled_at.date()
+        history = TopicHistory(
+            dates=np.array([date - timedelta(days=1), date], dtype="datetime64[D]"),
+            titles=[(row[1] or row[0]).title for row in rows],
+            categories=[(row[1] or row[0]).category for row in rows],
+            metrics={"rank": matrix("rank"), "heat_score": matrix("heat_score")},
+        )
+        return self.analyze_history(history)
 
-        logger.info(f"  热度上升: {len(rising_topics)}个")
-        logger.info(f"  热度下降: {len(falling_topics)}个")
-        logger.info(f"  新出现: {len(new_topics)}个")
-        logger.info(f"  消失: {len(disappeared_topics)}个")
-        logger.info(f"  稳定: {len(stable_topics)}个")
+    def analyze_history(self, history: TopicHistory, date: Optional[str] = None) -> dict:
+        """
+        基于历史矩阵分析趋势
+
+        Args:
+            history: TopicHistoryStore.query_range 的结果，需包含 rank 和 heat_score，
+                且覆盖目标日期前 lookback_days 天
+            date: 目标日期（YYYY-MM-DD），默认为最后一个有数据的日期
+
+        Returns:
+            趋势分析结果字典（rising/falling/new/disappeared/stable/breakout_topics）
+        """
+        metrics = self.compute_metrics(history, date)
+        if metrics is None or not metrics.present.any():
+            logger.warning("今日话题列表为空")
+            return self._empty_trend_result()
+
+        if not metrics.present_prev.any():
+            logger.info("无昨日数据，所有话题标记为新话题")
+
+        logger.info(f"开始趋势分析（{metrics.date}，{len(metrics.titles)} 个话题）...")
+
+        both = metrics.present & metrics.present_prev
+        change = metrics.deltas[1]
+        rising = both & ((change > self.min_heat_change) | metrics.breakout)
+        falling = both & (change < -self.min_heat_change) & ~rising
+        stable = both & ~rising & ~falling
+        new = metrics.present & ~metrics.present_prev
+        disappeared = metrics.present_prev & ~metrics.present
+
+        def top(mask: np.ndarray, key: np.ndarray, limit: int) -> np.ndarray:
+            index = np.flatnonzero(mask)
+            return index[np.argsort(key[index], kind="stable")[:limit]]
+
+        rising_idx = top(rising, -change, self.top_n)
+        falling_idx = top(falling, change, self.top_n)
+        breakout_idx = top(metrics.breakout, -metrics.zscore, self.top_n)
+
+        logger.info(f"  热度上升: {len(rising_idx)}个")
+        logger.info(f"  热度下降: {len(falling_idx)}个")
+        logger.info(f"  新出现: {int(new.sum())}个")
+        logger.info(f"  消失: {int(disappeared.sum())}个")
+        logger.info(f"  稳定: {int(stable.sum())}个")
+        logger.info(f"  异动突破: {int(metrics.breakout.sum())}个")
 
         return {
-            "rising_topics": rising_topics,
-            "falling_topics": falling_topics,
-            "new_topics": new_topics[:10],  # 只返回前10个
-            "disappeared_topics": disappeared_topics[:10],
-            "stable_topics": stable_topics[:5],  # 稳定话题返回少一些
+            "rising_topics": [self._topic_info(metrics, i) for i in rising_idx],
+            "falling_topics": [self._topic_info(metrics, i) for i in falling_idx],
+            "new_topics": [metrics.titles[i] for i in top(new, metrics.rank, self.top_n)],
+            "disappeared_topics": [metrics.titles[i] for i in top(disappeared, metrics.prev_rank, self.top_n)],
+            "stable_topics": [self._topic_info(metrics, i) for i in top(stable, metrics.rank, 5)],
+            "breakout_topics": [self._topic_info(metrics, i) for i in breakout_idx],
+        }
+
+    def compute_metrics(self, history: TopicHistory, date: Optional[str] = None) -> Optional[TrendMetrics]:
+        """
+        计算目标日期所有话题的趋势指标（向量化）
+
+        Args:
+            history: 历史矩阵
+            date: 目标日期，默认为最后一个有数据的日期
+
+        Returns:
+            TrendMetrics，区间内没有数据时返回 None
+        """
+        if "rank" not in history.metrics or "heat_score" not in history.metrics:
+            raise ValueError("history 需要包含 rank 和 heat_score 指标")
+
+        raw_heat = history.matrix("heat_score")
+        crawled = np.flatnonzero(~np.isnan(raw_heat).all(axis=0))
+        if len(crawled) == 0:
+            return None
+
+        if date is None:
+            today = int(crawled[-1])
+        else:
+            today = int((np.datetime64(date, "D") - history.dates[0]).astype(np.int64))
+            if not 0 <= today < len(history.dates):
+                raise ValueError(f"日期 {date} 不在历史区间内")
+
+        # 只取计算需要的窗口，之后 today 为窗口内最后一列
+        start = max(0, today - self.lookback_days)
+        heat = _carry_forward_missing_days(raw_heat[:, start: today + 1])
+        rank = _carry_forward_missing_days(history.matrix("rank")[:, start: today + 1])
+        rank = np.where(rank > 0, rank, np.nan)  # 0 表示未知排名
+        present = ~np.isnan(raw_heat[:, today])
+        date_str = str(history.dates[today])
+        today -= start
+
+        current = heat[:, today]
+        deltas, delta_percents = {}, {}
+        for window in self.windows:
+            past = _column(heat, today - window)
+            deltas[window] = current - past
+            delta_percents[window] = np.divide(
+                deltas[window] * 100, past, out=np.full_like(current, np.nan), where=past > 0
+            )
+
+        # 每日对数热度变化：第 j 列为第 j 天到第 j+1 天
+        daily_change = np.diff(np.log1p(np.maximum(heat, 0)), axis=1)
+        momentum = _ewma_last(daily_change, self.ewma_span) * 100
+
+        baseline = daily_change[:, max(0, today - 1 - self.zscore_window): max(0, today - 1)]
+        latest_change = _column(daily_change, today - 1)
+        zscore = _zscore(latest_change, baseline, self.min_history, min_std=0.05)
+        breakout = (zscore >= self.zscore_threshold) & (deltas[1] > 0)
+
+        rank_velocity = -_slope(rank[:, max(0, today + 1 - self.rank_velocity_window):])
+
+        return TrendMetrics(
+            date=date_str,
+            titles=history.titles,
+            categories=history.categories,
+            present=present,
+            present_prev=~np.isnan(_column(heat, today - 1)),
+            heat=current,
+            prev_heat=_column(heat, today - 1),
+            rank=rank[:, today],
+            prev_rank=_column(rank, today - 1),
+            deltas=deltas,
+            delta_percents=delta_percents,
+            momentum=momentum,
+            zscore=zscore,
+            rank_velocity=rank_velocity,
+            breakout=breakout,
+        )
+
+    def _topic_info(self, metrics: TrendMetrics, i: int) -> dict:
+        """单个话题的趋势信息（与原逐日对比的字段兼容）"""
+        today_rank = _number(metrics.rank[i])
+        yesterday_rank = _number(metrics.prev_rank[i])
+        percent = _number(metrics.delta_percents[1][i])
+        info = {
+            "title": metrics.titles[i],
+            "rank": today_rank,
+            "today_rank": today_rank,
+            "yesterday_rank": yesterday_rank,
+            "rank_change": (
+                yesterday_rank - today_rank if today_rank is not None and yesterday_rank is not None else 0
+            ),
+            "today_heat": _number(metrics.heat[i]),
+            "yesterday_heat": _number(metrics.prev_heat[i]),
+            "heat_change": _number(metrics.deltas[1][i]),
+            "heat_change_percent": round(percent, 1) if percent is not None else 0,
+            "category": metrics.categories[i],
         }
+        for window in self.windows[1:]:
+            info[f"heat_change_{window}d"] = _number(metrics.deltas[window][i])
+        momentum, zscore, velocity = (
+            _number(metrics.momentum[i]), _number(metrics.zscore[i]), _number(metrics.rank_velocity[i])
+        )
+        info["momentum"] = round(momentum, 2) if momentum is not None else None
+        info["zscore"] = round(zscore, 2) if zscore is not None else None
+        info["rank_velocity"] = round(velocity, 2) if velocity is not None else None
+        info["breakout"] = bool(metrics.breakout[i])
+        return info
 
     def _empty_trend_result(self) -> dict:
         """返回空趋势结果"""
@@ -122,6 +370,7 @@ class TrendAnalyzer:
             "new_topics": [],
             "disappeared_topics": [],
             "stable_topics": [],
+            "breakout_topics": [],
         }
 
     def generate_trend_summary(self, trends: dict) -> str:
@@ -136,9 +385,18 @@ class TrendAnalyzer:
         """
         lines = []
 
+        # 异动突破
+        if trends.get("breakout_topics"):
+            lines.append("【异动突破】")
+            for item in trends["breakout_topics"][:3]:
+                lines.append(
+                    f"- {item['title']}: {item['heat_change_percent']:+.1f}% "
+                    f"(z={item['zscore']:.1f}，排名 {item['yesterday_rank']}→{item['today_rank']})"
+                )
+
         # 热度上升
         if trends["rising_topics"]:
-            lines.append("【热度上升】")
+            lines.append("\n【热度上升】" if lines else "【热度上升】")
             for item in trends["rising_topics"][:5]:
                 lines.append(
                     f"- {item['title']}: {item['heat_change_percent']:+.1f}% "
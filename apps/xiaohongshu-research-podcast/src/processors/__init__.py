@@ -1,4 +1,4 @@
 """内容处理模块"""
-from .dialogue_writer import DialogueWriter, DialogueLine, DialogueScript
+from .dialogue_writer import DialogueWriter, DialogueLine, PodcastScript
 
-__all__ = ["DialogueWriter", "DialogueLine", "DialogueScript"]
+__all__ = ["DialogueWriter", "DialogueLine", "PodcastScript"]
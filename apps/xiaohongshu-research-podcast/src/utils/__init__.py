@@ -1,5 +1,7 @@
 """工具模块"""
 from .logger import setup_logger, get_logger
 from .cache_manager import CacheManager
+from .topic_history import TopicHistoryStore, TopicHistory
+from .topic_resolver import TopicResolver
 
-__all__ = ["setup_logger", "get_logger", "CacheManager"]
+__all__ = ["setup_logger", "get_logger", "CacheManager", "TopicHistoryStore", "TopicHistory", "TopicResolver"]
@@ -4,6 +4,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
 from ..models.topic import XHSTopic, TopicAnalysisResult, AIInsight
+from .topic_history import TopicHistoryStore
 
 
 class CacheManager:
@@ -18,6 +19,15 @@ class CacheManager:
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._history: Optional[TopicHistoryStore] = None
+
+    @property
+    def history(self) -> TopicHistoryStore:
+        """多日话题历史存储（首次访问时创建，并导入已有的 JSON 缓存）"""
+        if self._history is None:
+            self._history = TopicHistoryStore(self.cache_dir / "topic-history.db")
+            self._history.import_json_cache(self.cache_dir)
+        return self._history
 
     def save_topics(self, topics: list[XHSTopic], date: str):
         """
@@ -28,10 +38,13 @@ class CacheManager:
             date: 日期字符串（YYYY-MM-DD）
         """
         cache_file = self.cache_dir / f"{date}-raw-data.json"
+        crawled_at = datetime.now().isoformat()
+        # 先打开历史存储：首次打开会导入已有 JSON，在写当天文件之前导入才不会把当天数据写两遍
+        history = self.history
 
         data = {
             "date": date,
-            "crawled_at": datetime.now().isoformat(),
+            "crawled_at": crawled_at,
             "total_topics": len(topics),
             "topics": [topic.to_dict() for topic in topics],
         }
@@ -39,6 +52,9 @@ class CacheManager:
         with open(cache_file, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
+        # 同步写入历史存储，供多日趋势查询
+        history.append_day(topics, date, crawled_at=crawled_at)
+
     def load_topics(self, date: str) -> list[XHSTopic]:
         """
         从缓存加载话题数据
@@ -0,0 +1,367 @@
+"""话题多日历史存储（SQLite 列式指标表 + NumPy 区间查询）"""
+import json
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ..models.topic import XHSTopic
+from .topic_resolver import TopicResolver
+
+# 按天记录的指标列（与 XHSTopic 字段同名）
+METRICS = ("rank", "heat_score", "read_count", "note_count", "interaction_count")
+
+# SQLite 单条语句的参数个数上限（旧版本为 999）
+_BATCH = 900
+
+_TOPICS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    topic_key  INTEGER PRIMARY KEY,
+    title      TEXT NOT NULL,
+    topic_id   TEXT,
+    category   TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL
+);
+"""
+
+_SCHEMA = _TOPICS_TABLE.format(name="topics") + """
+CREATE TABLE IF NOT EXISTS daily_metrics (
+    date              TEXT NOT NULL,
+    topic_key         INTEGER NOT NULL REFERENCES topics(topic_key),
+    rank              INTEGER,
+    heat_score        INTEGER,
+    read_count        INTEGER,
+    note_count        INTEGER,
+    interaction_count INTEGER,
+    PRIMARY KEY (date, topic_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS aliases (
+    alias      TEXT PRIMARY KEY,
+    topic_key  INTEGER NOT NULL REFERENCES topics(topic_key),
+    tokens     TEXT NOT NULL,
+    first_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS crawls (
+    date         TEXT PRIMARY KEY,
+    crawled_at   TEXT NOT NULL,
+    total_topics INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class TopicHistory:
+    """
+    区间查询结果：话题 × 日期 的指标矩阵
+
+    dates 为连续的自然日（没有抓取的日期整列为 NaN），
+    某天未上榜的话题对应位置同样为 NaN。
+    """
+
+    dates: np.ndarray  # datetime64[D]，长度 n_days
+    titles: list[str]  # 长度 n_topics
+    categories: list[str]
+    metrics: dict[str, np.ndarray] = field(default_factory=dict)  # 指标名 -> (n_topics, n_days) float64
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.titles), len(self.dates)
+
+    def matrix(self, metric: str) -> np.ndarray:
+        """获取某个指标的 (n_topics, n_days) 矩阵"""
+        return self.metrics[metric]
+
+    def series(self, title: str, metric: str = "heat_score") -> np.ndarray:
+        """获取单个话题某指标的逐日序列，话题不存在时返回全 NaN"""
+        try:
+            return self.metrics[metric][self.titles.index(title)]
+        except ValueError:
+            return np.full(len(self.dates), np.nan)
+
+    def to_frame(self, metric: Optional[str] = None):
+        """
+        转换为 pandas DataFrame
+
+        Args:
+            metric: 指定时返回宽表（行=话题标题，列=日期）；
+                不指定时返回长表（date, title, category, 各指标），只保留有数据的行
+
+        Returns:
+            pandas.DataFrame
+        """
+        import pandas as pd
+
+        columns = pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="date")
+        if metric is not None:
+            return pd.DataFrame(
+                self.metrics[metric], index=pd.Index(self.titles, name="title"), columns=columns
+            )
+
+        topic_idx, day_idx = np.nonzero(~np.isnan(self.metrics["rank"]))
+        frame = pd.DataFrame({
+            "date": columns[day_idx],
+            "title": np.asarray(self.titles, dtype=object)[topic_idx],
+            "category": np.asarray(self.categories, dtype=object)[topic_idx],
+        })
+        for name, values in self.metrics.items():
+            frame[name] = values[topic_idx, day_idx]
+        return frame.sort_values(["date", "rank"], ignore_index=True)
+
+
+class TopicHistoryStore:
+    """
+    话题历史存储
+
+    - topics: 话题维表（稳定的 topic_key，title 为最近一次出现的标题）
+    - aliases: 标题别名 -> topic_key（含分词结果，加载时不用重新分词）
+    - daily_metrics: 每天每个话题一行排名 / 热度 / 阅读 / 笔记 / 互动
+    - crawls: 每天的抓取记录
+
+    每次抓取调用 append_day 增量写入（同一天重复写入时覆盖当天数据），
+    标题经 TopicResolver 识别，"#xxx挑战" 与 "xxx挑战" 等写法归入同一个 topic_key；
+    query_range 用一条 SQL 取出区间内的全部指标，再用 NumPy 一次性填进矩阵，
+    不需要逐个重新解析 JSON 和校验 XHSTopic。
+    """
+
+    def __init__(self, db_path: str = "cache/topic-history.db", resolver: Optional[TopicResolver] = None):
+        """
+        初始化
+
+        Args:
+            db_path: SQLite 数据库路径
+            resolver: 话题身份识别器（默认使用默认参数创建），已入库的别名会载入其中
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.resolver = resolver or TopicResolver()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            for alias, key, tokens in conn.execute(
+                "SELECT alias, topic_key, tokens FROM aliases ORDER BY first_seen, rowid"
+            ):
+                self.resolver.register(key, alias, tokens.split())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """
+        升级不含别名表的旧数据库
+
+        旧版 topics.title 带 UNIQUE 约束（改名后的标题与旧标题属于同一话题时无法各自保留），
+        按新表结构重建 topics；再把没有别名的话题标题登记为别名，使其能被识别器匹配。
+        """
+        unique_title = any(
+            unique and [col for _, _, col in conn.execute(f"PRAGMA index_info('{name}')")] == ["title"]
+            for _, name, unique, *_ in conn.execute("PRAGMA index_list(topics)").fetchall()
+        )
+        if unique_title:
+            conn.executescript(
+                "BEGIN;"
+                + _TOPICS_TABLE.format(name="topics_new")
+                + """
+                INSERT INTO topics_new (topic_key, title, topic_id, category, first_seen, last_seen)
+                    SELECT topic_key, title, topic_id, category, first_seen, last_seen FROM topics;
+                DROP TABLE topics;
+                ALTER TABLE topics_new RENAME TO topics;
+                COMMIT;
+                """
+            )
+
+        missing = conn.execute(
+            "SELECT topic_key, title, first_seen FROM topics "
+            "WHERE title NOT IN (SELECT alias FROM aliases) ORDER BY topic_key"
+        ).fetchall()
+        if missing:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO aliases (alias, topic_key, tokens, first_seen) VALUES (?, ?, ?, ?)",
+                    [
+                        (title, key, " ".join(sorted(self.resolver.tokenize(title))), first_seen)
+                        for key, title, first_seen in missing
+                    ],
+                )
+
+    def append_day(self, topics: Sequence[XHSTopic], date: str, crawled_at: Optional[str] = None) -> int:
+        """
+        写入一天的抓取结果
+
+        Args:
+            topics: 话题列表
+            date: 日期字符串（YYYY-MM-DD）
+            crawled_at: 抓取时间（默认当前时间）
+
+        Returns:
+            写入的话题数
+        """
+        rows = [topic.to_dict() if isinstance(topic, XHSTopic) else topic for topic in topics]
+        return self._append_rows(rows, date, crawled_at or datetime.now().isoformat())
+
+    def _append_rows(self, rows: list[dict], date: str, crawled_at: str) -> int:
+        # 同一天榜单里重复出现的标题只保留排名最靠前的一条
+        by_title: dict[str, dict] = {}
+        for row in sorted(rows, key=lambda r: r.get("rank") or 0):
+            by_title.setdefault(row["title"], row)
+
+        titles = list(by_title)
+        keys = dict(zip(titles, self.resolver.resolve(titles)))
+
+        with closing(self._connect()) as conn, conn:
+            for title, row in by_title.items():
+                if keys[title] is None:
+                    keys[title] = conn.execute(
+                        "INSERT INTO topics (title, topic_id, category, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                        (title, row.get("topic_id"), row.get("category"), date, date),
+                    ).lastrowid
+            conn.executemany(
+                """
+                UPDATE topics SET
+                    title = CASE WHEN ? >= last_seen THEN ? ELSE title END,
+                    topic_id = ?,
+                    category = ?,
+                    first_seen = MIN(first_seen, ?),
+                    last_seen = MAX(last_seen, ?)
+                WHERE topic_key = ?
+                """,
+                [
+                    (date, title, row.get("topic_id"), row.get("category"), date, date, keys[title])
+                    for title, row in by_title.items()
+                ],
+            )
+
+            new_aliases = [title for title in titles if self.resolver.aliases.get(title) != keys[title]]
+            tokens = {title: self.resolver.tokenize(title) for title in new_aliases}
+            conn.executemany(
+                "INSERT OR REPLACE INTO aliases (alias, topic_key, tokens, first_seen) VALUES (?, ?, ?, ?)",
+                [(title, keys[title], " ".join(sorted(tokens[title])), date) for title in new_aliases],
+            )
+
+            conn.execute("DELETE FROM daily_metrics WHERE date = ?", (date,))
+            conn.executemany(
+                f"INSERT INTO daily_metrics (date, topic_key, {', '.join(METRICS)}) VALUES (?, ?{', ?' * len(METRICS)})",
+                [(date, keys[title], *(row.get(m) for m in METRICS)) for title, row in by_title.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO crawls (date, crawled_at, total_topics) VALUES (?, ?, ?)",
+                (date, crawled_at, len(by_title)),
+            )
+
+        # 入库成功后再更新识别器
+        for title in titles:
+            self.resolver.register(keys[title], title, tokens.get(title))
+        return len(by_title)
+
+    def import_json_cache(self, cache_dir: str, overwrite: bool = False) -> list[str]:
+        """
+        从 CacheManager 的 {date}-raw-data.json 导入历史数据
+
+        直接读取 JSON 中的指标字段，不经过 XHSTopic 校验。
+
+        Args:
+            cache_dir: 缓存目录
+            overwrite: 是否覆盖已入库的日期
+
+        Returns:
+            导入的日期列表
+        """
+        existing = set() if overwrite else set(self.available_dates())
+        imported = []
+        for cache_file in sorted(Path(cache_dir).glob("*-raw-data.json")):
+            date = cache_file.name[: -len("-raw-data.json")]
+            if date in existing:
+                continue
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._append_rows(data.get("topics", []), data.get("date", date), data.get("crawled_at", ""))
+            imported.append(date)
+        return imported
+
+    def available_dates(self) -> list[str]:
+        """已入库的日期（升序）"""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT date FROM crawls ORDER BY date")]
+
+    def query_range(
+        self,
+        start: str,
+        end: str,
+        metrics: Sequence[str] = METRICS,
+        titles: Optional[Sequence[str]] = None,
+    ) -> TopicHistory:
+        """
+        查询日期区间内的指标矩阵
+
+        Args:
+            start: 开始日期（YYYY-MM-DD，包含）
+            end: 结束日期（YYYY-MM-DD，包含）
+            metrics: 需要的指标，取值见 METRICS
+            titles: 只查询这些话题（按任意别名匹配，默认区间内出现过的全部话题）
+
+        Returns:
+            TopicHistory，话题按首次入库顺序排列，标题为最近一次出现的写法
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"未知指标: {sorted(unknown)}")
+        metrics = list(metrics)
+
+        sql = (
+            f"SELECT m.date, m.topic_key, t.title, t.category, {', '.join('m.' + m for m in metrics)} "
+            "FROM daily_metrics m JOIN topics t USING (topic_key) "
+            "WHERE m.date BETWEEN ? AND ?"
+        )
+        with closing(self._connect()) as conn:
+            if titles is None:
+                rows = conn.execute(sql, (start, end)).fetchall()
+            else:
+                # 先把别名换成 topic_key，再按 key 分批查询，避免超出 SQLite 参数个数上限
+                titles = list(titles)
+                keys = set()
+                for i in range(0, len(titles), _BATCH):
+                    batch = titles[i: i + _BATCH]
+                    keys.update(key for (key,) in conn.execute(
+                        f"SELECT topic_key FROM aliases WHERE alias IN ({','.join('?' * len(batch))})", batch
+                    ))
+                keys = sorted(keys)
+                rows = []
+                for i in range(0, len(keys), _BATCH):
+                    batch = keys[i: i + _BATCH]
+                    rows += conn.execute(
+                        f"{sql} AND m.topic_key IN ({','.join('?' * len(batch))})", (start, end, *batch)
+                    ).fetchall()
+
+        dates = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        if not rows:
+            return TopicHistory(
+                dates=dates,
+                titles=[],
+                categories=[],
+                metrics={m: np.empty((0, len(dates))) for m in metrics},
+            )
+
+        day_strs, topic_keys, row_titles, row_categories, *columns = zip(*rows)
+        day_idx = (np.array(day_strs, dtype="datetime64[D]") - dates[0]).astype(np.int64)
+        unique_keys, first_pos, topic_idx = np.unique(np.array(topic_keys), return_index=True, return_inverse=True)
+
+        values = np.array(columns, dtype=np.float64)  # (n_metrics, n_rows)，None -> nan
+        result = {}
+        for i, metric in enumerate(metrics):
+            matrix = np.full((len(unique_keys), len(dates)), np.nan)
+            matrix[topic_idx, day_idx] = values[i]
+            result[metric] = matrix
+
+        return TopicHistory(
+            dates=dates,
+            titles=[row_titles[p] for p in first_pos],
+            categories=[row_categories[p] for p in first_pos],
+            metrics=result,
+        )
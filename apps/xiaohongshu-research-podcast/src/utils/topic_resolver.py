@@ -0,0 +1,209 @@
+"""话题身份识别（跨天合并标题略有改动的同一话题）"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Iterable, Optional, Sequence
+
+import jieba
+
+_NUMBER = re.compile(r"\d+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    标题归一化：全角转半角、小写，去掉 # 标签符号、标点、emoji 和空白
+
+    "#春节旅游挑战 🔥" 与 "春节旅游挑战" 归一化后相同。
+    """
+    text = unicodedata.normalize("NFKC", title).lower()
+    # 只保留字母（含汉字）和数字
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] in "LN")
+
+
+def char_ngrams(text: str, n: int = 2) -> frozenset[str]:
+    """字符 n-gram 集合（文本短于 n 时返回文本本身）"""
+    if len(text) <= n:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i: i + n] for i in range(len(text) - n + 1))
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """jieba 分词，去掉单字"""
+    return frozenset(w for w in jieba.cut(text) if len(w) > 1)
+
+
+def numbers(text: str) -> tuple[str, ...]:
+    """标题中的数字（年份、期数、型号等）"""
+    return tuple(_NUMBER.findall(text))
+
+
+def _overlap(a: frozenset, b: frozenset) -> float:
+    """Dice 系数"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class TopicResolver:
+    """
+    话题身份识别器
+
+    为每个话题维护一个稳定的 key，并记录指向它的所有标题（别名）。
+    新一天的标题依次尝试：
+
+    1. 别名精确匹配
+    2. 归一化文本精确匹配（去掉 #、标点、空白等）
+    3. 字符 n-gram 倒排索引召回候选，按 n-gram 与 jieba 分词的相似度打分，
+       超过阈值则归入候选话题（两个标题都含数字且数字不同时不合并）；
+       n-gram 与分词都不看词序，另要求归一化文本的顺序相似度（SequenceMatcher）达到
+       min_order_ratio，"北京到上海" 与 "上海到北京" 这类颠倒词序的标题不合并
+
+    召回只查标题自身 n-gram 的倒排表（跳过过于常见的 n-gram），
+    不与全部历史话题两两比较，每次抓取的耗时与当天话题数成线性。
+    同一次抓取中的不同标题不会归入同一个话题。
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        ngram: int = 2,
+        max_postings: int = 1000,
+        max_candidates: int = 5,
+        min_order_ratio: float = 0.6,
+    ):
+        """
+        初始化
+
+        Args:
+            threshold: 判定为同一话题的相似度阈值（0-1）
+            ngram: 字符 n-gram 长度
+            max_postings: 倒排表长度超过该值的 n-gram 不参与召回
+            max_candidates: 每个标题最多精确打分的候选数
+            min_order_ratio: 合并所需的最低顺序相似度（0-1）
+        """
+        self.threshold = threshold
+        self.ngram = ngram
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self.min_order_ratio = min_order_ratio
+
+        self.aliases: dict[str, int] = {}
+        self._tokens: dict[str, frozenset] = {}
+        self._normalized: dict[str, int] = {}
+        self._profiles: dict[int, tuple[str, frozenset, frozenset, tuple]] = {}
+        self._index: dict[str, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def register(self, key: int, title: str, tokens: Optional[Iterable[str]] = None) -> None:
+        """
+        记录标题属于话题 key，并更新索引
+
+        Args:
+            key: 话题 key
+            title: 标题（别名）
+            tokens: 预先分好的词（从持久化的别名表加载时传入，避免重新分词）
+        """
+        normalized = normalize_title(title)
+        grams = char_ngrams(normalized, self.ngram)
+        tokens = frozenset(tokens) if tokens is not None else self.tokenize(title)
+
+        self.aliases[title] = key
+        self._tokens[title] = tokens
+        self._normalized.setdefault(normalized, key)
+        # 相似度按最近一次出现的标题计算
+        self._profiles[key] = (normalized, grams, tokens, numbers(normalized))
+        for gram in grams:
+            self._index[gram].add(key)
+
+    def tokenize(self, title: str) -> frozenset[str]:
+        """标题归一化后的分词结果（已知别名直接复用）"""
+        tokens = self._tokens.get(title)
+        return tokens if tokens is not None else tokenize(normalize_title(title))
+
+    def similarity(self, title: str, key: int) -> float:
+        """标题与话题 key 的相似度（字符 n-gram 与分词 Dice 系数的平均）"""
+        normalized = normalize_title(title)
+        return self._score(
+            normalized, char_ngrams(normalized, self.ngram), self.tokenize(title), numbers(normalized), key
+        )
+
+    def _score(self, normalized: str, grams: frozenset, tokens: frozenset, nums: tuple, key: int) -> float:
+        known_text, known_grams, known_tokens, known_nums = self._profiles[key]
+        # 数字不同（"话题1号" 与 "话题11号"、"2025" 与 "2026"）视为不同话题
+        if nums and known_nums and nums != known_nums:
+            return 0.0
+        if not tokens or not known_tokens:
+            score = _overlap(grams, known_grams)
+        else:
+            score = (_overlap(grams, known_grams) + _overlap(tokens, known_tokens)) / 2
+        # 词序颠倒（"中国队战胜日本队" 与 "日本队战胜中国队"）视为不同话题，只对过阈值的候选计算
+        if score >= self.threshold and (
+            SequenceMatcher(None, normalized, known_text, autojunk=False).ratio() < self.min_order_ratio
+        ):
+            return 0.0
+        return score
+
+    def _candidates(self, grams: frozenset) -> list[int]:
+        shared = Counter()
+        for gram in grams:
+            keys = self._index.get(gram)
+            if keys and len(keys) <= self.max_postings:
+                shared.update(keys)
+        # Dice ≥ threshold 要求共享 n-gram 数至少为 threshold × |grams| / 2
+        minimum = math.ceil(self.threshold * len(grams) / 2)
+        return [key for key, count in shared.most_common(self.max_candidates) if count >= minimum]
+
+    def resolve(self, titles: Sequence[str]) -> list[Optional[int]]:
+        """
+        把一次抓取的标题映射到已知话题
+
+        不修改识别器状态，确认入库后再对结果调用 register。
+
+        Args:
+            titles: 标题列表（不含重复）
+
+        Returns:
+            与 titles 对应的话题 key，未识别的新话题为 None
+        """
+        result: list[Optional[int]] = [None] * len(titles)
+        claimed: set[int] = set()
+        pending = []
+
+        # 精确匹配优先认领
+        for i, title in enumerate(titles):
+            key = self.aliases.get(title)
+            if key is None or key in claimed:
+                pending.append(i)
+            else:
+                result[i] = key
+                claimed.add(key)
+
+        fuzzy = []
+        for i in pending:
+            normalized = normalize_title(titles[i])
+            key = self._normalized.get(normalized)
+            if key is not None and key not in claimed:
+                result[i] = key
+                claimed.add(key)
+                continue
+            grams = char_ngrams(normalized, self.ngram)
+            candidates = self._candidates(grams)
+            if not candidates:
+                continue
+            tokens = self.tokenize(titles[i])
+            for key in candidates:
+                score = self._score(normalized, grams, tokens, numbers(normalized), key)
+                if score >= self.threshold:
+                    fuzzy.append((score, i, key))
+
+        # 相似匹配按分数从高到低认领，一个话题只分配给一个标题
+        for score, i, key in sorted(fuzzy, reverse=True):
+            if result[i] is None and key not in claimed:
+                result[i] = key
+                claimed.add(key)
+
+        return result
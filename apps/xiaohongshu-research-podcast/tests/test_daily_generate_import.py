@@ -0,0 +1,21 @@
+"""scripts/daily_generate.py 导入冒烟测试"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "daily_generate.py"
+
+
+def test_daily_generate_imports():
+    """脚本能导入全部模块（src 内的相对导入需要经 src 包导入）"""
+    spec = importlib.util.spec_from_file_location("daily_generate", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ModuleNotFoundError as e:
+        # 只跳过缺少的第三方依赖，项目自身的导入错误照常失败
+        if e.name and e.name.split(".")[0] != "src":
+            pytest.skip(f"缺少依赖: {e.name}")
+        raise
+    assert callable(module.main)
@@ -0,0 +1,28 @@
+"""KeywordIndex 分词缓存测试"""
+import pytest
+
+pytest.importorskip("jieba")
+pytest.importorskip("google.generativeai")  # src.analyzers 包导入 InsightGenerator
+
+from src.analyzers import keyword_index  # noqa: E402
+from src.analyzers.keyword_index import KeywordIndex  # noqa: E402
+
+
+def test_english_tokens_are_lowercased():
+    index = KeywordIndex(workers=1)
+    docs = index.tokenize(["AI绘画教程", "ai绘画挑战"])
+    assert docs[0][0] == docs[1][0] == "ai"
+    assert index.top_keywords(docs, top_n=1) == ["ai"]
+
+
+def test_tokenizer_version_invalidates_cached_tokens(tmp_path, monkeypatch):
+    index = KeywordIndex(cache_dir=tmp_path, workers=1)
+    index.tokenize(["春节旅游攻略"])
+    # 模拟旧版本分词规则留下的缓存
+    with index._conn:
+        index._conn.execute("UPDATE tokens SET tokens = 'stale'")
+    index.close()
+
+    assert KeywordIndex(cache_dir=tmp_path, workers=1).tokenize(["春节旅游攻略"]) == [["stale"]]
+    monkeypatch.setattr(keyword_index, "TOKENIZER_VERSION", keyword_index.TOKENIZER_VERSION + 1)
+    assert KeywordIndex(cache_dir=tmp_path, workers=1).tokenize(["春节旅游攻略"]) != [["stale"]]
@@ -0,0 +1,34 @@
+"""TopicResolver 话题合并测试"""
+import pytest
+
+pytest.importorskip("jieba")
+
+from src.utils.topic_resolver import TopicResolver  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "known, title",
+    [
+        ("中国队战胜日本队", "日本队战胜中国队"),
+        ("考研还是工作", "工作还是考研"),
+        ("北京到上海", "上海到北京"),
+    ],
+)
+def test_reordered_titles_stay_distinct(known, title):
+    resolver = TopicResolver()
+    resolver.register(1, known)
+    assert resolver.similarity(title, 1) == 0.0
+    assert resolver.resolve([title]) == [None]
+
+
+def test_near_duplicate_titles_are_merged():
+    resolver = TopicResolver()
+    resolver.register(1, "冬日氛围感穿搭")
+    resolver.register(2, "春节旅游挑战")
+    assert resolver.resolve(["冬日氛围感穿搭分享", "#春节旅游挑战 🔥"]) == [1, 2]
+
+
+def test_titles_with_different_numbers_stay_distinct():
+    resolver = TopicResolver()
+    resolver.register(1, "话题1号")
+    assert resolver.resolve(["话题11号"]) == [None]